@@ -0,0 +1,322 @@
+# __main__.py
+
+"""
+헤드리스 실행 진입점입니다.
+
+    python -m algorithm backtest --symbol BTC-USD --interval 1h --days 30
+    python -m algorithm scan --symbols BTC-USD ETH-USD --interval 1h
+    python -m algorithm live --symbols BTCUSDT ETHUSDT --interval 1m [--trade --amount 0.001]
+    python -m algorithm chart --symbol BTC-USD --interval 1h --out chart.html
+    python -m algorithm imports
+
+서브커맨드는 필요한 모듈만 함수 안에서 import하므로, 차트(plotly)와 데이터 공급자(yfinance, ccxt)는
+그 경로를 실제로 탈 때만 로드됩니다. ``imports``는 서브커맨드별 import 시간 예산과
+헤드리스 경로에 무거운 모듈이 섞이지 않았는지를 새 프로세스에서 확인합니다.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path:
+    # 모듈들은 algorithm/ 기준 절대 경로(from backtest.core import ...)로 서로를 import
+    sys.path.insert(0, ROOT)
+
+# 서브커맨드가 import하는 모듈 (``imports``가 이 목록을 새 프로세스에서 import해 측정)
+SUBCOMMAND_MODULES: Dict[str, tuple] = {
+    'backtest': ('market_data.candle_store', 'technical_indicators.pipeline', 'backtest.core', 'backtest.sweep'),
+    'scan': ('market_data.candle_store', 'technical_indicators.pipeline', 'backtest.core'),
+    'live': ('market_data.kline_stream', 'market_data.async_fetcher', 'market_data.metadata',
+             'live.signal_pipeline', 'live.execution', 'instrumentation.latency'),
+    'chart': ('market_data.candle_store', 'technical_indicators.pipeline', 'research_epm_long', 'charting.fast_chart'),
+}
+# 서브커맨드별 cold import 시간 예산 (ms)
+IMPORT_BUDGET_MS: Dict[str, float] = {'backtest': 1000., 'scan': 1000., 'live': 1000., 'chart': 1000.}
+# 차트/데이터 공급자 모듈. 헤드리스 서브커맨드의 import 단계에서는 로드되면 안 됨
+HEAVY_MODULES = ('plotly', 'yfinance', 'ccxt')
+HEADLESS_COMMANDS = ('backtest', 'scan', 'live')
+
+
+# --- 공통 ---------------------------------------------------------------------------
+
+def _store(path: Optional[str]) -> Any:
+    from market_data.candle_store import CandleStore
+
+    store = CandleStore(path) if path else CandleStore.from_env()
+    if store is None:
+        raise SystemExit('캔들 저장소가 필요합니다 (--store 또는 PYCOIN_CANDLE_STORE)')
+    return store
+
+def _load(args: argparse.Namespace, symbol: str) -> Any:
+    import pandas as pd
+    from market_data.candle_store import yfinance_downloader
+
+    end = pd.Timestamp.now(tz='UTC').floor('min')
+    start = end - pd.Timedelta(days=args.days)
+    # --offline이면 저장된 봉만 읽고, 아니면 빠진 구간만 yfinance로 받음 (yfinance는 이때만 import)
+    downloader = None if args.offline else yfinance_downloader
+    return _store(args.store).load(symbol, args.interval, start, end, downloader)
+
+def _signals(data: Any) -> Any:
+    from technical_indicators.pipeline import IndicatorPipeline, epm_indicators
+
+    return IndicatorPipeline(epm_indicators(), cache=None).run(data)
+
+def _add_data_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--interval', default='1h', help='봉 간격 (기본값: 1h)')
+    parser.add_argument('--days', type=float, default=30., help='읽을 기간(일) (기본값: 30)')
+    parser.add_argument('--store', help='캔들 저장소 경로 (기본값: PYCOIN_CANDLE_STORE)')
+    parser.add_argument('--offline', action='store_true', help='내려받지 않고 저장된 봉만 사용')
+
+
+# --- 서브커맨드 ---------------------------------------------------------------------
+
+def cmd_backtest(args: argparse.Namespace) -> int:
+    import numpy as np
+    from backtest.core import backtest_arrays
+    from backtest.ledger import TradeLedger, ledger_statistics
+    from market_data.candle_store import interval_to_ns
+
+    data = _signals(_load(args, args.symbol))
+    columns = ('Close', 'High', 'Low', 'EMA200', 'MACD', 'Signal', 'ParabolicSAR')
+    events, entry_prices, exit_prices, profits = backtest_arrays(*(data[c].to_numpy(dtype=np.float64) for c in columns))
+    ledger = TradeLedger.from_events(events, entry_prices, exit_prices, profits, fee_rate=args.fee_rate)
+    bars_per_year = 365 * 86400 * 10**9 / interval_to_ns(args.interval)
+    print(json.dumps({'symbol': args.symbol, 'bars': len(data),
+                      **ledger_statistics(ledger, len(data), bars_per_year)}))
+    return 0
+
+def cmd_scan(args: argparse.Namespace) -> int:
+    import numpy as np
+    from backtest.core import EVENT_NONE, backtest_arrays
+
+    columns = ('Close', 'High', 'Low', 'EMA200', 'MACD', 'Signal', 'ParabolicSAR')
+    for symbol in args.symbols:
+        data = _signals(_load(args, symbol))
+        if len(data) == 0:
+            continue
+        events, entry_prices, exit_prices, _ = backtest_arrays(*(data[c].to_numpy(dtype=np.float64) for c in columns))
+        if events[-1] != EVENT_NONE or args.all:
+            print(json.dumps({'symbol': symbol, 'time': str(data.index[-1]), 'event': int(events[-1]),
+                              'entry_price': float(entry_prices[-1]), 'exit_price': float(exit_prices[-1])}))
+    return 0
+
+def cmd_chart(args: argparse.Namespace) -> int:
+    from charting.fast_chart import create_chart, write_chart
+    from research_epm_long import add_trade_signals, compact_epm_frame
+
+    trades = None
+    if args.compact:
+        data, ledger = compact_epm_frame(_load(args, args.symbol))
+        trades = ledger.signal_rows(data)
+    else:
+        data = add_trade_signals(_signals(_load(args, args.symbol)))
+    write_chart(create_chart(data, f'{args.symbol} {args.interval}', symbol=args.symbol,
+                             max_points=args.max_points, trades=trades), args.out)
+    print(args.out)
+    return 0
+
+def _credentials() -> Dict[str, str]:
+    if os.environ.get('BINANCE_API_KEY'):
+        return {'apiKey': os.environ['BINANCE_API_KEY'], 'secret': os.environ.get('BINANCE_SECRET', '')}
+    sys.path.append(os.path.dirname(ROOT))
+    from securite.decrypter import decrypter_les_donnees
+
+    data = decrypter_les_donnees()
+    return {'apiKey': data['api_key'], 'secret': data['secret_key']}
+
+async def _live(args: argparse.Namespace) -> None:
+    import asyncio
+    import logging
+
+    from backtest.core import EVENT_LONG_TO_SHORT, EVENT_SHORT_TO_LONG
+    from instrumentation.latency import LATENCY
+    from live.execution import (
+        OrderExecutor, OrderRejected, OrderTracker, ProtectionFailed, UserDataStream, signal_order
+    )
+    from live.signal_pipeline import SignalPipeline
+    from market_data.async_fetcher import AsyncOHLCVFetcher, create_binance_futures_exchange
+    from market_data.kline_stream import KlineStream, rest_backfill
+    from market_data.metadata import MarketMetadataCache, markets_to_array
+
+    log = logging.getLogger('pycoin.live')
+    exchange = create_binance_futures_exchange(_credentials() if args.trade else None)
+    tasks: List[Any] = []
+    if args.metrics_port or args.latency_dump:
+        LATENCY.enabled = True
+    if args.metrics_port:
+        tasks.append(await LATENCY.serve_prometheus(port=args.metrics_port))
+    if args.latency_dump:
+        tasks.append(asyncio.ensure_future(LATENCY.dump_periodically(args.latency_dump)))
+
+    try:
+        markets = await exchange.load_markets()
+        cache = MarketMetadataCache(args.market_cache).load(
+            lambda: markets_to_array(markets.values(), exchange.precisionMode)
+        )
+        linear = cache.markets[cache.markets['contract'] & cache.markets['linear']]
+        ids = dict(zip(linear['id'].tolist(), linear['symbol'].tolist()))  # Binance id -> ccxt 심볼
+        symbols = [symbol.upper() for symbol in args.symbols]
+        fetcher = AsyncOHLCVFetcher(exchange)
+        pipeline = SignalPipeline()
+
+        # 지표 상태를 과거 봉으로 먼저 채움 (이 동안의 신호로는 주문하지 않음)
+        step_ms = exchange.parse_timeframe(args.interval) * 1000
+        now_ms = int(exchange.milliseconds()) // step_ms * step_ms
+        backfill = rest_backfill(fetcher, ids, args.interval)
+        last_open = {}
+        for symbol, bars in zip(symbols, await asyncio.gather(
+                *(backfill(s, now_ms - args.warmup_bars * step_ms, now_ms) for s in symbols))):
+            for bar in bars:
+                pipeline.on_bar(bar)
+            if bars:
+                last_open[symbol] = bars[-1].open_time
+
+        executor = None
+        if args.trade:
+            tracker = OrderTracker()
+            executor = OrderExecutor(cache, exchange, tracker)
+            await executor.warmup()
+            tasks.append(asyncio.ensure_future(UserDataStream(exchange, tracker).run()))
+
+        async def act(update: Any) -> None:
+            symbol = ids[update.bar.symbol]
+            try:
+                if update.event in (EVENT_LONG_TO_SHORT, EVENT_SHORT_TO_LONG):
+                    await executor.close_position(symbol)
+                order = signal_order(update, symbol, args.amount)
+                if order is not None:
+                    await executor.open_position(order)
+            except OrderRejected:
+                raise  # 진입이 거부되어 새로 열린 포지션 없음
+            except Exception as error:
+                # 보호 주문 없이 포지션이 남지 않도록 스트림으로 알고 있는 수량을 청산 (실행기가 이미 청산했으면 생략)
+                if not (isinstance(error, ProtectionFailed) and error.flattened):
+                    await executor.close_position(symbol)
+                raise
+
+        def report(update: Any, task: Any) -> None:
+            # ensure_future로 띄운 주문 작업의 예외는 아무도 await하지 않으므로 여기서 남김
+            if not task.cancelled() and task.exception() is not None:
+                log.error('%s event %d order failed: %r', update.bar.symbol, update.event, task.exception(),
+                          exc_info=task.exception())
+
+        def on_signal(update: Any) -> None:
+            print(json.dumps({'symbol': update.bar.symbol, 'open_time': update.bar.open_time, 'event': update.event,
+                              'entry_price': update.entry_price, 'exit_price': update.exit_price, 'sar': update.sar}),
+                  flush=True)
+            if executor is not None:
+                task = asyncio.ensure_future(act(update))
+                task.add_done_callback(lambda task: report(update, task))
+                tasks.append(task)
+
+        pipeline.on_signal = on_signal
+        stream = KlineStream(symbols, args.interval, pipeline.on_bar, backfill)
+        stream.last_open_time.update(last_open)
+        await stream.run()
+    finally:
+        for task in tasks:
+            if hasattr(task, 'cancel'):
+                task.cancel()
+            else:
+                await task.cleanup()
+        await exchange.close()
+
+def cmd_live(args: argparse.Namespace) -> int:
+    import asyncio
+    import logging
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    try:
+        asyncio.run(_live(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def measure_imports(command: str) -> Dict[str, Any]:
+    """
+    새 인터프리터에서 서브커맨드의 모듈을 import하는 데 걸린 시간과 로드된 무거운 모듈을 잽니다.
+
+    :param command: 서브커맨드 이름
+    :return: {'command', 'ms', 'budget_ms', 'heavy'}
+    """
+    code = (
+        'import importlib, json, sys, time\n'
+        f'sys.path.insert(0, {ROOT!r})\n'
+        'start = time.perf_counter()\n'
+        f'for name in {SUBCOMMAND_MODULES[command]!r}:\n'
+        '    importlib.import_module(name)\n'
+        'elapsed = (time.perf_counter() - start) * 1000\n'
+        f'heavy = sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)\n'
+        'print(json.dumps({"ms": elapsed, "heavy": heavy}))\n'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return {'command': command, 'budget_ms': IMPORT_BUDGET_MS[command], **json.loads(result.stdout)}
+
+def cmd_imports(args: argparse.Namespace) -> int:
+    failed = False
+    for command in args.commands or list(SUBCOMMAND_MODULES):
+        report = measure_imports(command)
+        over = report['ms'] > report['budget_ms'] * args.scale
+        leaked = command in HEADLESS_COMMANDS and report['heavy']
+        failed = failed or over or bool(leaked)
+        status = 'FAIL' if over or leaked else 'ok'
+        print(f"{status:4} {command:9} {report['ms']:8.1f} ms (budget {report['budget_ms'] * args.scale:.0f} ms)"
+              + (f" heavy={','.join(report['heavy'])}" if report['heavy'] else ''))
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m algorithm', description='pycoin headless runner')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    backtest = commands.add_parser('backtest', help='EMA200 + MACD + Parabolic SAR 전략 백테스트')
+    backtest.add_argument('--symbol', default='BTC-USD')
+    backtest.add_argument('--fee-rate', type=float, default=0., help='진입/청산 한 번당 수수료율 (예: 0.0005)')
+    _add_data_arguments(backtest)
+    backtest.set_defaults(func=cmd_backtest)
+
+    scan = commands.add_parser('scan', help='여러 심볼의 마지막 봉 신호 확인')
+    scan.add_argument('--symbols', nargs='+', required=True)
+    scan.add_argument('--all', action='store_true', help='신호가 없는 심볼도 출력')
+    _add_data_arguments(scan)
+    scan.set_defaults(func=cmd_scan)
+
+    live = commands.add_parser('live', help='Binance 선물 kline 스트림으로 실시간 신호 (--trade면 주문)')
+    live.add_argument('--symbols', nargs='+', required=True, help='Binance 심볼 id (예: BTCUSDT)')
+    live.add_argument('--interval', default='1m')
+    live.add_argument('--warmup-bars', type=int, default=500, help='시작할 때 채울 과거 봉 수 (기본값: 500)')
+    live.add_argument('--trade', action='store_true', help='신호마다 손절/익절이 붙은 주문 전송')
+    live.add_argument('--amount', type=float, default=0., help='주문 수량 (--trade면 필수)')
+    live.add_argument('--market-cache', default='market_cache', help='마켓 메타데이터 캐시 디렉터리')
+    live.add_argument('--metrics-port', type=int, default=0, help='Prometheus /metrics 포트 (0이면 끔)')
+    live.add_argument('--latency-dump', help='지연 시간 JSON을 주기적으로 쓸 경로')
+    live.set_defaults(func=cmd_live)
+
+    chart = commands.add_parser('chart', help='신호 차트 HTML 저장')
+    chart.add_argument('--symbol', default='BTC-USD')
+    chart.add_argument('--out', default='chart.html')
+    chart.add_argument('--max-points', type=int, default=2000)
+    chart.add_argument('--compact', action='store_true', help='float32 지표와 int8 이벤트 컬럼, 거래 장부로 계산')
+    _add_data_arguments(chart)
+    chart.set_defaults(func=cmd_chart)
+
+    imports = commands.add_parser('imports', help='서브커맨드별 import 시간 예산 확인')
+    imports.add_argument('commands', nargs='*', help=f"확인할 서브커맨드 (기본값: {' '.join(SUBCOMMAND_MODULES)})")
+    imports.add_argument('--scale', type=float, default=1., help='예산 배율 (느린 CI 머신용)')
+    imports.set_defaults(func=cmd_imports)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'trade', False) and args.amount <= 0:
+        parser.error('--trade requires --amount > 0')
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
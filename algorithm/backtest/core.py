@@ -0,0 +1,261 @@
+# backtest/core.py
+
+import numpy as np
+from typing import Dict, Tuple
+
+from technical_indicators.jit import njit, to_kernel, from_kernel
+
+# 포지션 상태
+POSITION_FLAT = 0
+POSITION_LONG = 1
+POSITION_SHORT = -1
+
+# 봉마다 발생한 이벤트 코드 (int8)
+EVENT_NONE = 0
+EVENT_LONG_ENTRY = 1
+EVENT_SHORT_ENTRY = 2
+EVENT_LONG_PROFIT = 3
+EVENT_LONG_LOSS = 4
+EVENT_SHORT_PROFIT = 5
+EVENT_SHORT_LOSS = 6
+EVENT_LONG_TO_SHORT = 7  # Long 포지션 청산 후 Short 진입
+EVENT_SHORT_TO_LONG = 8  # Short 포지션 청산 후 Long 진입
+
+# 새 포지션 진입이 일어나는 이벤트
+ENTRY_EVENTS = (EVENT_LONG_ENTRY, EVENT_SHORT_ENTRY, EVENT_LONG_TO_SHORT, EVENT_SHORT_TO_LONG)
+# 기존 포지션 청산이 일어나는 이벤트
+EXIT_EVENTS = (
+    EVENT_LONG_PROFIT, EVENT_LONG_LOSS, EVENT_SHORT_PROFIT, EVENT_SHORT_LOSS, EVENT_LONG_TO_SHORT, EVENT_SHORT_TO_LONG
+)
+
+SIGNAL_COLUMNS = (
+    'LongSignal',
+    'ShortSignal',
+    'LongProfitSignal',
+    'LongLossSignal',
+    'ShortProfitSignal',
+    'ShortLossSignal',
+    'LongExitSignal',
+    'ShortExitSignal',
+)
+
+# 이벤트 코드 -> SIGNAL_COLUMNS 순서의 신호 플래그
+_EVENT_SIGNALS = np.zeros((9, len(SIGNAL_COLUMNS)), dtype=bool)
+_EVENT_SIGNALS[EVENT_LONG_ENTRY, 0] = True
+_EVENT_SIGNALS[EVENT_SHORT_ENTRY, 1] = True
+_EVENT_SIGNALS[EVENT_LONG_PROFIT, 2] = True
+_EVENT_SIGNALS[EVENT_LONG_LOSS, 3] = True
+_EVENT_SIGNALS[EVENT_SHORT_PROFIT, 4] = True
+_EVENT_SIGNALS[EVENT_SHORT_LOSS, 5] = True
+_EVENT_SIGNALS[EVENT_LONG_TO_SHORT, [6, 1]] = True
+_EVENT_SIGNALS[EVENT_SHORT_TO_LONG, [7, 0]] = True
+
+
+def entry_conditions(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    ema: np.ndarray,
+    macd: np.ndarray,
+    signal: np.ndarray,
+    sar: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    README의 Long/Short 진입 조건을 벡터 연산으로 계산합니다.
+
+    Long: 종가 > EMA, MACD가 시그널을 상향 돌파, SAR가 캔들 아래
+    Short: 종가 < EMA, MACD가 시그널을 하향 돌파, SAR가 캔들 위
+
+    :param close: 종가 배열
+    :param high: 고가 배열
+    :param low: 저가 배열
+    :param ema: EMA 배열
+    :param macd: MACD 라인 배열
+    :param signal: 시그널 라인 배열
+    :param sar: Parabolic SAR 배열
+    :return: Long 진입 조건, Short 진입 조건 (bool 배열, 첫 봉은 항상 False)
+    """
+    long_entry = np.zeros(len(close), dtype=bool)
+    short_entry = np.zeros(len(close), dtype=bool)
+
+    macd_now, signal_now = macd[1:], signal[1:]
+    macd_prev, signal_prev = macd[:-1], signal[:-1]
+
+    long_entry[1:] = (
+        (close[1:] > ema[1:])
+        & (macd_now > signal_now) & (macd_prev <= signal_prev)
+        & (sar[1:] < low[1:])
+    )
+    short_entry[1:] = (
+        (close[1:] < ema[1:])
+        & (macd_now < signal_now) & (macd_prev >= signal_prev)
+        & (sar[1:] > high[1:])
+    )
+    return long_entry, short_entry
+
+
+@njit(cache=True)
+def _position_step(
+    position: int, entry_price: float, stop_loss: float, take_profit: float,
+    close: float, high: float, low: float, sar: float,
+    long_entry: bool, short_entry: bool
+) -> Tuple[int, float, float, float, int, float, float]:
+    """
+    한 봉에 대해 포지션 상태 머신을 전진시킵니다.
+
+    익절을 손절보다 먼저 확인하고, 반대 방향 진입 조건이 나오면 종가에 청산 후 즉시 반대 포지션에 진입합니다.
+
+    :return: (포지션, 진입가, 손절가, 익절가, 이벤트 코드, 청산가, 수익률 %)
+    """
+    event = EVENT_NONE
+    exit_price = np.nan
+    profit = np.nan
+
+    if position == POSITION_LONG:
+        if high >= take_profit:
+            event = EVENT_LONG_PROFIT
+            exit_price = take_profit
+            profit = (take_profit - entry_price) / entry_price * 100
+            position = POSITION_FLAT
+        elif low <= stop_loss:
+            event = EVENT_LONG_LOSS
+            exit_price = stop_loss
+            profit = (stop_loss - entry_price) / entry_price * 100
+            position = POSITION_FLAT
+        elif short_entry:
+            event = EVENT_LONG_TO_SHORT
+            exit_price = close
+            profit = (close - entry_price) / entry_price * 100
+            position = POSITION_SHORT
+            entry_price = close
+            stop_loss = sar
+            take_profit = entry_price - (stop_loss - entry_price)
+
+    elif position == POSITION_SHORT:
+        if low <= take_profit:
+            event = EVENT_SHORT_PROFIT
+            exit_price = take_profit
+            profit = (entry_price - take_profit) / entry_price * 100
+            position = POSITION_FLAT
+        elif high >= stop_loss:
+            event = EVENT_SHORT_LOSS
+            exit_price = stop_loss
+            profit = (entry_price - stop_loss) / entry_price * 100
+            position = POSITION_FLAT
+        elif long_entry:
+            event = EVENT_SHORT_TO_LONG
+            exit_price = close
+            profit = (entry_price - close) / entry_price * 100
+            position = POSITION_LONG
+            entry_price = close
+            stop_loss = sar
+            take_profit = entry_price + (entry_price - stop_loss)
+
+    else:
+        if long_entry:
+            event = EVENT_LONG_ENTRY
+            position = POSITION_LONG
+            entry_price = close
+            stop_loss = sar
+            take_profit = entry_price + (entry_price - stop_loss)
+        elif short_entry:
+            event = EVENT_SHORT_ENTRY
+            position = POSITION_SHORT
+            entry_price = close
+            stop_loss = sar
+            take_profit = entry_price - (stop_loss - entry_price)
+
+    return position, entry_price, stop_loss, take_profit, event, exit_price, profit
+
+
+@njit(cache=True)
+def _position_kernel(close, high, low, sar, long_entry, short_entry, events, entry_prices, exit_prices, profits) -> None:
+    position = POSITION_FLAT
+    entry_price = 0.
+    stop_loss = 0.
+    take_profit = 0.
+
+    for i in range(1, len(close)):
+        position, entry_price, stop_loss, take_profit, event, exit_price, profit = _position_step(
+            position, entry_price, stop_loss, take_profit,
+            close[i], high[i], low[i], sar[i], long_entry[i], short_entry[i]
+        )
+        if event != EVENT_NONE:
+            events[i] = event
+            exit_prices[i] = exit_price
+            profits[i] = profit
+            if event == EVENT_LONG_ENTRY or event == EVENT_SHORT_ENTRY \
+                    or event == EVENT_LONG_TO_SHORT or event == EVENT_SHORT_TO_LONG:
+                entry_prices[i] = entry_price
+
+
+def run_position_state_machine(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    sar: np.ndarray,
+    long_entry: np.ndarray,
+    short_entry: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    진입 조건 배열을 받아 Long/Short/익절/손절 상태 머신을 실행합니다.
+
+    numba가 있으면 컴파일된 커널을, 없으면 순수 Python 커널을 사용합니다.
+
+    :param close: 종가 배열
+    :param high: 고가 배열
+    :param low: 저가 배열
+    :param sar: Parabolic SAR 배열 (진입 시 손절가)
+    :param long_entry: Long 진입 조건 배열
+    :param short_entry: Short 진입 조건 배열
+    :return: 이벤트 코드(int8), 진입가, 청산가, 수익률(%) 배열 (이벤트가 없는 봉은 NaN)
+    """
+    n = len(close)
+    events = to_kernel(np.zeros(n, dtype=np.int8))
+    entry_prices = to_kernel(np.full(n, np.nan))
+    exit_prices = to_kernel(np.full(n, np.nan))
+    profits = to_kernel(np.full(n, np.nan))
+
+    _position_kernel(
+        to_kernel(np.asarray(close, dtype=np.float64)),
+        to_kernel(np.asarray(high, dtype=np.float64)),
+        to_kernel(np.asarray(low, dtype=np.float64)),
+        to_kernel(np.asarray(sar, dtype=np.float64)),
+        to_kernel(np.asarray(long_entry, dtype=bool)),
+        to_kernel(np.asarray(short_entry, dtype=bool)),
+        events, entry_prices, exit_prices, profits
+    )
+
+    return (
+        from_kernel(events, np.int8),
+        from_kernel(entry_prices, np.float64),
+        from_kernel(exit_prices, np.float64),
+        from_kernel(profits, np.float64),
+    )
+
+def backtest_arrays(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    ema: np.ndarray,
+    macd: np.ndarray,
+    signal: np.ndarray,
+    sar: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    지표 배열로부터 진입 조건을 계산하고 상태 머신을 실행합니다.
+
+    :return: 이벤트 코드(int8), 진입가, 청산가, 수익률(%) 배열
+    """
+    long_entry, short_entry = entry_conditions(close, high, low, ema, macd, signal, sar)
+    return run_position_state_machine(close, high, low, sar, long_entry, short_entry)
+
+def expand_events(events: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    이벤트 코드 배열을 ``SIGNAL_COLUMNS`` 이름의 bool 신호 배열들로 펼칩니다.
+
+    :param events: 이벤트 코드 배열
+    :return: 컬럼 이름 -> bool 배열
+    """
+    flags = _EVENT_SIGNALS[events]
+    return {name: flags[:, j] for j, name in enumerate(SIGNAL_COLUMNS)}
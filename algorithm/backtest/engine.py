@@ -0,0 +1,375 @@
+# backtest/engine.py
+
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from technical_indicators.jit import njit, to_kernel, from_kernel
+from market_data.candle_store import interval_to_ns
+from backtest.core import (
+    EVENT_NONE, EVENT_LONG_ENTRY, EVENT_SHORT_ENTRY, EVENT_LONG_PROFIT, EVENT_LONG_LOSS,
+    EVENT_SHORT_PROFIT, EVENT_SHORT_LOSS, EVENT_LONG_TO_SHORT, EVENT_SHORT_TO_LONG,
+    POSITION_FLAT, POSITION_LONG, POSITION_SHORT, entry_conditions
+)
+
+# 한 봉 안에서 익절/손절 중 무엇이 먼저 닿았는지 정하는 방법
+PATH_TP_FIRST = 0  # 익절을 먼저 확인 (add_trade_signals와 같음)
+PATH_OHLC = 1      # 시가에서 가까운 극값을 먼저 지나간다고 가정 (O-H-L-C 또는 O-L-H-C)
+
+# 봉 안의 청산 종류
+_EXIT_NONE = 0
+_EXIT_TAKE = 1
+_EXIT_STOP = 2
+
+# Binance 선물 펀딩 주기 (8시간)
+FUNDING_INTERVAL_NS = 8 * 3600 * 10**9
+
+
+class EngineConfig(NamedTuple):
+    """
+    체결 비용과 자금 설정입니다. 수수료와 슬리피지는 체결 금액 대비 비율입니다.
+    """
+    initial_capital: float = 10000.
+    leverage: float = 1.         # 진입 시 자기자본 대비 포지션 규모
+    maker_fee: float = 0.0002    # 익절 지정가 주문
+    taker_fee: float = 0.0005    # 진입/반대 진입 시장가 주문과 손절 스탑 마켓 주문
+    slippage: float = 0.0001     # 시장가/스탑 체결이 불리하게 밀리는 비율
+    path: int = PATH_OHLC
+
+
+DEFAULT_CONFIG = EngineConfig()
+
+
+class MarketEvents(NamedTuple):
+    """
+    엔진이 재생하는 이벤트 큐입니다.
+
+    봉은 시간순 배열이고, 봉 i의 틱은 ``tick_price[tick_start[i]:tick_end[i]]``에 시간순으로 들어 있습니다.
+    펀딩은 봉이 열릴 때 적용할 펀딩 비율의 합입니다.
+    """
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    sar: np.ndarray
+    long_entry: np.ndarray
+    short_entry: np.ndarray
+    funding: np.ndarray
+    tick_start: np.ndarray
+    tick_end: np.ndarray
+    tick_price: np.ndarray
+
+
+class EngineResult(NamedTuple):
+    """
+    봉마다의 엔진 결과입니다. 이벤트가 없는 봉의 가격/수익률은 NaN입니다.
+
+    entry_prices, exit_prices는 슬리피지가 반영된 체결가이고, profits는 수수료와 펀딩까지 뺀 거래 순수익률(%)입니다.
+    """
+    events: np.ndarray
+    entry_prices: np.ndarray
+    exit_prices: np.ndarray
+    profits: np.ndarray
+    equity: np.ndarray
+    fees: np.ndarray
+    funding: np.ndarray
+
+
+def _utc_ns(index: pd.Index) -> np.ndarray:
+    # 시간대가 없는 인덱스는 UTC로 간주
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.as_unit('ns').asi8
+
+
+def funding_per_bar(
+    index: pd.Index,
+    interval: str,
+    rates: Union[float, pd.Series, None]
+) -> np.ndarray:
+    """
+    펀딩 시각을 봉에 배정합니다. 펀딩 시각이 ``[봉 시작, 다음 봉 시작)``에 들면 그 봉이 열릴 때 적용합니다.
+
+    :param index: 봉 시작 시각
+    :param interval: 봉 간격 (예: '1h')
+    :param rates: 고정 펀딩 비율(8시간마다, UTC 00/08/16시) 또는 펀딩 시각 -> 비율 Series
+    :return: 봉마다의 펀딩 비율 합
+    """
+    n = len(index)
+    funding = np.zeros(n)
+    if rates is None or n == 0:
+        return funding
+    starts = _utc_ns(index)
+    end = starts[-1] + interval_to_ns(interval)
+    if isinstance(rates, pd.Series):
+        times = _utc_ns(rates.index)
+        values = rates.to_numpy(dtype=np.float64)
+    else:
+        first = -(-starts[0] // FUNDING_INTERVAL_NS) * FUNDING_INTERVAL_NS
+        times = np.arange(first, end, FUNDING_INTERVAL_NS, dtype=np.int64)
+        values = np.full(len(times), float(rates))
+    keep = (times >= starts[0]) & (times < end)
+    bars = np.searchsorted(starts, times[keep], side='right') - 1
+    np.add.at(funding, bars, values[keep])
+    return funding
+
+
+def build_events(
+    data: pd.DataFrame,
+    interval: str,
+    ticks: Optional[pd.Series] = None,
+    funding: Union[float, pd.Series, None] = None
+) -> MarketEvents:
+    """
+    지표 컬럼(EMA200, MACD, Signal, ParabolicSAR)이 있는 봉 데이터로 이벤트 큐를 만듭니다.
+
+    :param data: 시계열 데이터
+    :param interval: 봉 간격 (예: '1h')
+    :param ticks: 체결가 Series (시각 인덱스, 시간순). 있으면 그 봉의 익절/손절은 틱 순서로 판정합니다.
+    :param funding: 고정 펀딩 비율 또는 펀딩 시각 -> 비율 Series (기본값: None, 펀딩 없음)
+    :return: 이벤트 큐
+    """
+    columns = {name: data[name].to_numpy(dtype=np.float64)
+               for name in ('Open', 'High', 'Low', 'Close', 'EMA200', 'MACD', 'Signal', 'ParabolicSAR')}
+    long_entry, short_entry = entry_conditions(
+        columns['Close'], columns['High'], columns['Low'],
+        columns['EMA200'], columns['MACD'], columns['Signal'], columns['ParabolicSAR']
+    )
+
+    n = len(data)
+    if ticks is None or len(ticks) == 0:
+        tick_start = np.zeros(n, dtype=np.int64)
+        tick_end = np.zeros(n, dtype=np.int64)
+        tick_price = np.zeros(0)
+    else:
+        bar_times = _utc_ns(data.index)
+        tick_times = _utc_ns(ticks.index)
+        tick_start = np.searchsorted(tick_times, bar_times, side='left')
+        tick_end = np.searchsorted(tick_times, bar_times + interval_to_ns(interval), side='left')
+        tick_price = ticks.to_numpy(dtype=np.float64)
+
+    return MarketEvents(
+        columns['Open'], columns['High'], columns['Low'], columns['Close'], columns['ParabolicSAR'],
+        long_entry, short_entry, funding_per_bar(data.index, interval, funding),
+        tick_start.astype(np.int64), tick_end.astype(np.int64), tick_price
+    )
+
+
+@njit(cache=True)
+def _bar_exit(position, stop_loss, take_profit, open_, high, low, path):
+    """
+    틱이 없는 봉에서 익절/손절 여부와 트리거 가격을 정합니다.
+
+    :return: (청산 종류, 트리거 가격)
+    """
+    if position == POSITION_LONG:
+        if path == PATH_TP_FIRST:
+            if high >= take_profit:
+                return _EXIT_TAKE, take_profit
+            if low <= stop_loss:
+                return _EXIT_STOP, stop_loss
+            return _EXIT_NONE, 0.
+        # 시가가 이미 레벨을 넘어서 열리면 시가에 체결
+        if open_ >= take_profit:
+            return _EXIT_TAKE, open_
+        if open_ <= stop_loss:
+            return _EXIT_STOP, open_
+        if high - open_ <= open_ - low:  # O-H-L-C
+            if high >= take_profit:
+                return _EXIT_TAKE, take_profit
+            if low <= stop_loss:
+                return _EXIT_STOP, stop_loss
+        else:  # O-L-H-C
+            if low <= stop_loss:
+                return _EXIT_STOP, stop_loss
+            if high >= take_profit:
+                return _EXIT_TAKE, take_profit
+    else:
+        if path == PATH_TP_FIRST:
+            if low <= take_profit:
+                return _EXIT_TAKE, take_profit
+            if high >= stop_loss:
+                return _EXIT_STOP, stop_loss
+            return _EXIT_NONE, 0.
+        if open_ <= take_profit:
+            return _EXIT_TAKE, open_
+        if open_ >= stop_loss:
+            return _EXIT_STOP, open_
+        if high - open_ <= open_ - low:
+            if high >= stop_loss:
+                return _EXIT_STOP, stop_loss
+            if low <= take_profit:
+                return _EXIT_TAKE, take_profit
+        else:
+            if low <= take_profit:
+                return _EXIT_TAKE, take_profit
+            if high >= stop_loss:
+                return _EXIT_STOP, stop_loss
+    return _EXIT_NONE, 0.
+
+@njit(cache=True)
+def _tick_exit(position, stop_loss, take_profit, tick_price, start, end):
+    """
+    봉 안의 틱을 순서대로 보며 먼저 닿은 레벨을 찾습니다.
+    익절은 지정가라 레벨 가격을, 손절은 스탑 마켓이라 레벨을 넘어선 틱의 가격을 트리거 가격으로 돌려줍니다.
+
+    :return: (청산 종류, 트리거 가격)
+    """
+    for j in range(start, end):
+        price = tick_price[j]
+        if position == POSITION_LONG:
+            if price >= take_profit:
+                return _EXIT_TAKE, take_profit
+            if price <= stop_loss:
+                return _EXIT_STOP, price
+        else:
+            if price <= take_profit:
+                return _EXIT_TAKE, take_profit
+            if price >= stop_loss:
+                return _EXIT_STOP, price
+    return _EXIT_NONE, 0.
+
+
+@njit(cache=True)
+def _engine_kernel(
+    open_, high, low, close, sar, long_entry, short_entry, funding, tick_start, tick_end, tick_price,
+    initial_capital, leverage, maker_fee, taker_fee, slippage, path,
+    events, entry_prices, exit_prices, profits, equity, fees, funding_paid
+) -> None:
+    # 포트폴리오 상태 (스칼라 지역 변수)
+    position = POSITION_FLAT
+    cash = initial_capital
+    quantity = 0.
+    entry_fill = 0.        # 슬리피지 반영 진입가
+    stop_loss = 0.
+    take_profit = 0.
+    trade_costs = 0.       # 진행 중인 거래의 수수료 + 펀딩
+
+    equity[0] = cash
+    for i in range(1, len(close)):
+        event = EVENT_NONE
+        bar_fees = 0.
+        bar_funding = 0.
+
+        # 펀딩 (봉이 열릴 때 보유 중인 포지션에 시가 기준으로 적용)
+        if position != POSITION_FLAT and funding[i] != 0.:
+            bar_funding = position * quantity * open_[i] * funding[i]
+            cash -= bar_funding
+            trade_costs += bar_funding
+
+        # 익절/손절
+        if position != POSITION_FLAT:
+            if tick_end[i] > tick_start[i]:
+                kind, trigger = _tick_exit(position, stop_loss, take_profit, tick_price, tick_start[i], tick_end[i])
+            else:
+                kind, trigger = _bar_exit(position, stop_loss, take_profit, open_[i], high[i], low[i], path)
+
+            if kind != _EXIT_NONE:
+                if kind == _EXIT_TAKE:
+                    # 지정가 주문: 레벨(또는 더 유리한 갭 가격)에 메이커로 체결
+                    fill = trigger
+                    fee = quantity * fill * maker_fee
+                    event = EVENT_LONG_PROFIT if position == POSITION_LONG else EVENT_SHORT_PROFIT
+                else:
+                    # 스탑 마켓 주문: 트리거 가격에서 불리하게 밀려 테이커로 체결
+                    fill = trigger * (1 - position * slippage)
+                    fee = quantity * fill * taker_fee
+                    event = EVENT_LONG_LOSS if position == POSITION_LONG else EVENT_SHORT_LOSS
+                pnl = position * quantity * (fill - entry_fill)
+                cash += pnl - fee
+                bar_fees += fee
+                trade_costs += fee
+                exit_prices[i] = fill
+                profits[i] = (pnl - trade_costs) / (quantity * entry_fill) * 100
+                position = POSITION_FLAT
+                quantity = 0.
+
+        # 종가 신호 (이번 봉에 익절/손절이 없었을 때만)
+        if event == EVENT_NONE:
+            side = POSITION_FLAT
+            if position == POSITION_FLAT:
+                if long_entry[i]:
+                    side = POSITION_LONG
+                elif short_entry[i]:
+                    side = POSITION_SHORT
+            elif position == POSITION_LONG and short_entry[i]:
+                side = POSITION_SHORT
+            elif position == POSITION_SHORT and long_entry[i]:
+                side = POSITION_LONG
+
+            if side != POSITION_FLAT:
+                if position != POSITION_FLAT:
+                    # 반대 신호: 기존 포지션을 종가에 시장가로 청산
+                    fill = close[i] * (1 - position * slippage)
+                    fee = quantity * fill * taker_fee
+                    pnl = position * quantity * (fill - entry_fill)
+                    cash += pnl - fee
+                    bar_fees += fee
+                    trade_costs += fee
+                    exit_prices[i] = fill
+                    profits[i] = (pnl - trade_costs) / (quantity * entry_fill) * 100
+                    event = EVENT_LONG_TO_SHORT if position == POSITION_LONG else EVENT_SHORT_TO_LONG
+                else:
+                    event = EVENT_LONG_ENTRY if side == POSITION_LONG else EVENT_SHORT_ENTRY
+
+                # 시장가 진입. 손절/익절 레벨은 신호 봉의 종가와 SAR로 정합니다.
+                position = side
+                entry_fill = close[i] * (1 + side * slippage)
+                quantity = cash * leverage / entry_fill
+                fee = quantity * entry_fill * taker_fee
+                cash -= fee
+                bar_fees += fee
+                trade_costs = fee
+                stop_loss = sar[i]
+                take_profit = close[i] + (close[i] - stop_loss)
+                entry_prices[i] = entry_fill
+
+        events[i] = event
+        fees[i] = bar_fees
+        funding_paid[i] = bar_funding
+        equity[i] = cash + position * quantity * (close[i] - entry_fill)
+
+
+def run_engine(events: MarketEvents, config: EngineConfig = DEFAULT_CONFIG) -> EngineResult:
+    """
+    이벤트 큐를 봉(틱이 있으면 틱) 순서대로 재생하며 README의 Long/Short 규칙으로 거래합니다.
+
+    - 진입, 반대 신호 청산: 신호 봉 종가에 시장가 (테이커 수수료 + 슬리피지)
+    - 익절: 지정가 (메이커 수수료, 시가가 넘어서 열리면 시가에 체결)
+    - 손절: 스탑 마켓 (테이커 수수료 + 슬리피지, 시가가 넘어서 열리면 시가 기준)
+    - 펀딩: 보유 포지션의 명목 금액 x 펀딩 비율 (Long이 양수 비율을 지불)
+
+    ``EngineConfig(maker_fee=0, taker_fee=0, slippage=0, path=PATH_TP_FIRST)``에 펀딩과 틱이 없으면
+    ``backtest_arrays``와 같은 이벤트를 냅니다.
+
+    :param events: ``build_events``로 만든 이벤트 큐
+    :param config: 체결 비용과 자금 설정
+    :return: 봉마다의 이벤트, 체결가, 순수익률, 자기자본, 수수료, 펀딩
+    """
+    n = len(events.close)
+    out_events = to_kernel(np.zeros(n, dtype=np.int8))
+    entry_prices = to_kernel(np.full(n, np.nan))
+    exit_prices = to_kernel(np.full(n, np.nan))
+    profits = to_kernel(np.full(n, np.nan))
+    equity = to_kernel(np.full(n, float(config.initial_capital)))
+    fees = to_kernel(np.zeros(n))
+    funding = to_kernel(np.zeros(n))
+
+    _engine_kernel(
+        *(to_kernel(np.asarray(values)) for values in events),
+        float(config.initial_capital), float(config.leverage), float(config.maker_fee),
+        float(config.taker_fee), float(config.slippage), int(config.path),
+        out_events, entry_prices, exit_prices, profits, equity, fees, funding
+    )
+
+    return EngineResult(
+        from_kernel(out_events, np.int8),
+        from_kernel(entry_prices, np.float64),
+        from_kernel(exit_prices, np.float64),
+        from_kernel(profits, np.float64),
+        from_kernel(equity, np.float64),
+        from_kernel(fees, np.float64),
+        from_kernel(funding, np.float64),
+    )
@@ -0,0 +1,134 @@
+# backtest/intrabar.py
+
+from typing import Callable, Dict, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from market_data.candle_store import TIME_COLUMN, CandleStore, interval_to_ns
+from backtest.core import (
+    ENTRY_EVENTS, EVENT_LONG_PROFIT, EVENT_LONG_LOSS, EVENT_SHORT_PROFIT, EVENT_SHORT_LOSS
+)
+
+# (시작 UTC 나노초, 끝 UTC 나노초, 미포함) -> 'time', 'High', 'Low' 등 컬럼 배열
+SubBarSource = Callable[[int, int], Dict[str, np.ndarray]]
+
+
+def store_source(store: CandleStore, symbol: str, interval: str) -> SubBarSource:
+    """
+    캔들 저장소의 하위 봉을 읽는 source를 만듭니다. 파티션을 memmap으로 열고 시간 인덱스로 구간만 잘라 읽습니다.
+
+    :param store: 캔들 저장소
+    :param symbol: 심볼 (예: 'BTC-USD')
+    :param interval: 하위 봉 간격 (예: '1m')
+    """
+    return lambda start_ns, end_ns: store.read_arrays(symbol, interval, start_ns, end_ns)
+
+def frame_source(data: pd.DataFrame) -> SubBarSource:
+    """
+    메모리에 있는 하위 봉 DataFrame에서 구간을 잘라 읽는 source를 만듭니다.
+
+    :param data: High, Low 컬럼과 시각 인덱스(시간순)를 가진 하위 봉 데이터
+    """
+    times = _utc_ns(data.index)
+    high = data['High'].to_numpy(dtype=np.float64)
+    low = data['Low'].to_numpy(dtype=np.float64)
+
+    def source(start_ns: int, end_ns: int) -> Dict[str, np.ndarray]:
+        lo, hi = np.searchsorted(times, [start_ns, end_ns])
+        return {TIME_COLUMN: times[lo:hi], 'High': high[lo:hi], 'Low': low[lo:hi]}
+
+    return source
+
+def _utc_ns(index: pd.Index) -> np.ndarray:
+    # 시간대가 없는 인덱스는 UTC로 간주 (CandleStore.write와 같음)
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    return index.tz_convert('UTC').as_unit('ns').asi8
+
+
+class IntrabarResult(NamedTuple):
+    """
+    하위 봉으로 다시 판정한 결과입니다.
+    """
+    events: np.ndarray
+    exit_prices: np.ndarray
+    profits: np.ndarray
+    ambiguous: int   # 익절가와 손절가에 모두 닿은 봉 수
+    resolved: int    # 그중 하위 봉으로 판정한 봉 수 (나머지는 하위 봉이 없어 익절로 유지)
+
+
+class IntrabarResolver:
+    """
+    한 봉 안에서 익절가와 손절가에 모두 닿은 경우에만 하위 봉(예: 1m)을 읽어 무엇이 먼저였는지 판정합니다.
+
+    ``backtest.core``의 상태 머신은 익절/손절 모두 그 봉에서 포지션을 닫으므로, 판정이 바뀌어도
+    이후 봉의 이벤트는 달라지지 않습니다. 그래서 상태 머신을 다시 돌리지 않고 해당 봉의
+    이벤트, 청산가, 수익률만 고칩니다.
+    """
+
+    def __init__(self, source: SubBarSource, interval: str):
+        """
+        :param source: 하위 봉을 읽는 함수 (``store_source`` 또는 ``frame_source``)
+        :param interval: 상위 봉 간격 (예: '1h')
+        """
+        self.source = source
+        self.bar_ns = interval_to_ns(interval)
+
+    def resolve(
+        self,
+        index: pd.Index,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        sar: np.ndarray,
+        events: np.ndarray,
+        exit_prices: np.ndarray,
+        profits: np.ndarray
+    ) -> IntrabarResult:
+        """
+        ``backtest_arrays``의 결과에서 모호한 익절 봉을 하위 봉으로 다시 판정합니다.
+
+        하위 봉에서 처음 손절가에 닿은 봉이 처음 익절가에 닿은 봉보다 빠르거나 같으면(같은 하위 봉 안에서도
+        모호하면) 손절로 봅니다.
+
+        :param index: 상위 봉 시작 시각
+        :return: 고친 이벤트, 청산가, 수익률과 판정 통계
+        """
+        events = np.array(events, dtype=np.int8)
+        exit_prices = np.array(exit_prices, dtype=np.float64)
+        profits = np.array(profits, dtype=np.float64)
+
+        # 각 봉에서 유지 중인 포지션의 진입 봉 (진입 봉의 종가와 SAR로 손절/익절가가 정해짐)
+        positions = np.arange(len(events))
+        entry_bar = np.maximum.accumulate(np.where(np.isin(events, ENTRY_EVENTS), positions, 0))
+
+        take_bars = np.flatnonzero((events == EVENT_LONG_PROFIT) | (events == EVENT_SHORT_PROFIT))
+        entry = entry_bar[take_bars]
+        is_long = events[take_bars] == EVENT_LONG_PROFIT
+        entry_price = close[entry]
+        stop_loss = sar[entry]
+        ambiguous = np.where(is_long, low[take_bars] <= stop_loss, high[take_bars] >= stop_loss)
+
+        times = _utc_ns(index)
+        resolved = 0
+        for i, long_side, price, stop in zip(take_bars[ambiguous], is_long[ambiguous],
+                                             entry_price[ambiguous], stop_loss[ambiguous]):
+            sub = self.source(int(times[i]), int(times[i]) + self.bar_ns)
+            if len(sub[TIME_COLUMN]) == 0:
+                continue
+            resolved += 1
+            sub_high = np.asarray(sub['High'])
+            sub_low = np.asarray(sub['Low'])
+            take = price + (price - stop) if long_side else price - (stop - price)
+            take_hits = sub_high >= take if long_side else sub_low <= take
+            stop_hits = sub_low <= stop if long_side else sub_high >= stop
+            first_take = np.argmax(take_hits) if take_hits.any() else len(take_hits)
+            first_stop = np.argmax(stop_hits) if stop_hits.any() else len(stop_hits)
+            if first_stop <= first_take and first_stop < len(stop_hits):
+                events[i] = EVENT_LONG_LOSS if long_side else EVENT_SHORT_LOSS
+                exit_prices[i] = stop
+                profits[i] = (stop - price) / price * 100 if long_side else (price - stop) / price * 100
+
+        return IntrabarResult(events, exit_prices, profits, int(ambiguous.sum()), resolved)
@@ -0,0 +1,423 @@
+# backtest/ledger.py
+
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from technical_indicators.jit import NUMBA_AVAILABLE, njit
+from backtest.core import (
+    ENTRY_EVENTS, EXIT_EVENTS, EVENT_LONG_ENTRY, EVENT_SHORT_TO_LONG, POSITION_LONG, POSITION_SHORT,
+    SIGNAL_COLUMNS, expand_events
+)
+
+# 거래 하나당 배열 (struct-of-arrays)
+LEDGER_FIELDS = (
+    'entry_index', 'exit_index', 'entry_time', 'exit_time', 'side',
+    'entry_price', 'exit_price', 'profit', 'fees', 'mae', 'mfe',
+)
+
+# ledger_statistics가 반환하는 지표 (순서는 _statistics_kernel의 반환 순서)
+STATISTICS = (
+    'trades', 'win_rate', 'total_return', 'mean_return',
+    'max_drawdown', 'sharpe', 'sortino', 'profit_factor', 'exposure',
+)
+
+# 시각이 없을 때 entry_time/exit_time 값 (datetime64로 보면 NaT)
+NAT = np.iinfo(np.int64).min
+
+# 이벤트 코드 -> 진입/청산/Long 진입 여부 (np.isin보다 빠른 표 조회)
+_IS_ENTRY = np.zeros(9, dtype=bool)
+_IS_ENTRY[list(ENTRY_EVENTS)] = True
+_IS_EXIT = np.zeros(9, dtype=bool)
+_IS_EXIT[list(EXIT_EVENTS)] = True
+_IS_LONG = np.zeros(9, dtype=bool)
+_IS_LONG[[EVENT_LONG_ENTRY, EVENT_SHORT_TO_LONG]] = True
+
+
+class TradeLedger:
+    """
+    백테스트의 거래 목록을 필드별 배열로 보관하는 희소 장부입니다.
+
+    봉마다 NaN/False로 채운 신호 컬럼 대신 진입/청산이 일어난 거래만 기록하므로
+    메모리는 봉 수가 아니라 거래 수에 비례합니다. 아직 청산되지 않은 마지막 거래는
+    exit_index가 -1이고 exit_time이 NaT, exit_price/profit이 NaN입니다.
+
+    수익률, 수수료, MAE/MFE는 모두 진입가 대비 %이며 MAE/MFE는 유리한 방향이 +입니다
+    (진입 다음 봉부터 청산 봉까지 가장 불리했던/유리했던 가격).
+    """
+    __slots__ = LEDGER_FIELDS
+
+    def __init__(
+        self,
+        entry_index: np.ndarray,
+        exit_index: np.ndarray,
+        entry_time: np.ndarray,
+        exit_time: np.ndarray,
+        side: np.ndarray,
+        entry_price: np.ndarray,
+        exit_price: np.ndarray,
+        profit: np.ndarray,
+        fees: np.ndarray,
+        mae: np.ndarray,
+        mfe: np.ndarray
+    ):
+        """
+        :param entry_index: 진입 봉 번호 (int64)
+        :param exit_index: 청산 봉 번호 (int64, 미청산이면 -1)
+        :param entry_time: 진입 봉 시각 (UTC epoch 나노초, int64)
+        :param exit_time: 청산 봉 시각 (UTC epoch 나노초, 미청산이면 NaT)
+        :param side: POSITION_LONG(1) 또는 POSITION_SHORT(-1) (int8)
+        :param entry_price: 진입가
+        :param exit_price: 청산가
+        :param profit: 수수료 전 수익률(%)
+        :param fees: 왕복 수수료(%)
+        :param mae: 최대 역행 폭(%)
+        :param mfe: 최대 순행 폭(%)
+        """
+        self.entry_index = entry_index
+        self.exit_index = exit_index
+        self.entry_time = entry_time
+        self.exit_time = exit_time
+        self.side = side
+        self.entry_price = entry_price
+        self.exit_price = exit_price
+        self.profit = profit
+        self.fees = fees
+        self.mae = mae
+        self.mfe = mfe
+
+    @classmethod
+    def from_events(
+        cls,
+        events: np.ndarray,
+        entry_prices: np.ndarray,
+        exit_prices: np.ndarray,
+        profits: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+        times: Optional[np.ndarray] = None,
+        fee_rate: float = 0.
+    ) -> 'TradeLedger':
+        """
+        ``backtest_arrays``의 봉별 결과에서 거래 목록을 뽑습니다.
+
+        포지션은 겹치지 않으므로 k번째 청산 이벤트는 k번째 진입을 닫습니다. Long/Short 전환 봉은
+        이전 거래의 청산이자 다음 거래의 진입입니다.
+
+        :param events: 이벤트 코드 배열
+        :param entry_prices: 진입 봉의 진입가 배열
+        :param exit_prices: 청산 봉의 청산가 배열
+        :param profits: 청산 봉의 수익률(%) 배열
+        :param high: 고가 배열 (주어지면 MAE/MFE 계산, 아니면 NaN)
+        :param low: 저가 배열
+        :param times: 봉 시각 (UTC epoch 나노초 배열 또는 DatetimeIndex, 기본값: None, NaT)
+        :param fee_rate: 진입/청산 한 번당 체결 금액 대비 수수료율 (예: 0.0005, 기본값: 0)
+        :return: 거래 장부
+        """
+        events = np.asarray(events)
+        rows = np.flatnonzero(events)
+        codes = events[rows]
+        entries = rows[_IS_ENTRY[codes]]
+        exits = rows[_IS_EXIT[codes]]
+        n = len(entries)
+
+        exit_index = np.full(n, -1, dtype=np.int64)
+        exit_index[:len(exits)] = exits
+        closed = exit_index >= 0
+        side = np.where(_IS_LONG[codes[_IS_ENTRY[codes]]], POSITION_LONG, POSITION_SHORT).astype(np.int8)
+        entry_price = np.asarray(entry_prices)[entries]
+        exit_price = np.where(closed, np.asarray(exit_prices)[exit_index], np.nan)
+
+        if times is None:
+            entry_time = np.full(n, NAT, dtype=np.int64)
+            exit_time = np.full(n, NAT, dtype=np.int64)
+        else:
+            times = _utc_ns(times)
+            entry_time = times[entries]
+            exit_time = np.where(closed, times[exit_index], NAT)
+
+        if high is not None and low is not None:
+            mae, mfe = _excursions(entries, exit_index, side, entry_price,
+                                   np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64))
+        else:
+            mae = np.full(n, np.nan)
+            mfe = np.full(n, np.nan)
+
+        return cls(
+            entries.astype(np.int64),
+            exit_index,
+            entry_time,
+            exit_time,
+            side,
+            entry_price,
+            exit_price,
+            np.where(closed, np.asarray(profits)[exit_index], np.nan),
+            # 진입 금액과 청산 금액에 각각 fee_rate (진입가 대비 %)
+            np.where(closed, fee_rate * (1. + exit_price / entry_price) * 100, fee_rate * 100),
+            mae,
+            mfe,
+        )
+
+    def __len__(self) -> int:
+        return len(self.entry_index)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in LEDGER_FIELDS)
+
+    @property
+    def net_profit(self) -> np.ndarray:
+        """
+        수수료를 뺀 수익률(%)입니다.
+        """
+        return self.profit - self.fees
+
+    def holding_bars(self, n_bars: int) -> np.ndarray:
+        """
+        :param n_bars: 백테스트한 봉 수 (미청산 거래는 마지막 봉까지 보유한 것으로 계산)
+        :return: 거래별 보유 봉 수
+        """
+        return np.where(self.exit_index >= 0, self.exit_index, n_bars) - self.entry_index
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        :return: 필드 이름 -> 배열
+        """
+        return {name: getattr(self, name) for name in LEDGER_FIELDS}
+
+    def to_frame(self, index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """
+        거래마다 한 행인 DataFrame으로 변환합니다.
+
+        :param index: 봉 인덱스 (주어지면 entry_time, exit_time을 그 인덱스의 시각으로 채움)
+        :return: 거래 DataFrame
+        """
+        frame = pd.DataFrame(self.arrays())
+        if index is not None:
+            frame['entry_time'] = index[self.entry_index]
+            exit_time = index[np.maximum(self.exit_index, 0)].to_series(index=frame.index)
+            frame['exit_time'] = exit_time.where(self.exit_index >= 0)
+        else:
+            frame['entry_time'] = pd.to_datetime(self.entry_time, utc=True)
+            frame['exit_time'] = pd.to_datetime(self.exit_time, utc=True)
+        return frame
+
+    def signal_rows(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        이벤트가 있는 봉만 ``add_trade_signals``와 같은 신호/가격 컬럼으로 펼칩니다 (차트 마커용).
+
+        :param data: 장부를 만든 전체 봉 데이터 (High, Low, Event 컬럼, ``add_trade_events``의 결과)
+        :return: 이벤트 봉의 High, Low, 신호 컬럼, EntryPrice, ExitPrice, ProfitPercentage
+        """
+        events = data['Event'].to_numpy(dtype=np.int8)
+        rows = np.flatnonzero(events)
+        signals = expand_events(events[rows])
+
+        # 진입/청산 봉은 모두 이벤트 봉이므로 rows 안의 위치로 바로 채움
+        closed = self.exit_index >= 0
+        exits = np.searchsorted(rows, self.exit_index[closed])
+        entry_prices = np.full(len(rows), np.nan)
+        exit_prices = np.full(len(rows), np.nan)
+        profits = np.full(len(rows), np.nan)
+        entry_prices[np.searchsorted(rows, self.entry_index)] = self.entry_price
+        exit_prices[exits] = self.exit_price[closed]
+        profits[exits] = self.profit[closed]
+
+        return pd.DataFrame({
+            'High': data['High'].to_numpy()[rows],
+            'Low': data['Low'].to_numpy()[rows],
+            **{name: signals[name] for name in SIGNAL_COLUMNS},
+            'EntryPrice': entry_prices,
+            'ExitPrice': exit_prices,
+            'ProfitPercentage': profits,
+        }, index=data.index[rows])
+
+
+def _utc_ns(times: np.ndarray) -> np.ndarray:
+    if isinstance(times, pd.Index):
+        index = pd.DatetimeIndex(times)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        return index.tz_convert('UTC').as_unit('ns').asi8
+    return np.asarray(times, dtype=np.int64)
+
+def _excursions(
+    entries: np.ndarray,
+    exit_index: np.ndarray,
+    side: np.ndarray,
+    entry_price: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    # 거래마다 (진입 다음 봉, 청산 봉] 구간의 최고가/최저가를 reduceat 한 번으로 계산
+    n_bars = len(high)
+    if len(entries) == 0:
+        return np.empty(0), np.empty(0)
+    starts = np.minimum(entries + 1, n_bars - 1)
+    ends = np.where(exit_index >= 0, exit_index + 1, n_bars)
+    bounds = np.empty(2 * len(entries), dtype=np.int64)
+    bounds[0::2] = starts
+    bounds[1::2] = ends
+    # 마지막 구간 끝(n_bars)이 범위를 벗어나지 않도록 값 하나를 덧붙임
+    highest = np.maximum.reduceat(np.append(high, np.nan), bounds)[0::2]
+    lowest = np.minimum.reduceat(np.append(low, np.nan), bounds)[0::2]
+
+    long = side == POSITION_LONG
+    favorable = np.where(long, highest - entry_price, entry_price - lowest) / entry_price * 100
+    adverse = np.where(long, lowest - entry_price, entry_price - highest) / entry_price * 100
+    # 진입 봉이 마지막 봉이면 지나간 봉이 없음
+    empty = entries + 1 >= n_bars
+    return np.where(empty, np.nan, adverse), np.where(empty, np.nan, favorable)
+
+
+# --- 성과 지표 ----------------------------------------------------------------------
+
+@njit(cache=True)
+def _statistics_kernel(returns, held, n_bars, periods):
+    # 청산된 거래의 수익률(%)을 한 번 훑어 모든 지표를 계산 (거래 수에 비례, 봉 수와 무관)
+    n = 0
+    wins = 0
+    total = 0.
+    total_sq = 0.
+    downside_sq = 0.
+    gross_win = 0.
+    gross_loss = 0.
+    equity = 1.
+    peak = 1.
+    max_drawdown = 0.
+    for i in range(len(returns)):
+        r = returns[i]
+        if r != r:
+            continue
+        n += 1
+        total += r
+        total_sq += r * r
+        if r > 0:
+            wins += 1
+            gross_win += r
+        else:
+            gross_loss -= r
+            downside_sq += r * r
+        equity *= 1 + r / 100
+        if equity > peak:
+            peak = equity
+        drawdown = 1 - equity / peak
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+
+    in_market = 0
+    for i in range(len(held)):
+        in_market += held[i]
+    exposure = in_market / n_bars if n_bars > 0 else np.nan
+
+    if n == 0:
+        return 0., np.nan, 0., np.nan, 0., np.nan, np.nan, np.nan, exposure
+
+    mean = total / n
+    variance = (total_sq - n * mean * mean) / (n - 1) if n > 1 else 0.
+    std = math.sqrt(variance) if variance > 0 else 0.
+    downside = math.sqrt(downside_sq / n)
+    scale = math.sqrt(periods) if periods > 0 else 1.
+    sharpe = mean / std * scale if std > 0 else np.nan
+    sortino = mean / downside * scale if downside > 0 else np.nan
+    profit_factor = gross_win / gross_loss if gross_loss > 0 else np.inf
+    return (float(n), wins / n, (equity - 1) * 100, mean, max_drawdown * 100,
+            sharpe, sortino, profit_factor, exposure)
+
+def _statistics_arrays(returns: np.ndarray, held: np.ndarray, n_bars: int, periods: float) -> Tuple[float, ...]:
+    # numba가 없을 때 _statistics_kernel과 같은 지표를 배열 연산으로 계산 (거래마다 Python 반복 없음)
+    exposure = held.sum() / n_bars if n_bars > 0 else np.nan
+    r = returns[~np.isnan(returns)]
+    n = len(r)
+    if n == 0:
+        return 0., np.nan, 0., np.nan, 0., np.nan, np.nan, np.nan, exposure
+
+    win = r > 0
+    gross_win = r[win].sum()
+    losses = r[~win]
+    gross_loss = -losses.sum()
+    equity = np.cumprod(1 + r / 100)
+    peak = np.maximum(np.maximum.accumulate(equity), 1.)
+    max_drawdown = max(float((1 - equity / peak).max()), 0.)
+
+    mean = r.mean()
+    std = r.std(ddof=1) if n > 1 else 0.
+    downside = math.sqrt((losses * losses).sum() / n)
+    scale = math.sqrt(periods) if periods > 0 else 1.
+    sharpe = mean / std * scale if std > 0 else np.nan
+    sortino = mean / downside * scale if downside > 0 else np.nan
+    profit_factor = gross_win / gross_loss if gross_loss > 0 else np.inf
+    return (float(n), np.count_nonzero(win) / n, (equity[-1] - 1) * 100, mean, max_drawdown * 100,
+            sharpe, sortino, profit_factor, exposure)
+
+
+def trade_statistics(
+    returns: np.ndarray,
+    held: np.ndarray,
+    n_bars: int,
+    bars_per_year: Optional[float] = None
+) -> Dict[str, float]:
+    """
+    거래별 수익률 배열로 성과 지표를 계산합니다. DataFrame 없이 배열만 쓰므로 numba가 있으면 파라미터 조합마다
+    수 마이크로초, 없어도 NumPy 배열 연산으로 거래 수천 개에 수백 마이크로초면 됩니다.
+
+    - total_return, max_drawdown: 거래마다 전액 재투자한 청산 기준 자산 곡선의 누적 수익률과 최대 낙폭(%)
+    - sharpe, sortino: 거래 수익률의 평균 / 표준편차(하방 편차). bars_per_year가 주어지면 연간 거래 수로 연율화
+    - exposure: 포지션을 들고 있던 봉의 비율
+
+    :param returns: 거래별 수익률(%) (미청산은 NaN)
+    :param held: 거래별 보유 봉 수
+    :param n_bars: 백테스트한 봉 수
+    :param bars_per_year: 1년의 봉 수 (예: 1분 봉 525600, 기본값: None, 연율화하지 않음)
+    :return: ``STATISTICS`` 이름 -> 값
+    """
+    periods = 0.
+    if bars_per_year and n_bars > 0:
+        periods = np.count_nonzero(~np.isnan(returns)) * bars_per_year / n_bars
+    statistics = _statistics_kernel if NUMBA_AVAILABLE else _statistics_arrays
+    values = statistics(np.asarray(returns, dtype=np.float64), np.asarray(held, dtype=np.int64), n_bars, periods)
+    stats = dict(zip(STATISTICS, (float(value) for value in values)))
+    stats['trades'] = int(stats['trades'])
+    return stats
+
+def ledger_statistics(
+    ledger: TradeLedger,
+    n_bars: int,
+    bars_per_year: Optional[float] = None,
+    net: bool = True
+) -> Dict[str, float]:
+    """
+    장부의 성과 지표를 계산합니다.
+
+    :param ledger: 거래 장부
+    :param n_bars: 백테스트한 봉 수
+    :param bars_per_year: ``trade_statistics``와 같음
+    :param net: True면 수수료를 뺀 수익률로 계산 (기본값: True)
+    :return: ``STATISTICS`` 이름 -> 값
+    """
+    returns = ledger.net_profit if net else ledger.profit
+    return trade_statistics(returns, ledger.holding_bars(n_bars), n_bars, bars_per_year)
+
+def equity_curve(ledger: TradeLedger, n_bars: int, net: bool = True) -> np.ndarray:
+    """
+    봉별 청산 기준 자산 곡선(시작 1)입니다. 자산은 거래가 청산되는 봉에서만 바뀝니다.
+
+    :param ledger: 거래 장부
+    :param n_bars: 백테스트한 봉 수
+    :param net: True면 수수료를 뺀 수익률로 계산
+    :return: 길이 n_bars의 자산 배열
+    """
+    closed = ledger.exit_index >= 0
+    returns = (ledger.net_profit if net else ledger.profit)[closed]
+    growth = np.ones(n_bars)
+    growth[ledger.exit_index[closed]] = 1 + returns / 100
+    return np.cumprod(growth)
+
+def drawdown_curve(equity: np.ndarray) -> np.ndarray:
+    """
+    :param equity: 자산 곡선
+    :return: 직전 고점 대비 낙폭(%) 배열 (0 이상)
+    """
+    return (1 - equity / np.maximum.accumulate(equity)) * 100
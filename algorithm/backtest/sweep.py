@@ -0,0 +1,215 @@
+# backtest/sweep.py
+
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from technical_indicators.ema200 import calculate_ema
+from technical_indicators.parabolic_sar import parabolic_sar_arrays
+from backtest.core import backtest_arrays
+from backtest.ledger import STATISTICS, TradeLedger, ledger_statistics
+
+OHLC_COLUMNS = ('Open', 'High', 'Low', 'Close')
+SUMMARY_COLUMNS = ('trades', 'win_rate', 'total_return', 'mean_return')
+
+
+class SweepParams(NamedTuple):
+    """
+    한 번의 백테스트에 사용할 지표 파라미터 조합입니다.
+    """
+    ema_period: int = 200
+    fast_period: int = 12
+    slow_period: int = 26
+    signal_period: int = 9
+    step: float = 0.02
+    max_step: float = 0.2
+
+
+def grid_search_space(
+    ema_periods: Iterable[int] = (200,),
+    fast_periods: Iterable[int] = (12,),
+    slow_periods: Iterable[int] = (26,),
+    signal_periods: Iterable[int] = (9,),
+    steps: Iterable[float] = (0.02,),
+    max_steps: Iterable[float] = (0.2,)
+) -> List[SweepParams]:
+    """
+    파라미터 후보들의 모든 조합을 만듭니다. fast >= slow, step > max_step 조합은 제외합니다.
+
+    :return: 파라미터 조합 목록
+    """
+    return [
+        SweepParams(*combo)
+        for combo in itertools.product(ema_periods, fast_periods, slow_periods, signal_periods, steps, max_steps)
+        if combo[1] < combo[2] and combo[4] <= combo[5]
+    ]
+
+def random_search_space(space: Dict[str, Sequence], n_samples: int, seed: Optional[int] = None) -> List[SweepParams]:
+    """
+    파라미터 후보에서 중복 없이 무작위 조합을 뽑습니다.
+
+    :param space: SweepParams 필드 이름 -> 후보 값 목록 (없는 필드는 기본값 사용)
+    :param n_samples: 뽑을 조합 수
+    :param seed: 난수 시드
+    :return: 파라미터 조합 목록
+    :raises ValueError: space에 SweepParams에 없는 이름이 있으면
+    """
+    unknown = sorted(set(space) - set(SweepParams._fields))
+    if unknown:
+        # 오타 난 이름이 조용히 기본값으로 바뀌지 않도록
+        raise ValueError(f'알 수 없는 파라미터: {", ".join(unknown)}')
+    grid = grid_search_space(*(space.get(name, (default,)) for name, default in SweepParams._field_defaults.items()))
+    rng = random.Random(seed)
+    return rng.sample(grid, min(n_samples, len(grid)))
+
+
+def summarize_trades(events: np.ndarray, profits: np.ndarray) -> Dict[str, float]:
+    """
+    백테스트 결과의 청산 수익률로 기본 성과 지표를 계산합니다.
+
+    :param events: 이벤트 코드 배열
+    :param profits: 청산 봉의 수익률(%) 배열 (그 외 NaN)
+    :return: 거래 수, 승률, 누적 수익률(%), 평균 수익률(%)
+    """
+    closed = profits[~np.isnan(profits)]
+    n_trades = len(closed)
+    if n_trades == 0:
+        return {'trades': 0, 'win_rate': np.nan, 'total_return': 0.0, 'mean_return': np.nan}
+    return {
+        'trades': n_trades,
+        'win_rate': float((closed > 0).mean()),
+        'total_return': float((np.prod(1 + closed / 100) - 1) * 100),
+        'mean_return': float(closed.mean()),
+    }
+
+
+# --- 워커 프로세스 상태 ---------------------------------------------------------
+
+_shm: Optional[shared_memory.SharedMemory] = None
+_ohlc: Optional[np.ndarray] = None
+_close_frame: Optional[pd.DataFrame] = None
+
+
+def _init_worker(shm_name: str, shape: Tuple[int, int]) -> None:
+    """
+    공유 메모리에 올라간 OHLC 배열을 복사 없이 붙입니다.
+    """
+    global _shm, _ohlc, _close_frame
+    _shm = shared_memory.SharedMemory(name=shm_name)
+    _ohlc = np.ndarray(shape, dtype=np.float64, buffer=_shm.buf)
+    _close_frame = pd.DataFrame({'Close': _ohlc[3]}, copy=False)
+    _clear_caches()
+
+def _attach_local(ohlc: np.ndarray) -> None:
+    global _ohlc, _close_frame
+    _ohlc = ohlc
+    _close_frame = pd.DataFrame({'Close': ohlc[3]}, copy=False)
+    _clear_caches()
+
+def _clear_caches() -> None:
+    _ema.cache_clear()
+    _macd.cache_clear()
+    _sar.cache_clear()
+
+
+# 같은 파라미터를 쓰는 조합끼리 지표를 재사용하기 위한 캐시
+@lru_cache(maxsize=64)
+def _ema(period: int) -> np.ndarray:
+    return calculate_ema(_close_frame, period).to_numpy()
+
+@lru_cache(maxsize=64)
+def _macd(fast_period: int, slow_period: int, signal_period: int) -> Tuple[np.ndarray, np.ndarray]:
+    macd_line = pd.Series(_ema(fast_period) - _ema(slow_period))
+    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    return macd_line.to_numpy(), signal_line.to_numpy()
+
+@lru_cache(maxsize=16)
+def _sar(step: float, max_step: float) -> np.ndarray:
+    return parabolic_sar_arrays(_ohlc[1], _ohlc[2], step, max_step)[0]
+
+
+def _evaluate(
+    params: SweepParams,
+    start: int = 0,
+    end: Optional[int] = None,
+    statistics: bool = False,
+    fee_rate: float = 0.,
+    bars_per_year: Optional[float] = None
+) -> Dict[str, float]:
+    # 지표는 전체 구간에서 계산해 두고 [start, end) 구간만 잘라 상태 머신을 실행 (지표는 인과적이므로 워밍업 재사용)
+    window = slice(start, end)
+    macd_line, signal_line = _macd(params.fast_period, params.slow_period, params.signal_period)
+    events, entry_prices, exit_prices, profits = backtest_arrays(
+        _ohlc[3, window], _ohlc[1, window], _ohlc[2, window],
+        _ema(params.ema_period)[window], macd_line[window], signal_line[window],
+        _sar(params.step, params.max_step)[window]
+    )
+    if statistics:
+        # 거래 장부의 배열만으로 지표 계산 (DataFrame 없음)
+        ledger = TradeLedger.from_events(events, entry_prices, exit_prices, profits, fee_rate=fee_rate)
+        return {**params._asdict(), **ledger_statistics(ledger, len(events), bars_per_year)}
+    return {**params._asdict(), **summarize_trades(events, profits)}
+
+def _cache_order(params: Sequence[SweepParams]) -> List[SweepParams]:
+    # 지표 캐시를 공유하는 조합끼리 이웃하도록 SAR/MACD 파라미터 순으로 정렬
+    return sorted(params, key=lambda p: (p.step, p.max_step, p.fast_period, p.slow_period, p.signal_period, p.ema_period))
+
+def _evaluate_chunk(chunk: List[SweepParams], **options: Any) -> List[Dict[str, float]]:
+    return [_evaluate(params, **options) for params in chunk]
+
+
+def run_sweep(
+    data: pd.DataFrame,
+    params: Sequence[SweepParams],
+    max_workers: Optional[int] = None,
+    chunk_size: int = 64,
+    rank_by: str = 'total_return',
+    statistics: bool = False,
+    fee_rate: float = 0.,
+    bars_per_year: Optional[float] = None,
+    ascending: bool = False
+) -> pd.DataFrame:
+    """
+    파라미터 조합마다 지표 계산과 ``add_trade_signals`` 상태 머신을 실행하고 순위표를 만듭니다.
+
+    OHLC 배열은 공유 메모리로 워커에 전달되어 DataFrame을 pickle하지 않습니다.
+    조합은 SAR/MACD 파라미터 순으로 정렬해 청크로 나누므로 같은 청크 안에서 지표 캐시가 재사용됩니다.
+
+    :param data: 시계열 데이터 (Open, High, Low, Close 컬럼 필요)
+    :param params: 파라미터 조합 목록
+    :param max_workers: 프로세스 수 (1이면 현재 프로세스에서 실행, 기본값: CPU 수)
+    :param chunk_size: 워커에 한 번에 넘길 조합 수 (기본값: 64)
+    :param rank_by: 순위 기준 컬럼 (기본값: 'total_return', statistics면 'sharpe', 'max_drawdown' 등도 가능)
+    :param statistics: True면 거래 장부로 수수료 반영 수익률, 최대 낙폭, Sharpe/Sortino, 노출도까지 계산
+    :param fee_rate: statistics일 때 진입/청산 한 번당 수수료율
+    :param bars_per_year: statistics일 때 Sharpe/Sortino 연율화에 쓸 1년의 봉 수
+    :param ascending: True면 rank_by 오름차순 (예: max_drawdown)
+    :return: rank_by로 정렬된 결과 DataFrame
+    """
+    ohlc = np.ascontiguousarray(data[list(OHLC_COLUMNS)].to_numpy(dtype=np.float64).T)
+    ordered = _cache_order(params)
+    chunks = [ordered[i:i + chunk_size] for i in range(0, len(ordered), chunk_size)]
+    evaluate = partial(_evaluate_chunk, statistics=statistics, fee_rate=fee_rate, bars_per_year=bars_per_year)
+
+    if max_workers == 1:
+        _attach_local(ohlc)
+        rows = [row for chunk in chunks for row in evaluate(chunk)]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=ohlc.nbytes)
+        try:
+            np.ndarray(ohlc.shape, dtype=ohlc.dtype, buffer=shm.buf)[:] = ohlc
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(shm.name, ohlc.shape)) as pool:
+                rows = [row for result in pool.map(evaluate, chunks) for row in result]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    metrics = STATISTICS if statistics else SUMMARY_COLUMNS
+    results = pd.DataFrame(rows, columns=list(SweepParams._fields) + list(metrics))
+    return results.sort_values(rank_by, ascending=ascending, kind='stable').reset_index(drop=True)
@@ -0,0 +1,144 @@
+# backtest/walk_forward.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.sweep import (
+    OHLC_COLUMNS, SweepParams, _attach_local, _cache_order, _evaluate, _init_worker
+)
+
+METRICS = ('trades', 'win_rate', 'total_return', 'mean_return')
+
+
+class Window(NamedTuple):
+    """
+    학습/검증 구간입니다. 모두 봉 위치이며 끝은 포함하지 않습니다.
+    """
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def rolling_windows(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    warmup: int = 0,
+    anchored: bool = False
+) -> List[Window]:
+    """
+    학습 구간 바로 뒤에 검증 구간이 오도록 test_bars씩 밀어가며 구간을 나눕니다.
+
+    :param n_bars: 전체 봉 수
+    :param train_bars: 학습 구간 길이
+    :param test_bars: 검증 구간 길이
+    :param warmup: 앞쪽에서 지표 워밍업으로만 쓰고 평가하지 않을 봉 수 (기본값: 0)
+    :param anchored: True면 학습 구간 시작을 warmup에 고정하고 끝만 늘림 (기본값: False)
+    :return: 구간 목록 (마지막 검증 구간이 test_bars보다 짧으면 제외)
+    """
+    windows = []
+    train_start = warmup
+    while train_start + train_bars + test_bars <= n_bars:
+        train_end = train_start + train_bars
+        windows.append(Window(warmup if anchored else train_start, train_end, train_end, train_end + test_bars))
+        train_start += test_bars
+    return windows
+
+
+def _evaluate_windows(task: Tuple[List[SweepParams], List[Window]]) -> List[Dict[str, float]]:
+    # 파라미터마다 지표를 한 번 계산하고(캐시) 모든 구간의 학습/검증 슬라이스를 평가
+    params, windows = task
+    rows = []
+    for candidate in params:
+        for number, window in enumerate(windows):
+            train = _evaluate(candidate, window.train_start, window.train_end)
+            test = _evaluate(candidate, window.test_start, window.test_end)
+            row = {'window': number, **candidate._asdict()}
+            row.update({f'train_{name}': train[name] for name in METRICS})
+            row.update({f'test_{name}': test[name] for name in METRICS})
+            rows.append(row)
+    return rows
+
+
+def run_walk_forward(
+    data: pd.DataFrame,
+    params: Sequence[SweepParams],
+    train_bars: int,
+    test_bars: int,
+    warmup: int = 0,
+    anchored: bool = False,
+    max_workers: Optional[int] = None,
+    rank_by: str = 'total_return',
+    min_trades: int = 1
+) -> pd.DataFrame:
+    """
+    구간마다 학습 구간에서 가장 좋은 파라미터를 고르고 바로 다음 검증 구간에서 평가합니다.
+
+    지표는 파라미터마다 전체 이력에서 한 번만 계산하고 구간마다 잘라서만 씁니다. EMA/MACD/SAR는
+    인과적이라 잘라낸 값이 그 구간 앞의 이력으로 워밍업된 값과 같으므로, 겹치는 구간마다 워밍업을
+    다시 계산하지 않습니다. 파라미터 후보를 프로세스에 나눠 모든 구간을 병렬로 평가합니다.
+
+    :param data: 시계열 데이터 (Open, High, Low, Close 컬럼 필요)
+    :param params: 파라미터 후보 (``grid_search_space``, ``random_search_space``)
+    :param train_bars: 학습 구간 길이 (봉 수)
+    :param test_bars: 검증 구간 길이 (봉 수)
+    :param warmup: 평가하지 않을 앞쪽 봉 수 (기본값: 0)
+    :param anchored: True면 학습 구간을 처음부터 누적 (기본값: False)
+    :param max_workers: 프로세스 수 (1이면 현재 프로세스에서 실행, 기본값: CPU 수)
+    :param rank_by: 학습 구간 선택 기준 (기본값: 'total_return')
+    :param min_trades: 선택 대상이 되기 위한 학습 구간 최소 거래 수 (기본값: 1)
+    :return: 구간마다 검증 시각, 고른 파라미터, train_*/test_* 성과를 가진 DataFrame (고를 조합이 없으면 NaN)
+    """
+    ohlc = np.ascontiguousarray(data[list(OHLC_COLUMNS)].to_numpy(dtype=np.float64).T)
+    windows = rolling_windows(len(data), train_bars, test_bars, warmup, anchored)
+    ordered = _cache_order(params)
+    chunk_size = max(1, -(-len(ordered) // (4 * (max_workers or os.cpu_count() or 1))))
+    tasks = [(ordered[i:i + chunk_size], windows) for i in range(0, len(ordered), chunk_size)]
+
+    if max_workers == 1:
+        _attach_local(ohlc)
+        rows = [row for task in tasks for row in _evaluate_windows(task)]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=ohlc.nbytes)
+        try:
+            np.ndarray(ohlc.shape, dtype=ohlc.dtype, buffer=shm.buf)[:] = ohlc
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(shm.name, ohlc.shape)) as pool:
+                rows = [row for result in pool.map(_evaluate_windows, tasks) for row in result]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    columns = (['window'] + list(SweepParams._fields)
+               + [f'train_{name}' for name in METRICS] + [f'test_{name}' for name in METRICS])
+    scores = pd.DataFrame(rows, columns=columns)
+
+    # 구간마다 학습 성과가 가장 좋은 파라미터 선택 (동점이면 먼저 나온 조합)
+    eligible = scores[(scores['train_trades'] >= min_trades) & scores[f'train_{rank_by}'].notna()]
+    best = eligible.sort_values(['window', f'train_{rank_by}'], ascending=[True, False], kind='stable')
+    best = best.drop_duplicates('window').set_index('window')
+
+    frame = pd.DataFrame(windows, columns=list(Window._fields))
+    frame['test_from'] = data.index[frame['test_start'].to_numpy()] if windows else []
+    frame['test_to'] = data.index[frame['test_end'].to_numpy() - 1] if windows else []
+    return frame.join(best)
+
+def summarize_walk_forward(results: pd.DataFrame) -> Dict[str, float]:
+    """
+    검증 구간 성과를 이어 붙인 전체 표본 외(out-of-sample) 성과를 계산합니다.
+
+    :param results: ``run_walk_forward``의 결과
+    :return: 구간 수, 거래 수, 누적 수익률(%), 수익 구간 비율
+    """
+    returns = results['test_total_return'].fillna(0.).to_numpy()
+    return {
+        'windows': len(results),
+        'trades': int(results['test_trades'].fillna(0).sum()),
+        'total_return': float((np.prod(1 + returns / 100) - 1) * 100),
+        'positive_windows': float((returns > 0).mean()) if len(returns) else np.nan,
+    }
@@ -0,0 +1,279 @@
+# benchmarks/suite.py
+
+"""
+지표, 하이킨 아시, 백테스트 루프의 처리량(봉/초)과 최대 메모리를 재는 벤치마크입니다.
+
+    python -m benchmarks.suite                       # 10k, 1m 봉
+    python -m benchmarks.suite --sizes 10k 1m 10m --save
+    python -m benchmarks.suite --cases cal_rsi stochastic_rsi --baseline other.json
+
+결과는 저장된 기준(기본값: benchmarks/baseline.json)과 비교해 처리량이 떨어졌거나 메모리가 늘어난
+케이스를 표시하고, 하나라도 있으면 종료 코드 1을 반환합니다. 기준은 측정한 머신에서만 의미가 있습니다.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SIZES, synthetic_ohlcv
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = ('10k', '1m')
+# 이 비율 이상 느려지거나 메모리가 늘면 회귀로 표시
+DEFAULT_TOLERANCE = 0.25
+# JIT 컴파일과 첫 호출 비용을 측정에서 빼기 위한 예열 봉 수
+WARMUP_BARS = 1000
+
+
+class Case(NamedTuple):
+    """
+    벤치마크 하나입니다. setup은 측정 밖에서 입력을 준비하고(입력을 바꾸는 함수도 매번 새 입력을 받음),
+    run만 시간과 메모리를 잽니다.
+    """
+    name: str
+    setup: Callable[[pd.DataFrame], Tuple[Any, ...]]
+    run: Callable[..., Any]
+
+
+def _ema(data: pd.DataFrame) -> Any:
+    from technical_indicators.ema200 import calculate_ema
+
+    return calculate_ema(data, 200)
+
+def _macd(data: pd.DataFrame) -> Any:
+    from technical_indicators.macd import calculate_macd
+
+    return calculate_macd(data)
+
+def _sar(data: pd.DataFrame) -> Any:
+    from technical_indicators.parabolic_sar import calculate_parabolic_sar
+
+    return calculate_parabolic_sar(data)
+
+def _heikin_ashi(data: pd.DataFrame) -> Any:
+    from heikin_ashi import heikin_ashi
+
+    return heikin_ashi(data)
+
+def _rsi(data: pd.DataFrame) -> Any:
+    from rsi import cal_rsi
+
+    return cal_rsi(data)
+
+def _stoch_rsi_input(data: pd.DataFrame) -> Tuple[Any, ...]:
+    from rsi import cal_rsi
+
+    return (cal_rsi(data),)
+
+def _stoch_rsi(rsi: pd.Series) -> Any:
+    from rsi import stochastic_rsi
+
+    return stochastic_rsi(rsi)
+
+def _trade_signals_input(data: pd.DataFrame) -> Tuple[Any, ...]:
+    from technical_indicators.pipeline import IndicatorPipeline, epm_indicators
+
+    return (IndicatorPipeline(epm_indicators(), cache=None).run(data),)
+
+def _trade_signals(data: pd.DataFrame) -> Any:
+    from research_epm_long import add_trade_signals
+
+    return add_trade_signals(data)
+
+def _compact(data: pd.DataFrame) -> Any:
+    from research_epm_long import compact_epm_frame
+
+    return compact_epm_frame(data)
+
+def _same(data: pd.DataFrame) -> Tuple[Any, ...]:
+    return (data,)
+
+
+CASES: Dict[str, Case] = {case.name: case for case in (
+    Case('calculate_ema', _same, _ema),
+    Case('calculate_macd', _same, _macd),
+    Case('calculate_parabolic_sar', _same, _sar),
+    Case('heikin_ashi', _same, _heikin_ashi),
+    Case('cal_rsi', _same, _rsi),
+    Case('stochastic_rsi', _stoch_rsi_input, _stoch_rsi),
+    Case('add_trade_signals', _trade_signals_input, _trade_signals),
+    Case('compact_epm_frame', _same, _compact),
+)}
+
+
+def environment() -> Dict[str, Any]:
+    """
+    결과를 비교할 수 있는 조건인지 확인하기 위한 실행 환경 정보입니다.
+    """
+    from technical_indicators.jit import NUMBA_AVAILABLE
+
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'numba': NUMBA_AVAILABLE and os.environ.get('NUMBA_DISABLE_JIT', '0') in ('', '0'),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def measure(case: Case, data: pd.DataFrame, repeat: int = 3) -> Dict[str, Any]:
+    """
+    한 케이스의 최소 실행 시간과 최대 메모리를 잽니다.
+
+    시간은 ``perf_counter``로 repeat번 재서 가장 짧은 값을, 메모리는 tracemalloc을 켠 별도 실행에서
+    run이 새로 할당한 최대 바이트(입력 제외)를 기록합니다. tracemalloc은 실행을 느리게 하므로 시간 측정과 나눕니다.
+
+    :param case: 벤치마크 케이스
+    :param data: 입력 OHLCV
+    :param repeat: 시간 측정 횟수 (기본값: 3)
+    :return: case, bars, seconds, bars_per_second, peak_bytes
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        args = case.setup(data)
+        gc.collect()
+        start = time.perf_counter()
+        case.run(*args)
+        best = min(best, time.perf_counter() - start)
+        del args
+
+    args = case.setup(data)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del args
+
+    return {
+        'case': case.name,
+        'bars': len(data),
+        'seconds': best,
+        'bars_per_second': len(data) / best if best > 0 else float('inf'),
+        'peak_bytes': peak,
+    }
+
+
+def run_suite(
+    sizes: Iterable[str] = DEFAULT_SIZES,
+    cases: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    seed: int = 0,
+    log: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    크기별로 합성 데이터를 한 번 만들고 모든 케이스를 잽니다.
+
+    :param sizes: SIZES의 크기 이름 목록
+    :param cases: 실행할 케이스 이름 (기본값: 전부)
+    :param repeat: 케이스별 시간 측정 횟수 (10m 봉은 1회)
+    :param seed: 합성 데이터 seed
+    :param log: 결과 하나가 나올 때마다 호출할 함수
+    :return: {'environment': ..., 'results': [...]}
+    """
+    selected = [CASES[name] for name in (cases or CASES)]
+    warmup = synthetic_ohlcv(WARMUP_BARS, seed)
+    for case in selected:
+        case.run(*case.setup(warmup))
+
+    results = []
+    for size in sizes:
+        data = synthetic_ohlcv(SIZES[size], seed)
+        for case in selected:
+            result = measure(case, data, repeat if SIZES[size] < SIZES['10m'] else 1)
+            results.append(result)
+            if log is not None:
+                log(result)
+        del data
+    return {'environment': environment(), 'results': results}
+
+
+def compare(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE
+) -> List[Dict[str, Any]]:
+    """
+    같은 (케이스, 봉 수)의 결과를 기준과 비교합니다.
+
+    :param report: ``run_suite`` 결과
+    :param baseline: 저장된 ``run_suite`` 결과
+    :param tolerance: 허용 비율 (기본값: 0.25, 처리량 25% 감소 또는 메모리 25% 증가까지 허용)
+    :return: 결과별 {'case', 'bars', 'speedup', 'memory_ratio', 'regressions'}
+    """
+    previous = {(r['case'], r['bars']): r for r in baseline['results']}
+    rows = []
+    for result in report['results']:
+        base = previous.get((result['case'], result['bars']))
+        if base is None:
+            continue
+        speedup = result['bars_per_second'] / base['bars_per_second']
+        memory_ratio = result['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else 1.
+        regressions = []
+        if speedup < 1. - tolerance:
+            regressions.append('throughput')
+        if memory_ratio > 1. + tolerance:
+            regressions.append('memory')
+        rows.append({'case': result['case'], 'bars': result['bars'], 'speedup': speedup,
+                     'memory_ratio': memory_ratio, 'regressions': regressions})
+    return rows
+
+
+def _format_bars(n: int) -> str:
+    return next((name for name, size in SIZES.items() if size == n), str(n))
+
+def _print_result(result: Dict[str, Any]) -> None:
+    print(f"{result['case']:24} {_format_bars(result['bars']):>5} {result['seconds'] * 1e3:10.2f} ms "
+          f"{result['bars_per_second'] / 1e6:10.2f} Mbar/s {result['peak_bytes'] / 2**20:10.1f} MiB", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description='pycoin benchmarks')
+    parser.add_argument('--sizes', nargs='+', default=list(DEFAULT_SIZES), choices=list(SIZES))
+    parser.add_argument('--cases', nargs='+', choices=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='비교할 기준 JSON')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--save', action='store_true', help='결과를 기준 JSON으로 저장')
+    parser.add_argument('--output', help='결과를 저장할 JSON 경로')
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.cases, args.repeat, args.seed, _print_result)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('environment') != report['environment']:
+            print(f"warning: 기준과 실행 환경이 다릅니다 {baseline.get('environment')} -> {report['environment']}")
+        print()
+        for row in compare(report, baseline, args.tolerance):
+            failed = failed or bool(row['regressions'])
+            print(f"{'REGRESSION' if row['regressions'] else 'ok':10} {row['case']:24} {_format_bars(row['bars']):>5} "
+                  f"x{row['speedup']:.2f} speed, x{row['memory_ratio']:.2f} memory "
+                  + ','.join(row['regressions']))
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'saved {args.baseline}')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# benchmarks/synthetic.py
+
+import numpy as np
+import pandas as pd
+
+# 벤치마크 크기 이름 -> 봉 수
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+
+def synthetic_ohlcv(
+    n: int,
+    seed: int = 0,
+    start: str = '2020-01-01',
+    interval: str = '1min',
+    price: float = 30000.,
+    volatility: float = 0.001
+) -> pd.DataFrame:
+    """
+    네트워크 없이 같은 seed면 항상 같은 값이 나오는 OHLCV를 만듭니다.
+
+    종가는 로그 정규 랜덤 워크, 시가는 직전 종가, 고가/저가는 시가와 종가 바깥으로 벌어진 값이며
+    호가 단위(0.01)로 반올림되어 있어 실제 데이터처럼 추세와 횡보, 익절/손절이 섞입니다.
+
+    :param n: 봉 수
+    :param seed: 난수 seed (기본값: 0)
+    :param start: 첫 봉 시각 (UTC)
+    :param interval: 봉 간격 (pandas freq, 기본값: '1min')
+    :param price: 시작 가격
+    :param volatility: 봉당 로그 수익률 표준편차
+    :return: UTC DatetimeIndex를 가진 OHLCV DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    close = np.round(price * np.exp(np.cumsum(rng.normal(0., volatility, n))), 2)
+    open_ = np.empty(n)
+    open_[0] = price
+    open_[1:] = close[:-1]
+    spread = price * volatility * rng.random((2, n))
+    high = np.round(np.maximum(open_, close) + spread[0], 2)
+    low = np.round(np.minimum(open_, close) - spread[1], 2)
+    volume = np.round(rng.gamma(2., 5., n), 3)
+
+    index = pd.date_range(start, periods=n, freq=interval, tz='UTC', name='Datetime')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
@@ -0,0 +1,334 @@
+# charting/fast_chart.py
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# plotly는 import만 해도 수백 ms가 걸리므로 차트를 실제로 그리는 함수 안에서만 import
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# 기본 최대 표시 점 수 (화면 가로 픽셀 수 정도면 충분)
+DEFAULT_MAX_POINTS = 2000
+
+# plotly.js를 HTML에 넣지 않고 CDN에서 받아옵니다. 로컬 공용 번들 경로('plotly.min.js' 등)를 줄 수도 있습니다.
+DEFAULT_PLOTLYJS = 'cdn'
+
+
+# --- 다운샘플링 ---------------------------------------------------------------------
+
+def _bucket_edges(n: int, n_buckets: int) -> np.ndarray:
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    구간마다 최솟값과 최댓값 위치만 남기는 다운샘플링 인덱스를 계산합니다.
+
+    :param y: 값 배열
+    :param n_out: 최대 출력 점 수
+    :return: 남길 위치 (오름차순)
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    # 구간마다 두 점 + 처음/끝 점이 n_out을 넘지 않도록
+    starts = _bucket_edges(n, max((n_out - 2) // 2, 1))[:-1]
+    filled = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0., y)
+    mins = np.minimum.reduceat(filled, starts)
+    maxs = np.maximum.reduceat(filled, starts)
+    # 각 구간의 첫 번째 최솟값/최댓값 위치
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+    first = np.full(len(starts), n)
+    idx = np.arange(n)
+    is_min = filled == mins[bucket]
+    is_max = filled == maxs[bucket]
+    argmin = first.copy()
+    np.minimum.at(argmin, bucket[is_min], idx[is_min])
+    argmax = first.copy()
+    np.minimum.at(argmax, bucket[is_max], idx[is_max])
+    return np.unique(np.concatenate([argmin, argmax, [0, n - 1]]))
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 알고리즘으로 선 모양을 유지하는 다운샘플링 인덱스를 계산합니다.
+
+    :param y: 값 배열 (x는 등간격으로 간주)
+    :param n_out: 출력 점 수 (3 이상)
+    :return: 남길 위치 (오름차순)
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    y = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0., y)
+    edges = _bucket_edges(n - 2, n_out - 2) + 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        if next_end <= next_start:
+            next_start, next_end = n - 1, n
+        avg_x = (next_start + next_end - 1) / 2.
+        avg_y = y[next_start:next_end].mean()
+        xs = np.arange(start, end)
+        area = np.abs((a - avg_x) * (y[start:end] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def downsample_ohlc(data: pd.DataFrame, n_out: int) -> pd.DataFrame:
+    """
+    캔들을 n_out개 이하의 구간 캔들(첫 시가, 최고가, 최저가, 마지막 종가)로 합칩니다.
+
+    :param data: Open, High, Low, Close 컬럼을 가진 데이터
+    :param n_out: 최대 캔들 수
+    :return: 합쳐진 캔들 (인덱스는 각 구간의 첫 시각)
+    """
+    n = len(data)
+    if n <= n_out:
+        return data[['Open', 'High', 'Low', 'Close']]
+    starts = _bucket_edges(n, n_out)[:-1]
+    ends = np.append(starts[1:], n) - 1
+    return pd.DataFrame({
+        'Open': data['Open'].to_numpy()[starts],
+        'High': np.fmax.reduceat(data['High'].to_numpy(), starts),
+        'Low': np.fmin.reduceat(data['Low'].to_numpy(), starts),
+        'Close': data['Close'].to_numpy()[ends],
+    }, index=data.index[starts])
+
+def visible(data: pd.DataFrame, x_range: Optional[Tuple[object, object]]) -> pd.DataFrame:
+    """
+    현재 확대 구간에 해당하는 행만 남깁니다. 확대 구간마다 다시 다운샘플링할 때 씁니다.
+    """
+    if x_range is None:
+        return data
+    return data.loc[x_range[0]:x_range[1]]
+
+def relayout_range(relayout: Dict[str, Any]) -> Tuple[bool, Optional[Tuple[object, object]]]:
+    """
+    Plotly relayout 이벤트(Dash ``relayoutData``, ``plotly_relayout``)에서 x축 확대 구간을 꺼냅니다.
+
+    공유 x축 서브플롯이므로 xaxis, xaxis2 어느 쪽 이벤트든 같은 구간으로 봅니다.
+
+    :param relayout: relayout 이벤트 dict
+    :return: (x축 변경 여부, 확대 구간 또는 전체 보기면 None)
+    """
+    for axis in ('xaxis', 'xaxis2'):
+        if f'{axis}.range[0]' in relayout and f'{axis}.range[1]' in relayout:
+            return True, (relayout[f'{axis}.range[0]'], relayout[f'{axis}.range[1]'])
+        if f'{axis}.range' in relayout:
+            start, end = relayout[f'{axis}.range']
+            return True, (start, end)
+        if relayout.get(f'{axis}.autorange'):
+            return True, None
+    return False, None
+
+
+# --- 트레이스 -----------------------------------------------------------------------
+
+def _line(data: pd.DataFrame, column: str, max_points: int, **kwargs) -> 'go.Scattergl':
+    import plotly.graph_objects as go
+
+    y = data[column].to_numpy()
+    idx = lttb_indices(y, max_points)
+    return go.Scattergl(x=data.index[idx], y=y[idx], name=kwargs.pop('name', column), **kwargs)
+
+def _labels(template: str, *columns: np.ndarray) -> np.ndarray:
+    """
+    '%.2f' 형식의 템플릿을 배열 전체에 한 번에 적용합니다. '%%'는 '%'로 씁니다.
+    """
+    parts = [part.replace('%%', '%') for part in template.split('%.2f')]
+    labels = np.full(len(columns[0]) if columns else 0, parts[0], dtype=object)
+    for values, text in zip(columns, parts[1:]):
+        labels = labels + np.char.mod('%.2f', values).astype(object) + text
+    return labels
+
+# (신호 컬럼, y 컬럼, 색, 심볼, 이름, 라벨 템플릿, 라벨 컬럼)
+SIGNAL_MARKERS: Sequence[Tuple[str, str, str, str, str, str, Tuple[str, ...]]] = (
+    ('LongSignal', 'Low', 'blue', 'triangle-up', 'Long Signal', 'Long 진입: %.2f', ('EntryPrice',)),
+    ('ShortSignal', 'High', 'orange', 'triangle-down', 'Short Signal', 'Short 진입: %.2f', ('EntryPrice',)),
+    ('LongProfitSignal', 'High', 'green', 'triangle-up', 'Long Profit',
+     'Long 매수: %.2f<br>매도: %.2f<br>수익률: %.2f%%', ('EntryPrice', 'ExitPrice', 'ProfitPercentage')),
+    ('LongLossSignal', 'Low', 'red', 'triangle-down', 'Long Loss',
+     'Long 매수: %.2f<br>매도: %.2f<br>손실률: %.2f%%', ('EntryPrice', 'ExitPrice', 'ProfitPercentage')),
+    ('ShortProfitSignal', 'Low', 'lime', 'triangle-down', 'Short Profit',
+     'Short 매도: %.2f<br>매수: %.2f<br>수익률: %.2f%%', ('EntryPrice', 'ExitPrice', 'ProfitPercentage')),
+    ('ShortLossSignal', 'High', 'pink', 'triangle-up', 'Short Loss',
+     'Short 매도: %.2f<br>매수: %.2f<br>손실률: %.2f%%', ('EntryPrice', 'ExitPrice', 'ProfitPercentage')),
+)
+
+
+def create_chart(
+    data: pd.DataFrame,
+    title: str,
+    symbol: str = 'BTC/USD',
+    max_points: int = DEFAULT_MAX_POINTS,
+    x_range: Optional[Tuple[object, object]] = None,
+    sar_marker: Tuple[str, str] = ('purple', 'triangle-down'),
+    hovermode: Optional[str] = 'x unified',
+    trades: Optional[pd.DataFrame] = None
+) -> 'go.Figure':
+    """
+    캔들스틱, EMA200, Parabolic SAR, (있으면) 매매 신호와 MACD 서브플롯을 가진 차트를 만듭니다.
+
+    선은 ``Scattergl``로 그리고 LTTB로, 캔들은 구간 OHLC로, 히스토그램은 구간 최소/최대로 다운샘플링합니다.
+    매매 신호 마커는 드물기 때문에 모두 그립니다.
+
+    :param data: 지표(EMA200, MACD, Signal, MACD_Histogram, ParabolicSAR)와 선택적으로 신호 컬럼을 가진 데이터
+    :param title: 차트 제목
+    :param symbol: 가격 서브플롯 제목
+    :param max_points: 트레이스당 최대 점 수 (기본값: 2000)
+    :param x_range: 확대 구간 (시작, 끝). 주어지면 그 구간만 다운샘플링합니다. 브라우저에서 확대할 때
+                    다시 다운샘플링하려면 ``update_visible``/``zoom_widget``을 씁니다.
+    :param sar_marker: Parabolic SAR 마커 (색, 모양)
+    :param hovermode: 레이아웃 hovermode (None이면 Plotly 기본값)
+    :param trades: 신호 컬럼이 data에 없을 때 마커를 그릴 이벤트 봉 데이터 (``TradeLedger.signal_rows``)
+    :return: Plotly Figure 객체
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    data = visible(data, x_range)
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                        vertical_spacing=0.1, subplot_titles=(symbol, 'MACD'),
+                        row_heights=[0.7, 0.3])
+
+    # 캔들스틱 차트
+    candles = downsample_ohlc(data, max_points)
+    fig.add_trace(go.Candlestick(x=candles.index,
+                                 open=candles['Open'],
+                                 high=candles['High'],
+                                 low=candles['Low'],
+                                 close=candles['Close'],
+                                 name=symbol),
+                  row=1, col=1)
+
+    # EMA 200
+    fig.add_trace(_line(data, 'EMA200', max_points, line=dict(color='blue', width=1.5), name='EMA 200'),
+                  row=1, col=1)
+
+    # Parabolic SAR
+    fig.add_trace(_line(data, 'ParabolicSAR', max_points, mode='markers',
+                        marker=dict(size=2, color=sar_marker[0], symbol=sar_marker[1]), name='Parabolic SAR'),
+                  row=1, col=1)
+
+    # 매매 신호
+    markers = visible(trades, x_range) if trades is not None else data
+    for column, y_column, color, marker, name, template, label_columns in SIGNAL_MARKERS:
+        if column not in markers:
+            continue
+        signals = markers[markers[column].to_numpy(dtype=bool)]
+        fig.add_trace(go.Scattergl(x=signals.index, y=signals[y_column],
+                                   mode='markers',
+                                   marker=dict(size=10, color=color, symbol=marker),
+                                   name=name,
+                                   text=_labels(template, *(signals[c].to_numpy() for c in label_columns)),
+                                   hoverinfo='text+x+y'),
+                      row=1, col=1)
+
+    # MACD
+    fig.add_trace(_line(data, 'MACD', max_points, line=dict(color='blue', width=1.5)), row=2, col=1)
+    fig.add_trace(_line(data, 'Signal', max_points, line=dict(color='orange', width=1.5)), row=2, col=1)
+
+    # MACD Histogram
+    histogram = data['MACD_Histogram'].to_numpy()
+    idx = minmax_indices(histogram, max_points)
+    fig.add_trace(go.Bar(x=data.index[idx], y=histogram[idx],
+                         marker_color=np.where(histogram[idx] >= 0, 'green', 'red'),
+                         name='Histogram'),
+                  row=2, col=1)
+
+    layout = dict(hovermode=hovermode) if hovermode is not None else {}
+    fig.update_layout(
+        title=title,
+        yaxis_title='Price (USD)',
+        xaxis_rangeslider_visible=False,
+        height=800,
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        **layout
+    )
+
+    return fig
+
+# 확대 구간이 바뀌었을 때 다시 채우는 트레이스 데이터 속성
+_DATA_PROPERTIES = ('x', 'y', 'open', 'high', 'low', 'close', 'text')
+
+def update_visible(
+    fig: 'go.Figure',
+    data: pd.DataFrame,
+    x_range: Optional[Tuple[object, object]],
+    max_points: int = DEFAULT_MAX_POINTS,
+    trades: Optional[pd.DataFrame] = None
+) -> 'go.Figure':
+    """
+    ``create_chart``로 만든 차트의 트레이스를 새 확대 구간으로 다시 다운샘플링한 값으로 바꿉니다.
+
+    레이아웃(현재 확대 상태 포함)은 그대로 두고 트레이스 데이터만 바꾸므로, 브라우저에서 확대할 때마다
+    화면에 보이는 구간을 max_points 해상도로 다시 그립니다. ``zoom_widget``(Jupyter)이나
+    Dash 콜백에서 ``relayout_range``와 함께 씁니다::
+
+        @app.callback(Output('chart', 'figure'), Input('chart', 'relayoutData'), State('chart', 'figure'))
+        def on_zoom(relayout, figure):
+            changed, x_range = relayout_range(relayout or {})
+            if not changed:
+                raise PreventUpdate
+            return update_visible(go.Figure(figure), data, x_range)
+
+    :param fig: ``create_chart``로 만든 Figure (또는 FigureWidget)
+    :param data: ``create_chart``에 넘긴 전체 데이터
+    :param x_range: 새 확대 구간 (None이면 전체)
+    :param trades: ``create_chart``에 넘긴 이벤트 봉 데이터
+    :return: fig
+    """
+    import plotly.graph_objects as go
+
+    fresh = create_chart(data, '', max_points=max_points, x_range=x_range, trades=trades)
+    if len(fresh.data) != len(fig.data):
+        raise ValueError('차트의 트레이스 구성이 data와 맞지 않습니다')
+    with fig.batch_update():
+        for trace, new in zip(fig.data, fresh.data):
+            values = new.to_plotly_json()
+            trace.update({key: values[key] for key in _DATA_PROPERTIES if key in values})
+            if isinstance(new, go.Bar):
+                trace.marker.color = new.marker.color
+    return fig
+
+def zoom_widget(
+    data: pd.DataFrame,
+    title: str,
+    max_points: int = DEFAULT_MAX_POINTS,
+    trades: Optional[pd.DataFrame] = None,
+    **chart_kwargs: Any
+) -> 'go.FigureWidget':
+    """
+    확대/이동할 때마다 보이는 구간을 다시 다운샘플링하는 Jupyter 차트를 만듭니다 (ipywidgets/anywidget 필요).
+
+    :param data: ``create_chart``와 같은 데이터
+    :param title: 차트 제목
+    :param chart_kwargs: ``create_chart``의 나머지 인자
+    :return: FigureWidget
+    """
+    import plotly.graph_objects as go
+
+    fig = go.FigureWidget(create_chart(data, title, max_points=max_points, trades=trades, **chart_kwargs))
+
+    def on_range(layout: Any, x_range: Optional[Tuple[object, object]]) -> None:
+        update_visible(fig, data, tuple(x_range) if x_range else None, max_points, trades)
+
+    for axis in ('xaxis', 'xaxis2'):
+        fig.layout[axis].on_change(on_range, 'range')
+    return fig
+
+def write_chart(fig: 'go.Figure', path: str, plotlyjs: str = DEFAULT_PLOTLYJS) -> None:
+    """
+    차트를 HTML로 저장합니다. plotly.js(약 3.5MB)는 기본적으로 포함하지 않고 CDN 또는 공용 번들을 참조합니다.
+
+    :param fig: Plotly Figure 객체
+    :param path: 저장 경로
+    :param plotlyjs: 'cdn', 'directory'(같은 폴더의 plotly.min.js 공유), '.js' 경로/URL, 또는 True(포함)
+    """
+    fig.write_html(path, include_plotlyjs=plotlyjs)
@@ -1,19 +1,142 @@
-from math_extention.math_extention import perfectRound
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
 
+from math_extention.rounding import ROUND_HALF_UP, _quantize_array, _round_scaled, tick_scale
+from technical_indicators.jit import NUMBA_AVAILABLE, njit, to_kernel, from_kernel
 
-def heikin_ashi(df):
-    ha_df = df[['Open','High','Low','Close']].copy()
-    ha_df['Close'] = perfectRound(((df['Open']+df['High']+df['Low']+df['Close'])/4),2)
+# 이전 구현(perfectRound(..., 2))과 같은 소수 둘째 자리 반올림
+DEFAULT_TICK = 0.01
+# 벡터 경로에서 재귀식을 한 번에 검사하는 봉 수
+_CHECK_BLOCK = 1 << 16
 
-    # Heikin Ashi Open price
-    ha_df.iat[0, 0] = perfectRound((df['Open'].iloc[0] + df['Close'].iloc[0]) / 2, 2)
-    ha_df['Open'] = ha_df['Open'].shift().fillna(ha_df['Open'].iloc[0])
-    ha_df['Open'] = perfectRound((ha_df['Open'] + ha_df['Close'].shift().fillna(ha_df['Close'].iloc[0])) / 2, 2)
 
-    # Heikin Ashi High price
-    ha_df['High'] = ha_df.loc[:,['Open','Close']].join(df['High']).max(axis=1)
+@njit(cache=True)
+def _heikin_ashi_kernel(open_, high, low, close, scale, units, ha_open, ha_close) -> None:
+    # HA 종가와 HA 시가 = (이전 HA 시가 + 이전 HA 종가) / 2 를 호가 단위로 반올림하며 순서대로 계산
+    for i in range(len(close)):
+        ha_close[i] = _round_scaled((open_[i] + high[i] + low[i] + close[i]) / 4, scale, units)
+        if i == 0:
+            ha_open[i] = _round_scaled((open_[0] + close[0]) / 2, scale, units)
+            continue
+        total = ha_open[i-1] + ha_close[i-1]
+        if total != total:
+            ha_open[i] = total
+            continue
+        # 두 값 모두 호가 단위의 배수이므로 단위 개수(정수)의 합을 2로 나눠 0.5를 0에서 먼 쪽으로 반올림
+        count = round(ha_open[i-1] * scale / units) + round(ha_close[i-1] * scale / units)
+        count = (count + 1) // 2 if count >= 0 else -((1 - count) // 2)
+        ha_open[i] = count * units / scale
 
-    # Heikin Ashi Low price
-    ha_df['Low'] = ha_df.loc[:,['Open','Close']].join(df['Low']).min(axis=1)
 
-    return ha_df
\ No newline at end of file
+def _half_away(total: np.ndarray) -> np.ndarray:
+    # 정수 합을 2로 나눠 0.5를 0에서 먼 쪽으로 반올림 (_heikin_ashi_kernel과 같음)
+    return np.where(total >= 0, (total + 1) // 2, -((1 - total) // 2))
+
+def _heikin_ashi_vectorized(open_, high, low, close, scale, units) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    numba가 없을 때 ``_heikin_ashi_kernel``과 같은 값을 배열 연산으로 계산합니다.
+
+    HA 시가의 단위 개수 O는 O[i] = floor((O[i-1] + C[i-1] + 1) / 2)이고, 중첩된 floor를 풀면
+    반올림 없는 재귀식 T[i] = (T[i-1] + C[i-1] + 1) / 2 (alpha=0.5 EWM)의 floor와 같습니다.
+    EWM으로 구한 후보를 정수 재귀식으로 블록 단위 검사하고, float 오차(또는 음수 가격)로 어긋난
+    봉만 순서대로 다시 계산하므로 결과는 커널과 비트 단위로 같습니다.
+    """
+    n = len(close)
+    ha_close = _quantize_array((open_ + high + low + close) / 4, scale, units, ROUND_HALF_UP)
+    ha_open = np.full(n, np.nan)
+    if n == 0:
+        return ha_open, ha_close
+    ha_open[0] = _round_scaled((open_[0] + close[0]) / 2, scale, units)
+
+    # NaN이 나오면 그다음 HA 시가부터는 모두 NaN
+    invalid = np.flatnonzero(np.isnan(ha_close[:-1]))
+    valid = min(invalid[0] + 1 if len(invalid) else n, n if ha_open[0] == ha_open[0] else 1)
+    if valid < 2:
+        return ha_open, ha_close
+
+    c = np.rint(ha_close[:valid - 1] * scale / units).astype(np.int64)
+    seed = np.empty(valid)
+    seed[0] = round(ha_open[0] * scale / units)
+    seed[1:] = c + 1
+    o = np.floor(pd.Series(seed).ewm(alpha=0.5, adjust=False).mean().to_numpy()).astype(np.int64)
+    o[0] = int(seed[0])
+
+    pos = 1
+    while pos < valid:
+        end = min(pos + _CHECK_BLOCK, valid)
+        bad = np.flatnonzero(o[pos:end] != _half_away(o[pos - 1:end - 1] + c[pos - 1:end - 1]))
+        if not len(bad):
+            pos = end
+            continue
+        # 후보가 정확한 값과 다시 만날 때까지 순서대로 계산
+        k = pos + int(bad[0])
+        while k < valid:
+            total = int(o[k - 1]) + int(c[k - 1])
+            value = (total + 1) // 2 if total >= 0 else -((1 - total) // 2)
+            if value == o[k]:
+                break
+            o[k] = value
+            k += 1
+        pos = k + 1
+
+    ha_open[:valid] = o * units / scale
+    return ha_open, ha_close
+
+
+def heikin_ashi_arrays(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    tick: Optional[float] = DEFAULT_TICK
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    하이킨 아시 캔들을 배열로 계산합니다.
+
+    HA 종가 = (시가 + 고가 + 저가 + 종가) / 4
+    HA 시가 = (이전 HA 시가 + 이전 HA 종가) / 2, 첫 봉은 (시가 + 종가) / 2
+    HA 고가/저가 = HA 시가, HA 종가, 원래 고가/저가 중 최댓값/최솟값
+
+    tick이 있으면 HA 종가와 HA 시가를 매 봉 호가 단위로 반올림하고, 반올림된 값으로 다음 HA 시가를
+    계산합니다 (numba가 있으면 컴파일된 커널, 없으면 같은 값을 내는 배열 연산).
+    tick이 None이면 반올림 없이 alpha=0.5인 EWM 한 번으로 재귀식을 그대로 계산합니다.
+
+    :param tick: 호가 단위 (기본값: 0.01, None이면 반올림하지 않음)
+    :return: HA 시가, 고가, 저가, 종가 배열
+    """
+    open_, high, low, close = (np.asarray(x, dtype=np.float64) for x in (open_, high, low, close))
+    if tick is None:
+        ha_close = (open_ + high + low + close) / 4
+        seed = np.empty_like(ha_close)
+        seed[:1] = (open_[:1] + close[:1]) / 2
+        seed[1:] = ha_close[:-1]
+        ha_open = pd.Series(seed).ewm(alpha=0.5, adjust=False).mean().to_numpy()
+    elif not NUMBA_AVAILABLE:
+        ha_open, ha_close = _heikin_ashi_vectorized(open_, high, low, close, *tick_scale(tick))
+    else:
+        scale, units = tick_scale(tick)
+        ha_open = to_kernel(np.empty_like(close))
+        ha_close = to_kernel(np.empty_like(close))
+        _heikin_ashi_kernel(to_kernel(open_), to_kernel(high), to_kernel(low), to_kernel(close),
+                            scale, units, ha_open, ha_close)
+        ha_open = from_kernel(ha_open, np.float64)
+        ha_close = from_kernel(ha_close, np.float64)
+
+    ha_high = np.fmax(np.fmax(ha_open, ha_close), high)
+    ha_low = np.fmin(np.fmin(ha_open, ha_close), low)
+    return ha_open, ha_high, ha_low, ha_close
+
+
+def heikin_ashi(df: pd.DataFrame, tick: Optional[float] = DEFAULT_TICK) -> pd.DataFrame:
+    """
+    하이킨 아시 캔들을 계산합니다.
+
+    :param df: Open, High, Low, Close 컬럼을 가진 데이터
+    :param tick: HA 시가/종가를 반올림할 호가 단위 (기본값: 0.01, None이면 반올림하지 않음)
+    :return: 하이킨 아시 Open, High, Low, Close 컬럼을 가진 DataFrame
+    """
+    ha_open, ha_high, ha_low, ha_close = heikin_ashi_arrays(
+        df['Open'].to_numpy(), df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(), tick
+    )
+    return pd.DataFrame({'Open': ha_open, 'High': ha_high, 'Low': ha_low, 'Close': ha_close}, index=df.index)
@@ -0,0 +1,262 @@
+# instrumentation/latency.py
+
+import asyncio
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Iterable
+
+# 환경 변수로 켜고 끄며, 꺼져 있으면 span은 아무것도 하지 않는 공유 객체를 돌려줍니다
+ENV_ENABLED = 'PYCOIN_LATENCY'
+
+# 2의 거듭제곱 구간마다 2 ** (PRECISION_BITS - 1)개의 선형 버킷 (상대 오차 < 1 / 2 ** (PRECISION_BITS - 1) = 0.78%)
+PRECISION_BITS = 8
+# 이보다 긴 값은 마지막 버킷에 기록 (1시간)
+MAX_LATENCY_NS = 3600 * 10**9
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """
+    나노초 지연 시간을 기록하는 HDR 방식(로그-선형 버킷) 히스토그램입니다.
+
+    ``2 ** PRECISION_BITS`` 미만의 값은 1ns 단위로, 그 이상은 2의 거듭제곱 구간을 같은 개수로 나눈 버킷에
+    기록하므로 기록은 O(1)이고 분위수의 상대 오차는 1% 미만입니다.
+    """
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (_bucket_index(MAX_LATENCY_NS) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value_ns: int) -> None:
+        """
+        :param value_ns: 지연 시간 (나노초)
+        """
+        if value_ns < 0:
+            value_ns = 0
+        self.counts[_bucket_index(min(value_ns, MAX_LATENCY_NS))] += 1
+        if self.count == 0 or value_ns < self.min:
+            self.min = value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+        self.count += 1
+        self.total += value_ns
+
+    def quantile(self, q: float) -> int:
+        """
+        :param q: 분위 (0 ~ 1)
+        :return: 분위수 (나노초, 버킷 상한값. 기록이 없으면 0)
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        if other.count == 0:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def snapshot(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """
+        :return: count, 평균/최소/최대, 분위수 (모두 나노초)
+        """
+        return {
+            'count': self.count,
+            'mean_ns': self.total / self.count if self.count else 0.,
+            'min_ns': self.min,
+            'max_ns': self.max,
+            **{f'p{q * 100:g}_ns': self.quantile(q) for q in quantiles},
+        }
+
+def _bucket_index(value: int) -> int:
+    sub_count = 1 << PRECISION_BITS
+    if value < sub_count:
+        return value
+    shift = value.bit_length() - PRECISION_BITS
+    half = sub_count >> 1
+    return sub_count + (shift - 1) * half + ((value >> shift) - half)
+
+def _bucket_upper(index: int) -> int:
+    sub_count = 1 << PRECISION_BITS
+    if index < sub_count:
+        return index
+    half = sub_count >> 1
+    shift = (index - sub_count) // half + 1
+    top = (index - sub_count) % half + half
+    return ((top + 1) << shift) - 1
+
+
+class _Span:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+
+    def __enter__(self) -> '_Span':
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.histogram.record(time.perf_counter_ns() - self.start)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+_NULL_SPAN = _NullSpan()
+
+
+class LatencyRegistry:
+    """
+    이름별 지연 시간 히스토그램 모음입니다.
+
+    ``with registry.span('signal.update'):``처럼 단조 시계(``perf_counter_ns``)로 구간을 잽니다.
+    꺼져 있으면 span은 공유 no-op 객체를 돌려주므로 호출 비용만 남습니다.
+    """
+
+    def __init__(self, enabled: bool = False, prefix: str = 'pycoin'):
+        """
+        :param enabled: 측정 여부 (기본값: False)
+        :param prefix: Prometheus 메트릭 이름 접두사
+        """
+        self.enabled = enabled
+        self.prefix = prefix
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+
+    def span(self, name: str) -> Any:
+        """
+        :param name: 구간 이름 (예: 'fetch.ohlcv', 'indicator.ewm', 'order.submit')
+        :return: with 문에 쓸 context manager
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self.histogram(name))
+
+    def record(self, name: str, value_ns: int) -> None:
+        """
+        이미 잰 지연 시간을 기록합니다.
+        """
+        if self.enabled:
+            self.histogram(name).record(value_ns)
+
+    def record_since_epoch_ms(self, name: str, epoch_ms: int) -> None:
+        """
+        거래소 시각(epoch 밀리초)부터 지금까지를 기록합니다 (예: 봉 마감 -> 수신). 벽시계 기준이라 시계 오차가 포함됩니다.
+        """
+        if self.enabled:
+            self.histogram(name).record(time.time_ns() - epoch_ms * 10**6)
+
+    def reset(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    # --- 내보내기 ---------------------------------------------------------------------
+
+    def snapshot(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: 구간 이름 -> ``LatencyHistogram.snapshot``
+        """
+        quantiles = tuple(quantiles)
+        return {name: histogram.snapshot(quantiles) for name, histogram in sorted(self.histograms.items())}
+
+    def prometheus_text(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> str:
+        """
+        Prometheus text 형식(summary, 초 단위)으로 내보냅니다.
+
+        :return: ``{prefix}_latency_seconds{span="...",quantile="..."}`` 형식의 문자열
+        """
+        metric = f'{self.prefix}_latency_seconds'
+        lines = [f'# HELP {metric} Latency of instrumented spans.', f'# TYPE {metric} summary']
+        for name, histogram in sorted(self.histograms.items()):
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            for q in quantiles:
+                lines.append(f'{metric}{{span="{label}",quantile="{q:g}"}} {histogram.quantile(q) / 1e9:.9g}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {histogram.total / 1e9:.9g}')
+            lines.append(f'{metric}_count{{span="{label}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def dump_json(self, path: str) -> None:
+        """
+        스냅샷을 JSON 파일로 씁니다 (임시 파일에 쓴 뒤 교체).
+
+        :param path: 파일 경로
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'time': time.time(), 'spans': self.snapshot()}, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    async def dump_periodically(self, path: str, interval: float = 60.) -> None:
+        """
+        interval초마다 ``dump_json``을 실행합니다. 취소될 때까지 돕니다.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.dump_json(path)
+
+    async def serve_prometheus(self, host: str = '127.0.0.1', port: int = 9108) -> Any:
+        """
+        ``/metrics``로 Prometheus text를 내보내는 HTTP 서버를 띄웁니다.
+
+        :return: aiohttp AppRunner (종료할 때 ``await runner.cleanup()``)
+        """
+        from aiohttp import web
+
+        async def metrics(request: Any) -> Any:
+            return web.Response(text=self.prometheus_text(), content_type='text/plain', charset='utf-8')
+
+        app = web.Application()
+        app.router.add_get('/metrics', metrics)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+
+LATENCY = LatencyRegistry(enabled=os.environ.get(ENV_ENABLED, '') not in ('', '0'))
+
+
+def span(name: str) -> Any:
+    """
+    기본 레지스트리(``LATENCY``)의 span입니다.
+    """
+    return LATENCY.span(name)
+
+def enable(enabled: bool = True) -> LatencyRegistry:
+    """
+    기본 레지스트리의 측정을 켜거나 끕니다.
+
+    :return: 기본 레지스트리
+    """
+    LATENCY.enabled = enabled
+    return LATENCY
@@ -0,0 +1,725 @@
+# live/execution.py
+
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from backtest.core import (
+    EVENT_LONG_ENTRY, EVENT_SHORT_ENTRY, EVENT_LONG_TO_SHORT, EVENT_SHORT_TO_LONG
+)
+from instrumentation.latency import span
+from live.signal_pipeline import SignalUpdate
+from market_data.async_fetcher import create_binance_futures_exchange
+from market_data.kline_stream import BINANCE_FUTURES_WS_URL
+from math_extention.rounding import PrecisionTable
+
+log = logging.getLogger(__name__)
+
+# listenKey는 60분 뒤 만료되므로 그 전에 연장
+LISTEN_KEY_KEEPALIVE = 30 * 60.
+
+# 주문 구성 (client order id 접미사)
+LEG_ENTRY = 'e'
+LEG_STOP_LOSS = 'sl'
+LEG_TAKE_PROFIT = 'tp'
+
+# Binance 주문 상태 ('X')
+STATUS_NEW = 'NEW'
+STATUS_PARTIALLY_FILLED = 'PARTIALLY_FILLED'
+STATUS_FILLED = 'FILLED'
+STATUS_CANCELED = 'CANCELED'
+STATUS_EXPIRED = 'EXPIRED'
+STATUS_REJECTED = 'REJECTED'
+FINAL_STATUSES = frozenset((STATUS_FILLED, STATUS_CANCELED, STATUS_EXPIRED, STATUS_REJECTED))
+# ccxt 주문 상태 -> Binance 주문 상태 (REST로 다시 맞출 때)
+CCXT_STATUSES = {'closed': STATUS_FILLED, 'canceled': STATUS_CANCELED, 'expired': STATUS_EXPIRED,
+                 'rejected': STATUS_REJECTED}
+# 시간 초과/네트워크 오류로 접수 여부를 확인하지 못한 주문의 결과 상태
+ORDER_UNKNOWN = 'unknown'
+
+
+class OrderRejected(Exception):
+    """
+    진입 주문이 거래소에서 거부되었습니다. 먼저 접수된 보호 주문은 취소된 상태입니다.
+    """
+
+    def __init__(self, message: str, client_ids: Optional[Dict[str, str]] = None):
+        """
+        :param message: 오류 메시지
+        :param client_ids: 구성(LEG_*)별 client order id
+        """
+        super().__init__(message)
+        self.client_ids = dict(client_ids or {})
+
+
+class ProtectionFailed(Exception):
+    """
+    진입 주문이 접수되었거나 접수 여부를 알 수 없는데 손절/익절을 모두 걸지 못했습니다.
+
+    보호되지 않은 포지션을 남기지 않도록 남은 주문을 취소하고 체결된 수량을 reduceOnly 시장가로 청산한 뒤
+    발생합니다. flattened가 False면 체결 수량을 확인하지 못했거나 청산 주문까지 실패한 것이므로
+    포지션이 남아 있을 수 있습니다.
+    """
+
+    def __init__(self, message: str, client_ids: Dict[str, str], filled: Optional[float], flattened: bool):
+        """
+        :param message: 오류 메시지
+        :param client_ids: 구성(LEG_*)별 client order id
+        :param filled: 진입 체결 수량 (확인하지 못했으면 None)
+        :param flattened: 체결 수량을 청산했는지 (체결이 없었으면 True, 체결 수량을 모르면 False)
+        """
+        super().__init__(message)
+        self.client_ids = dict(client_ids)
+        self.filled = filled
+        self.flattened = flattened
+
+
+class OrderRequest(NamedTuple):
+    """
+    손절/익절이 붙은 진입 주문 하나입니다. 가격과 수량은 보내기 전에 심볼 정밀도로 맞춥니다.
+    """
+    symbol: str        # ccxt 심볼 (예: 'BTC/USDT:USDT')
+    side: str          # 'buy' (Long) 또는 'sell' (Short)
+    amount: float
+    stop_loss: float
+    take_profit: float
+
+
+class ProtectedPosition(NamedTuple):
+    """
+    보낸 진입/손절/익절 주문의 client order id입니다.
+    """
+    request: OrderRequest
+    entry_id: str
+    stop_loss_id: str
+    take_profit_id: str
+
+
+class OrderState:
+    """
+    user-data 스트림의 ORDER_TRADE_UPDATE로 갱신되는 주문 하나의 로컬 상태입니다.
+    """
+    __slots__ = ('client_id', 'symbol', 'side', 'leg', 'status', 'order_id', 'filled', 'average', 'updated')
+
+    def __init__(self, client_id: str, symbol: str, side: str, leg: str):
+        self.client_id = client_id
+        self.symbol = symbol
+        self.side = side
+        self.leg = leg
+        self.status = ''
+        self.order_id = ''
+        self.filled = 0.
+        self.average = 0.
+        self.updated = 0
+
+    def __repr__(self) -> str:
+        return f'OrderState({self.client_id!r}, {self.status or "PENDING"}, filled={self.filled})'
+
+
+def protection_prices(side: str, entry_price: float, sar: float) -> Dict[str, float]:
+    """
+    README 규칙의 손절/익절가를 계산합니다. 손절은 SAR, 익절은 진입가에서 같은 거리만큼 반대쪽입니다.
+
+    :param side: 'buy' 또는 'sell'
+    :param entry_price: 진입가
+    :param sar: 진입 봉의 Parabolic SAR
+    :return: {'stop_loss': ..., 'take_profit': ...}
+    """
+    distance = entry_price - sar if side == 'buy' else sar - entry_price
+    take_profit = entry_price + distance if side == 'buy' else entry_price - distance
+    return {'stop_loss': sar, 'take_profit': take_profit}
+
+def signal_order(update: SignalUpdate, symbol: str, amount: float) -> Optional[OrderRequest]:
+    """
+    ``SignalPipeline``의 진입 이벤트를 주문으로 바꿉니다.
+    Long/Short 전환 이벤트는 ``OrderExecutor.close_position``으로 기존 포지션을 닫은 뒤 보내야 합니다.
+
+    :param update: 신호 갱신 결과
+    :param symbol: ccxt 심볼
+    :param amount: 주문 수량
+    :return: 진입 이벤트가 아니면 None
+    """
+    if update.event in (EVENT_LONG_ENTRY, EVENT_SHORT_TO_LONG):
+        side = 'buy'
+    elif update.event in (EVENT_SHORT_ENTRY, EVENT_LONG_TO_SHORT):
+        side = 'sell'
+    else:
+        return None
+    return OrderRequest(symbol, side, amount, **protection_prices(side, update.entry_price, update.sar))
+
+
+class OrderTracker:
+    """
+    주문 상태와 포지션 수량을 user-data 스트림 이벤트로만 갱신하는 로컬 장부입니다.
+
+    ``fetch_order`` 폴링 없이 ``wait``로 상태 변화를 기다리며, REST 응답보다 스트림 이벤트가 먼저
+    도착해도 잃지 않도록 주문을 보내기 전에 ``expect``로 등록합니다.
+    """
+
+    def __init__(self, on_update: Optional[Callable[[OrderState], Any]] = None):
+        """
+        :param on_update: 주문 상태가 바뀔 때마다 호출할 함수
+        """
+        self.on_update = on_update
+        self.orders: Dict[str, OrderState] = {}
+        self.positions: Dict[str, float] = {}   # Binance 심볼 id -> 포지션 수량 (Short는 음수)
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+
+    def expect(self, client_id: str, symbol: str, side: str, leg: str) -> OrderState:
+        state = self.orders.get(client_id)
+        if state is None:
+            state = self.orders[client_id] = OrderState(client_id, symbol, side, leg)
+        return state
+
+    def apply(self, payload: Dict[str, Any]) -> Optional[OrderState]:
+        """
+        user-data 스트림 이벤트 하나를 반영합니다.
+
+        :param payload: ORDER_TRADE_UPDATE 또는 ACCOUNT_UPDATE 이벤트
+        :return: 갱신된 주문 상태 (주문 이벤트가 아니거나 모르는 주문이면 None)
+        """
+        event = payload.get('e')
+        if event == 'ACCOUNT_UPDATE':
+            for position in payload['a'].get('P', []):
+                self.positions[position['s']] = float(position['pa'])
+            return None
+        if event != 'ORDER_TRADE_UPDATE':
+            return None
+
+        o = payload['o']
+        state = self.orders.get(o['c'])
+        if state is None:
+            return None
+        event_time = int(payload.get('E', 0))
+        if event_time < state.updated or (state.status in FINAL_STATUSES and o['X'] not in FINAL_STATUSES):
+            return state  # 늦게 도착한 이전 이벤트 (REST로 이미 최종 상태를 알게 된 경우 포함)
+        state.status = o['X']
+        state.order_id = str(o['i'])
+        state.filled = float(o['z'])
+        state.average = float(o['ap'])
+        state.updated = event_time
+        self._notify(state)
+        return state
+
+    def mark(self, client_id: str, status: str, order_id: str = '', filled: Optional[float] = None) -> None:
+        """
+        REST 응답으로 알게 된 상태를 반영합니다 (스트림이 이미 더 최신 상태를 알려줬으면 무시).
+        """
+        state = self.orders[client_id]
+        if not state.status or (status in FINAL_STATUSES and state.status not in FINAL_STATUSES):
+            state.status = status
+            state.order_id = state.order_id or order_id
+            if filled is not None:
+                state.filled = filled
+            self._notify(state)
+
+    def sync(self, client_id: str, order: Dict[str, Any]) -> None:
+        """
+        ``fetch_order``/``fetch_open_orders``로 조회한 ccxt 주문을 반영합니다.
+        """
+        filled = float(order.get('filled') or 0.)
+        status = CCXT_STATUSES.get(order.get('status'), STATUS_PARTIALLY_FILLED if filled else STATUS_NEW)
+        self.mark(client_id, status, str(order.get('id') or ''), filled)
+
+    def _notify(self, state: OrderState) -> None:
+        waiters = self._waiters.pop(state.client_id, [])
+        for future in waiters:
+            if not future.done():
+                future.set_result(state)
+        if self.on_update is not None:
+            self.on_update(state)
+
+    async def wait(
+        self, client_id: str, statuses: Iterable[str] = FINAL_STATUSES, timeout: Optional[float] = None
+    ) -> OrderState:
+        """
+        주문이 statuses 중 하나가 될 때까지 기다립니다.
+
+        :param client_id: client order id
+        :param statuses: 기다릴 상태 (기본값: 최종 상태)
+        :param timeout: 최대 대기(초) (기본값: 무제한)
+        :return: 주문 상태
+        """
+        statuses = frozenset(statuses)
+        state = self.orders[client_id]
+
+        async def until() -> OrderState:
+            while state.status not in statuses:
+                future = asyncio.get_running_loop().create_future()
+                self._waiters.setdefault(client_id, []).append(future)
+                await future
+            return state
+
+        return await asyncio.wait_for(until(), timeout)
+
+
+class UserDataStream:
+    """
+    Binance 선물 user-data 스트림(listenKey)을 구독해 주문/계정 이벤트를 ``OrderTracker``에 전달합니다.
+
+    ``KlineStream``과 같이 연결이 끊기면 지수 백오프로 다시 연결하고, listenKey는 주기적으로 연장합니다.
+    listenKey 발급 실패(ccxt 네트워크 오류 등)도 재연결로 처리하며, 연결할 때마다 끊긴 동안 놓친 이벤트를
+    ``resync``로 맞춥니다.
+    """
+
+    def __init__(
+        self,
+        exchange: Any,
+        tracker: OrderTracker,
+        base_url: str = BINANCE_FUTURES_WS_URL,
+        session: Any = None,
+        max_backoff: float = 30.,
+        initial_backoff: float = 1.
+    ):
+        """
+        :param exchange: ccxt.async_support Binance 선물 객체 (listenKey 발급/연장, 재동기화용)
+        :param tracker: 이벤트를 반영할 장부
+        :param base_url: WebSocket 서버 주소 (로컬 모의 거래소로 바꿀 수 있음)
+        :param session: 공유할 aiohttp.ClientSession (기본값: 새로 생성)
+        :param max_backoff: 재연결 최대 대기(초) (기본값: 30)
+        :param initial_backoff: 첫 재연결 대기(초) (기본값: 1)
+        """
+        self.exchange = exchange
+        self.tracker = tracker
+        self.base_url = base_url
+        self.session = session
+        self.max_backoff = max_backoff
+        self.initial_backoff = initial_backoff
+        self.connected = asyncio.Event()
+        self._stopped = False
+        self._ws: Any = None
+
+    async def handle_message(self, message: Dict[str, Any]) -> None:
+        payload = message.get('data', message)
+        self.tracker.apply(payload)
+
+    async def resync(self) -> None:
+        """
+        끊긴 동안 놓친 주문/계정 이벤트를 REST로 맞춥니다.
+
+        접수된 뒤 끝나지 않은 주문은 ``fetch_open_orders``에 없으면 ``fetch_order``로 최종 상태를 읽어 반영하고
+        (손절/익절 체결이면 장부의 on_update가 남은 쪽을 취소), 주문한 심볼의 포지션은 ``fetch_positions``로 다시 읽습니다.
+        """
+        tracker = self.tracker
+        pending = [state for state in tracker.orders.values() if state.status in (STATUS_NEW, STATUS_PARTIALLY_FILLED)]
+        for symbol in sorted({state.symbol for state in pending}):
+            open_orders = {order.get('clientOrderId'): order for order in await self.exchange.fetch_open_orders(symbol)}
+            for state in pending:
+                if state.symbol != symbol:
+                    continue
+                order = open_orders.get(state.client_id)
+                if order is None:
+                    order = await self.exchange.fetch_order(state.order_id or None, symbol,
+                                                            {'origClientOrderId': state.client_id})
+                tracker.sync(state.client_id, order)
+
+        symbols = sorted({state.symbol for state in tracker.orders.values()})
+        if symbols:
+            positions = await self.exchange.fetch_positions(symbols)
+            for symbol in symbols:
+                tracker.positions[self.exchange.market_id(symbol)] = _position_size(positions, symbol)
+
+    async def _keepalive(self) -> None:
+        while not self._stopped:
+            await asyncio.sleep(LISTEN_KEY_KEEPALIVE)
+            try:
+                await self.exchange.fapiPrivatePutListenKey()
+            except Exception as error:
+                # 키가 만료되면 스트림이 끊기고 다음 연결에서 새 listenKey를 받음
+                log.warning('listenKey keepalive failed: %r', error)
+
+    async def run(self) -> None:
+        """
+        ``stop``이 호출될 때까지 스트림을 구독합니다.
+        """
+        import aiohttp
+
+        own_session = self.session is None
+        session = self.session or aiohttp.ClientSession()
+        keepalive = asyncio.ensure_future(self._keepalive())
+        backoff = self.initial_backoff
+        try:
+            while not self._stopped:
+                try:
+                    listen_key = (await self.exchange.fapiPrivatePostListenKey())['listenKey']
+                    async with session.ws_connect(f'{self.base_url}/ws/{listen_key}', heartbeat=30.) as ws:
+                        self._ws = ws
+                        # 새 이벤트는 연결에 쌓이므로, 먼저 끊긴 동안의 상태를 맞춘 뒤 읽음 (주문 전이면 요청 없음)
+                        try:
+                            await self.resync()
+                        except Exception as error:
+                            log.warning('user-data resync failed: %r', error)
+                        backoff = self.initial_backoff
+                        self.connected.set()
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                await self.handle_message(json.loads(msg.data))
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                            if self._stopped:
+                                break
+                except Exception as error:
+                    # aiohttp 연결 오류뿐 아니라 listenKey 발급의 ccxt 오류도 다시 연결 (취소는 그대로 전파)
+                    log.warning('user-data stream disconnected: %r', error)
+                finally:
+                    self._ws = None
+                self.connected.clear()
+                if not self._stopped:
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.max_backoff)
+        finally:
+            keepalive.cancel()
+            if own_session:
+                await session.close()
+
+    def stop(self) -> None:
+        """
+        구독을 멈춥니다. 메시지가 없는 연결도 바로 닫습니다.
+        """
+        self._stopped = True
+        if self._ws is not None:
+            asyncio.ensure_future(self._ws.close())
+
+
+class OrderExecutor:
+    """
+    손절/익절이 붙은 진입 주문을 한 번의 왕복으로 보내는 비동기 주문 실행기입니다.
+
+    - 거래소 객체(HTTP 세션)를 하나 만들어 계속 재사용하고, 마켓 정보는 ``warmup``에서 미리 읽어 둡니다.
+    - 가격/수량은 ``MarketMetadataCache``에서 만든 ``PrecisionTable``로 맞추므로 주문 경로에서 조회하지 않습니다.
+    - 진입, 손절(STOP_MARKET), 익절(TAKE_PROFIT_MARKET)을 ``create_orders`` 배치 하나로 보냅니다.
+      배치를 지원하지 않거나 보호 주문이 거부되면(진입 전 reduceOnly 거부 등) 진입 체결을 스트림으로
+      확인한 뒤 거부된 보호 주문만 다시 보냅니다. fill_timeout 안에 스트림 이벤트가 없으면 ``fetch_order``
+      한 번으로 체결을 확인합니다.
+    - 시간 초과나 네트워크 오류는 거래소가 주문을 이미 받았을 수 있으므로 거부로 보지 않습니다. 같은 client
+      order id로 다시 보내지 않고 ``fetch_order``로 조회하며, 조회도 실패하면 접수 여부를 모르는 것으로 봅니다.
+      거부는 거래소가 ``ExchangeError``(InvalidOrder 등)로 답했거나 rejected 상태를 돌려준 경우뿐입니다.
+    - 다시 보낸 보호 주문도 거부되거나 진입 체결을 확인하지 못하면, 남은 주문을 취소하고 체결된 수량을
+      청산한 뒤 ``ProtectionFailed``를 발생시킵니다. 체결 수량을 모르면 ``fetch_positions``로 포지션을
+      확인합니다. 손절/익절 없이 열린 포지션을 남기지 않습니다.
+    - 손절/익절 중 하나가 체결되면 남은 쪽을 취소합니다.
+
+    exchange에는 ccxt와 같은 메서드를 가진 모의 거래소를 넘겨 테스트할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        metadata: Any,
+        exchange: Any = None,
+        tracker: Optional[OrderTracker] = None,
+        use_batch: bool = True,
+        fill_timeout: float = 5.,
+        client_prefix: str = 'pc'
+    ):
+        """
+        :param metadata: 로드된 MarketMetadataCache (정밀도와 Binance 심볼 id)
+        :param exchange: ccxt.async_support 거래소 객체 (기본값: Binance 선물)
+        :param tracker: 주문 장부 (기본값: 새로 생성, ``UserDataStream``에 같은 장부를 넘겨야 함)
+        :param use_batch: False면 진입 후 보호 주문을 따로 보냄 (기본값: True)
+        :param fill_timeout: 보호 주문을 다시 보내기 전 진입 체결을 기다릴 최대 시간(초) (기본값: 5)
+        :param client_prefix: client order id 접두사
+        """
+        self.metadata = metadata
+        self.precision = PrecisionTable.from_metadata(metadata)
+        self.exchange = exchange if exchange is not None else create_binance_futures_exchange()
+        self.tracker = tracker if tracker is not None else OrderTracker()
+        self.tracker.on_update = self._on_update
+        self.use_batch = use_batch
+        self.fill_timeout = fill_timeout
+        self.client_prefix = f'{client_prefix}{int(time.time()) % 10**8:x}'
+        self._sequence = itertools.count()
+        self._siblings: Dict[str, str] = {}   # 손절 id <-> 익절 id
+        self._tasks: List[asyncio.Future] = []
+
+    async def __aenter__(self) -> 'OrderExecutor':
+        await self.warmup()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def warmup(self) -> None:
+        """
+        첫 주문에서 마켓 정보를 읽느라 지연되지 않도록 미리 로드합니다.
+        """
+        await self.exchange.load_markets()
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await self.exchange.close()
+
+    def market_id(self, symbol: str) -> str:
+        return self.metadata.get(symbol).id
+
+    # --- 주문 구성 ------------------------------------------------------------------
+
+    def build_orders(self, request: OrderRequest, client_ids: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        진입/손절/익절 주문을 ``create_orders`` 형식으로 만듭니다.
+
+        :param request: 주문 요청
+        :param client_ids: 구성별 client order id
+        :return: ccxt 주문 목록 (진입, 손절, 익절 순)
+        """
+        symbol = request.symbol
+        amount = self.precision.amount(symbol, request.amount)
+        exit_side = 'sell' if request.side == 'buy' else 'buy'
+        protection = {'reduceOnly': True, 'workingType': 'MARK_PRICE'}
+        return [
+            {'symbol': symbol, 'type': 'market', 'side': request.side, 'amount': amount,
+             'params': {'newClientOrderId': client_ids[LEG_ENTRY]}},
+            {'symbol': symbol, 'type': 'STOP_MARKET', 'side': exit_side, 'amount': amount,
+             'params': {**protection, 'stopPrice': self.precision.price(symbol, request.stop_loss),
+                        'newClientOrderId': client_ids[LEG_STOP_LOSS]}},
+            {'symbol': symbol, 'type': 'TAKE_PROFIT_MARKET', 'side': exit_side, 'amount': amount,
+             'params': {**protection, 'stopPrice': self.precision.price(symbol, request.take_profit),
+                        'newClientOrderId': client_ids[LEG_TAKE_PROFIT]}},
+        ]
+
+    def _client_ids(self) -> Dict[str, str]:
+        number = next(self._sequence)
+        return {leg: f'{self.client_prefix}-{number:x}-{leg}' for leg in (LEG_ENTRY, LEG_STOP_LOSS, LEG_TAKE_PROFIT)}
+
+    # --- 주문 전송 ------------------------------------------------------------------
+
+    async def _submit(self, order: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            with span('order.submit'):
+                return await self.exchange.create_order(
+                    order['symbol'], order['type'], order['side'], order['amount'], order.get('price'), order['params']
+                )
+        except Exception as error:
+            if _definite_rejection(error):
+                return {'id': None, 'status': 'rejected', 'info': {'error': repr(error)}}
+            return await self._lookup(order, error)
+
+    async def _lookup(self, order: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """
+        응답을 받지 못한 주문을 client order id로 조회합니다.
+
+        :param order: 보낸 주문
+        :param error: 주문 전송 중 발생한 예외
+        :return: 조회한 주문, 없으면 rejected, 조회도 실패하면 ``ORDER_UNKNOWN`` 상태
+        """
+        try:
+            return await self.exchange.fetch_order(None, order['symbol'],
+                                                   {'origClientOrderId': order['params']['newClientOrderId']})
+        except Exception as lookup_error:
+            status = 'rejected' if _definite_rejection(lookup_error) else ORDER_UNKNOWN  # OrderNotFound면 접수 안 됨
+            return {'id': None, 'status': status, 'info': {'error': repr(error), 'lookup': repr(lookup_error)}}
+
+    async def _submit_all(self, orders: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        if self.use_batch and self.exchange.has.get('createOrders'):
+            try:
+                with span('order.submit_batch'):
+                    return list(await self.exchange.create_orders(orders))
+            except Exception as error:
+                if not _definite_rejection(error):
+                    # 배치가 접수되었을 수 있으므로 같은 client order id로 다시 보내지 않고 조회
+                    return list(await asyncio.gather(*(self._lookup(order, error) for order in orders)))
+                # 배치 전체가 거부되면 따로 보냄
+        entry = await self._submit(orders[0])
+        if not _accepted(entry):
+            return [entry, None, None]
+        return [entry, *await asyncio.gather(*(self._submit(order) for order in orders[1:]))]
+
+    async def open_position(self, request: OrderRequest) -> ProtectedPosition:
+        """
+        진입 주문과 손절/익절 주문을 보냅니다. 보호 주문이 모두 접수되면 반환합니다.
+
+        :param request: 주문 요청
+        :return: 주문 id
+        :raises OrderRejected: 진입 주문이 거부됨 (먼저 접수된 보호 주문은 취소)
+        :raises ProtectionFailed: 보호 주문을 걸지 못했거나 진입 접수 여부를 모름 (남은 주문 취소, 체결 수량 청산)
+        """
+        client_ids = self._client_ids()
+        orders = self.build_orders(request, client_ids)
+        for order, leg in zip(orders, (LEG_ENTRY, LEG_STOP_LOSS, LEG_TAKE_PROFIT)):
+            self.tracker.expect(client_ids[leg], request.symbol, order['side'], leg)
+        self._siblings[client_ids[LEG_STOP_LOSS]] = client_ids[LEG_TAKE_PROFIT]
+        self._siblings[client_ids[LEG_TAKE_PROFIT]] = client_ids[LEG_STOP_LOSS]
+
+        with span('order.protect'):
+            return await self._open_position(request, client_ids, orders)
+
+    async def _open_position(
+        self, request: OrderRequest, client_ids: Dict[str, str], orders: List[Dict[str, Any]]
+    ) -> ProtectedPosition:
+        results = await self._submit_all(orders)
+        for order, result in zip(orders, results):
+            if _accepted(result):
+                self.tracker.mark(order['params']['newClientOrderId'], STATUS_NEW, str(result['id']))
+
+        if _unknown(results[0]):
+            await self._abandon(request, client_ids, f'entry outcome unknown: {results[0].get("info")}')
+        if not _accepted(results[0]):
+            await asyncio.gather(*(self.cancel(order['params']['newClientOrderId'], request.symbol)
+                                   for order, result in zip(orders[1:], results[1:]) if _accepted(result)))
+            self.tracker.mark(client_ids[LEG_ENTRY], STATUS_REJECTED)
+            self._forget(client_ids)
+            raise OrderRejected(f'{request.symbol} {request.side} entry rejected: {(results[0] or {}).get("info")}',
+                                client_ids)
+
+        retry = [order for order, result in zip(orders[1:], results[1:]) if not _accepted(result)]
+        if retry:
+            # 진입 체결 전이라 거부된 reduceOnly 주문은 체결을 확인한 뒤 다시 보냄
+            if not await self._entry_filled(request, client_ids[LEG_ENTRY]):
+                await self._abandon(request, client_ids, 'entry fill not confirmed')
+            rejected = []
+            for order, result in zip(retry, await asyncio.gather(*(self._submit(order) for order in retry))):
+                client_id = order['params']['newClientOrderId']
+                if _accepted(result):
+                    self.tracker.mark(client_id, STATUS_NEW, str(result['id']))
+                else:
+                    self.tracker.mark(client_id, STATUS_REJECTED)
+                    rejected.append(f'{client_id}: {(result or {}).get("info")}')
+            if rejected:
+                await self._abandon(request, client_ids, f'protection rejected ({"; ".join(rejected)})')
+
+        return ProtectedPosition(request, client_ids[LEG_ENTRY], client_ids[LEG_STOP_LOSS], client_ids[LEG_TAKE_PROFIT])
+
+    async def _entry_filled(self, request: OrderRequest, entry_id: str) -> bool:
+        """
+        진입 체결을 스트림으로 기다리고, fill_timeout 안에 이벤트가 없으면 ``fetch_order`` 한 번으로 확인합니다.
+        """
+        try:
+            await self.tracker.wait(entry_id, {STATUS_FILLED}, self.fill_timeout)
+            return True
+        except asyncio.TimeoutError:
+            pass
+        state = self.tracker.orders[entry_id]
+        if state.status in FINAL_STATUSES:
+            return state.status == STATUS_FILLED
+        try:
+            order = await self.exchange.fetch_order(state.order_id or None, request.symbol,
+                                                    {'origClientOrderId': entry_id})
+        except Exception as error:
+            log.warning('entry order %s lookup failed, treating as unfilled: %r', entry_id, error)
+            return False
+        filled = float(order.get('filled') or 0.)
+        if order.get('status') == 'closed':
+            self.tracker.mark(entry_id, STATUS_FILLED, str(order.get('id') or ''), filled)
+            return True
+        if filled:
+            state.filled = filled
+        return False
+
+    async def _abandon(self, request: OrderRequest, client_ids: Dict[str, str], reason: str) -> None:
+        """
+        보호 주문을 걸지 못한 포지션을 정리합니다. 남은 주문(진입 포함)을 취소하고, 체결된 수량만큼
+        reduceOnly 시장가로 청산한 뒤 ``ProtectionFailed``를 발생시킵니다.
+
+        진입이 끝난 상태(체결/취소/거부)가 아니면 체결되지 않았다고 가정하지 않고 포지션을 조회합니다.
+        """
+        self._forget(client_ids)
+        await asyncio.gather(*(self.cancel(client_id, request.symbol) for client_id in client_ids.values()))
+
+        entry = self.tracker.orders[client_ids[LEG_ENTRY]]
+        filled: Optional[float] = entry.filled
+        if entry.status == STATUS_FILLED:
+            filled = filled or self.precision.amount(request.symbol, request.amount)
+        elif entry.status not in FINAL_STATUSES:
+            filled = await self._position_amount(request)
+        flattened = filled is not None
+        if filled:
+            exit_side = 'sell' if request.side == 'buy' else 'buy'
+            try:
+                result = await self.exchange.create_order(request.symbol, 'market', exit_side, filled, None,
+                                                          {'reduceOnly': True})
+                flattened = _accepted(result)
+            except Exception:
+                flattened = False
+        raise ProtectionFailed(
+            f'{request.symbol} {request.side} {reason}; filled={filled}, flattened={flattened}',
+            client_ids, filled, flattened
+        )
+
+    async def _position_amount(self, request: OrderRequest) -> Optional[float]:
+        """
+        진입 방향으로 열려 있는 포지션 수량을 ``fetch_positions``로 확인합니다. 조회에 실패하면
+        스트림으로 알고 있는 포지션이 진입 방향일 때만 그 수량을 쓰고, 아니면 None(모름)을 반환합니다.
+        """
+        market_id = self.market_id(request.symbol)
+        try:
+            positions = await self.exchange.fetch_positions([request.symbol])
+        except Exception:
+            position = self.tracker.positions.get(market_id, 0.)
+            amount = position if request.side == 'buy' else -position
+            return amount if amount > 0 else None
+        position = _position_size(positions, request.symbol)
+        self.tracker.positions[market_id] = position
+        return max(position if request.side == 'buy' else -position, 0.)
+
+    def _forget(self, client_ids: Dict[str, str]) -> None:
+        for leg in (LEG_STOP_LOSS, LEG_TAKE_PROFIT):
+            self._siblings.pop(client_ids[leg], None)
+
+    async def cancel(self, client_id: str, symbol: str) -> None:
+        """
+        client order id로 주문을 취소합니다. 이미 끝난 주문이면 아무것도 하지 않습니다.
+        """
+        state = self.tracker.orders.get(client_id)
+        if state is not None and state.status in FINAL_STATUSES:
+            return
+        try:
+            order_id = (state.order_id or None) if state is not None else None
+            await self.exchange.cancel_order(order_id, symbol, {'origClientOrderId': client_id})
+        except Exception as error:
+            # 이미 체결/취소되었으면 스트림 이벤트가 상태를 갱신함
+            log.warning('cancel %s failed: %r', client_id, error)
+            return
+        if state is not None:
+            self.tracker.mark(client_id, STATUS_CANCELED)
+
+    async def close_position(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        남은 보호 주문을 취소하고, 스트림으로 알고 있는 포지션 수량만큼 reduceOnly 시장가로 청산합니다.
+
+        :param symbol: ccxt 심볼
+        :return: 청산 주문 (포지션이 없으면 None)
+        """
+        open_legs = [state.client_id for state in self.tracker.orders.values()
+                     if state.symbol == symbol and state.leg != LEG_ENTRY and state.status not in FINAL_STATUSES]
+        await asyncio.gather(*(self.cancel(client_id, symbol) for client_id in open_legs))
+
+        position = self.tracker.positions.get(self.market_id(symbol), 0.)
+        if position == 0:
+            return None
+        side = 'sell' if position > 0 else 'buy'
+        return await self.exchange.create_order(symbol, 'market', side, abs(position), None, {'reduceOnly': True})
+
+    def _on_update(self, state: OrderState) -> None:
+        # 손절/익절 중 하나가 체결되면 남은 쪽을 취소 (OCO)
+        if state.status == STATUS_FILLED and state.client_id in self._siblings:
+            sibling = self._siblings.pop(state.client_id)
+            self._siblings.pop(sibling, None)
+            self._tasks = [task for task in self._tasks if not task.done()]
+            self._tasks.append(asyncio.ensure_future(self.cancel(sibling, state.symbol)))
+
+
+def _accepted(result: Optional[Dict[str, Any]]) -> bool:
+    return bool(result) and bool(result.get('id')) and result.get('status') not in ('rejected', 'canceled')
+
+def _unknown(result: Optional[Dict[str, Any]]) -> bool:
+    return bool(result) and result.get('status') == ORDER_UNKNOWN
+
+def _definite_rejection(error: Exception) -> bool:
+    # ccxt.ExchangeError(InvalidOrder, InsufficientFunds, OrderNotFound 등)는 거래소가 요청을 처리해 답한 것.
+    # RequestTimeout/NetworkError 등 나머지는 거래소가 주문을 받았는지 알 수 없음
+    # (ccxt는 거래소 객체를 만들 때 import되므로 여기서 새로 import하지 않음)
+    ccxt = sys.modules.get('ccxt')
+    return ccxt is not None and isinstance(error, ccxt.ExchangeError)
+
+def _position_size(positions: List[Dict[str, Any]], symbol: str) -> float:
+    # ccxt fetch_positions 결과에서 심볼의 포지션 수량 (Short는 음수)
+    size = 0.
+    for position in positions:
+        if position.get('symbol') == symbol:
+            contracts = float(position.get('contracts') or 0.)
+            size += -contracts if position.get('side') == 'short' else contracts
+    return size
@@ -0,0 +1,155 @@
+# live/signal_pipeline.py
+
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from instrumentation.latency import span
+from technical_indicators.streaming import (
+    NAN, EMAState, MACDState, ParabolicSARState, StreamingState
+)
+from backtest.core import ENTRY_EVENTS, EVENT_NONE, POSITION_FLAT, _position_step
+
+
+class Bar(NamedTuple):
+    """
+    마감된 봉 하나입니다. open_time은 UTC epoch 밀리초입니다.
+    """
+    symbol: str
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class SignalUpdate(NamedTuple):
+    """
+    봉 하나를 처리한 뒤의 지표 값과 상태 머신 이벤트입니다.
+    """
+    bar: Bar
+    ema: float
+    macd: float
+    signal: float
+    sar: float
+    event: int
+    entry_price: float
+    exit_price: float
+    profit: float
+
+
+class PositionStateMachine(StreamingState):
+    """
+    ``backtest.core``의 Long/Short/익절/손절 상태 머신을 봉 단위로 실행하는 스트리밍 버전입니다.
+    """
+    __slots__ = ('position', 'entry_price', 'stop_loss', 'take_profit')
+
+    def __init__(self):
+        self.position = POSITION_FLAT
+        self.entry_price = 0.
+        self.stop_loss = 0.
+        self.take_profit = 0.
+
+    def update(
+        self, close: float, high: float, low: float, sar: float, long_entry: bool, short_entry: bool
+    ) -> Tuple[int, float, float]:
+        """
+        :return: 이벤트 코드, 청산가, 수익률(%)
+        """
+        (self.position, self.entry_price, self.stop_loss, self.take_profit,
+         event, exit_price, profit) = _position_step(
+            self.position, self.entry_price, self.stop_loss, self.take_profit,
+            close, high, low, sar, long_entry, short_entry
+        )
+        return event, exit_price, profit
+
+
+class EpmSignalState(StreamingState):
+    """
+    ``research_epm_long``의 EMA200 + MACD + Parabolic SAR 전략을 봉 단위로 갱신하는 상태입니다.
+
+    배치 경로(지표 함수 + ``add_trade_signals``)와 같은 봉에서 같은 이벤트를 냅니다.
+    """
+    __slots__ = ('ema', 'macd', 'sar', 'prev_macd', 'prev_signal', 'machine')
+
+    def __init__(
+        self,
+        ema_period: int = 200,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9,
+        step: float = 0.02,
+        max_step: float = 0.2
+    ):
+        self.ema = EMAState(ema_period)
+        self.macd = MACDState(fast_period, slow_period, signal_period)
+        self.sar = ParabolicSARState(step, max_step)
+        self.prev_macd = NAN
+        self.prev_signal = NAN
+        self.machine = PositionStateMachine()
+
+    def update(self, bar: Bar) -> SignalUpdate:
+        """
+        마감된 봉으로 지표와 상태 머신을 갱신합니다.
+
+        :param bar: 마감된 봉
+        :return: 지표 값과 이벤트
+        """
+        close, high, low = bar.close, bar.high, bar.low
+        ema = self.ema.update(close)
+        macd_line, signal_line, _ = self.macd.update(close)
+        sar = self.sar.update(high, low)
+
+        long_entry = (close > ema and macd_line > signal_line
+                      and self.prev_macd <= self.prev_signal and sar < low)
+        short_entry = (close < ema and macd_line < signal_line
+                       and self.prev_macd >= self.prev_signal and sar > high)
+        self.prev_macd, self.prev_signal = macd_line, signal_line
+
+        event, exit_price, profit = self.machine.update(close, high, low, sar, long_entry, short_entry)
+        entry_price = self.machine.entry_price if event in ENTRY_EVENTS else NAN
+        return SignalUpdate(bar, ema, macd_line, signal_line, sar, event, entry_price, exit_price, profit)
+
+
+class SignalPipeline:
+    """
+    여러 심볼의 마감 봉을 받아 심볼별 ``EpmSignalState``로 보내는 라우터입니다.
+    """
+
+    def __init__(
+        self,
+        on_signal: Optional[Callable[[SignalUpdate], None]] = None,
+        state_factory: Callable[[], EpmSignalState] = EpmSignalState
+    ):
+        """
+        :param on_signal: 이벤트가 발생한 봉마다 호출할 함수
+        :param state_factory: 새 심볼의 상태를 만드는 함수 (기본값: 기본 파라미터의 EpmSignalState)
+        """
+        self.on_signal = on_signal
+        self.state_factory = state_factory
+        self.states: Dict[str, EpmSignalState] = {}
+
+    def on_bar(self, bar: Bar) -> SignalUpdate:
+        """
+        :param bar: 마감된 봉
+        :return: 지표 값과 이벤트
+        """
+        state = self.states.get(bar.symbol)
+        if state is None:
+            state = self.states[bar.symbol] = self.state_factory()
+        with span('signal.update'):
+            update = state.update(bar)
+        if update.event != EVENT_NONE and self.on_signal is not None:
+            self.on_signal(update)
+        return update
+
+    def checkpoint(self) -> Dict[str, dict]:
+        """
+        :return: 심볼 -> 직렬화된 상태
+        """
+        return {symbol: state.to_dict() for symbol, state in self.states.items()}
+
+    def restore(self, checkpoint: Dict[str, dict]) -> None:
+        """
+        :param checkpoint: ``checkpoint``의 결과
+        """
+        self.states = {symbol: EpmSignalState.from_dict(state) for symbol, state in checkpoint.items()}
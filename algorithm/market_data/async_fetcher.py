@@ -0,0 +1,223 @@
+# market_data/async_fetcher.py
+
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import pandas as pd
+
+from instrumentation.latency import span
+from market_data.candle_store import CANDLE_COLUMNS, TimeLike, to_utc_ns
+
+# Binance USDⓈ-M 선물 REQUEST_WEIGHT 한도 (1분당)
+BINANCE_FUTURES_WEIGHT_PER_MINUTE = 2400
+# Binance 선물 klines 1회 최대 개수
+BINANCE_FUTURES_KLINE_LIMIT = 1500
+
+
+def kline_weight(limit: int) -> int:
+    """
+    Binance 선물 klines 요청의 가중치를 limit에 따라 계산합니다.
+
+    :param limit: 요청 봉 수
+    :return: 요청 가중치
+    """
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class TokenBucket:
+    """
+    거래소 가중치 한도를 지키기 위한 비동기 토큰 버킷입니다.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        :param capacity: 버킷 최대 토큰 수
+        :param refill_per_second: 초당 채워지는 토큰 수
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, weight_per_minute: float) -> 'TokenBucket':
+        return cls(weight_per_minute, weight_per_minute / 60.)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    async def acquire(self, weight: float = 1) -> None:
+        """
+        weight만큼의 토큰이 생길 때까지 기다린 뒤 차감합니다. 대기는 요청 순서대로 처리됩니다.
+
+        :param weight: 요청 가중치
+        """
+        async with self._lock:
+            self._refill()
+            while self.tokens < weight:
+                await asyncio.sleep((weight - self.tokens) / self.refill_per_second)
+                self._refill()
+            self.tokens -= weight
+
+
+def ohlcv_to_frame(rows: List[List[float]]) -> pd.DataFrame:
+    """
+    ccxt ``fetch_ohlcv`` 결과를 UTC DatetimeIndex를 가진 OHLCV DataFrame으로 변환합니다.
+
+    :param rows: [timestamp(ms), open, high, low, close, volume] 목록
+    :return: OHLCV DataFrame
+    """
+    frame = pd.DataFrame(rows, columns=['timestamp', *CANDLE_COLUMNS])
+    frame.index = pd.DatetimeIndex(pd.to_datetime(frame.pop('timestamp'), unit='ms', utc=True), name='Datetime')
+    return frame.astype('float64')
+
+
+def create_binance_futures_exchange(config: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    ``ccxt.async_support.binance`` 선물 클라이언트를 만듭니다.
+
+    가중치 한도는 ``TokenBucket``이 관리하므로 ccxt 자체 rate limit은 끕니다.
+
+    :param config: ccxt 설정 (apiKey, secret 등)
+    :return: 비동기 거래소 객체
+    """
+    import ccxt.async_support as ccxt_async
+
+    options = {'defaultType': 'future'}
+    options.update((config or {}).get('options', {}))
+    return ccxt_async.binance(config={**(config or {}), 'enableRateLimit': False, 'options': options})
+
+
+class FetchResult(NamedTuple):
+    """
+    ``fetch_many``의 결과입니다. 한 심볼의 실패(상장 폐지, 잘못된 심볼, 네트워크 오류)가 나머지를 막지 않도록
+    성공한 심볼과 실패한 심볼을 나눠 담습니다.
+    """
+    frames: Dict[str, pd.DataFrame]
+    errors: Dict[str, Exception]
+
+
+class AsyncOHLCVFetcher:
+    """
+    여러 심볼의 OHLCV를 동시에 내려받는 비동기 수집기입니다.
+
+    하나의 거래소 객체(하나의 HTTP 세션)를 공유하고, 세마포어로 동시 요청 수를,
+    토큰 버킷으로 Binance 가중치 한도를 제한합니다. 긴 구간은 자동으로 나눠 받습니다.
+    """
+
+    def __init__(
+        self,
+        exchange: Any = None,
+        max_concurrency: int = 20,
+        weight_per_minute: float = BINANCE_FUTURES_WEIGHT_PER_MINUTE,
+        page_limit: int = BINANCE_FUTURES_KLINE_LIMIT
+    ):
+        """
+        :param exchange: ccxt.async_support 거래소 객체 (기본값: Binance 선물)
+        :param max_concurrency: 동시에 보낼 최대 요청 수 (기본값: 20)
+        :param weight_per_minute: 1분당 허용 가중치 (기본값: 2400)
+        :param page_limit: 요청 한 번에 받을 봉 수 (기본값: 1500)
+        """
+        self.exchange = exchange if exchange is not None else create_binance_futures_exchange()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.bucket = TokenBucket.per_minute(weight_per_minute)
+        self.page_limit = page_limit
+
+    async def __aenter__(self) -> 'AsyncOHLCVFetcher':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        공유 HTTP 세션을 닫습니다.
+        """
+        await self.exchange.close()
+
+    async def _fetch_page(self, symbol: str, timeframe: str, since: int, limit: int) -> List[List[float]]:
+        async with self.semaphore:
+            await self.bucket.acquire(kline_weight(limit))
+            with span('fetch.ohlcv'):
+                return await self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+    async def fetch_ohlcv_range(self, symbol: str, timeframe: str, start: TimeLike, end: TimeLike) -> pd.DataFrame:
+        """
+        [start, end) 구간의 OHLCV를 페이지 단위로 이어 받습니다.
+
+        :param symbol: 심볼 (예: 'BTC/USDT')
+        :param timeframe: 봉 간격 (예: '1m')
+        :param start: 시작 시각
+        :param end: 끝 시각
+        :return: OHLCV DataFrame
+        """
+        step_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        cursor = to_utc_ns(start) // 10**6
+        end_ms = to_utc_ns(end) // 10**6
+
+        rows: List[List[float]] = []
+        while cursor < end_ms:
+            limit = min(self.page_limit, max(1, -(-(end_ms - cursor) // step_ms)))
+            page = await self._fetch_page(symbol, timeframe, cursor, limit)
+            if not page:
+                break
+            rows.extend(row for row in page if cursor <= row[0] < end_ms)
+            cursor = page[-1][0] + step_ms
+        return ohlcv_to_frame(rows)
+
+    async def fetch_many(
+        self,
+        symbols: Iterable[str],
+        timeframe: str,
+        start: TimeLike,
+        end: TimeLike
+    ) -> FetchResult:
+        """
+        여러 심볼의 [start, end) 구간 OHLCV를 동시에 내려받습니다.
+
+        심볼별 예외는 전체 갱신을 중단하지 않고 ``errors``에 모입니다 (취소는 그대로 전파).
+
+        :return: 심볼 -> OHLCV DataFrame, 심볼 -> 예외
+        """
+        symbols = list(symbols)
+        results = await asyncio.gather(*(self.fetch_ohlcv_range(s, timeframe, start, end) for s in symbols),
+                                       return_exceptions=True)
+        frames, errors = {}, {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                errors[symbol] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                frames[symbol] = result
+        return FetchResult(frames, errors)
+
+
+def fetch_ohlcv_many(
+    symbols: Iterable[str],
+    timeframe: str,
+    start: TimeLike,
+    end: TimeLike,
+    **fetcher_kwargs: Any
+) -> FetchResult:
+    """
+    동기 코드에서 ``AsyncOHLCVFetcher.fetch_many``를 실행합니다.
+
+    :param fetcher_kwargs: AsyncOHLCVFetcher 생성 인자
+    :return: 심볼 -> OHLCV DataFrame, 심볼 -> 예외
+    """
+    async def run() -> FetchResult:
+        async with AsyncOHLCVFetcher(**fetcher_kwargs) as fetcher:
+            return await fetcher.fetch_many(symbols, timeframe, start, end)
+
+    return asyncio.run(run())
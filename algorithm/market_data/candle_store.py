@@ -0,0 +1,290 @@
+# market_data/candle_store.py
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+CANDLE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+TIME_COLUMN = 'time'
+
+# 저장소 경로를 지정하면 데이터 로더가 기본으로 이 저장소를 사용합니다.
+STORE_ENV_VAR = 'PYCOIN_CANDLE_STORE'
+
+_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+_NS_PER_DAY = 86400 * 10**9
+
+TimeLike = Union[datetime, pd.Timestamp, str, int]
+Downloader = Callable[[str, pd.Timestamp, pd.Timestamp, str], pd.DataFrame]
+
+
+def interval_to_ns(interval: str) -> int:
+    """
+    '1m', '15m', '1h', '1d' 같은 봉 간격 문자열을 나노초로 변환합니다.
+
+    :param interval: 봉 간격
+    :return: 나노초
+    """
+    return int(interval[:-1]) * _UNIT_SECONDS[interval[-1]] * 10**9
+
+def to_utc_ns(value: TimeLike) -> int:
+    """
+    시각을 UTC 기준 epoch 나노초로 변환합니다.
+    timezone이 없는 시각은 저장소의 인덱스(``_index_to_utc_ns``)와 같이 UTC로 간주합니다.
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return int(ts.tz_convert('UTC').as_unit('ns').value)
+
+def _index_to_utc_ns(index: pd.Index) -> np.ndarray:
+    # timezone이 없는 인덱스는 UTC로 간주 (to_utc_ns와 같음)
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    return index.tz_convert('UTC').as_unit('ns').asi8
+
+
+def yfinance_downloader(symbol: str, start: pd.Timestamp, end: pd.Timestamp, interval: str) -> pd.DataFrame:
+    """
+    yfinance로 OHLCV를 내려받습니다. 새 버전의 (Price, Ticker) MultiIndex 컬럼은 한 단계로 펼칩니다.
+    """
+    import yfinance as yf
+
+    data = yf.download(symbol, start=start, end=end, interval=interval, progress=False)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    return data
+
+
+class CandleStore:
+    """
+    심볼/봉 간격별 OHLCV를 일 단위 파티션의 컬럼별 ``.npy`` 파일로 보관하는 로컬 저장소입니다.
+
+    디렉터리 구조::
+
+        {root}/{symbol}/{interval}/{YYYY-MM-DD}/{time,Open,High,Low,Close,Volume}.npy
+        {root}/{symbol}/{interval}/coverage.json
+
+    ``coverage.json``에는 이미 내려받은 구간이 기록되어 있어 빠진 구간만 새로 받습니다.
+    읽기는 ``np.load(mmap_mode='r')``로 메모리 매핑되며, 한 파티션 안의 구간은 복사 없이 반환됩니다.
+    """
+
+    def __init__(self, root: str):
+        """
+        :param root: 저장소 루트 디렉터리
+        """
+        self.root = root
+
+    @classmethod
+    def from_env(cls) -> Optional['CandleStore']:
+        """
+        ``PYCOIN_CANDLE_STORE`` 환경 변수가 설정되어 있으면 그 경로의 저장소를 반환합니다.
+
+        :return: 저장소 또는 None
+        """
+        root = os.environ.get(STORE_ENV_VAR)
+        return cls(root) if root else None
+
+    # --- 경로/메타데이터 ---------------------------------------------------------
+
+    def _series_dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol, interval)
+
+    def _partition_dir(self, symbol: str, interval: str, day: str) -> str:
+        return os.path.join(self._series_dir(symbol, interval), day)
+
+    def _coverage_path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self._series_dir(symbol, interval), 'coverage.json')
+
+    def coverage(self, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        """
+        이미 내려받은 구간 목록을 반환합니다.
+
+        :return: [시작, 끝) epoch 나노초 구간 목록 (정렬, 병합됨)
+        """
+        try:
+            with open(self._coverage_path(symbol, interval)) as f:
+                return [tuple(span) for span in json.load(f)]
+        except FileNotFoundError:
+            return []
+
+    def _add_coverage(self, symbol: str, interval: str, start_ns: int, end_ns: int) -> None:
+        if end_ns <= start_ns:
+            return
+        merged: List[List[int]] = []
+        for s, e in sorted(self.coverage(symbol, interval) + [(start_ns, end_ns)]):
+            if merged and s <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        path = self._coverage_path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(merged, f)
+        os.replace(path + '.tmp', path)
+
+    def partitions(self, symbol: str, interval: str) -> List[str]:
+        """
+        저장된 일 단위 파티션 이름(YYYY-MM-DD) 목록을 반환합니다.
+        """
+        series_dir = self._series_dir(symbol, interval)
+        if not os.path.isdir(series_dir):
+            return []
+        return sorted(name for name in os.listdir(series_dir) if os.path.isdir(os.path.join(series_dir, name)))
+
+    def missing_ranges(self, symbol: str, interval: str, start: TimeLike, end: TimeLike) -> List[Tuple[int, int]]:
+        """
+        [start, end) 중 아직 내려받지 않은 구간을 계산합니다.
+
+        :return: [시작, 끝) epoch 나노초 구간 목록
+        """
+        cursor, end_ns = to_utc_ns(start), to_utc_ns(end)
+        missing = []
+        for s, e in self.coverage(symbol, interval):
+            if e <= cursor:
+                continue
+            if s >= end_ns:
+                break
+            if s > cursor:
+                missing.append((cursor, s))
+            cursor = max(cursor, e)
+        if cursor < end_ns:
+            missing.append((cursor, end_ns))
+        return missing
+
+    # --- 쓰기 -----------------------------------------------------------------------
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
+        """
+        OHLCV 봉을 일 단위 파티션에 병합합니다. 같은 시각의 기존 봉은 새 봉으로 교체됩니다.
+
+        :param data: DatetimeIndex와 Open, High, Low, Close, Volume 컬럼을 가진 데이터
+        """
+        if data.empty:
+            return
+        times = _index_to_utc_ns(data.index)
+        columns = {name: data[name].to_numpy(dtype=np.float64) for name in CANDLE_COLUMNS}
+        days = times // _NS_PER_DAY
+
+        for day in np.unique(days):
+            mask = days == day
+            name = pd.Timestamp(int(day) * _NS_PER_DAY).strftime('%Y-%m-%d')
+            new = {TIME_COLUMN: times[mask], **{c: v[mask] for c, v in columns.items()}}
+
+            old = self.read_partition(symbol, interval, name)
+            if old is not None:
+                new = {c: np.concatenate([old[c], new[c]]) for c in new}
+            # 같은 시각은 나중에 들어온 값을 남기고 시간순 정렬
+            _, last = np.unique(new[TIME_COLUMN][::-1], return_index=True)
+            keep = len(new[TIME_COLUMN]) - 1 - last
+            self._write_partition(symbol, interval, name, {c: v[keep] for c, v in new.items()})
+
+    def _write_partition(self, symbol: str, interval: str, day: str, arrays: Dict[str, np.ndarray]) -> None:
+        partition_dir = self._partition_dir(symbol, interval, day)
+        os.makedirs(partition_dir, exist_ok=True)
+        for name, values in arrays.items():
+            path = os.path.join(partition_dir, f'{name}.npy')
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, np.ascontiguousarray(values))
+            os.replace(path + '.tmp', path)
+
+    def sync(
+        self,
+        symbol: str,
+        interval: str,
+        start: TimeLike,
+        end: TimeLike,
+        downloader: Downloader = yfinance_downloader
+    ) -> None:
+        """
+        [start, end) 중 저장되지 않은 구간만 내려받아 저장합니다.
+
+        진행 중일 수 있는 마지막 봉은 다음 동기화 때 다시 받도록 커버리지에서 제외합니다.
+
+        :param downloader: (symbol, start, end, interval) -> OHLCV DataFrame
+        """
+        step = interval_to_ns(interval)
+        now_ns = to_utc_ns(datetime.now(timezone.utc))
+        for s, e in self.missing_ranges(symbol, interval, start, end):
+            data = downloader(symbol, pd.Timestamp(s, tz='UTC'), pd.Timestamp(e, tz='UTC'), interval)
+            self.write(symbol, interval, data)
+            covered_end = min(e, now_ns // step * step)
+            self._add_coverage(symbol, interval, s, covered_end)
+
+    # --- 읽기 -----------------------------------------------------------------------
+
+    def read_partition(self, symbol: str, interval: str, day: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        한 파티션을 메모리 매핑으로 읽습니다.
+
+        :param day: 파티션 이름 (YYYY-MM-DD)
+        :return: 컬럼 이름 -> 읽기 전용 memmap 배열 (파티션이 없으면 None)
+        """
+        partition_dir = self._partition_dir(symbol, interval, day)
+        if not os.path.isdir(partition_dir):
+            return None
+        return {
+            name: np.load(os.path.join(partition_dir, f'{name}.npy'), mmap_mode='r')
+            for name in (TIME_COLUMN,) + CANDLE_COLUMNS
+        }
+
+    def read_arrays(self, symbol: str, interval: str, start: TimeLike, end: TimeLike) -> Dict[str, np.ndarray]:
+        """
+        [start, end) 구간의 봉을 컬럼별 배열로 읽습니다.
+
+        구간이 한 파티션 안에 있으면 memmap의 슬라이스를 그대로 반환하고(복사 없음),
+        여러 파티션에 걸치면 이어 붙인 배열을 반환합니다.
+
+        :return: 'time'(UTC epoch 나노초)과 OHLCV 컬럼 이름 -> 배열
+        """
+        start_ns, end_ns = to_utc_ns(start), to_utc_ns(end)
+        first = pd.Timestamp(start_ns // _NS_PER_DAY * _NS_PER_DAY).strftime('%Y-%m-%d')
+        last = pd.Timestamp((end_ns - 1) // _NS_PER_DAY * _NS_PER_DAY).strftime('%Y-%m-%d')
+
+        pieces = []
+        for day in self.partitions(symbol, interval):
+            if day < first or day > last:
+                continue
+            part = self.read_partition(symbol, interval, day)
+            lo, hi = np.searchsorted(part[TIME_COLUMN], [start_ns, end_ns])
+            if hi > lo:
+                pieces.append({name: values[lo:hi] for name, values in part.items()})
+
+        if len(pieces) == 1:
+            return pieces[0]
+        if not pieces:
+            empty = {TIME_COLUMN: np.empty(0, dtype=np.int64)}
+            return {**empty, **{name: np.empty(0) for name in CANDLE_COLUMNS}}
+        return {name: np.concatenate([p[name] for p in pieces]) for name in pieces[0]}
+
+    def read(self, symbol: str, interval: str, start: TimeLike, end: TimeLike) -> pd.DataFrame:
+        """
+        [start, end) 구간의 봉을 UTC DatetimeIndex를 가진 DataFrame으로 읽습니다.
+        """
+        arrays = self.read_arrays(symbol, interval, start, end)
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(arrays[TIME_COLUMN]), utc=True), name='Datetime')
+        return pd.DataFrame({name: arrays[name] for name in CANDLE_COLUMNS}, index=index)
+
+    def load(
+        self,
+        symbol: str,
+        interval: str,
+        start: TimeLike,
+        end: TimeLike,
+        downloader: Optional[Downloader] = yfinance_downloader
+    ) -> pd.DataFrame:
+        """
+        빠진 구간을 동기화한 뒤 [start, end) 구간을 읽습니다. downloader가 None이면 오프라인으로 읽기만 합니다.
+
+        :param downloader: (symbol, start, end, interval) -> OHLCV DataFrame (기본값: yfinance)
+        :return: OHLCV DataFrame
+        """
+        if downloader is not None:
+            self.sync(symbol, interval, start, end, downloader)
+        return self.read(symbol, interval, start, end)
@@ -0,0 +1,291 @@
+# market_data/kline_stream.py
+
+import asyncio
+import inspect
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from instrumentation.latency import LATENCY
+from market_data.candle_store import interval_to_ns
+from live.signal_pipeline import Bar
+
+log = logging.getLogger(__name__)
+
+BINANCE_FUTURES_WS_URL = 'wss://fstream.binance.com'
+
+BarHandler = Callable[[Bar], Any]
+# (symbol, 시작 open_time(ms), 끝 open_time(ms, 미포함)) -> 마감된 봉 목록
+Backfill = Callable[[str, int, int], Awaitable[List[Bar]]]
+
+
+def stream_url(symbols: Iterable[str], interval: str, base_url: str = BINANCE_FUTURES_WS_URL, agg_trade: bool = False) -> str:
+    """
+    Binance combined stream URL을 만듭니다.
+
+    :param symbols: Binance 심볼 id (예: 'BTCUSDT')
+    :param interval: 봉 간격 (예: '1m')
+    :param base_url: WebSocket 서버 주소 (로컬 리플레이 서버로 바꿀 수 있음)
+    :param agg_trade: True면 kline 대신 aggTrade 스트림을 구독
+    :return: 구독 URL
+    """
+    suffix = 'aggTrade' if agg_trade else f'kline_{interval}'
+    streams = '/'.join(f'{symbol.lower()}@{suffix}' for symbol in symbols)
+    return f'{base_url}/stream?streams={streams}'
+
+
+def parse_kline(payload: Dict[str, Any]) -> Optional[Bar]:
+    """
+    kline 이벤트에서 마감된 봉을 꺼냅니다. 진행 중인 봉이면 None을 반환합니다.
+
+    :param payload: ``{"e": "kline", "s": ..., "k": {...}}`` 이벤트
+    :return: 마감된 봉 또는 None
+    """
+    k = payload['k']
+    if not k['x']:
+        return None
+    return Bar(payload['s'], int(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v']))
+
+
+class TradeBarAssembler:
+    """
+    aggTrade 체결을 봉 간격으로 묶어 마감된 봉을 만듭니다.
+
+    다음 구간의 체결이 들어오거나 ``flush``가 호출되면 이전 봉이 마감됩니다.
+    체결이 드문 심볼도 봉 마감 직후 전달되도록 ``KlineStream``이 타이머로 ``flush``를 호출합니다.
+    """
+
+    def __init__(self, interval: str):
+        """
+        :param interval: 봉 간격 (예: '1m')
+        """
+        self.step = interval_to_ns(interval) // 10**6
+        self.bars: Dict[str, List[float]] = {}
+
+    def add_trade(self, symbol: str, price: float, quantity: float, trade_time: int) -> Optional[Bar]:
+        """
+        :param trade_time: 체결 시각 (epoch 밀리초)
+        :return: 이번 체결로 마감된 봉 또는 None
+        """
+        open_time = trade_time - trade_time % self.step
+        current = self.bars.get(symbol)
+        closed = None
+        if current is not None and open_time > current[0]:
+            closed = Bar(symbol, int(current[0]), *current[1:])
+            current = None
+        if current is None:
+            self.bars[symbol] = [open_time, price, price, price, price, quantity]
+        else:
+            if price > current[2]:
+                current[2] = price
+            if price < current[3]:
+                current[3] = price
+            current[4] = price
+            current[5] += quantity
+        return closed
+
+    def flush(self, now: int) -> List[Bar]:
+        """
+        now 시각 기준으로 이미 끝난 봉들을 마감합니다.
+
+        :param now: 현재 시각 (epoch 밀리초)
+        :return: 마감된 봉 목록
+        """
+        closed = []
+        for symbol, current in list(self.bars.items()):
+            if current[0] + self.step <= now:
+                closed.append(Bar(symbol, int(current[0]), *current[1:]))
+                del self.bars[symbol]
+        return closed
+
+
+def rest_backfill(fetcher: Any, ccxt_symbols: Dict[str, str], interval: str) -> Backfill:
+    """
+    ``AsyncOHLCVFetcher``로 빠진 봉을 채우는 backfill 함수를 만듭니다.
+
+    :param fetcher: AsyncOHLCVFetcher
+    :param ccxt_symbols: Binance 심볼 id -> ccxt 심볼 (예: {'BTCUSDT': 'BTC/USDT:USDT'})
+    :param interval: 봉 간격
+    :return: backfill 함수
+    """
+    async def backfill(symbol: str, start: int, end: int) -> List[Bar]:
+        frame = await fetcher.fetch_ohlcv_range(ccxt_symbols[symbol], interval, start * 10**6, end * 10**6)
+        open_times = frame.index.as_unit('ms').asi8.tolist()
+        return [Bar(symbol, t, *row) for t, row in zip(open_times, frame.itertuples(index=False, name=None))]
+
+    return backfill
+
+
+class KlineStream:
+    """
+    Binance 선물 kline(또는 aggTrade) 스트림을 구독해 마감된 봉을 순서대로 전달합니다.
+
+    연결이 끊기면 지수 백오프로 다시 연결합니다. 재연결 후 첫 봉이 마지막 봉과 이어지지 않으면
+    빈 구간을 backfill로 먼저 채운 뒤 전달하므로, 소비자는 항상 빠짐없는 시간순 봉을 받습니다.
+    aggTrade 모드에서는 봉 경계마다 flush_delay만큼 늦게 진행 중인 봉을 마감하므로 다음 체결을 기다리지 않습니다.
+
+    backfill이나 on_bar의 예외는 기록만 하고 스트림을 멈추지 않습니다. backfill이 실패하면 그 봉을 전달하지 않고
+    마지막 봉 시각을 그대로 두므로, 다음 봉에서 빈 구간을 다시 채웁니다.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        interval: str,
+        on_bar: BarHandler,
+        backfill: Optional[Backfill] = None,
+        base_url: str = BINANCE_FUTURES_WS_URL,
+        agg_trade: bool = False,
+        session: Any = None,
+        max_backoff: float = 30.,
+        initial_backoff: float = 1.,
+        flush_delay: float = 0.1,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        :param symbols: Binance 심볼 id 목록 (예: ['BTCUSDT', 'ETHUSDT'])
+        :param interval: 봉 간격 (예: '1m')
+        :param on_bar: 마감된 봉마다 호출할 함수 (코루틴 함수도 가능, 예: ``SignalPipeline.on_bar``)
+        :param backfill: 빠진 봉을 채울 함수 (기본값: None, 채우지 않음)
+        :param base_url: WebSocket 서버 주소 (기본값: Binance 선물)
+        :param agg_trade: True면 aggTrade로 봉을 직접 조립
+        :param session: 공유할 aiohttp.ClientSession (기본값: 새로 생성)
+        :param max_backoff: 재연결 최대 대기(초) (기본값: 30)
+        :param initial_backoff: 첫 재연결 대기(초) (기본값: 1)
+        :param flush_delay: aggTrade 봉을 경계 후 몇 초 뒤에 마감할지 (늦게 도착하는 체결 대기, 기본값: 0.1)
+        :param clock: 현재 epoch 초를 반환하는 함수 (기본값: time.time)
+        """
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.interval = interval
+        self.step = interval_to_ns(interval) // 10**6
+        self.on_bar = on_bar
+        self.backfill = backfill
+        self.url = stream_url(self.symbols, interval, base_url, agg_trade)
+        self.assembler = TradeBarAssembler(interval) if agg_trade else None
+        self.session = session
+        self.max_backoff = max_backoff
+        self.initial_backoff = initial_backoff
+        self.flush_delay = flush_delay
+        self.clock = clock
+        self.last_open_time: Dict[str, int] = {}
+        self._stopped = False
+        self._ws: Any = None
+        # 메시지 처리와 flush 타이머가 봉 순서를 섞지 않도록 전달을 직렬화
+        self._emit_lock = asyncio.Lock()
+
+    async def _emit(self, bar: Bar) -> None:
+        async with self._emit_lock:
+            await self._emit_unlocked(bar)
+
+    async def _emit_unlocked(self, bar: Bar) -> None:
+        last = self.last_open_time.get(bar.symbol)
+        if last is not None:
+            if bar.open_time <= last:
+                return  # 재연결/backfill로 중복된 봉
+            if bar.open_time > last + self.step and self.backfill is not None:
+                try:
+                    missing = await self.backfill(bar.symbol, last + self.step, bar.open_time)
+                except Exception as error:
+                    log.warning('%s backfill %d..%d failed, retrying on next bar: %r',
+                                bar.symbol, last + self.step, bar.open_time, error)
+                    return
+                for missing_bar in missing:
+                    await self._deliver(missing_bar)
+        await self._deliver(bar)
+
+    async def _deliver(self, bar: Bar) -> None:
+        last = self.last_open_time.get(bar.symbol)
+        if last is not None and bar.open_time <= last:
+            return
+        self.last_open_time[bar.symbol] = bar.open_time
+        # 거래소의 봉 마감 시각부터 소비자에게 전달하기까지
+        LATENCY.record_since_epoch_ms('stream.bar_close', bar.open_time + self.step)
+        try:
+            result = self.on_bar(bar)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as error:
+            log.error('%s bar %d handler failed: %r', bar.symbol, bar.open_time, error, exc_info=error)
+
+    async def handle_message(self, message: Dict[str, Any]) -> None:
+        """
+        combined stream 메시지 하나를 처리합니다.
+
+        :param message: ``{"stream": ..., "data": {...}}`` 또는 이벤트 자체
+        """
+        payload = message.get('data', message)
+        event = payload.get('e')
+        if event == 'kline':
+            bar = parse_kline(payload)
+            if bar is not None:
+                await self._emit(bar)
+        elif event == 'aggTrade' and self.assembler is not None:
+            bar = self.assembler.add_trade(payload['s'], float(payload['p']), float(payload['q']), int(payload['T']))
+            if bar is not None:
+                await self._emit(bar)
+
+    async def flush(self) -> None:
+        """
+        flush_delay 이전에 끝난 aggTrade 봉을 마감해 전달합니다.
+        """
+        if self.assembler is None:
+            return
+        now = int((self.clock() - self.flush_delay) * 1000)
+        for bar in self.assembler.flush(now):
+            await self._emit(bar)
+
+    async def _flush_periodically(self) -> None:
+        while not self._stopped:
+            now = self.clock() * 1000
+            next_close = (now // self.step + 1) * self.step
+            await asyncio.sleep((next_close - now) / 1000 + self.flush_delay)
+            try:
+                await self.flush()
+            except Exception as error:
+                log.error('aggTrade flush failed: %r', error, exc_info=error)
+
+    async def run(self) -> None:
+        """
+        ``stop``이 호출될 때까지 스트림을 구독합니다.
+        """
+        import aiohttp
+
+        own_session = self.session is None
+        session = self.session or aiohttp.ClientSession()
+        flusher = asyncio.ensure_future(self._flush_periodically()) if self.assembler is not None else None
+        backoff = self.initial_backoff
+        try:
+            while not self._stopped:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=30.) as ws:
+                        self._ws = ws
+                        backoff = self.initial_backoff
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                await self.handle_message(json.loads(msg.data))
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                            if self._stopped:
+                                break
+                except Exception as error:
+                    # 연결 오류와 잘못된 메시지 모두 다시 연결 (취소는 그대로 전파)
+                    log.warning('kline stream disconnected: %r', error)
+                finally:
+                    self._ws = None
+                if not self._stopped:
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.max_backoff)
+        finally:
+            if flusher is not None:
+                flusher.cancel()
+            if own_session:
+                await session.close()
+
+    def stop(self) -> None:
+        """
+        현재 메시지 처리 후 구독을 멈춥니다. 메시지가 없는 연결도 바로 닫습니다.
+        """
+        self._stopped = True
+        if self._ws is not None:
+            asyncio.ensure_future(self._ws.close())
@@ -0,0 +1,225 @@
+# market_data/metadata.py
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+# ccxt precisionMode 값
+DECIMAL_PLACES = 2
+SIGNIFICANT_DIGITS = 3
+TICK_SIZE = 4
+
+MARKET_DTYPE = np.dtype([
+    ('symbol', 'U32'),
+    ('id', 'U32'),
+    ('base', 'U16'),
+    ('quote', 'U8'),
+    ('settle', 'U8'),
+    ('contract', '?'),
+    ('linear', '?'),
+    ('active', '?'),
+    ('contract_size', 'f8'),
+    ('price_tick', 'f8'),
+    ('amount_step', 'f8'),
+    ('min_amount', 'f8'),
+    ('max_amount', 'f8'),
+    ('min_cost', 'f8'),
+])
+
+
+class MarketSpec:
+    """
+    주문 경로에서 쓰는 심볼 하나의 거래 규격입니다.
+    """
+    __slots__ = MARKET_DTYPE.names
+
+    def __init__(self, row: np.void):
+        for name in self.__slots__:
+            setattr(self, name, row[name].item())
+
+    def __repr__(self) -> str:
+        return f'MarketSpec({self.symbol!r}, tick={self.price_tick}, step={self.amount_step})'
+
+
+class MarketDiff(NamedTuple):
+    """
+    캐시 갱신 시 이전 메타데이터와 비교한 변경 내역입니다.
+    """
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def _precision_to_step(value: Optional[float], precision_mode: int) -> float:
+    if value is None:
+        return np.nan
+    if precision_mode == TICK_SIZE:
+        return float(value)
+    return 10.0 ** -value
+
+def _limit(market: Dict[str, Any], kind: str, bound: str) -> float:
+    value = (market.get('limits') or {}).get(kind, {}).get(bound)
+    return np.nan if value is None else float(value)
+
+def markets_to_array(markets: Iterable[Dict[str, Any]], precision_mode: int = TICK_SIZE) -> np.ndarray:
+    """
+    ccxt 마켓 dict 목록을 심볼순으로 정렬된 구조화 배열로 변환합니다.
+
+    :param markets: ccxt ``load_markets()``의 값 또는 ``fetch_markets()`` 결과
+    :param precision_mode: ccxt ``exchange.precisionMode`` (기본값: TICK_SIZE)
+    :return: MARKET_DTYPE 구조화 배열
+    """
+    rows = []
+    for m in markets:
+        precision = m.get('precision') or {}
+        rows.append((
+            m['symbol'], m.get('id') or '', m.get('base') or '', m.get('quote') or '', m.get('settle') or '',
+            bool(m.get('contract')), bool(m.get('linear')), m.get('active') is not False,
+            float(m.get('contractSize') or 1.0),
+            _precision_to_step(precision.get('price'), precision_mode),
+            _precision_to_step(precision.get('amount'), precision_mode),
+            _limit(m, 'amount', 'min'), _limit(m, 'amount', 'max'), _limit(m, 'cost', 'min'),
+        ))
+    array = np.array(rows, dtype=MARKET_DTYPE)
+    return array[np.argsort(array['symbol'], kind='stable')]
+
+def fetch_ccxt_markets(exchange: Any) -> np.ndarray:
+    """
+    ccxt 거래소의 마켓 목록을 내려받아 구조화 배열로 변환합니다.
+
+    :param exchange: ccxt 거래소 객체
+    :return: MARKET_DTYPE 구조화 배열
+    """
+    return markets_to_array(exchange.fetch_markets(), exchange.precisionMode)
+
+
+class MarketMetadataCache:
+    """
+    심볼 규격(틱 크기, 수량 단위, 계약 규격)을 디스크에 캐시하는 메타데이터 저장소입니다.
+
+    ``{cache_dir}/{name}.npy``에 구조화 배열을, ``{name}.json``에 내려받은 시각과 내용 해시를 저장합니다.
+    TTL이 지나지 않았으면 거래소에 요청하지 않고, 지났으면 다시 받아 해시가 같으면 시각만 갱신합니다.
+    메모리에서는 심볼 -> 행 번호 dict로 O(1) 조회합니다.
+    """
+
+    def __init__(self, cache_dir: str, name: str = 'binance_future', ttl: float = 3600.):
+        """
+        :param cache_dir: 캐시 디렉터리
+        :param name: 캐시 파일 이름 (거래소/마켓 종류별로 구분)
+        :param ttl: 캐시 유효 시간(초) (기본값: 3600)
+        """
+        self.array_path = os.path.join(cache_dir, f'{name}.npy')
+        self.header_path = os.path.join(cache_dir, f'{name}.json')
+        self.ttl = ttl
+        self.markets = np.empty(0, dtype=MARKET_DTYPE)
+        self.fetched_at = 0.
+        self.digest = ''
+        self._index: Dict[str, int] = {}
+        self._specs: Dict[str, MarketSpec] = {}
+
+    # --- 로드/갱신 ------------------------------------------------------------------
+
+    def load(self, fetch: Callable[[], np.ndarray]) -> 'MarketMetadataCache':
+        """
+        디스크 캐시를 읽고, 없거나 TTL이 지났으면 ``refresh``합니다.
+
+        :param fetch: 구조화 배열을 반환하는 함수 (예: ``lambda: fetch_ccxt_markets(exchange)``)
+        :return: self
+        """
+        if not self._read() or self.is_stale():
+            self.refresh(fetch)
+        return self
+
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at > self.ttl
+
+    def refresh(self, fetch: Callable[[], np.ndarray]) -> MarketDiff:
+        """
+        거래소에서 다시 받아 캐시를 갱신합니다. 내용 해시가 같으면 배열은 다시 쓰지 않습니다.
+
+        :param fetch: 구조화 배열을 반환하는 함수
+        :return: 이전 캐시와의 변경 내역
+        """
+        markets = np.asarray(fetch(), dtype=MARKET_DTYPE)
+        digest = hashlib.sha1(markets.tobytes()).hexdigest()
+
+        diff = MarketDiff([], [], [])
+        if digest != self.digest:
+            diff = self.diff(markets)
+            self._set(markets)
+            os.makedirs(os.path.dirname(self.array_path) or '.', exist_ok=True)
+            with open(self.array_path + '.tmp', 'wb') as f:
+                np.save(f, markets)
+            os.replace(self.array_path + '.tmp', self.array_path)
+
+        self.digest = digest
+        self.fetched_at = time.time()
+        with open(self.header_path + '.tmp', 'w') as f:
+            json.dump({'fetched_at': self.fetched_at, 'digest': digest, 'count': len(markets)}, f)
+        os.replace(self.header_path + '.tmp', self.header_path)
+        return diff
+
+    def diff(self, markets: np.ndarray) -> MarketDiff:
+        """
+        현재 캐시와 새 배열을 비교합니다.
+
+        :param markets: 새 구조화 배열
+        :return: 추가/삭제/변경된 심볼
+        """
+        old = dict(zip(self.markets['symbol'].tolist(), self.markets))
+        new = dict(zip(markets['symbol'].tolist(), markets))
+        changed = [symbol for symbol in new.keys() & old.keys() if old[symbol].tobytes() != new[symbol].tobytes()]
+        return MarketDiff(sorted(new.keys() - old.keys()), sorted(old.keys() - new.keys()), sorted(changed))
+
+    def _read(self) -> bool:
+        try:
+            with open(self.header_path) as f:
+                header = json.load(f)
+            markets = np.load(self.array_path)
+        except (FileNotFoundError, ValueError):
+            return False
+        self._set(markets)
+        self.fetched_at = header['fetched_at']
+        self.digest = header['digest']
+        return True
+
+    def _set(self, markets: np.ndarray) -> None:
+        self.markets = markets
+        self._index = {symbol: i for i, symbol in enumerate(markets['symbol'].tolist())}
+        self._specs = {}
+
+    # --- 조회 -----------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def symbols(self) -> List[str]:
+        return list(self._index)
+
+    def get(self, symbol: str) -> MarketSpec:
+        """
+        심볼의 거래 규격을 O(1)로 조회합니다. 같은 심볼은 같은 객체를 재사용합니다.
+
+        :param symbol: ccxt 심볼 (예: 'BTC/USDT:USDT')
+        :return: 거래 규격
+        """
+        spec = self._specs.get(symbol)
+        if spec is None:
+            spec = self._specs[symbol] = MarketSpec(self.markets[self._index[symbol]])
+        return spec
+
+    def price_tick(self, symbol: str) -> float:
+        return self.markets['price_tick'][self._index[symbol]]
+
+    def amount_step(self, symbol: str) -> float:
+        return self.markets['amount_step'][self._index[symbol]]
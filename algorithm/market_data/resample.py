@@ -0,0 +1,206 @@
+# market_data/resample.py
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from live.signal_pipeline import Bar
+from market_data.candle_store import CANDLE_COLUMNS, TIME_COLUMN, interval_to_ns
+
+BASE_INTERVAL = '1m'
+DEFAULT_INTERVALS = ('5m', '15m', '1h', '4h')
+
+# (봉 간격, 마감된 상위 봉)
+ResampledHandler = Callable[[str, Bar], Any]
+
+
+def bucket_starts(times: np.ndarray, step: int) -> np.ndarray:
+    """
+    시각을 상위 봉의 시작 시각으로 내립니다. Binance와 같이 UTC epoch 기준으로 정렬됩니다 (4h는 00/04/08...시).
+
+    :param times: 시각 배열 (정수 epoch, step과 같은 단위)
+    :param step: 상위 봉 간격 (times와 같은 단위)
+    :return: 시작 시각 배열
+    """
+    return times - times % step
+
+
+def _reduce(
+    times: np.ndarray,
+    columns: Dict[str, np.ndarray],
+    step: int,
+    base_step: Optional[int],
+    complete_only: bool
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    starts = bucket_starts(times, step)
+    if len(times) == 0:
+        return starts, {name: np.empty(0) for name in CANDLE_COLUMNS}
+
+    boundaries = np.flatnonzero(np.diff(starts)) + 1
+    first = np.concatenate(([0], boundaries))
+    last = np.concatenate((boundaries - 1, [len(times) - 1]))
+    if complete_only:
+        if base_step is None:
+            raise ValueError('complete_only에는 base_interval이 필요합니다')
+        if times[-1] + base_step < starts[-1] + step:
+            first, last = first[:-1], last[:-1]
+            if len(first) == 0:
+                return starts[:0], {name: np.empty(0) for name in CANDLE_COLUMNS}
+
+    def column(name: str) -> np.ndarray:
+        values = np.asarray(columns[name], dtype=np.float64)
+        return values[:last[-1] + 1]
+
+    return starts[first], {
+        'Open': column('Open')[first],
+        'High': np.maximum.reduceat(column('High'), first),
+        'Low': np.minimum.reduceat(column('Low'), first),
+        'Close': column('Close')[last],
+        'Volume': np.add.reduceat(column('Volume'), first),
+    }
+
+
+def resample_arrays(
+    arrays: Dict[str, np.ndarray],
+    interval: str,
+    base_interval: Optional[str] = None,
+    complete_only: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    시간순으로 정렬된 하위 봉 배열을 상위 봉으로 묶습니다.
+
+    같은 구간의 경계를 한 번 찾은 뒤 ``np.maximum.reduceat`` 같은 구간 리듀스로 시가(첫 값), 고가(최대),
+    저가(최소), 종가(마지막 값), 거래량(합)을 계산하므로 파이썬 반복이 없습니다.
+    빠진 하위 봉이 있어도 구간은 시각으로 정해지며, 하위 봉이 하나도 없는 구간은 만들지 않습니다.
+
+    :param arrays: ``CandleStore.read_arrays``와 같은 'time'(UTC epoch 나노초)과 OHLCV 컬럼 이름 -> 배열
+    :param interval: 상위 봉 간격 (예: '15m')
+    :param base_interval: 하위 봉 간격 (complete_only에 필요)
+    :param complete_only: True면 마지막 구간이 아직 끝나지 않았을 때(마지막 하위 봉이 구간 끝에 닿지 않음) 버림
+    :return: 같은 형식의 상위 봉 배열
+    """
+    base_step = interval_to_ns(base_interval) if base_interval is not None else None
+    starts, bars = _reduce(np.asarray(arrays[TIME_COLUMN], dtype=np.int64), arrays, interval_to_ns(interval),
+                           base_step, complete_only)
+    return {TIME_COLUMN: starts, **bars}
+
+
+def resample(
+    data: pd.DataFrame,
+    interval: str,
+    base_interval: Optional[str] = None,
+    complete_only: bool = False
+) -> pd.DataFrame:
+    """
+    OHLCV DataFrame을 상위 봉으로 묶습니다. 결과 인덱스는 UTC 기준 봉 시작 시각입니다.
+
+    인덱스는 자기 해상도(pandas의 unit) 그대로 정수로 다루므로 나노초로 바꾸는 복사가 없습니다.
+
+    :param data: 하위 봉 OHLCV DataFrame (예: ``CandleStore.load(symbol, '1m', ...)``)
+    :param interval: 상위 봉 간격
+    :return: 상위 봉 OHLCV DataFrame
+    """
+    index = pd.DatetimeIndex(data.index)
+    index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+    per_unit = int(pd.Timedelta(1, unit=index.unit).value)
+    base_step = interval_to_ns(base_interval) // per_unit if base_interval is not None else None
+    starts, bars = _reduce(index.asi8, {name: data[name].to_numpy() for name in CANDLE_COLUMNS},
+                           interval_to_ns(interval) // per_unit, base_step, complete_only)
+    return pd.DataFrame(bars, index=pd.DatetimeIndex(starts.view(f'M8[{index.unit}]'), name='Datetime').tz_localize('UTC'))
+
+
+def resample_many(
+    data: pd.DataFrame,
+    intervals: Iterable[str] = DEFAULT_INTERVALS,
+    base_interval: Optional[str] = None,
+    complete_only: bool = False
+) -> Dict[str, pd.DataFrame]:
+    """
+    하나의 하위 봉 시계열에서 여러 간격의 봉을 만듭니다. 모든 간격이 같은 원본에서 나오므로 경계가 정확히 맞습니다.
+
+    :return: 봉 간격 -> OHLCV DataFrame
+    """
+    return {interval: resample(data, interval, base_interval, complete_only) for interval in intervals}
+
+
+class IncrementalResampler:
+    """
+    마감된 1분 봉을 하나씩 받아 여러 상위 간격의 진행 중인 봉을 갱신하고, 구간이 끝나면 마감된 봉을 내보냅니다.
+
+    ``TradeBarAssembler``와 같이 심볼/간격별 진행 중인 봉을 [open_time, open, high, low, close, volume]
+    목록으로 들고 있습니다. 구간의 마지막 하위 봉이 들어오면 바로 마감하고, 하위 봉이 빠져 다음 구간의 봉이
+    먼저 들어오면 이전 봉을 그 시점에 마감합니다. 같은 하위 봉으로 ``resample(..., complete_only=True)``한 결과와
+    같습니다 (거래량은 합산 순서가 달라 마지막 자리가 다를 수 있음).
+    재연결 뒤 다시 받은 봉처럼 심볼의 마지막 하위 봉보다 open_time이 같거나 이른 봉은 무시합니다.
+
+    ``KlineStream(symbols, '1m', resampler.update)``처럼 하나의 1분 스트림에서 모든 간격의 지표를 갱신할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        intervals: Iterable[str] = DEFAULT_INTERVALS,
+        base_interval: str = BASE_INTERVAL,
+        on_bar: Optional[ResampledHandler] = None
+    ):
+        """
+        :param intervals: 만들 상위 봉 간격 (기본값: 5m, 15m, 1h, 4h)
+        :param base_interval: 입력 봉 간격 (기본값: 1m)
+        :param on_bar: 상위 봉이 마감될 때마다 (간격, 봉)으로 호출할 함수
+        """
+        self.base_step = interval_to_ns(base_interval) // 10**6
+        self.steps: Dict[str, int] = {}
+        for interval in intervals:
+            step = interval_to_ns(interval) // 10**6
+            if step % self.base_step:
+                raise ValueError(f'{interval}은 {base_interval}의 배수가 아닙니다')
+            self.steps[interval] = step
+        self.on_bar = on_bar
+        self.bars: Dict[Tuple[str, str], List[float]] = {}
+        self.last_open: Dict[str, int] = {}
+
+    def update(self, bar: Bar) -> List[Tuple[str, Bar]]:
+        """
+        :param bar: 마감된 하위 봉 (open_time은 epoch 밀리초)
+        :return: 이번 봉으로 마감된 (간격, 상위 봉) 목록 (중복/역순 봉이면 빈 목록)
+        """
+        last = self.last_open.get(bar.symbol)
+        if last is not None and bar.open_time <= last:
+            # 같은 하위 봉이 두 번 더해지거나 마감된 구간이 다시 열리지 않도록
+            return []
+        self.last_open[bar.symbol] = bar.open_time
+
+        closed = []
+        for interval, step in self.steps.items():
+            key = (bar.symbol, interval)
+            open_time = bar.open_time - bar.open_time % step
+            current = self.bars.get(key)
+            if current is not None and open_time > current[0]:
+                closed.append((interval, Bar(bar.symbol, int(current[0]), *current[1:])))
+                current = None
+            if current is None:
+                current = self.bars[key] = [open_time, bar.open, bar.high, bar.low, bar.close, bar.volume]
+            else:
+                if bar.high > current[2]:
+                    current[2] = bar.high
+                if bar.low < current[3]:
+                    current[3] = bar.low
+                current[4] = bar.close
+                current[5] += bar.volume
+            if bar.open_time + self.base_step >= open_time + step:
+                closed.append((interval, Bar(bar.symbol, int(open_time), *current[1:])))
+                del self.bars[key]
+
+        if self.on_bar is not None:
+            for interval, higher in closed:
+                self.on_bar(interval, higher)
+        return closed
+
+    def partial(self, symbol: str, interval: str) -> Optional[Bar]:
+        """
+        진행 중인 상위 봉을 반환합니다 (지금까지 들어온 하위 봉까지 반영).
+
+        :return: 진행 중인 봉 또는 None
+        """
+        current = self.bars.get((symbol, interval))
+        return Bar(symbol, int(current[0]), *current[1:]) if current is not None else None
@@ -1,2 +1,11 @@
+from math_extention.rounding import round_to_tick
+
+
 def perfectRound(val, digits):
-    return round(val+10**(-len(str(val))-1), digits)
\ No newline at end of file
+    """
+    소수 digits자리에서 반올림합니다 (0.5는 0에서 먼 쪽). 스칼라와 배열/Series 모두 받습니다.
+    """
+    rounded = round_to_tick(getattr(val, 'values', val), 10.0 ** -digits)
+    if hasattr(val, 'index'):
+        return type(val)(rounded, index=val.index, name=getattr(val, 'name', None))
+    return rounded
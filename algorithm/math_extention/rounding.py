@@ -0,0 +1,294 @@
+# math_extention/rounding.py
+
+import math
+from decimal import Decimal
+from typing import Any, Iterable, Tuple, Union
+
+import numpy as np
+
+from technical_indicators.jit import njit
+
+# float64가 십진수로 정확히 왕복하는 유효 자릿수. 값을 이 자릿수의 정수로 옮겨 이진수 표현 오차를 없앱니다.
+SIGNIFICANT_DIGITS = 15
+
+# 반올림 방식
+ROUND_HALF_UP = 0  # 0.5는 0에서 먼 쪽 (가격)
+ROUND_DOWN = 1     # 0 쪽으로 버림 (주문 수량)
+ROUND_UP = 2       # 0에서 먼 쪽으로 올림 (최소 수량/금액 맞추기)
+
+Number = Union[float, np.ndarray]
+
+# 판정 경계(반올림은 0.5, 버림/올림은 정수)에서 이만큼(상대 오차 + 절대 오차, 단위 개수 기준) 떨어진 값은
+# float 연산만으로도 정수 연산과 같은 결과
+_REL_TOL = 1e-13
+_ABS_TOL = 1e-12
+# 정수 판정에 쓰는 값(값/단위 x 배율)의 상한. 넘으면 int64가 넘치므로 Python 정수로 계산
+_INT64_LIMIT = 2. ** 62
+# float64가 모든 정수를 정확히 나타내는 한계 (단위 개수 x 단위가 이보다 크면 Python 정수로 계산)
+_FLOAT_INT_LIMIT = 2. ** 53
+
+
+def tick_scale(tick: float) -> Tuple[int, int]:
+    """
+    호가 단위를 (10의 거듭제곱 배율, 배율을 곱한 정수 단위)로 나타냅니다.
+
+    예: 0.01 -> (100, 1), 0.05 -> (100, 5), 10 -> (1, 10)
+
+    :param tick: 호가 단위(또는 수량 단위)
+    :return: (scale, units). ``tick == units / scale``, tick이 NaN이거나 0 이하면 (0, 0)
+    """
+    tick = float(tick)
+    if not tick > 0 or math.isinf(tick):
+        return 0, 0
+    exponent = Decimal(repr(tick)).normalize().as_tuple().exponent
+    decimals = max(-exponent, 0)
+    scale = 10 ** decimals
+    return scale, int(Decimal(repr(tick)) * scale)
+
+
+@njit(cache=True)
+def _quantize_scaled(value: float, scale: int, units: int, mode: int) -> float:
+    """
+    값 하나를 단위(units / scale)의 배수로 맞춥니다. ``quantize``의 스칼라 커널 버전입니다.
+    """
+    if value != value or value == 0 or units == 0:
+        return value
+    scaled = abs(value) * scale
+    shifted = scaled / units + (0.5 if mode == ROUND_HALF_UP else 0.)
+    count = math.floor(shifted)
+    tol = shifted * _REL_TOL + _ABS_TOL
+    if shifted - count <= tol or count + 1 - shifted <= tol:
+        # 판정 경계 근처: 유효 숫자 15자리 정수로 옮겨 정수 연산으로 판정
+        digits = int(math.floor(math.log10(scaled))) + 1
+        guard = 10 ** max(SIGNIFICANT_DIGITS - digits, 1)
+        fine = int(round(scaled * guard))
+        fine_units = units * guard
+        if mode == ROUND_HALF_UP:
+            count = (fine + fine_units // 2) // fine_units
+        else:
+            count = fine // fine_units
+            if mode == ROUND_UP and count * fine_units < fine:
+                count += 1
+    elif mode == ROUND_UP:
+        count += 1
+    result = count * units / scale
+    return result if value > 0 else -result
+
+def _quantize_exact(value: float, scale: int, units: int, mode: int) -> float:
+    """
+    ``_quantize_scaled``와 같은 판정을 Python 정수로 합니다. 배율을 곱하면 int64(또는 float)가 넘치는
+    아주 작거나 큰 값에 씁니다.
+    """
+    scaled = abs(value) * scale
+    mantissa, exponent = f'{scaled:.{SIGNIFICANT_DIGITS - 1}e}'.split('e')
+    fine = int(mantissa.replace('.', ''))  # scaled = fine * 10**power (유효 숫자 15자리)
+    power = int(exponent) - (SIGNIFICANT_DIGITS - 1)
+    fine_units = units
+    if power >= 0:
+        fine *= 10 ** power
+    else:
+        fine_units *= 10 ** -power
+    if mode == ROUND_HALF_UP:
+        count = (2 * fine + fine_units) // (2 * fine_units)
+    else:
+        count = fine // fine_units
+        if mode == ROUND_UP and count * fine_units < fine:
+            count += 1
+    result = count * units / scale
+    return result if value > 0 else -result
+
+def _overflows(scaled: Any, units: Any) -> Any:
+    # 판정 경계 경로의 배율(guard)을 곱했을 때 int64를 넘거나, 단위 개수 x 단위가 float로 정확히 표현되지 않는지
+    # (아주 작거나 큰 값)
+    with np.errstate(over='ignore'):
+        digits = np.floor(np.log10(scaled)) + 1
+        guard = 10. ** np.maximum(SIGNIFICANT_DIGITS - digits, 1)
+        return (scaled * guard >= _INT64_LIMIT) | (units * guard >= _INT64_LIMIT) | (scaled >= _FLOAT_INT_LIMIT)
+
+def _quantize_value(value: float, scale: int, units: int, mode: int) -> float:
+    # 스칼라(주문 경로)용. ``_overflows``와 같은 판정을 math로
+    if units and math.isfinite(value) and value != 0:
+        scaled = abs(value) * scale
+        guard = 10. ** min(max(SIGNIFICANT_DIGITS - math.floor(math.log10(scaled)) - 1, 1), 300)
+        if scaled * guard >= _INT64_LIMIT or units * guard >= _INT64_LIMIT or scaled >= _FLOAT_INT_LIMIT:
+            return _quantize_exact(value, scale, units, mode)
+    return _quantize_scaled(value, scale, units, mode)
+
+@njit(cache=True)
+def _round_scaled(value: float, scale: int, units: int) -> float:
+    return _quantize_scaled(value, scale, units, ROUND_HALF_UP)
+
+
+def _quantize_array(values: np.ndarray, scale: Any, units: Any, mode: int) -> np.ndarray:
+    # scale, units는 스칼라 또는 values와 같은 모양의 정수 배열
+    scale = np.broadcast_to(np.asarray(scale, dtype=np.int64), values.shape)
+    units = np.broadcast_to(np.asarray(units, dtype=np.int64), values.shape)
+    active = (units > 0) & np.isfinite(values) & (values != 0)
+    safe_units = np.where(active, units, 1)
+
+    scaled = np.abs(values) * scale
+    shifted = scaled / safe_units + (0.5 if mode == ROUND_HALF_UP else 0.)
+    count = np.floor(shifted)
+    tol = shifted * _REL_TOL + _ABS_TOL
+    near = active & ((shifted - count <= tol) | (count + 1 - shifted <= tol))
+    if mode == ROUND_UP:
+        count = np.where(near, count, count + 1)
+    wide = np.zeros_like(near)
+    if near.any():
+        # 배율을 곱하면 int64가 넘치는 값(아주 작거나 큰 값)은 아래에서 Python 정수로 따로 계산
+        wide[near] = _overflows(scaled[near], units[near])
+        near &= ~wide
+        exact = scaled[near]
+        digits = np.floor(np.log10(exact)).astype(np.int64) + 1
+        guard = 10 ** np.maximum(SIGNIFICANT_DIGITS - digits, 1)
+        fine = np.rint(exact * guard).astype(np.int64)
+        fine_units = units[near] * guard
+        if mode == ROUND_HALF_UP:
+            count[near] = (fine + fine_units // 2) // fine_units
+        else:
+            down = fine // fine_units
+            count[near] = down + ((mode == ROUND_UP) & (down * fine_units < fine))
+
+    result = count * safe_units / np.where(active, scale, 1)
+    result = np.where(active, np.where(values < 0, -result, result), values)
+    if wide.any():
+        result[wide] = [_quantize_exact(value, int(s), int(u), mode)
+                        for value, s, u in zip(values[wide].tolist(), scale[wide].tolist(), units[wide].tolist())]
+    return result
+
+
+def quantize(values: Number, tick: float, mode: int = ROUND_HALF_UP) -> Number:
+    """
+    값을 단위의 배수로 맞춥니다.
+
+    판정 경계(반올림은 0.5, 버림/올림은 정수) 근처의 값은 유효 숫자 15자리의 정수로 옮긴 뒤
+    정수 연산으로 판정하므로 ``1.005 -> 1.01``, ``0.3 / 0.1 -> 3``처럼 이진수 표현 오차에
+    흔들리지 않고, 값을 유효 숫자 15자리 십진수로 나타내 ``Decimal``로 처리한 것과 같은 결과를 냅니다.
+    (``0.1 + 0.2``는 0.3으로 보므로 올림해도 0.31이 되지 않습니다.)
+    경계에서 먼 값은 float 연산만으로 같은 결과가 나옵니다.
+
+    :param values: 스칼라 또는 배열 (NaN은 그대로 유지)
+    :param tick: 단위 (예: 호가 단위 0.01, 수량 단위 0.001). NaN이면 그대로 반환
+    :param mode: ROUND_HALF_UP, ROUND_DOWN, ROUND_UP (기본값: ROUND_HALF_UP)
+    :return: 단위에 맞춘 값 (입력과 같은 형태)
+    """
+    scale, units = tick_scale(tick)
+    if np.ndim(values) == 0:
+        return _quantize_value(float(values), scale, units, mode)
+    return _quantize_array(np.asarray(values, dtype=np.float64), scale, units, mode)
+
+def round_to_tick(values: Number, tick: float) -> Number:
+    """
+    가격을 호가 단위의 배수로 반올림합니다. 0.5는 0에서 먼 쪽으로 올립니다 (``Decimal.ROUND_HALF_UP``).
+
+    :param values: 스칼라 또는 배열 (NaN은 그대로 유지)
+    :param tick: 호가 단위 (예: 0.01)
+    :return: 반올림된 값 (입력과 같은 형태)
+    """
+    return quantize(values, tick, ROUND_HALF_UP)
+
+def floor_to_step(values: Number, step: float) -> Number:
+    """
+    수량을 수량 단위의 배수로 버립니다 (0 쪽으로).
+
+    :param values: 스칼라 또는 배열
+    :param step: 수량 단위 (예: 0.001)
+    :return: 버린 값
+    """
+    return quantize(values, step, ROUND_DOWN)
+
+def ceil_to_step(values: Number, step: float) -> Number:
+    """
+    수량을 수량 단위의 배수로 올립니다 (0에서 먼 쪽으로).
+
+    :param values: 스칼라 또는 배열
+    :param step: 수량 단위 (예: 0.001)
+    :return: 올린 값
+    """
+    return quantize(values, step, ROUND_UP)
+
+
+class PrecisionTable:
+    """
+    심볼별 호가 단위/수량 단위의 (scale, units)를 미리 계산해 둔 표입니다.
+
+    주문 경로에서는 심볼 하나의 스칼라를, 리서치에서는 심볼 배열과 값 배열을 한 번에 맞춥니다.
+    """
+
+    def __init__(self, symbols: Iterable[str], price_ticks: Iterable[float], amount_steps: Iterable[float]):
+        """
+        :param symbols: 심볼 목록
+        :param price_ticks: 심볼별 호가 단위 (NaN이면 맞추지 않음)
+        :param amount_steps: 심볼별 수량 단위 (NaN이면 맞추지 않음)
+        """
+        self.symbols = list(symbols)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        price = [tick_scale(tick) for tick in price_ticks]
+        amount = [tick_scale(step) for step in amount_steps]
+        self.price_scale = np.array([s for s, _ in price], dtype=np.int64)
+        self.price_units = np.array([u for _, u in price], dtype=np.int64)
+        self.amount_scale = np.array([s for s, _ in amount], dtype=np.int64)
+        self.amount_units = np.array([u for _, u in amount], dtype=np.int64)
+
+    @classmethod
+    def from_metadata(cls, cache: Any) -> 'PrecisionTable':
+        """
+        ``MarketMetadataCache``의 price_tick/amount_step으로 표를 만듭니다.
+
+        :param cache: 로드된 MarketMetadataCache
+        :return: 정밀도 표
+        """
+        markets = cache.markets
+        return cls(markets['symbol'].tolist(), markets['price_tick'].tolist(), markets['amount_step'].tolist())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def _positions(self, symbols: Iterable[str]) -> np.ndarray:
+        return np.array([self._index[symbol] for symbol in symbols], dtype=np.int64)
+
+    def price(self, symbol: str, values: Number, mode: int = ROUND_HALF_UP) -> Number:
+        """
+        한 심볼의 가격을 호가 단위에 맞춥니다.
+
+        :param symbol: 심볼 (예: 'BTC/USDT:USDT')
+        :param values: 가격 (스칼라 또는 배열)
+        :param mode: 반올림 방식 (기본값: ROUND_HALF_UP)
+        """
+        i = self._index[symbol]
+        if np.ndim(values) == 0:
+            return _quantize_value(float(values), int(self.price_scale[i]), int(self.price_units[i]), mode)
+        return _quantize_array(np.asarray(values, dtype=np.float64), self.price_scale[i], self.price_units[i], mode)
+
+    def amount(self, symbol: str, values: Number, mode: int = ROUND_DOWN) -> Number:
+        """
+        한 심볼의 수량을 수량 단위에 맞춥니다.
+
+        :param symbol: 심볼
+        :param values: 수량 (스칼라 또는 배열)
+        :param mode: 반올림 방식 (기본값: ROUND_DOWN)
+        """
+        i = self._index[symbol]
+        if np.ndim(values) == 0:
+            return _quantize_value(float(values), int(self.amount_scale[i]), int(self.amount_units[i]), mode)
+        return _quantize_array(np.asarray(values, dtype=np.float64), self.amount_scale[i], self.amount_units[i], mode)
+
+    def prices(self, symbols: Iterable[str], values: np.ndarray, mode: int = ROUND_HALF_UP) -> np.ndarray:
+        """
+        심볼이 섞인 가격 배열을 각 심볼의 호가 단위에 맞춥니다.
+
+        :param symbols: 원소별 심볼 (values와 같은 길이)
+        :param values: 가격 배열
+        """
+        i = self._positions(symbols)
+        return _quantize_array(np.asarray(values, dtype=np.float64), self.price_scale[i], self.price_units[i], mode)
+
+    def amounts(self, symbols: Iterable[str], values: np.ndarray, mode: int = ROUND_DOWN) -> np.ndarray:
+        """
+        심볼이 섞인 수량 배열을 각 심볼의 수량 단위에 맞춥니다.
+
+        :param symbols: 원소별 심볼 (values와 같은 길이)
+        :param values: 수량 배열
+        """
+        i = self._positions(symbols)
+        return _quantize_array(np.asarray(values, dtype=np.float64), self.amount_scale[i], self.amount_units[i], mode)
@@ -1,14 +1,20 @@
+from datetime import datetime, timedelta, timezone
+
 import pandas as pd
 import plotly.graph_objects as go
-import yfinance as yf
 from heikin_ashi import heikin_ashi
 from math_extention.math_extention import perfectRound
+from market_data.candle_store import CandleStore, yfinance_downloader
 from plotly.subplots import make_subplots
 from rsi import cal_rsi, stochastic_rsi
 
 # Download BTC-USD data for the last 5 days with 15-minute intervals
 symbol = "BTC-USD"
-df = yf.download(tickers=symbol, period="5d", interval="15m")
+end = datetime.now(timezone.utc)
+start = end - timedelta(days=5)
+# PYCOIN_CANDLE_STORE 저장소가 있으면 빠진 구간만 받고, 없으면 매번 내려받음
+store = CandleStore.from_env()
+df = store.load(symbol, '15m', start, end) if store is not None else yfinance_downloader(symbol, start, end, '15m')
 
 # Heikin Ashi calculation
 ha_df = heikin_ashi(df)
@@ -1,76 +1,24 @@
+from datetime import datetime, timedelta, timezone
+
 import pandas as pd
 import plotly.graph_objects as go
-import yfinance as yf
-from heikin_ashi import heikin_ashi
-from math_extention.math_extention import perfectRound
+from market_data.candle_store import CandleStore, yfinance_downloader
 from plotly.subplots import make_subplots
-from rsi import cal_rsi, stochastic_rsi
+from technical_indicators.stoch_rsi_timing import stoch_rsi_buy_timing
 
 # This file is about studying buying timing tracking.
 
 # Download BTC-USD data for the last 5 days with 15-minute intervals
 symbol = "ETH-USD"
-df = yf.download(tickers=symbol, period="30d", interval="1h")
-
-# Heikin Ashi calculation
-ha_df = heikin_ashi(df)
-
-# EMA 200 calculation
-ema200 = df['Close'].ewm(span=200, adjust=False).mean()
-
-# Stochastic RSI calculation
-ha_df['RSI'] = cal_rsi(df)
-ha_df['K'], ha_df['D'] = stochastic_rsi(ha_df['RSI'])
-
-# Create a new column to indicate where %K crosses above %D and should continue to be True until %D crosses above %K
-ha_df['k_above_d'] = (ha_df['K'].shift(1) < ha_df['D'].shift(1)) & (ha_df['K'] > ha_df['D'])
-
-# Initialize the extended k_above_d signal
-extended_k_above_d = ha_df['k_above_d'].copy()
-extended_k_above_d.iloc[0] = ha_df['k_above_d'].iloc[0]  # Initialize first value
-
-for i in range(1, len(ha_df)):
-    if extended_k_above_d.iloc[i - 1]:  # If previous signal was True
-        if ha_df['D'].iloc[i] > ha_df['K'].iloc[i]:
-            extended_k_above_d.iloc[i] = False
-        else:
-            extended_k_above_d.iloc[i] = True
-    elif ha_df['k_above_d'].iloc[i]:  # Reset to True if new k_above_d signal is True
-        extended_k_above_d.iloc[i] = True
-
-ha_df['extended_k_above_d'] = extended_k_above_d
-
-# Calculate initial Buy signals, including extended_k_above_d
-init_buy_signal = (ha_df['Close'] > ema200) & (ha_df['K'] < 20) & (ha_df['D'] < 20) & (ha_df['extended_k_above_d'])
-
-# Create extended buy signal column with condition to reset to False
-buy_signal = init_buy_signal.copy()
-buy_signal.iloc[0] = init_buy_signal.iloc[0]  # Initialize first value
-
-for i in range(1, len(init_buy_signal)):
-    if buy_signal.iloc[i - 1]:  # If previous signal was True
-        if (ha_df['K'].iloc[i] >= 80) or (ha_df['Close'].iloc[i] < ema200.iloc[i]) or (ha_df['K'].iloc[i] < ha_df['D'].iloc[i]):
-            buy_signal.iloc[i] = False
-        else:
-            buy_signal.iloc[i] = True
-    elif init_buy_signal.iloc[i]:  # Reset to True if new buy signal is True
-        buy_signal.iloc[i] = True
-
-ha_df['buy_signal'] = buy_signal
-
-# Calculate actual buy signals when %K crosses above 20 while buy_signal is True
-actual_buy_signal = buy_signal & (ha_df['K'] > 20)
-ha_df['actual_buy_signal'] = actual_buy_signal
-
-# Debugging output
-print("Condition 1 (Close > EMA200):\n", ha_df['Close'] > ema200)
-print("Condition 2 (K < 20):\n", ha_df['K'] < 20)
-print("Condition 3 (D < 20):\n", ha_df['D'] < 20)
-print("K above D condition:\n", ha_df['k_above_d'])
-print("Extended K above D Signal:\n", ha_df['extended_k_above_d'])
-print("Combined Condition (Initial Buy Signal):\n", init_buy_signal)
-print("Extended Buy Signal:\n", ha_df['buy_signal'])
-print("Actual Buy Signal:\n", ha_df['actual_buy_signal'])
+end = datetime.now(timezone.utc)
+start = end - timedelta(days=30)
+# PYCOIN_CANDLE_STORE 저장소가 있으면 빠진 구간만 받고, 없으면 매번 내려받음
+store = CandleStore.from_env()
+df = store.load(symbol, '1h', start, end) if store is not None else yfinance_downloader(symbol, start, end, '1h')
+
+# Heikin Ashi, EMA 200, Stochastic RSI and the latched buy-timing signals
+ha_df = stoch_rsi_buy_timing(df)
+ema200 = ha_df['EMA']
 
 # Create figure with subplots
 fig = make_subplots(
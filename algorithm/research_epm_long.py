@@ -1,252 +1,166 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import yfinance as yf
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
 
 # 기술적 지표 import
-from technical_indicators.ema200 import add_ema_to_dataframe
-from technical_indicators.macd import add_macd_to_dataframe
-from technical_indicators.parabolic_sar import add_parabolic_sar_to_dataframe
+from technical_indicators.pipeline import IndicatorPipeline, epm_indicators
+
+# 데이터 저장소 import
+from market_data.candle_store import CandleStore
+
+# 백테스트 코어 import
+from backtest.core import SIGNAL_COLUMNS, backtest_arrays, expand_events
+from backtest.intrabar import IntrabarResolver
+from backtest.ledger import TradeLedger
+from instrumentation.latency import span
+
+# 차트 import (plotly/yfinance는 쓰는 함수 안에서만 import)
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+from charting import fast_chart
+from charting.fast_chart import DEFAULT_MAX_POINTS, write_chart
+
+def get_bitcoin_data(start_date: datetime, end_date: datetime, store: Optional[CandleStore] = None) -> pd.DataFrame:
+    """
+    지정된 기간 동안의 비트코인 데이터를 가져옵니다.
+
+    :param start_date: 데이터 시작 날짜
+    :param end_date: 데이터 종료 날짜
+    :param store: 로컬 캔들 저장소 (기본값: PYCOIN_CANDLE_STORE 환경 변수의 저장소, 없으면 매번 내려받음)
+    :return: 비트코인 데이터
+    """
+    store = store or CandleStore.from_env()
+    if store is not None:
+        return store.load('BTC-USD', '1h', start_date, end_date)
+    import yfinance as yf
 
-def get_bitcoin_data(start_date: datetime, end_date: datetime) -> pd.DataFrame:
     return yf.download('BTC-USD', start=start_date, end=end_date, interval='1h')
-def add_trade_signals(data: pd.DataFrame) -> pd.DataFrame:
-    data['LongSignal'] = False
-    data['ShortSignal'] = False
-    data['LongProfitSignal'] = False
-    data['LongLossSignal'] = False
-    data['ShortProfitSignal'] = False
-    data['ShortLossSignal'] = False
-    data['EntryPrice'] = np.nan
-    data['ExitPrice'] = np.nan
-    data['ProfitPercentage'] = np.nan
-    
-    in_long_position = False
-    in_short_position = False
-    entry_price = 0
-    stop_loss = 0
-    take_profit = 0
-    
-    for i in range(1, len(data)):
-        # Long 조건
-        long_condition1 = data['Close'].iloc[i] > data['EMA200'].iloc[i]
-        long_condition2 = (data['MACD'].iloc[i] > data['Signal'].iloc[i] and 
-                           data['MACD'].iloc[i-1] <= data['Signal'].iloc[i-1])
-        long_condition3 = data['ParabolicSAR'].iloc[i] < data['Low'].iloc[i]
-        
-        # Short 조건
-        short_condition1 = data['Close'].iloc[i] < data['EMA200'].iloc[i]
-        short_condition2 = (data['MACD'].iloc[i] < data['Signal'].iloc[i] and 
-                            data['MACD'].iloc[i-1] >= data['Signal'].iloc[i-1])
-        short_condition3 = data['ParabolicSAR'].iloc[i] > data['High'].iloc[i]
-
-        if in_long_position:
-            if data['High'].iloc[i] >= take_profit:
-                # Long 포지션 익절
-                data.loc[data.index[i], 'LongProfitSignal'] = True
-                data.loc[data.index[i], 'ExitPrice'] = take_profit
-                data.loc[data.index[i], 'ProfitPercentage'] = (take_profit - entry_price) / entry_price * 100
-                in_long_position = False
-            elif data['Low'].iloc[i] <= stop_loss:
-                # Long 포지션 손절
-                data.loc[data.index[i], 'LongLossSignal'] = True
-                data.loc[data.index[i], 'ExitPrice'] = stop_loss
-                data.loc[data.index[i], 'ProfitPercentage'] = (stop_loss - entry_price) / entry_price * 100
-                in_long_position = False
-            elif short_condition1 and short_condition2 and short_condition3:
-                # Long 포지션 청산 후 Short 진입
-                data.loc[data.index[i], 'LongExitSignal'] = True
-                data.loc[data.index[i], 'ExitPrice'] = data['Close'].iloc[i]
-                data.loc[data.index[i], 'ProfitPercentage'] = (data['Close'].iloc[i] - entry_price) / entry_price * 100
-                in_long_position = False
-                
-                # Short 진입
-                data.loc[data.index[i], 'ShortSignal'] = True
-                data.loc[data.index[i], 'EntryPrice'] = data['Close'].iloc[i]
-                in_short_position = True
-                entry_price = data['Close'].iloc[i]
-                stop_loss = data['ParabolicSAR'].iloc[i]
-                take_profit = entry_price - (stop_loss - entry_price)
-
-        elif in_short_position:
-            if data['Low'].iloc[i] <= take_profit:
-                # Short 포지션 익절
-                data.loc[data.index[i], 'ShortProfitSignal'] = True
-                data.loc[data.index[i], 'ExitPrice'] = take_profit
-                data.loc[data.index[i], 'ProfitPercentage'] = (entry_price - take_profit) / entry_price * 100
-                in_short_position = False
-            elif data['High'].iloc[i] >= stop_loss:
-                # Short 포지션 손절
-                data.loc[data.index[i], 'ShortLossSignal'] = True
-                data.loc[data.index[i], 'ExitPrice'] = stop_loss
-                data.loc[data.index[i], 'ProfitPercentage'] = (entry_price - stop_loss) / entry_price * 100
-                in_short_position = False
-            elif long_condition1 and long_condition2 and long_condition3:
-                # Short 포지션 청산 후 Long 진입
-                data.loc[data.index[i], 'ShortExitSignal'] = True
-                data.loc[data.index[i], 'ExitPrice'] = data['Close'].iloc[i]
-                data.loc[data.index[i], 'ProfitPercentage'] = (entry_price - data['Close'].iloc[i]) / entry_price * 100
-                in_short_position = False
-                
-                # Long 진입
-                data.loc[data.index[i], 'LongSignal'] = True
-                data.loc[data.index[i], 'EntryPrice'] = data['Close'].iloc[i]
-                in_long_position = True
-                entry_price = data['Close'].iloc[i]
-                stop_loss = data['ParabolicSAR'].iloc[i]
-                take_profit = entry_price + (entry_price - stop_loss)
-
-        elif not in_long_position and not in_short_position:
-            if long_condition1 and long_condition2 and long_condition3:
-                # Long 진입
-                data.loc[data.index[i], 'LongSignal'] = True
-                data.loc[data.index[i], 'EntryPrice'] = data['Close'].iloc[i]
-                in_long_position = True
-                entry_price = data['Close'].iloc[i]
-                stop_loss = data['ParabolicSAR'].iloc[i]
-                take_profit = entry_price + (entry_price - stop_loss)
-            elif short_condition1 and short_condition2 and short_condition3:
-                # Short 진입
-                data.loc[data.index[i], 'ShortSignal'] = True
-                data.loc[data.index[i], 'EntryPrice'] = data['Close'].iloc[i]
-                in_short_position = True
-                entry_price = data['Close'].iloc[i]
-                stop_loss = data['ParabolicSAR'].iloc[i]
-                take_profit = entry_price - (stop_loss - entry_price)
 
-    return data
+def add_trade_signals(data: pd.DataFrame, intrabar: Optional[IntrabarResolver] = None) -> pd.DataFrame:
+    """
+    EMA200, MACD, Parabolic SAR 컬럼을 이용해 Long/Short 진입과 익절/손절 신호를 추가합니다.
+
+    :param data: 지표 컬럼(EMA200, MACD, Signal, ParabolicSAR)이 추가된 시계열 데이터
+    :param intrabar: 한 봉에서 익절가와 손절가에 모두 닿았을 때 하위 봉으로 판정할 resolver
+                     (기본값: None, 익절로 간주)
+    :return: 신호 컬럼과 EntryPrice, ExitPrice, ProfitPercentage 컬럼이 추가된 데이터
+    """
+    with span('signal.add_trade_signals'):
+        return _add_trade_signals(data, intrabar)
+
+def _trade_arrays(
+    data: pd.DataFrame,
+    intrabar: Optional[IntrabarResolver],
+    indicators: Optional[Dict[str, np.ndarray]] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    indicators = indicators or {}
+
+    def column(name: str) -> np.ndarray:
+        # 이미 계산한 float64 지표가 있으면 저장된(예: float32) 컬럼 대신 사용
+        if name in indicators:
+            return np.asarray(indicators[name], dtype=np.float64)
+        return data[name].to_numpy(dtype=np.float64)
+
+    events, entry_prices, exit_prices, profits = backtest_arrays(
+        column('Close'), column('High'), column('Low'),
+        column('EMA200'), column('MACD'), column('Signal'), column('ParabolicSAR'),
+    )
+    if intrabar is not None:
+        events, exit_prices, profits, _, _ = intrabar.resolve(
+            data.index, column('Close'), column('High'), column('Low'), column('ParabolicSAR'),
+            events, exit_prices, profits
+        )
+    return events, entry_prices, exit_prices, profits
+
+def _add_trade_signals(data: pd.DataFrame, intrabar: Optional[IntrabarResolver]) -> pd.DataFrame:
+    events, entry_prices, exit_prices, profits = _trade_arrays(data, intrabar)
+    signals = expand_events(events)
+
+    for name in SIGNAL_COLUMNS[:6]:
+        data[name] = signals[name]
+    data['EntryPrice'] = entry_prices
+    data['ExitPrice'] = exit_prices
+    data['ProfitPercentage'] = profits
+    for name in SIGNAL_COLUMNS[6:]:
+        data[name] = signals[name]
 
+    return data
 
-def create_chart(data: pd.DataFrame) -> go.Figure:
-    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
-                        vertical_spacing=0.1, subplot_titles=('BTC/USD', 'MACD'),
-                        row_heights=[0.7, 0.3])
-
-    # 캔들스틱 차트
-    fig.add_trace(go.Candlestick(x=data.index,
-                                 open=data['Open'],
-                                 high=data['High'],
-                                 low=data['Low'],
-                                 close=data['Close'],
-                                 name='BTC/USD'),
-                  row=1, col=1)
-
-    # EMA 200
-    fig.add_trace(go.Scatter(x=data.index, y=data['EMA200'],
-                             line=dict(color='blue', width=1.5),
-                             name='EMA 200'),
-                  row=1, col=1)
-
-    # Parabolic SAR
-    fig.add_trace(go.Scatter(x=data.index, y=data['ParabolicSAR'],
-                             mode='markers',
-                             marker=dict(size=2, color='purple', symbol='triangle-down'),
-                             name='Parabolic SAR'),
-                  row=1, col=1)
-
-    # Long 매수 신호
-    long_signals = data[data['LongSignal']]
-    fig.add_trace(go.Scatter(x=long_signals.index, y=long_signals['Low'],
-                             mode='markers',
-                             marker=dict(size=10, color='blue', symbol='triangle-up'),
-                             name='Long Signal',
-                             text=long_signals.apply(lambda row: f"Long 진입: {row['EntryPrice']:.2f}", axis=1),
-                             hoverinfo='text+x+y'),
-                  row=1, col=1)
-
-    # Short 매수 신호
-    short_signals = data[data['ShortSignal']]
-    fig.add_trace(go.Scatter(x=short_signals.index, y=short_signals['High'],
-                             mode='markers',
-                             marker=dict(size=10, color='orange', symbol='triangle-down'),
-                             name='Short Signal',
-                             text=short_signals.apply(lambda row: f"Short 진입: {row['EntryPrice']:.2f}", axis=1),
-                             hoverinfo='text+x+y'),
-                  row=1, col=1)
-
-    # Long 익절 신호
-    long_profit_signals = data[data['LongProfitSignal']]
-    fig.add_trace(go.Scatter(x=long_profit_signals.index, y=long_profit_signals['High'],
-                             mode='markers',
-                             marker=dict(size=10, color='green', symbol='triangle-up'),
-                             name='Long Profit',
-                             text=long_profit_signals.apply(lambda row: f"Long 매수: {row['EntryPrice']:.2f}<br>매도: {row['ExitPrice']:.2f}<br>수익률: {row['ProfitPercentage']:.2f}%", axis=1),
-                             hoverinfo='text+x+y'),
-                  row=1, col=1)
-
-    # Long 손절 신호
-    long_loss_signals = data[data['LongLossSignal']]
-    fig.add_trace(go.Scatter(x=long_loss_signals.index, y=long_loss_signals['Low'],
-                             mode='markers',
-                             marker=dict(size=10, color='red', symbol='triangle-down'),
-                             name='Long Loss',
-                             text=long_loss_signals.apply(lambda row: f"Long 매수: {row['EntryPrice']:.2f}<br>매도: {row['ExitPrice']:.2f}<br>손실률: {row['ProfitPercentage']:.2f}%", axis=1),
-                             hoverinfo='text+x+y'),
-                  row=1, col=1)
-
-    # Short 익절 신호
-    short_profit_signals = data[data['ShortProfitSignal']]
-    fig.add_trace(go.Scatter(x=short_profit_signals.index, y=short_profit_signals['Low'],
-                             mode='markers',
-                             marker=dict(size=10, color='lime', symbol='triangle-down'),
-                             name='Short Profit',
-                             text=short_profit_signals.apply(lambda row: f"Short 매도: {row['EntryPrice']:.2f}<br>매수: {row['ExitPrice']:.2f}<br>수익률: {row['ProfitPercentage']:.2f}%", axis=1),
-                             hoverinfo='text+x+y'),
-                  row=1, col=1)
-
-    # Short 손절 신호
-    short_loss_signals = data[data['ShortLossSignal']]
-    fig.add_trace(go.Scatter(x=short_loss_signals.index, y=short_loss_signals['High'],
-                             mode='markers',
-                             marker=dict(size=10, color='pink', symbol='triangle-up'),
-                             name='Short Loss',
-                             text=short_loss_signals.apply(lambda row: f"Short 매도: {row['EntryPrice']:.2f}<br>매수: {row['ExitPrice']:.2f}<br>손실률: {row['ProfitPercentage']:.2f}%", axis=1),
-                             hoverinfo='text+x+y'),
-                  row=1, col=1)
-
-    # MACD
-    fig.add_trace(go.Scatter(x=data.index, y=data['MACD'],
-                             line=dict(color='blue', width=1.5),
-                             name='MACD'),
-                  row=2, col=1)
-    fig.add_trace(go.Scatter(x=data.index, y=data['Signal'],
-                             line=dict(color='orange', width=1.5),
-                             name='Signal'),
-                  row=2, col=1)
-
-    # MACD Histogram
-    colors = ['green' if val >= 0 else 'red' for val in data['MACD_Histogram']]
-    fig.add_trace(go.Bar(x=data.index, y=data['MACD_Histogram'],
-                         marker_color=colors,
-                         name='Histogram'),
-                  row=2, col=1)
-
-    fig.update_layout(
-        title='Bitcoin 1-hour Candlestick Chart with Long and Short Signals',
-        yaxis_title='Price (USD)',
-        xaxis_rangeslider_visible=False,
-        height=800,
-        showlegend=True,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        hovermode="x unified"
-    )
 
-    return fig
+def add_trade_events(
+    data: pd.DataFrame,
+    intrabar: Optional[IntrabarResolver] = None,
+    indicators: Optional[Dict[str, np.ndarray]] = None
+) -> Tuple[pd.DataFrame, TradeLedger]:
+    """
+    ``add_trade_signals``의 컴팩트 버전입니다. 봉마다 신호 8개와 가격 3개 컬럼 대신 int8 이벤트 코드 컬럼(Event)
+    하나만 추가하고, 진입가/청산가/수익률은 거래마다 한 행인 장부로 반환합니다.
+
+    :param data: 지표 컬럼(EMA200, MACD, Signal, ParabolicSAR)이 추가된 시계열 데이터
+    :param intrabar: ``add_trade_signals``와 같음
+    :param indicators: 지표 이름 -> float64 배열 (주어지면 data의 지표 컬럼 대신 판정에 사용)
+    :return: Event 컬럼이 추가된 데이터, 거래 장부
+    """
+    with span('signal.add_trade_events'):
+        events, entry_prices, exit_prices, profits = _trade_arrays(data, intrabar, indicators)
+    data['Event'] = events
+    ledger = TradeLedger.from_events(events, entry_prices, exit_prices, profits,
+                                     data['High'].to_numpy(dtype=np.float64), data['Low'].to_numpy(dtype=np.float64),
+                                     data.index)
+    return data, ledger
+
+def compact_epm_frame(
+    data: pd.DataFrame,
+    dtype: Union[str, np.dtype] = np.float32,
+    intrabar: Optional[IntrabarResolver] = None
+) -> Tuple[pd.DataFrame, TradeLedger]:
+    """
+    긴 기간/많은 심볼을 메모리에 올리기 위한 컴팩트 모드입니다.
+
+    지표는 float64로 계산해 그 배열로 상태 머신을 실행하므로 ``add_trade_signals``와 같은 이벤트를 내고,
+    DataFrame에는 지표 컬럼을 처음부터 dtype(기본값: float32)으로만 담습니다 (float64 지표 컬럼을 만든 뒤
+    변환하는 복사가 없음). OHLCV는 손절/익절 가격 비교에 쓰이므로 그대로 둡니다.
+    1분 봉 기준 봉당 약 120바이트(dense)가 약 65바이트가 됩니다.
+
+    :param data: OHLCV 데이터
+    :param dtype: 지표 컬럼 dtype
+    :param intrabar: ``add_trade_signals``와 같음
+    :return: OHLCV, 지표, Event 컬럼을 가진 데이터, 거래 장부
+    """
+    pipeline = IndicatorPipeline(epm_indicators(), cache=None)
+    values = pipeline.compute(data)
+    return add_trade_events(pipeline.to_frame(data, values, dtype), intrabar, values)
+
+
+def create_chart(
+    data: pd.DataFrame,
+    max_points: int = DEFAULT_MAX_POINTS,
+    ledger: Optional[TradeLedger] = None
+) -> 'go.Figure':
+    """
+    캔들스틱, EMA200, Parabolic SAR, 매매 신호와 MACD 서브플롯을 가진 차트를 생성합니다.
+
+    :param data: 지표와 신호 컬럼(또는 컴팩트 모드의 Event 컬럼)이 추가된 데이터
+    :param max_points: 트레이스당 최대 점 수 (기본값: 2000)
+    :param ledger: 컴팩트 모드의 거래 장부 (주어지면 마커를 장부에서 그림)
+    :return: Plotly Figure 객체
+    """
+    return fast_chart.create_chart(data, 'Bitcoin 1-hour Candlestick Chart with Long and Short Signals',
+                                   max_points=max_points,
+                                   trades=ledger.signal_rows(data) if ledger is not None else None)
 
 def main() -> None:
-    end_date = datetime.now()
+    end_date = datetime.now(timezone.utc)
     start_date = end_date - timedelta(days=30)  # 30일 데이터
 
     btc_data = get_bitcoin_data(start_date, end_date)
-    btc_data = add_ema_to_dataframe(btc_data, period=200, ema_column_name='EMA200')
-    btc_data = add_macd_to_dataframe(btc_data)
-    btc_data = add_parabolic_sar_to_dataframe(btc_data)
+    btc_data = IndicatorPipeline(epm_indicators()).run(btc_data)
     btc_data = add_trade_signals(btc_data)
 
     fig = create_chart(btc_data)
-    fig.write_html("bitcoin_chart_with_signals.html")
+    write_chart(fig, "bitcoin_chart_with_signals.html")
     print("Chart saved as 'bitcoin_chart_with_signals.html'")
     fig.show()
 
@@ -1,3 +1,8 @@
+import pandas as pd
+
+from technical_indicators.rolling import stochastic_rsi_arrays
+
+
 def cal_rsi(data, rsi_length=14):
     delta = data['Close'].diff(1)
     up = delta.where(delta > 0, 0)
@@ -14,12 +19,6 @@ def cal_rsi(data, rsi_length=14):
 
 #     return k,d
 def stochastic_rsi(rsi, k_period=3, d_period=3, stoch_length=14):
-    min_val = rsi.rolling(window=stoch_length).min()
-    max_val = rsi.rolling(window=stoch_length).max()
-    stoch_rsi = ((rsi - min_val) / (max_val - min_val)) * 100
-    
-    k = stoch_rsi.rolling(window=k_period).mean()
-    d = k.rolling(window=d_period).mean()
-    
-    return k, d
-
+    # rolling min/max/mean과 같은 값을 단조 덱/누적 합 커널로 계산 (technical_indicators.rolling)
+    k, d = stochastic_rsi_arrays(rsi.to_numpy(dtype=float), k_period, d_period, stoch_length)
+    return pd.Series(k, index=rsi.index), pd.Series(d, index=rsi.index)
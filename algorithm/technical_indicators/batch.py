@@ -0,0 +1,189 @@
+# technical_indicators/batch.py
+
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+from technical_indicators.jit import NUMBA_AVAILABLE, njit
+from technical_indicators.parabolic_sar import _parabolic_sar_kernel
+from technical_indicators.rolling import stochastic_rsi_arrays
+
+# 모든 함수는 (심볼 수, 시간) 모양의 2차원 배열을 받아 같은 모양의 배열을 반환합니다.
+# 심볼마다 데이터 시작 시점이 다르면 앞부분을 NaN으로 채워 넘기면 됩니다. 각 행은 첫 유효 값에서
+# 시작한 것처럼 계산되어, 앞의 NaN을 잘라 낸 심볼별 계산과 같은 값을 내고 채운 구간은 NaN입니다.
+
+
+def _by_time(values: np.ndarray) -> pd.DataFrame:
+    # pandas의 window/ewm 연산은 컬럼별 C 루프로 돌기 때문에 (시간, 심볼)로 뒤집어 한 번에 계산
+    return pd.DataFrame(np.asarray(values, dtype=np.float64).T, copy=False)
+
+def _to_symbols(frame: pd.DataFrame) -> np.ndarray:
+    return np.ascontiguousarray(frame.to_numpy().T)
+
+def _first_valid(valid: np.ndarray) -> np.ndarray:
+    # 행마다 첫 유효 값의 위치 (유효 값이 없으면 길이)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), valid.shape[1])
+
+
+def ema_2d(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    여러 심볼의 EMA를 한 번에 계산합니다. 심볼별 ``calculate_ema``와 같은 값을 냅니다.
+
+    :param close: (심볼, 시간) 종가 배열
+    :param period: EMA 기간
+    :return: (심볼, 시간) EMA 배열
+    """
+    return _to_symbols(_by_time(close).ewm(span=period, adjust=False).mean())
+
+def macd_2d(
+    close: np.ndarray,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    여러 심볼의 MACD를 한 번에 계산합니다. 심볼별 ``calculate_macd``와 같은 값을 냅니다.
+
+    :param close: (심볼, 시간) 종가 배열
+    :return: MACD 라인, 시그널 라인, MACD 히스토그램 (각각 (심볼, 시간))
+    """
+    frame = _by_time(close)
+    macd_line = frame.ewm(span=fast_period, adjust=False).mean() - frame.ewm(span=slow_period, adjust=False).mean()
+    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    return _to_symbols(macd_line), _to_symbols(signal_line), _to_symbols(macd_line - signal_line)
+
+def rsi_2d(close: np.ndarray, rsi_length: int = 14) -> np.ndarray:
+    """
+    여러 심볼의 RSI를 한 번에 계산합니다. 심볼별 ``cal_rsi``와 같은 값을 냅니다.
+
+    :param close: (심볼, 시간) 종가 배열
+    :param rsi_length: RSI 기간 (기본값: 14)
+    :return: (심볼, 시간) RSI 배열
+    """
+    frame = _by_time(close)
+    delta = frame.diff(1)
+    # 앞에 채운 NaN은 관측이 아니므로 0이 아니라 NaN으로 남김 (첫 유효 봉의 diff는 cal_rsi와 같이 0)
+    started = frame.notna().cummax()
+    up = delta.where(delta > 0, 0).where(started)
+    down = -delta.where(delta < 0, 0).where(started)
+
+    avg_gain = up.ewm(com=rsi_length-1, min_periods=rsi_length).mean()
+    avg_loss = down.ewm(com=rsi_length-1, min_periods=rsi_length).mean()
+
+    rs = avg_gain / avg_loss
+    return _to_symbols(100.0 - (100.0 / (1.0 + rs)))
+
+def stochastic_rsi_2d(
+    rsi: np.ndarray,
+    k_period: int = 3,
+    d_period: int = 3,
+    stoch_length: int = 14
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 심볼의 Stochastic RSI를 한 번에 계산합니다. 심볼별 ``stochastic_rsi``와 같은 값을 냅니다.
+
+    :param rsi: (심볼, 시간) RSI 배열
+    :return: %K, %D (각각 (심볼, 시간))
+    """
+    return stochastic_rsi_arrays(np.atleast_2d(rsi), k_period, d_period, stoch_length)
+
+def heikin_ashi_2d(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    여러 심볼의 하이킨 아시 캔들을 한 번에 계산합니다.
+
+    HA 시가는 ``(이전 HA 시가 + 이전 HA 종가) / 2``의 재귀식 그대로 계산하며, 반올림은 하지 않습니다.
+    이 재귀식은 alpha=0.5인 EWM과 같으므로 시간 축 방향 한 번의 ewm으로 계산합니다.
+    (0.5를 곱하는 연산은 오차가 없어 ``(a + b) / 2``와 비트 단위로 같습니다.)
+
+    :return: HA 시가, 고가, 저가, 종가 (각각 (심볼, 시간))
+    """
+    open_, high, low, close = (np.asarray(x, dtype=np.float64) for x in (open_, high, low, close))
+    ha_close = (open_ + high + low + close) / 4
+
+    seed = np.empty_like(ha_close)
+    seed[:, 1:] = ha_close[:, :-1]
+    # 행마다 첫 유효 봉에서 (시가 + 종가) / 2로 시작
+    rows = np.arange(len(seed))
+    starts = _first_valid(~np.isnan(ha_close))
+    seed[rows, 0] = np.nan
+    has_data = starts < seed.shape[1]
+    first = starts[has_data]
+    seed[rows[has_data], first] = (open_[rows[has_data], first] + close[rows[has_data], first]) / 2
+    ha_open = _to_symbols(_by_time(seed).ewm(alpha=0.5, adjust=False).mean())
+
+    ha_high = np.maximum(np.maximum(ha_open, ha_close), high)
+    ha_low = np.minimum(np.minimum(ha_open, ha_close), low)
+    return ha_open, ha_high, ha_low, ha_close
+
+
+@njit(cache=True)
+def _parabolic_sar_rows(high, low, step, max_step, sar, ep, af, trend, starts) -> None:
+    for row in range(high.shape[0]):
+        s = starts[row]
+        _parabolic_sar_kernel(high[row, s:], low[row, s:], step, max_step,
+                              sar[row, s:], ep[row, s:], af[row, s:], trend[row, s:])
+
+def _parabolic_sar_lockstep(high, low, step, max_step, sar, ep, af, trend, starts) -> None:
+    # 봉마다 모든 심볼을 벡터 연산으로 한 칸씩 전진 (_sar_step과 같은 비교 순서)
+    # 각 행은 첫 유효 봉부터 두 봉이 지나야 전진하며, 그 전에는 초기값(저가/고가)을 유지
+    for i in range(2, high.shape[1]):
+        prev_sar, prev_ep, prev_af, prev_trend = sar[:, i-1], ep[:, i-1], af[:, i-1], trend[:, i-1]
+        h0, l0 = high[:, i], low[:, i]
+        h1, l1, h2, l2 = high[:, i-1], low[:, i-1], high[:, i-2], low[:, i-2]
+        up = prev_trend > 0
+
+        s = prev_sar + prev_af * (prev_ep - prev_sar)
+        clamp_up = up & (l0 > s)
+        s = np.where(clamp_up & (l1 < s), l1, s)
+        s = np.where(clamp_up & (l2 < s), l2, s)
+        clamp_down = ~up & (h0 < s)
+        s = np.where(clamp_down & (h1 > s), h1, s)
+        s = np.where(clamp_down & (h2 > s), h2, s)
+
+        extend = np.where(up, h0 > prev_ep, l0 < prev_ep)
+        e = np.where(extend, np.where(up, h0, l0), prev_ep)
+        a = prev_af + step
+        a = np.where(extend, np.where(max_step < a, max_step, a), prev_af)
+
+        flip = np.where(up, s > l0, s < h0)
+        active = starts + 2 <= i
+        trend[:, i] = np.where(active, np.where(flip, np.where(up, -1, 1), prev_trend), trend[:, i])
+        sar[:, i] = np.where(active, np.where(flip, e, s), sar[:, i])
+        ep[:, i] = np.where(active, np.where(flip, np.where(up, l0, h0), e), ep[:, i])
+        af[:, i] = np.where(active, np.where(flip, step, a), af[:, i])
+
+def parabolic_sar_2d(
+    high: np.ndarray,
+    low: np.ndarray,
+    step: float = 0.02,
+    max_step: float = 0.2
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    여러 심볼의 Parabolic SAR를 계산합니다. 심볼별 ``parabolic_sar_arrays``와 비트 단위로 같은 값을 냅니다.
+
+    numba가 있으면 심볼마다 컴파일된 커널을 돌리고, 없으면 봉마다 모든 심볼을 벡터 연산으로 함께 전진시킵니다.
+
+    :param high: (심볼, 시간) 고가 배열
+    :param low: (심볼, 시간) 저가 배열
+    :return: SAR, 가속 인자(AF), 극점(EP), 추세 (각각 (심볼, 시간), 앞에 채운 구간의 추세는 0)
+    """
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+
+    sar = low.copy()
+    ep = high.copy()
+    af = np.full(high.shape, step, dtype=np.float64)
+    trend = np.ones(high.shape, dtype=np.int64)
+
+    starts = _first_valid(~np.isnan(high) & ~np.isnan(low))
+    kernel = _parabolic_sar_rows if NUMBA_AVAILABLE else _parabolic_sar_lockstep
+    kernel(high, low, float(step), float(max_step), sar, ep, af, trend, starts)
+    padded = np.arange(high.shape[1]) < starts[:, None]
+    af[padded] = np.nan
+    trend[padded] = 0
+    return sar, af, ep, trend
@@ -0,0 +1,50 @@
+# technical_indicators/jit.py
+
+import numpy as np
+from typing import Any, Callable, List, Union
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba가 없으면 순수 Python 커널로 동작
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args: Any, **kwargs: Any) -> Callable:
+    """
+    numba가 설치되어 있으면 ``numba.njit``을, 없으면 함수를 그대로 돌려주는 데코레이터입니다.
+
+    ``@njit`` 과 ``@njit(cache=True)`` 두 가지 형태를 모두 지원합니다.
+    """
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
+
+
+def to_kernel(values: np.ndarray) -> Union[np.ndarray, List]:
+    """
+    커널에 넘길 입력을 준비합니다.
+
+    컴파일된 커널에는 ndarray를 그대로 넘기고, 순수 Python 커널에는 스칼라 접근이
+    훨씬 빠른 list로 변환해서 넘깁니다.
+
+    :param values: 1차원 배열
+    :return: 커널 입력
+    """
+    if NUMBA_AVAILABLE:
+        return values
+    return values.tolist()
+
+
+def from_kernel(values: Union[np.ndarray, List], dtype: Any) -> np.ndarray:
+    """
+    커널이 채운 출력 버퍼를 ndarray로 변환합니다.
+
+    :param values: 커널 출력 (ndarray 또는 list)
+    :param dtype: 결과 dtype
+    :return: 결과 배열
+    """
+    return np.asarray(values, dtype=dtype)
@@ -0,0 +1,62 @@
+# technical_indicators/latch.py
+
+import numpy as np
+
+# 봉마다 다음 규칙으로 켜지고 꺼지는 상태(set/reset 래치)를 Python 루프 없이 계산합니다.
+#
+#   state[i] = not reset[i]  (이전 상태가 켜져 있으면)
+#   state[i] = set[i]        (이전 상태가 꺼져 있으면)
+#
+# 봉 하나만 보면 결과는 네 가지 중 하나입니다.
+#   set만 참    -> 켜짐 (이전 상태와 무관)
+#   reset만 참  -> 꺼짐 (이전 상태와 무관)
+#   둘 다 거짓  -> 이전 상태 유지
+#   둘 다 참    -> 이전 상태 반전
+# 그래서 마지막으로 상태를 강제한 봉의 값을 앞으로 채우고, 그 뒤 반전 횟수의 홀짝을 누적 합으로 더하면 됩니다.
+
+
+def latch(set_: np.ndarray, reset: np.ndarray, initial: bool = False) -> np.ndarray:
+    """
+    set 조건에 켜지고 reset 조건에 꺼지는 상태를 계산합니다.
+
+    마지막 축을 시간 축으로 보므로 (시간,) 배열 하나나 (심볼, 시간) 배열 여러 심볼을 한 번에 계산합니다.
+    NaN 비교 결과처럼 거짓인 값은 조건이 성립하지 않은 것으로 봅니다.
+
+    :param set_: 상태를 켜는 조건 (bool 배열)
+    :param reset: 상태를 끄는 조건 (set_과 같은 모양의 bool 배열)
+    :param initial: 첫 봉 이전의 상태 (기본값: False)
+    :return: 봉마다 상태 (bool 배열, 입력과 같은 모양)
+    """
+    set_ = np.asarray(set_, dtype=bool)
+    reset = np.asarray(reset, dtype=bool)
+    set_, reset = np.broadcast_arrays(set_, reset)
+    if set_.shape[-1] == 0:
+        return np.zeros(set_.shape, dtype=bool)
+
+    forced = set_ ^ reset
+    toggle = set_ & reset
+
+    # 마지막으로 상태를 강제한 봉 위치 (-1이면 아직 없음)
+    positions = np.broadcast_to(np.arange(set_.shape[-1]), set_.shape)
+    last = np.maximum.accumulate(np.where(forced, positions, -1), axis=-1)
+    safe_last = np.maximum(last, 0)
+    base = np.where(last >= 0, np.take_along_axis(set_, safe_last, axis=-1), initial)
+
+    # 강제한 봉 이후의 반전 횟수 (강제한 봉 자체는 반전이 아니므로 그 봉까지의 누적 합을 빼면 됨)
+    toggles = np.cumsum(toggle, axis=-1, dtype=np.int64)
+    since = toggles - np.where(last >= 0, np.take_along_axis(toggles, safe_last, axis=-1), 0)
+    return base ^ (since & 1).astype(bool)
+
+def crossed_above(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    a가 b를 위로 뚫은 봉 (이전 봉 a < b, 현재 봉 a > b)을 찾습니다.
+
+    :param a: 시계열 (마지막 축이 시간)
+    :param b: 시계열 (a와 같은 모양 또는 스칼라)
+    :return: bool 배열 (첫 봉은 False)
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.broadcast_to(np.asarray(b, dtype=np.float64), a.shape)
+    result = np.zeros(a.shape, dtype=bool)
+    result[..., 1:] = (a[..., :-1] < b[..., :-1]) & (a[..., 1:] > b[..., 1:])
+    return result
@@ -4,6 +4,138 @@ import pandas as pd
 import numpy as np
 from typing import Tuple
 
+from technical_indicators.jit import njit, to_kernel, from_kernel
+
+
+@njit(cache=True)
+def _sar_step(
+    trend: int, sar: float, ep: float, af: float,
+    high: float, low: float,
+    high1: float, low1: float, high2: float, low2: float,
+    step: float, max_step: float
+) -> Tuple[int, float, float, float]:
+    """
+    직전 봉의 SAR 상태(trend, sar, ep, af)에서 한 봉만큼 전진한 상태를 계산합니다.
+
+    high1/low1은 직전 봉, high2/low2는 그 이전 봉의 고가/저가입니다.
+    min/max는 Python 내장 함수와 같은 비교 순서로 풀어 써서 결과가 비트 단위로 같습니다.
+    """
+    new_sar = sar + af * (ep - sar)
+
+    if trend > 0:
+        if low > new_sar:
+            if low1 < new_sar:
+                new_sar = low1
+            if low2 < new_sar:
+                new_sar = low2
+        if high > ep:
+            new_ep = high
+            new_af = af + step
+            if max_step < new_af:
+                new_af = max_step
+        else:
+            new_ep = ep
+            new_af = af
+        if new_sar > low:
+            trend = -1
+            new_sar = new_ep
+            new_ep = low
+            new_af = step
+    else:
+        if high < new_sar:
+            if high1 > new_sar:
+                new_sar = high1
+            if high2 > new_sar:
+                new_sar = high2
+        if low < ep:
+            new_ep = low
+            new_af = af + step
+            if max_step < new_af:
+                new_af = max_step
+        else:
+            new_ep = ep
+            new_af = af
+        if new_sar < high:
+            trend = 1
+            new_sar = new_ep
+            new_ep = high
+            new_af = step
+
+    return trend, new_sar, new_ep, new_af
+
+
+@njit(cache=True)
+def _parabolic_sar_kernel(high, low, step, max_step, sar, ep, af, trend) -> None:
+    """
+    미리 초기화된 sar/ep/af/trend 버퍼를 인덱스 2부터 채웁니다.
+    """
+    for i in range(2, len(high)):
+        trend[i], sar[i], ep[i], af[i] = _sar_step(
+            trend[i-1], sar[i-1], ep[i-1], af[i-1],
+            high[i], low[i], high[i-1], low[i-1], high[i-2], low[i-2],
+            step, max_step
+        )
+
+
+def parabolic_sar_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    step: float = 0.02,
+    max_step: float = 0.2
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NumPy 배열 위에서 Parabolic SAR를 계산합니다.
+
+    numba가 있으면 컴파일된 커널을, 없으면 순수 Python 커널을 사용합니다.
+
+    :param high: 고가 배열
+    :param low: 저가 배열
+    :param step: SAR 계산에 사용되는 가속 인자의 초기값 (기본값: 0.02)
+    :param max_step: 가속 인자의 최대값 (기본값: 0.2)
+    :return: SAR, 가속 인자(AF), 극점(EP), 추세(1: 상승, -1: 하락) 배열
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    n = len(high)
+
+    sar = to_kernel(low.copy())
+    ep = to_kernel(high.copy())  # Extreme Point
+    af = to_kernel(np.full(n, step, dtype=np.float64))  # Acceleration Factor
+    trend = to_kernel(np.ones(n, dtype=np.int64))  # 1 for uptrend, -1 for downtrend
+
+    _parabolic_sar_kernel(to_kernel(high), to_kernel(low), float(step), float(max_step), sar, ep, af, trend)
+
+    return (
+        from_kernel(sar, np.float64),
+        from_kernel(af, np.float64),
+        from_kernel(ep, np.float64),
+        from_kernel(trend, np.int64),
+    )
+
+def calculate_parabolic_sar_components(
+    data: pd.DataFrame,
+    step: float = 0.02,
+    max_step: float = 0.2
+) -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
+    """
+    Parabolic SAR와 함께 내부 상태(가속 인자, 극점, 추세)를 계산합니다.
+
+    :param data: 시계열 데이터 (High, Low 컬럼 필요)
+    :param step: SAR 계산에 사용되는 가속 인자의 초기값 (기본값: 0.02)
+    :param max_step: 가속 인자의 최대값 (기본값: 0.2)
+    :return: SAR, 가속 인자(AF), 극점(EP), 추세 Series
+    """
+    high, low = data['High'], data['Low']
+    sar, af, ep, trend = parabolic_sar_arrays(high.to_numpy(), low.to_numpy(), step, max_step)
+
+    index = high.index
+    return (
+        pd.Series(sar, index=index, name=low.name),
+        pd.Series(af, index=index),
+        pd.Series(ep, index=index, name=high.name),
+        pd.Series(trend, index=index),
+    )
+
 def calculate_parabolic_sar(data: pd.DataFrame, step: float = 0.02, max_step: float = 0.2) -> pd.Series:
     """
     Parabolic SAR (Stop And Reverse)를 계산합니다.
@@ -13,47 +145,7 @@ def calculate_parabolic_sar(data: pd.DataFrame, step: float = 0.02, max_step: fl
     :param max_step: 가속 인자의 최대값 (기본값: 0.2)
     :return: Parabolic SAR 값
     """
-    high, low = data['High'], data['Low']
-    
-    sar = low.copy()
-    ep = high.copy()  # Extreme Point
-    af = pd.Series(step, index=high.index)  # Acceleration Factor
-    trend = pd.Series(1, index=high.index)  # 1 for uptrend, -1 for downtrend
-    
-    for i in range(2, len(data)):
-        trend.iloc[i] = trend.iloc[i-1]
-        sar.iloc[i] = sar.iloc[i-1] + af.iloc[i-1] * (ep.iloc[i-1] - sar.iloc[i-1])
-        
-        if trend.iloc[i] > 0:
-            if low.iloc[i] > sar.iloc[i]:
-                sar.iloc[i] = min(sar.iloc[i], low.iloc[i-1], low.iloc[i-2])
-            if high.iloc[i] > ep.iloc[i-1]:
-                ep.iloc[i] = high.iloc[i]
-                af.iloc[i] = min(af.iloc[i-1] + step, max_step)
-            else:
-                ep.iloc[i] = ep.iloc[i-1]
-                af.iloc[i] = af.iloc[i-1]
-            if sar.iloc[i] > low.iloc[i]:
-                trend.iloc[i] = -1
-                sar.iloc[i] = ep.iloc[i]
-                ep.iloc[i] = low.iloc[i]
-                af.iloc[i] = step
-        else:
-            if high.iloc[i] < sar.iloc[i]:
-                sar.iloc[i] = max(sar.iloc[i], high.iloc[i-1], high.iloc[i-2])
-            if low.iloc[i] < ep.iloc[i-1]:
-                ep.iloc[i] = low.iloc[i]
-                af.iloc[i] = min(af.iloc[i-1] + step, max_step)
-            else:
-                ep.iloc[i] = ep.iloc[i-1]
-                af.iloc[i] = af.iloc[i-1]
-            if sar.iloc[i] < high.iloc[i]:
-                trend.iloc[i] = 1
-                sar.iloc[i] = ep.iloc[i]
-                ep.iloc[i] = high.iloc[i]
-                af.iloc[i] = step
-    
-    return sar
+    return calculate_parabolic_sar_components(data, step, max_step)[0]
 
 def add_parabolic_sar_to_dataframe(data: pd.DataFrame, step: float = 0.02, max_step: float = 0.2) -> pd.DataFrame:
     """
@@ -65,4 +157,4 @@ def add_parabolic_sar_to_dataframe(data: pd.DataFrame, step: float = 0.02, max_s
     :return: Parabolic SAR 열이 추가된 데이터
     """
     data['ParabolicSAR'] = calculate_parabolic_sar(data, step, max_step)
-    return data
\ No newline at end of file
+    return data
@@ -0,0 +1,343 @@
+# technical_indicators/pipeline.py
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from instrumentation.latency import span
+from technical_indicators.parabolic_sar import parabolic_sar_arrays
+from technical_indicators.rolling import rolling_mean, stochastic
+
+Array = np.ndarray
+
+
+class Node:
+    """
+    지표 계산 그래프의 노드입니다.
+
+    ``key``는 노드의 종류와 파라미터, 입력 노드의 key로 이루어져 있어
+    같은 계산(예: ``EWM(Close, span=26)``)은 어느 지표에서 선언하든 같은 key를 갖습니다.
+    """
+    __slots__ = ('inputs', 'key')
+
+    def __init__(self, key: Tuple[Hashable, ...], *inputs: 'Node'):
+        self.inputs = inputs
+        self.key = key + tuple(node.key for node in inputs)
+
+    def compute(self, *values: Array) -> Union[Array, Tuple[Array, ...]]:
+        raise NotImplementedError
+
+    def __getitem__(self, index: int) -> 'Node':
+        return Select(self, index)
+
+    def __sub__(self, other: 'Node') -> 'Node':
+        return Transform('sub', np.subtract, self, other)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}{self.key}'
+
+
+class Column(Node):
+    """
+    입력 DataFrame의 컬럼입니다.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(('column', name))
+
+
+class EWM(Node):
+    """
+    ``pandas.Series.ewm(...).mean()``입니다.
+    """
+    __slots__ = ('params',)
+
+    def __init__(self, source: Node, span: Optional[float] = None, com: Optional[float] = None,
+                 adjust: bool = False, min_periods: int = 0):
+        if span is not None:
+            com = (span - 1) / 2.
+        self.params = dict(com=com, adjust=adjust, min_periods=min_periods)
+        super().__init__(('ewm', com, adjust, min_periods), source)
+
+    def compute(self, values: Array) -> Array:
+        return pd.Series(values).ewm(**self.params).mean().to_numpy()
+
+
+class Transform(Node):
+    """
+    입력 배열에 함수를 적용하는 노드입니다. name과 params가 같으면 같은 계산으로 취급합니다.
+    """
+    __slots__ = ('func', 'params')
+
+    def __init__(self, name: str, func: Callable[..., Any], *inputs: Node, **params: Hashable):
+        self.func = func
+        self.params = params
+        super().__init__((name, tuple(sorted(params.items()))), *inputs)
+
+    def compute(self, *values: Array) -> Union[Array, Tuple[Array, ...]]:
+        return self.func(*values, **self.params)
+
+
+class Select(Node):
+    """
+    여러 출력을 내는 노드에서 하나를 고릅니다.
+    """
+    __slots__ = ('index',)
+
+    def __init__(self, source: Node, index: int):
+        self.index = index
+        super().__init__(('select', index), source)
+
+    def compute(self, values: Tuple[Array, ...]) -> Array:
+        return values[self.index]
+
+
+# --- 지표 정의 ----------------------------------------------------------------------
+
+def ema(period: int, column: str = 'Close') -> Node:
+    """
+    ``calculate_ema``와 같은 EMA 노드를 만듭니다.
+    """
+    return EWM(Column(column), span=period)
+
+def macd(fast_period: int = 12, slow_period: int = 26, signal_period: int = 9, column: str = 'Close') -> Dict[str, Node]:
+    """
+    ``add_macd_to_dataframe``과 같은 이름의 MACD 노드들을 만듭니다. 빠른/느린 EMA는 ``ema`` 노드와 공유됩니다.
+    """
+    macd_line = ema(fast_period, column) - ema(slow_period, column)
+    signal_line = EWM(macd_line, span=signal_period)
+    return {'MACD': macd_line, 'Signal': signal_line, 'MACD_Histogram': macd_line - signal_line}
+
+def parabolic_sar(step: float = 0.02, max_step: float = 0.2) -> Node:
+    """
+    ``calculate_parabolic_sar``와 같은 SAR 노드를 만듭니다.
+    """
+    return Transform('parabolic_sar', parabolic_sar_arrays, Column('High'), Column('Low'), step=step, max_step=max_step)[0]
+
+
+def _gain(delta: Array) -> Array:
+    return np.where(delta > 0, delta, 0.)
+
+def _loss(delta: Array) -> Array:
+    return -np.where(delta < 0, delta, 0.)
+
+def _rsi(avg_gain: Array, avg_loss: Array) -> Array:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return 100.0 - (100.0 / (1.0 + rs))
+
+def rsi(rsi_length: int = 14, column: str = 'Close') -> Node:
+    """
+    ``cal_rsi``와 같은 RSI 노드를 만듭니다.
+    """
+    delta = Transform('diff', lambda values: pd.Series(values).diff(1).to_numpy(), Column(column))
+    avg_gain = EWM(Transform('gain', _gain, delta), com=rsi_length - 1, adjust=True, min_periods=rsi_length)
+    avg_loss = EWM(Transform('loss', _loss, delta), com=rsi_length - 1, adjust=True, min_periods=rsi_length)
+    return Transform('rsi', _rsi, avg_gain, avg_loss)
+
+
+def _stoch(values: Array, window: int) -> Array:
+    return stochastic(values, window)
+
+def _rolling_mean(values: Array, window: int) -> Array:
+    return rolling_mean(values, window)
+
+def stoch_rsi(k_period: int = 3, d_period: int = 3, stoch_length: int = 14, rsi_length: int = 14) -> Dict[str, Node]:
+    """
+    ``stochastic_rsi(cal_rsi(data))``와 같은 %K, %D 노드를 만듭니다.
+    """
+    k = Transform('rolling_mean', _rolling_mean, Transform('stoch', _stoch, rsi(rsi_length), window=stoch_length),
+                  window=k_period)
+    d = Transform('rolling_mean', _rolling_mean, k, window=d_period)
+    return {'K': k, 'D': d}
+
+
+def _heikin_ashi(open_: Array, high: Array, low: Array, close: Array) -> Tuple[Array, ...]:
+    from heikin_ashi import heikin_ashi_arrays
+
+    return heikin_ashi_arrays(open_, high, low, close)
+
+def heikin_ashi(prefix: str = 'HA_') -> Dict[str, Node]:
+    """
+    ``heikin_ashi``와 같은 하이킨 아시 시가/고가/저가/종가 노드를 만듭니다.
+    """
+    node = Transform('heikin_ashi', _heikin_ashi, Column('Open'), Column('High'), Column('Low'), Column('Close'))
+    return {f'{prefix}{name}': node[i] for i, name in enumerate(('Open', 'High', 'Low', 'Close'))}
+
+
+# --- 실행 ---------------------------------------------------------------------------
+
+class IndicatorCache:
+    """
+    (입력 데이터 지문, 노드 key)로 계산 결과를 저장하는 LRU 캐시입니다.
+
+    결과 수와 결과 배열의 총 바이트 수를 함께 제한하므로, 수백만 봉의 이력을 여러 번 계산해도
+    캐시가 붙잡는 메모리는 max_bytes를 넘지 않습니다. max_bytes보다 큰 결과 하나는 캐시하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int = 256, max_bytes: int = 256 * 2**20):
+        """
+        :param maxsize: 보관할 최대 결과 수 (기본값: 256)
+        :param max_bytes: 보관할 결과 배열의 최대 총 바이트 (기본값: 256 MiB)
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = _nbytes(value)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while len(self._entries) > self.maxsize or self.nbytes > self.max_bytes:
+            self.nbytes -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    return getattr(value, 'nbytes', 0)
+
+DEFAULT_CACHE = IndicatorCache()
+
+
+def fingerprint(values: Array) -> str:
+    """
+    배열 내용의 지문을 계산합니다.
+    """
+    values = np.ascontiguousarray(values)
+    return hashlib.blake2b(values.view(np.uint8), digest_size=16).hexdigest() + str(values.dtype)
+
+
+class IndicatorPipeline:
+    """
+    선언된 지표들을 의존성 그래프로 계산해 하나의 넓은 DataFrame으로 반환합니다.
+
+    여러 지표가 공유하는 중간 계산(예: MACD와 EMA의 ``EWM(Close, span=26)``)은 한 번만 계산되고,
+    결과는 (입력 컬럼 지문, 노드 key)로 캐시되어 같은 데이터로 다시 실행하면 재사용됩니다.
+    """
+
+    def __init__(self, indicators: Optional[Dict[str, Node]] = None, cache: Optional[IndicatorCache] = DEFAULT_CACHE):
+        """
+        :param indicators: 출력 컬럼 이름 -> 노드
+        :param cache: 결과 캐시 (None이면 실행 안에서만 공유)
+        """
+        self.indicators: Dict[str, Node] = dict(indicators or {})
+        self.cache = cache
+
+    def add(self, name: str, node: Node) -> 'IndicatorPipeline':
+        self.indicators[name] = node
+        return self
+
+    def update(self, indicators: Dict[str, Node]) -> 'IndicatorPipeline':
+        self.indicators.update(indicators)
+        return self
+
+    def compute(self, data: pd.DataFrame) -> Dict[str, Array]:
+        """
+        모든 지표를 계산합니다.
+
+        :param data: 시계열 데이터
+        :return: 출력 컬럼 이름 -> 배열
+        """
+        resolved: Dict[Hashable, Any] = {}  # 노드 key -> 지문이 반영된 key
+        results: Dict[Hashable, Any] = {}   # 노드 key -> 결과 (이번 실행 안의 메모)
+
+        def evaluate(node: Node) -> Any:
+            if node.key in results:
+                return results[node.key]
+            if isinstance(node, Column):
+                value = data[node.name].to_numpy(dtype=np.float64)
+                resolved[node.key] = ('column', fingerprint(value))
+            else:
+                inputs = [evaluate(child) for child in node.inputs]
+                resolved[node.key] = node.key[:len(node.key) - len(node.inputs)] + tuple(
+                    resolved[child.key] for child in node.inputs
+                )
+                value = self.cache.get(resolved[node.key]) if self.cache is not None else None
+                if value is None:
+                    with span(f'indicator.{node.key[0]}'):
+                        value = node.compute(*inputs)
+                    if self.cache is not None:
+                        self.cache.put(resolved[node.key], value)
+            results[node.key] = value
+            return value
+
+        return {name: evaluate(node) for name, node in self.indicators.items()}
+
+    def run(self, data: pd.DataFrame, dtype: Optional[Union[str, np.dtype]] = None) -> pd.DataFrame:
+        """
+        지표를 계산해 원본 컬럼 옆에 한 번에 붙인 새 DataFrame을 반환합니다.
+
+        ``data[col] = ...``을 반복하지 않으므로 블록이 조각나지 않습니다.
+
+        :param data: 시계열 데이터
+        :param dtype: 지표 컬럼의 저장 dtype (예: np.float32, 기본값: None, 계산 결과 그대로).
+                      계산은 항상 float64로 하고 저장할 때만 바꿉니다.
+        :return: 원본 컬럼과 지표 컬럼을 가진 DataFrame
+        """
+        return self.to_frame(data, self.compute(data), dtype)
+
+    def to_frame(
+        self,
+        data: pd.DataFrame,
+        values: Dict[str, Array],
+        dtype: Optional[Union[str, np.dtype]] = None
+    ) -> pd.DataFrame:
+        """
+        ``compute``의 결과를 원본 컬럼 옆에 붙입니다. float64 결과를 다른 계산에 쓰면서 저장만 작게 할 때 씁니다.
+
+        :param data: 시계열 데이터
+        :param values: ``compute``의 결과
+        :param dtype: 지표 컬럼의 저장 dtype (기본값: None, 계산 결과 그대로)
+        :return: 원본 컬럼과 지표 컬럼을 가진 DataFrame
+        """
+        if dtype is not None:
+            values = {name: value.astype(dtype, copy=False) for name, value in values.items()}
+        outputs = pd.DataFrame(values, index=data.index)
+        return pd.concat([data.drop(columns=outputs.columns, errors='ignore'), outputs], axis=1)
+
+
+def epm_indicators(
+    ema_period: int = 200,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9,
+    step: float = 0.02,
+    max_step: float = 0.2
+) -> Dict[str, Node]:
+    """
+    ``research_epm_long``이 쓰는 EMA200, MACD, Parabolic SAR 컬럼 정의입니다.
+    """
+    return {
+        'EMA200': ema(ema_period),
+        **macd(fast_period, slow_period, signal_period),
+        'ParabolicSAR': parabolic_sar(step, max_step),
+    }
@@ -0,0 +1,169 @@
+# technical_indicators/rolling.py
+
+import math
+import numpy as np
+from typing import Tuple
+
+from technical_indicators.jit import njit, to_kernel, from_kernel
+
+# pandas의 ``rolling(window).min()/max()/mean()``(min_periods=window)과 같은 값을 내는 이동 구간 연산입니다.
+#
+# - 최솟값/최댓값: 단조 덱으로 봉마다 O(1) (분할 상환). 구간에 NaN이 있으면 NaN
+# - 평균: pandas와 같은 순서의 Kahan 보정 누적 합. 구간에 NaN이 있으면 NaN
+#
+# 배치 함수는 njit 커널로 배열 전체를, 스트리밍 상태(``streaming.py``)는 같은 단계 함수로 봉 하나씩 계산하므로
+# 두 경로의 결과가 pandas와 비트 단위로 같습니다.
+
+
+@njit(cache=True)
+def _mean_add(value, nobs, sum_x, neg_ct, compensation, same_count, prev_value):
+    # pandas add_mean: NaN은 건너뛰고, 같은 값이 연속되면 그 값을 평균으로 쓰기 위해 연속 횟수를 셈
+    if value == value:
+        nobs += 1
+        y = value - compensation
+        t = sum_x + y
+        compensation = t - sum_x - y
+        sum_x = t
+        if math.copysign(1., value) < 0:
+            neg_ct += 1
+        if value == prev_value:
+            same_count += 1
+        else:
+            same_count = 1
+        prev_value = value
+    return nobs, sum_x, neg_ct, compensation, same_count, prev_value
+
+@njit(cache=True)
+def _mean_remove(value, nobs, sum_x, neg_ct, compensation):
+    # pandas remove_mean: 빼는 값은 더하는 값과 별도의 보정 항을 씀
+    if value == value:
+        nobs -= 1
+        y = -value - compensation
+        t = sum_x + y
+        compensation = t - sum_x - y
+        sum_x = t
+        if math.copysign(1., value) < 0:
+            neg_ct -= 1
+    return nobs, sum_x, neg_ct, compensation
+
+@njit(cache=True)
+def _mean_value(window, nobs, sum_x, neg_ct, same_count, prev_value):
+    # pandas calc_mean (min_periods=window)
+    if nobs < window or nobs == 0:
+        return np.nan
+    result = sum_x / nobs
+    if same_count >= nobs:
+        return prev_value
+    if neg_ct == 0 and result < 0:
+        return 0.
+    if neg_ct == nobs and result > 0:
+        return 0.
+    return result
+
+
+@njit(cache=True)
+def _rolling_mean_kernel(values, window, out) -> None:
+    nobs = neg_ct = same_count = 0
+    sum_x = comp_add = comp_remove = 0.
+    prev_value = np.nan
+    for i in range(len(values)):
+        if i >= window:
+            nobs, sum_x, neg_ct, comp_remove = _mean_remove(values[i - window], nobs, sum_x, neg_ct, comp_remove)
+        nobs, sum_x, neg_ct, comp_add, same_count, prev_value = _mean_add(
+            values[i], nobs, sum_x, neg_ct, comp_add, same_count, prev_value
+        )
+        out[i] = _mean_value(window, nobs, sum_x, neg_ct, same_count, prev_value)
+
+@njit(cache=True)
+def _rolling_extreme_kernel(values, window, is_max, queue, out) -> None:
+    # queue는 인덱스를 담는 단조 덱 (앞쪽이 구간의 최솟값/최댓값). 각 인덱스는 한 번씩만 들어가므로 길이 n 버퍼로 충분
+    head = tail = 0
+    last_nan = -window
+    for i in range(len(values)):
+        value = values[i]
+        if value != value:
+            last_nan = i
+        else:
+            while tail > head:
+                back = values[queue[tail - 1]]
+                if (back <= value) if is_max else (back >= value):
+                    tail -= 1
+                else:
+                    break
+            queue[tail] = i
+            tail += 1
+        while tail > head and queue[head] <= i - window:
+            head += 1
+        if i < window - 1 or last_nan > i - window or tail == head:
+            out[i] = np.nan
+        else:
+            out[i] = values[queue[head]]
+
+
+def _rolling(values: np.ndarray, window: int, kernel, *args) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim > 1:
+        return np.stack([_rolling(row, window, kernel, *args) for row in values]) if len(values) else values.copy()
+    out = to_kernel(np.empty_like(values))
+    kernel(to_kernel(values), int(window), *args, out)
+    return from_kernel(out, np.float64)
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    이동 구간 최솟값을 계산합니다. ``pd.Series(values).rolling(window).min()``과 같은 값을 냅니다.
+
+    :param values: 1차원 배열 또는 (심볼, 시간) 배열
+    :param window: 구간 길이
+    :return: 입력과 같은 모양의 배열 (구간이 덜 찼거나 NaN이 있으면 NaN)
+    """
+    return _rolling(values, window, _rolling_extreme_kernel, False, to_kernel(np.zeros(np.shape(values)[-1], np.int64)))
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    이동 구간 최댓값을 계산합니다. ``pd.Series(values).rolling(window).max()``와 같은 값을 냅니다.
+
+    :param values: 1차원 배열 또는 (심볼, 시간) 배열
+    :param window: 구간 길이
+    :return: 입력과 같은 모양의 배열 (구간이 덜 찼거나 NaN이 있으면 NaN)
+    """
+    return _rolling(values, window, _rolling_extreme_kernel, True, to_kernel(np.zeros(np.shape(values)[-1], np.int64)))
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    이동 평균을 계산합니다. ``pd.Series(values).rolling(window).mean()``과 비트 단위로 같은 값을 냅니다.
+
+    :param values: 1차원 배열 또는 (심볼, 시간) 배열
+    :param window: 구간 길이
+    :return: 입력과 같은 모양의 배열 (구간이 덜 찼거나 NaN이 있으면 NaN)
+    """
+    return _rolling(values, window, _rolling_mean_kernel)
+
+def stochastic(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    ``(값 - 구간 최솟값) / (구간 최댓값 - 구간 최솟값) * 100``을 계산합니다.
+
+    :param values: 1차원 배열 또는 (심볼, 시간) 배열
+    :param window: 최저/최고 구간 길이
+    :return: 입력과 같은 모양의 배열
+    """
+    values = np.asarray(values, dtype=np.float64)
+    min_val = rolling_min(values, window)
+    max_val = rolling_max(values, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ((values - min_val) / (max_val - min_val)) * 100
+
+def stochastic_rsi_arrays(
+    rsi: np.ndarray,
+    k_period: int = 3,
+    d_period: int = 3,
+    stoch_length: int = 14
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    RSI 배열로 Stochastic RSI %K, %D를 계산합니다. ``stochastic_rsi``와 같은 값을 냅니다.
+
+    :param rsi: RSI 1차원 배열 또는 (심볼, 시간) 배열
+    :return: %K, %D
+    """
+    k = rolling_mean(stochastic(rsi, stoch_length), k_period)
+    return k, rolling_mean(k, d_period)
+
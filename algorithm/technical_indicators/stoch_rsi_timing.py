@@ -0,0 +1,112 @@
+# technical_indicators/stoch_rsi_timing.py
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+from heikin_ashi import DEFAULT_TICK, heikin_ashi
+from math_extention.rounding import round_to_tick
+from rsi import cal_rsi, stochastic_rsi
+from technical_indicators.batch import ema_2d, rsi_2d, stochastic_rsi_2d
+from technical_indicators.latch import crossed_above, latch
+
+TIMING_COLUMNS = ('k_above_d', 'extended_k_above_d', 'buy_signal', 'actual_buy_signal')
+
+
+def buy_timing_signals(
+    close: np.ndarray,
+    ema: np.ndarray,
+    k: np.ndarray,
+    d: np.ndarray,
+    oversold: float = 20,
+    overbought: float = 80
+) -> Dict[str, np.ndarray]:
+    """
+    Stochastic RSI 매수 타이밍 신호를 계산합니다. 마지막 축이 시간이므로 (심볼, 시간) 배열도 그대로 받습니다.
+
+    - k_above_d: %K가 %D를 위로 뚫은 봉
+    - extended_k_above_d: k_above_d에 켜지고 %D > %K가 되면 꺼지는 상태
+    - buy_signal: 종가 > EMA, %K와 %D가 oversold 미만, extended_k_above_d일 때 켜지고
+      %K >= overbought, 종가 < EMA, %K < %D 중 하나가 되면 꺼지는 상태
+    - actual_buy_signal: buy_signal이 켜진 상태에서 %K > oversold인 봉
+
+    :param close: 종가 (r2.py에서는 하이킨 아시 종가)
+    :param ema: 추세 필터 EMA
+    :param k: Stochastic RSI %K
+    :param d: Stochastic RSI %D
+    :param oversold: 과매도 기준 (기본값: 20)
+    :param overbought: 과매수 기준 (기본값: 80)
+    :return: TIMING_COLUMNS 이름별 bool 배열
+    """
+    close, ema, k, d = (np.asarray(x, dtype=np.float64) for x in (close, ema, k, d))
+
+    k_above_d = crossed_above(k, d)
+    extended_k_above_d = latch(k_above_d, d > k)
+
+    init_buy_signal = (close > ema) & (k < oversold) & (d < oversold) & extended_k_above_d
+    buy_signal = latch(init_buy_signal, (k >= overbought) | (close < ema) | (k < d))
+
+    return {
+        'k_above_d': k_above_d,
+        'extended_k_above_d': extended_k_above_d,
+        'buy_signal': buy_signal,
+        'actual_buy_signal': buy_signal & (k > oversold),
+    }
+
+def stoch_rsi_buy_timing(
+    data: pd.DataFrame,
+    ema_period: int = 200,
+    tick: Optional[float] = DEFAULT_TICK,
+    k_period: int = 3,
+    d_period: int = 3,
+    stoch_length: int = 14,
+    rsi_length: int = 14
+) -> pd.DataFrame:
+    """
+    한 심볼의 매수 타이밍 연구(r2.py) 결과를 계산합니다.
+
+    RSI와 EMA는 원래 종가로, 매수 조건의 종가는 하이킨 아시 종가로 계산합니다.
+
+    :param data: Open, High, Low, Close 컬럼을 가진 데이터
+    :param ema_period: 추세 필터 EMA 기간 (기본값: 200)
+    :param tick: 하이킨 아시 호가 단위 (기본값: 0.01)
+    :return: 하이킨 아시 OHLC, EMA, RSI, K, D와 TIMING_COLUMNS 컬럼을 가진 DataFrame
+    """
+    frame = heikin_ashi(data, tick)
+    frame['EMA'] = data['Close'].ewm(span=ema_period, adjust=False).mean()
+    frame['RSI'] = cal_rsi(data, rsi_length)
+    frame['K'], frame['D'] = stochastic_rsi(frame['RSI'], k_period, d_period, stoch_length)
+
+    signals = buy_timing_signals(frame['Close'], frame['EMA'], frame['K'], frame['D'])
+    for name in TIMING_COLUMNS:
+        frame[name] = signals[name]
+    return frame
+
+def stoch_rsi_buy_timing_2d(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    ema_period: int = 200,
+    tick: Optional[float] = DEFAULT_TICK,
+    k_period: int = 3,
+    d_period: int = 3,
+    stoch_length: int = 14,
+    rsi_length: int = 14
+) -> Dict[str, np.ndarray]:
+    """
+    여러 심볼의 매수 타이밍 신호를 한 번에 계산합니다. 심볼별 ``stoch_rsi_buy_timing``과 같은 값을 냅니다.
+
+    :param open_: (심볼, 시간) 시가 배열 (high, low, close도 같은 모양)
+    :return: TIMING_COLUMNS 이름별 (심볼, 시간) bool 배열
+    """
+    open_, high, low, close = (np.atleast_2d(np.asarray(x, dtype=np.float64)) for x in (open_, high, low, close))
+
+    # 하이킨 아시 종가는 재귀식이 없으므로 호가 단위 반올림까지 벡터 연산으로 계산 (heikin_ashi_arrays와 같은 값)
+    ha_close = (open_ + high + low + close) / 4
+    if tick is not None:
+        ha_close = round_to_tick(ha_close, tick)
+
+    ema = ema_2d(close, ema_period)
+    k, d = stochastic_rsi_2d(rsi_2d(close, rsi_length), k_period, d_period, stoch_length)
+    return buy_timing_signals(ha_close, ema, k, d)
@@ -0,0 +1,409 @@
+# technical_indicators/streaming.py
+
+import math
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+from math_extention.rounding import _round_scaled, tick_scale
+from technical_indicators.parabolic_sar import _sar_step
+from technical_indicators.rolling import _mean_add, _mean_remove, _mean_value
+
+NAN = float('nan')
+
+_STATE_TYPES: Dict[str, type] = {}
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, StreamingState):
+        return value.to_dict()
+    if isinstance(value, deque):
+        return {'__deque__': list(value), 'maxlen': value.maxlen}
+    return value
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if '__deque__' in value:
+            return deque(value['__deque__'], maxlen=value['maxlen'])
+        if '__state__' in value:
+            return load_state(value)
+    return value
+
+
+class StreamingState:
+    """
+    봉 하나씩 O(1)로 갱신되는 지표 상태의 기반 클래스입니다.
+
+    모든 상태는 ``__slots__``에 선언된 값만 가지며, ``to_dict``/``load_state``로
+    JSON 직렬화 가능한 dict와 상호 변환되어 체크포인트로 저장할 수 있습니다.
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _STATE_TYPES[cls.__name__] = cls
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        상태를 JSON 직렬화 가능한 dict로 변환합니다.
+
+        :return: 상태 dict
+        """
+        state = {'__state__': type(self).__name__}
+        for name in self.__slots__:
+            state[name] = _encode(getattr(self, name))
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'StreamingState':
+        """
+        ``to_dict``로 저장한 dict에서 상태를 복원합니다.
+
+        :param state: 상태 dict
+        :return: 복원된 상태 객체
+        """
+        obj = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(obj, name, _decode(state[name]))
+        return obj
+
+def load_state(state: Dict[str, Any]) -> StreamingState:
+    """
+    ``__state__`` 키에 기록된 타입으로 상태 객체를 복원합니다.
+
+    :param state: ``StreamingState.to_dict``의 결과
+    :return: 복원된 상태 객체
+    """
+    return _STATE_TYPES[state['__state__']].from_dict(state)
+
+
+class EWMState(StreamingState):
+    """
+    ``pandas.Series.ewm(...).mean()``과 같은 순서로 계산하는 지수 가중 평균 상태입니다.
+    """
+    __slots__ = ('old_wt_factor', 'new_wt', 'adjust', 'min_periods', 'weighted', 'old_wt', 'nobs')
+
+    def __init__(self, alpha: float, adjust: bool = False, min_periods: int = 0):
+        """
+        :param alpha: 평활 계수
+        :param adjust: pandas ``adjust`` 옵션 (기본값: False)
+        :param min_periods: 값을 내기 위한 최소 관측 수 (기본값: 0)
+        """
+        self.old_wt_factor = 1. - alpha
+        self.new_wt = 1. if adjust else alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.weighted = NAN
+        self.old_wt = 1.
+        self.nobs = 0
+
+    @classmethod
+    def from_span(cls, span: float, adjust: bool = False, min_periods: int = 0) -> 'EWMState':
+        return cls.from_com((span - 1) / 2., adjust, min_periods)
+
+    @classmethod
+    def from_com(cls, com: float, adjust: bool = False, min_periods: int = 0) -> 'EWMState':
+        return cls(1. / (1. + com), adjust, min_periods)
+
+    def update(self, value: float) -> float:
+        """
+        새 관측값을 반영합니다.
+
+        :param value: 새 값
+        :return: 갱신된 평균 (관측 수가 부족하면 NaN)
+        """
+        # numpy 스칼라가 들어와도 상태가 JSON으로 저장되도록 파이썬 float/int로 보관
+        value = float(value)
+        is_observation = value == value
+        self.nobs += int(is_observation)
+        if self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if not self.adjust and self.old_wt_factor == 0.5:
+                # pandas는 com == 1이고 adjust=False이면 새 값의 가중치를 1 - old_wt로 다시 계산 (NaN 다음 봉에서 차이)
+                self.new_wt = 1. - self.old_wt
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * value) / (self.old_wt + self.new_wt)
+                if self.adjust:
+                    self.old_wt += self.new_wt
+                else:
+                    self.old_wt = 1.
+        elif is_observation:
+            self.weighted = value
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.weighted if self.nobs >= self.min_periods else NAN
+
+
+class EMAState(StreamingState):
+    """
+    ``calculate_ema``의 스트리밍 버전입니다.
+    """
+    __slots__ = ('period', 'ewm')
+
+    def __init__(self, period: int):
+        """
+        :param period: EMA 기간
+        """
+        self.period = period
+        self.ewm = EWMState.from_span(period)
+
+    def update(self, close: float) -> float:
+        """
+        :param close: 새 봉의 값
+        :return: 갱신된 EMA
+        """
+        return self.ewm.update(close)
+
+    @property
+    def value(self) -> float:
+        return self.ewm.value
+
+
+class MACDState(StreamingState):
+    """
+    ``calculate_macd``의 스트리밍 버전입니다.
+    """
+    __slots__ = ('fast', 'slow', 'signal')
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        """
+        :param fast_period: 빠른 EMA의 기간 (기본값: 12)
+        :param slow_period: 느린 EMA의 기간 (기본값: 26)
+        :param signal_period: 시그널 라인의 기간 (기본값: 9)
+        """
+        self.fast = EWMState.from_span(fast_period)
+        self.slow = EWMState.from_span(slow_period)
+        self.signal = EWMState.from_span(signal_period)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """
+        :param close: 새 봉의 값
+        :return: MACD 라인, 시그널 라인, MACD 히스토그램
+        """
+        macd_line = self.fast.update(close) - self.slow.update(close)
+        signal_line = self.signal.update(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class ParabolicSARState(StreamingState):
+    """
+    ``calculate_parabolic_sar``의 스트리밍 버전입니다.
+    """
+    __slots__ = ('step', 'max_step', 'count', 'trend', 'sar', 'ep', 'af', 'high1', 'low1', 'high2', 'low2')
+
+    def __init__(self, step: float = 0.02, max_step: float = 0.2):
+        """
+        :param step: SAR 계산에 사용되는 가속 인자의 초기값 (기본값: 0.02)
+        :param max_step: 가속 인자의 최대값 (기본값: 0.2)
+        """
+        self.step = step
+        self.max_step = max_step
+        self.count = 0
+        self.trend = 1
+        self.sar = NAN
+        self.ep = NAN
+        self.af = step
+        self.high1 = self.low1 = self.high2 = self.low2 = NAN
+
+    def update(self, high: float, low: float) -> float:
+        """
+        :param high: 새 봉의 고가
+        :param low: 새 봉의 저가
+        :return: 갱신된 Parabolic SAR
+        """
+        high, low = float(high), float(low)
+        if self.count < 2:
+            # 처음 두 봉은 배치 계산과 같이 저가/고가로 초기화
+            self.sar, self.ep = low, high
+        else:
+            self.trend, self.sar, self.ep, self.af = _sar_step(
+                self.trend, self.sar, self.ep, self.af,
+                high, low, self.high1, self.low1, self.high2, self.low2,
+                self.step, self.max_step
+            )
+        self.high2, self.low2 = self.high1, self.low1
+        self.high1, self.low1 = high, low
+        self.count += 1
+        return self.sar
+
+
+class RSIState(StreamingState):
+    """
+    ``cal_rsi``의 스트리밍 버전입니다.
+    """
+    __slots__ = ('prev_close', 'avg_gain', 'avg_loss')
+
+    def __init__(self, rsi_length: int = 14):
+        """
+        :param rsi_length: RSI 기간 (기본값: 14)
+        """
+        self.prev_close = NAN
+        self.avg_gain = EWMState.from_com(rsi_length - 1, adjust=True, min_periods=rsi_length)
+        self.avg_loss = EWMState.from_com(rsi_length - 1, adjust=True, min_periods=rsi_length)
+
+    def update(self, close: float) -> float:
+        """
+        :param close: 새 봉의 종가
+        :return: 갱신된 RSI (초기 구간은 NaN)
+        """
+        close = float(close)
+        delta = close - self.prev_close
+        self.prev_close = close
+        avg_gain = self.avg_gain.update(delta if delta > 0 else 0.)
+        avg_loss = self.avg_loss.update(-delta if delta < 0 else 0.)
+
+        if avg_loss == 0:
+            rs = math.inf if avg_gain > 0 else NAN
+        else:
+            rs = avg_gain / avg_loss
+        return 100.0 - (100.0 / (1.0 + rs))
+
+
+class RollingMinMaxState(StreamingState):
+    """
+    ``rolling_min``/``rolling_max``의 스트리밍 버전입니다. 단조 덱으로 봉마다 O(1)(분할 상환)에 갱신합니다.
+    """
+    __slots__ = ('window', 'is_max', 'count', 'last_nan', 'positions', 'values')
+
+    def __init__(self, window: int, is_max: bool = False):
+        """
+        :param window: 구간 길이
+        :param is_max: True면 최댓값, False면 최솟값 (기본값: False)
+        """
+        self.window = window
+        self.is_max = is_max
+        self.count = 0
+        self.last_nan = -window
+        self.positions = deque()
+        self.values = deque()
+
+    def update(self, value: float) -> float:
+        """
+        :param value: 새 봉의 값
+        :return: 갱신된 구간 최솟값/최댓값 (구간이 덜 찼거나 NaN이 있으면 NaN)
+        """
+        value = float(value)
+        i = self.count
+        self.count += 1
+        positions, values = self.positions, self.values
+        if value != value:
+            self.last_nan = i
+        else:
+            if self.is_max:
+                while values and values[-1] <= value:
+                    positions.pop()
+                    values.pop()
+            else:
+                while values and values[-1] >= value:
+                    positions.pop()
+                    values.pop()
+            positions.append(i)
+            values.append(value)
+        while positions and positions[0] <= i - self.window:
+            positions.popleft()
+            values.popleft()
+
+        if i < self.window - 1 or self.last_nan > i - self.window or not values:
+            return NAN
+        return values[0]
+
+
+class RollingMeanState(StreamingState):
+    """
+    ``rolling_mean``의 스트리밍 버전입니다. 배치 커널과 같은 단계 함수로 계산하므로 비트 단위로 같은 값을 냅니다.
+    """
+    __slots__ = ('window', 'buffer', 'nobs', 'sum_x', 'neg_ct', 'comp_add', 'comp_remove', 'same_count', 'prev_value')
+
+    def __init__(self, window: int):
+        """
+        :param window: 구간 길이
+        """
+        self.window = window
+        self.buffer = deque(maxlen=window)
+        self.nobs = self.neg_ct = self.same_count = 0
+        self.sum_x = self.comp_add = self.comp_remove = 0.
+        self.prev_value = NAN
+
+    def update(self, value: float) -> float:
+        """
+        :param value: 새 봉의 값
+        :return: 갱신된 이동 평균 (구간이 덜 찼거나 NaN이 있으면 NaN)
+        """
+        value = float(value)
+        if len(self.buffer) == self.window:
+            self.nobs, self.sum_x, self.neg_ct, self.comp_remove = _mean_remove(
+                self.buffer[0], self.nobs, self.sum_x, self.neg_ct, self.comp_remove
+            )
+        self.buffer.append(value)
+        self.nobs, self.sum_x, self.neg_ct, self.comp_add, self.same_count, self.prev_value = _mean_add(
+            value, self.nobs, self.sum_x, self.neg_ct, self.comp_add, self.same_count, self.prev_value
+        )
+        return _mean_value(self.window, self.nobs, self.sum_x, self.neg_ct, self.same_count, self.prev_value)
+
+
+class StochRSIState(StreamingState):
+    """
+    ``stochastic_rsi``의 스트리밍 버전입니다. RSI 값을 입력으로 받습니다.
+
+    구간 최저/최고는 단조 덱, %K/%D는 누적 합으로 갱신하므로 봉마다 구간 길이와 무관하게 O(1)입니다.
+    """
+    __slots__ = ('rsi_min', 'rsi_max', 'k_mean', 'd_mean')
+
+    def __init__(self, k_period: int = 3, d_period: int = 3, stoch_length: int = 14):
+        """
+        :param k_period: %K 이동 평균 기간 (기본값: 3)
+        :param d_period: %D 이동 평균 기간 (기본값: 3)
+        :param stoch_length: 스토캐스틱 최저/최고 구간 (기본값: 14)
+        """
+        self.rsi_min = RollingMinMaxState(stoch_length, is_max=False)
+        self.rsi_max = RollingMinMaxState(stoch_length, is_max=True)
+        self.k_mean = RollingMeanState(k_period)
+        self.d_mean = RollingMeanState(d_period)
+
+    def update(self, rsi: float) -> Tuple[float, float]:
+        """
+        :param rsi: 새 봉의 RSI
+        :return: %K, %D
+        """
+        min_val = self.rsi_min.update(rsi)
+        max_val = self.rsi_max.update(rsi)
+        stoch_rsi = NAN
+        if max_val != min_val:
+            stoch_rsi = ((rsi - min_val) / (max_val - min_val)) * 100
+
+        k = self.k_mean.update(stoch_rsi)
+        d = self.d_mean.update(k)
+        return k, d
+
+
+class HeikinAshiState(StreamingState):
+    """
+    ``heikin_ashi``의 스트리밍 버전입니다.
+    """
+    __slots__ = ('scale', 'units', 'ha_open', 'ha_close')
+
+    def __init__(self, tick: Optional[float] = 0.01):
+        """
+        :param tick: HA 시가/종가를 반올림할 호가 단위 (기본값: 0.01, None이면 반올림하지 않음)
+        """
+        self.scale, self.units = tick_scale(tick) if tick is not None else (0, 0)
+        self.ha_open = NAN
+        self.ha_close = NAN
+
+    def _round(self, value: float) -> float:
+        return _round_scaled(value, self.scale, self.units) if self.units else value
+
+    def update(self, open_: float, high: float, low: float, close: float) -> Tuple[float, float, float, float]:
+        """
+        :return: HA 시가, 고가, 저가, 종가
+        """
+        open_, high, low, close = float(open_), float(high), float(low), float(close)
+        if self.ha_close != self.ha_close:
+            ha_open = self._round((open_ + close) / 2)
+        else:
+            ha_open = self._round((self.ha_open + self.ha_close) / 2)
+        ha_close = self._round((open_ + high + low + close) / 4)
+        self.ha_open, self.ha_close = ha_open, ha_close
+        return ha_open, max(ha_open, ha_close, high), min(ha_open, ha_close, low), ha_close
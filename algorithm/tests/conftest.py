@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# 모듈들은 algorithm/ 디렉터리 기준의 절대 경로로 import 합니다 (python -m algorithm과 같음)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
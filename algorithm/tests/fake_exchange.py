@@ -0,0 +1,243 @@
+# tests/fake_exchange.py
+
+"""
+네트워크 없이 테스트하기 위한 ``ccxt.async_support`` 거래소의 로컬 대역입니다.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic import synthetic_ohlcv
+from market_data.candle_store import interval_to_ns
+
+
+class BadSymbol(Exception):
+    """
+    ccxt.BadSymbol 대역 (상장 폐지되었거나 없는 심볼)
+    """
+
+
+class RequestTimeout(Exception):
+    """
+    ccxt.RequestTimeout 대역 (거래소가 요청을 처리했는지 알 수 없음)
+    """
+
+
+def ohlcv_rows(n: int, start: str = '2024-01-01', interval: str = '1m', seed: int = 0) -> List[List[float]]:
+    """
+    ``fetch_ohlcv`` 형식([timestamp(ms), open, high, low, close, volume])의 합성 봉 목록을 만듭니다.
+    """
+    data = synthetic_ohlcv(n, seed, start, interval.replace('m', 'min'))
+    times = data.index.as_unit('ms').asi8.tolist()
+    return [[t, *values] for t, values in zip(times, data.to_numpy().tolist())]
+
+
+class FakeExchange:
+    """
+    심볼별 봉 목록을 들고 Binance처럼 ``since``부터 최대 ``max_limit``개씩 돌려주는 거래소입니다.
+
+    요청 기록(calls)과 동시에 처리 중이던 최대 요청 수(peak_concurrency)를 남깁니다.
+    """
+
+    def __init__(self, ohlcv: Optional[Dict[str, List[List[float]]]] = None, latency: float = 0., max_limit: int = 1500):
+        """
+        :param ohlcv: 심볼 -> 봉 목록 (없는 심볼은 BadSymbol)
+        :param latency: 요청마다 기다릴 시간(초)
+        :param max_limit: 한 번에 돌려줄 최대 봉 수
+        """
+        self.ohlcv = ohlcv or {}
+        self.latency = latency
+        self.max_limit = max_limit
+        self.calls: List[tuple] = []
+        self.in_flight = 0
+        self.peak_concurrency = 0
+        self.closed = False
+
+    def parse_timeframe(self, timeframe: str) -> int:
+        return interval_to_ns(timeframe) // 10**9
+
+    async def _request(self, *call: Any) -> None:
+        self.calls.append(call)
+        self.in_flight += 1
+        self.peak_concurrency = max(self.peak_concurrency, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None,
+                          limit: Optional[int] = None) -> List[List[float]]:
+        await self._request('fetch_ohlcv', symbol, since, limit)
+        if symbol not in self.ohlcv:
+            raise BadSymbol(f'binance does not have market symbol {symbol}')
+        rows = [row for row in self.ohlcv[symbol] if since is None or row[0] >= since]
+        return rows[:min(limit or self.max_limit, self.max_limit)]
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeFuturesExchange(FakeExchange):
+    """
+    Binance 선물 주문을 흉내 내는 거래소입니다.
+
+    시장가 주문은 fill_delay 뒤에 체결되고, 손절/익절(STOP_MARKET/TAKE_PROFIT_MARKET)은 ``trigger``로
+    체결시킵니다. 상태가 바뀔 때마다 ORDER_TRADE_UPDATE/ACCOUNT_UPDATE 이벤트를 listeners에 보냅니다
+    (``ws_replay.UserDataFeed``가 user-data 스트림으로 전달).
+    """
+
+    def __init__(
+        self,
+        batch: bool = True,
+        fill_delay: Optional[float] = 0.01,
+        reject_entry: bool = False,
+        reject_protection: int = 0,
+        reduce_only_needs_position: bool = True,
+        silent_fills: bool = False,
+        errors: Optional[Dict[str, Exception]] = None,
+        latency: float = 0.
+    ):
+        """
+        :param batch: ``create_orders`` 지원 여부
+        :param fill_delay: 시장가 주문이 체결되기까지의 시간(초) (None이면 체결되지 않음)
+        :param reject_entry: 진입(시장가) 주문 거부
+        :param reject_protection: 조건과 관계없이 거부할 보호 주문 수
+        :param reduce_only_needs_position: 포지션이 없을 때 보호 주문 거부 (진입 체결 전 -2022)
+        :param silent_fills: 시장가 체결 이벤트를 보내지 않음 (스트림 유실, ``fetch_order``로만 확인 가능)
+        :param errors: 메서드 이름 -> 호출마다 발생시킬 예외 (create_order(s)는 주문을 처리한 뒤 발생, 응답 유실)
+        :param latency: 요청마다 기다릴 시간(초)
+        """
+        super().__init__(latency=latency)
+        self.has = {'createOrders': batch}
+        self.fill_delay = fill_delay
+        self.reject_entry = reject_entry
+        self.reject_protection = reject_protection
+        self.reduce_only_needs_position = reduce_only_needs_position
+        self.silent_fills = silent_fills
+        self.errors = dict(errors or {})
+        self.orders: Dict[str, Dict[str, Any]] = {}   # client order id -> 주문
+        self.positions: Dict[str, float] = {}          # Binance 심볼 id -> 포지션 수량
+        self.listeners: List[Any] = []
+        self._ids = iter(range(1000, 10**9))
+        self._event_time = 0
+
+    @staticmethod
+    def market_id(symbol: str) -> str:
+        return symbol.split(':')[0].replace('/', '')
+
+    def _emit(self, payload: Dict[str, Any]) -> None:
+        self._event_time += 1
+        payload['E'] = self._event_time
+        for listener in self.listeners:
+            listener(payload)
+
+    def _order_event(self, order: Dict[str, Any]) -> None:
+        self._emit({'e': 'ORDER_TRADE_UPDATE', 'o': {
+            'c': order['clientOrderId'], 's': self.market_id(order['symbol']), 'X': order['status'],
+            'i': int(order['id']), 'z': str(order['filled']), 'ap': str(order['average'])}})
+
+    def _fill(self, order: Dict[str, Any], price: float, silent: bool = False) -> None:
+        if order['status'] not in ('NEW', 'PARTIALLY_FILLED'):
+            return
+        order.update(status='FILLED', filled=order['amount'], average=price)
+        market_id = self.market_id(order['symbol'])
+        signed = order['amount'] if order['side'] == 'buy' else -order['amount']
+        self.positions[market_id] = round(self.positions.get(market_id, 0.) + signed, 12)
+        if not silent:
+            self._order_event(order)
+            self._emit({'e': 'ACCOUNT_UPDATE', 'a': {'P': [{'s': market_id, 'pa': str(self.positions[market_id])}]}})
+
+    def _place(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        params = order.get('params') or {}
+        client_id = params.get('newClientOrderId') or f'auto-{next(self._ids)}'
+        market = order['type'] == 'market'
+        if market and not params.get('reduceOnly') and self.reject_entry:
+            return {'id': None, 'clientOrderId': client_id, 'status': 'rejected',
+                    'info': {'code': -2019, 'msg': 'Margin is insufficient.'}}
+        if not market:
+            position = self.positions.get(self.market_id(order['symbol']), 0.)
+            if self.reject_protection > 0 or (self.reduce_only_needs_position and position == 0):
+                self.reject_protection = max(self.reject_protection - 1, 0)
+                return {'id': None, 'clientOrderId': client_id, 'status': 'rejected',
+                        'info': {'code': -2022, 'msg': 'ReduceOnly Order is rejected.'}}
+
+        placed = {'id': str(next(self._ids)), 'clientOrderId': client_id, 'symbol': order['symbol'],
+                  'type': order['type'], 'side': order['side'], 'amount': order['amount'], 'status': 'NEW',
+                  'filled': 0., 'average': 0., 'params': params}
+        self.orders[client_id] = placed
+        if market and self.fill_delay is not None:
+            silent = self.silent_fills and not params.get('reduceOnly')
+            asyncio.get_running_loop().call_later(self.fill_delay, self._fill, placed, 100., silent)
+        return {'id': placed['id'], 'clientOrderId': client_id, 'status': 'open', 'info': {}}
+
+    async def load_markets(self) -> Dict[str, Any]:
+        await self._request('load_markets')
+        return {}
+
+    def _raise(self, name: str) -> None:
+        if name in self.errors:
+            raise self.errors[name]
+
+    async def create_order(self, symbol: str, type: str, side: str, amount: float, price: Optional[float] = None,
+                           params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        await self._request('create_order', symbol, type, side, amount, dict(params or {}))
+        placed = self._place({'symbol': symbol, 'type': type, 'side': side, 'amount': amount, 'params': params})
+        self._raise('create_order')
+        return placed
+
+    async def create_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        await self._request('create_orders', [order['type'] for order in orders])
+        placed = [self._place(order) for order in orders]
+        self._raise('create_orders')
+        return placed
+
+    async def cancel_order(self, id: Optional[str], symbol: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        client_id = (params or {}).get('origClientOrderId')
+        await self._request('cancel_order', symbol, client_id)
+        order = self.orders.get(client_id)
+        if order is None or order['status'] not in ('NEW', 'PARTIALLY_FILLED'):
+            raise KeyError(f'Unknown order sent: {client_id}')   # ccxt.OrderNotFound 대역
+        order['status'] = 'CANCELED'
+        self._order_event(order)
+        return {'id': order['id'], 'clientOrderId': client_id, 'status': 'canceled'}
+
+    async def fetch_order(self, id: Optional[str], symbol: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        client_id = (params or {}).get('origClientOrderId')
+        await self._request('fetch_order', symbol, client_id)
+        self._raise('fetch_order')
+        order = self.orders[client_id]
+        status = {'NEW': 'open', 'PARTIALLY_FILLED': 'open', 'FILLED': 'closed'}.get(order['status'], 'canceled')
+        return {'id': order['id'], 'clientOrderId': client_id, 'status': status, 'filled': order['filled']}
+
+    async def fetch_open_orders(self, symbol: str) -> List[Dict[str, Any]]:
+        await self._request('fetch_open_orders', symbol)
+        self._raise('fetch_open_orders')
+        return [{'id': order['id'], 'clientOrderId': client_id, 'status': 'open', 'filled': order['filled']}
+                for client_id, order in self.orders.items()
+                if order['symbol'] == symbol and order['status'] in ('NEW', 'PARTIALLY_FILLED')]
+
+    async def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        await self._request('fetch_positions', symbols)
+        self._raise('fetch_positions')
+        symbols = symbols or sorted({order['symbol'] for order in self.orders.values()})
+        positions = []
+        for symbol in symbols:
+            amount = self.positions.get(self.market_id(symbol), 0.)
+            side = 'long' if amount > 0 else 'short' if amount < 0 else None
+            positions.append({'symbol': symbol, 'contracts': abs(amount), 'side': side,
+                              'info': {'symbol': self.market_id(symbol), 'positionAmt': str(amount)}})
+        return positions
+
+    def trigger(self, client_id: str, price: float) -> None:
+        """
+        손절/익절 주문을 체결시킵니다.
+        """
+        self._fill(self.orders[client_id], price)
+
+    async def fapiPrivatePostListenKey(self) -> Dict[str, str]:
+        await self._request('listen_key')
+        self._raise('fapiPrivatePostListenKey')
+        return {'listenKey': 'fake-listen-key'}
+
+    async def fapiPrivatePutListenKey(self) -> Dict[str, Any]:
+        return {}
@@ -0,0 +1,108 @@
+# tests/test_async_fetcher.py
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from fake_exchange import BadSymbol, FakeExchange, ohlcv_rows
+from market_data.async_fetcher import AsyncOHLCVFetcher, TokenBucket, fetch_ohlcv_many, kline_weight
+
+STEP_MS = 60_000
+MS = 10**6  # TimeLike 정수는 epoch 나노초
+
+
+def test_fetch_range_paginates_without_gaps_or_duplicates():
+    rows = ohlcv_rows(1000)
+    exchange = FakeExchange({'BTC/USDT': rows})
+    start, end = rows[10][0], rows[760][0]
+
+    async def run():
+        async with AsyncOHLCVFetcher(exchange, page_limit=200) as fetcher:
+            return await fetcher.fetch_ohlcv_range('BTC/USDT', '1m', start * MS, end * MS)
+
+    frame = asyncio.run(run())
+    times = frame.index.as_unit('ms').asi8
+    assert len(frame) == 750
+    assert times[0] == start and times[-1] == end - STEP_MS
+    assert (np.diff(times) == STEP_MS).all()
+    np.testing.assert_array_equal(frame['Close'].to_numpy(), [row[4] for row in rows[10:760]])
+    assert [call[2] for call in exchange.calls] == [start + i * 200 * STEP_MS for i in range(4)]
+    assert [call[3] for call in exchange.calls] == [200, 200, 200, 150]
+    assert exchange.closed
+
+def test_fetch_range_stops_when_exchange_has_no_more_bars():
+    rows = ohlcv_rows(300)
+    exchange = FakeExchange({'BTC/USDT': rows})
+
+    async def run():
+        fetcher = AsyncOHLCVFetcher(exchange, page_limit=100)
+        return await fetcher.fetch_ohlcv_range('BTC/USDT', '1m', rows[0][0] * MS, (rows[0][0] + 1000 * STEP_MS) * MS)
+
+    frame = asyncio.run(run())
+    assert len(frame) == 300
+    # 300봉을 다 받은 뒤 빈 페이지 한 번으로 끝남
+    assert len(exchange.calls) == 4
+
+def test_fetch_many_bounds_concurrency():
+    exchange = FakeExchange({f'S{i}/USDT': ohlcv_rows(50, seed=i) for i in range(12)}, latency=0.01)
+    start = exchange.ohlcv['S0/USDT'][0][0]
+
+    result = fetch_ohlcv_many(list(exchange.ohlcv), '1m', start * MS, (start + 50 * STEP_MS) * MS,
+                              exchange=exchange, max_concurrency=3)
+    assert sorted(result.frames) == sorted(exchange.ohlcv)
+    assert all(len(frame) == 50 for frame in result.frames.values())
+    assert result.errors == {}
+    assert exchange.peak_concurrency == 3
+
+def test_fetch_many_collects_per_symbol_errors():
+    exchange = FakeExchange({'BTC/USDT': ohlcv_rows(50), 'ETH/USDT': ohlcv_rows(50, seed=1)})
+    start = exchange.ohlcv['BTC/USDT'][0][0]
+
+    result = fetch_ohlcv_many(['BTC/USDT', 'LUNA/USDT', 'ETH/USDT'], '1m', start * MS, (start + 50 * STEP_MS) * MS,
+                              exchange=exchange)
+    assert sorted(result.frames) == ['BTC/USDT', 'ETH/USDT']
+    assert list(result.errors) == ['LUNA/USDT']
+    assert isinstance(result.errors['LUNA/USDT'], BadSymbol)
+
+def test_fetch_many_spends_kline_weight():
+    exchange = FakeExchange({'BTC/USDT': ohlcv_rows(1000)})
+    start = exchange.ohlcv['BTC/USDT'][0][0]
+
+    async def run():
+        fetcher = AsyncOHLCVFetcher(exchange, weight_per_minute=100, page_limit=500)
+        await fetcher.fetch_many(['BTC/USDT'], '1m', start * MS, (start + 1000 * STEP_MS) * MS)
+        return fetcher.bucket.tokens
+
+    # 500봉 요청 두 번 = 가중치 5 x 2
+    assert asyncio.run(run()) == pytest.approx(90, abs=0.1)
+
+
+def test_kline_weight():
+    assert [kline_weight(n) for n in (1, 99, 100, 499, 500, 1000, 1001, 1500)] == [1, 1, 2, 2, 5, 5, 10, 10]
+
+def test_token_bucket_waits_for_refill():
+    async def run():
+        bucket = TokenBucket(capacity=5, refill_per_second=100)
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire(5)
+        return time.monotonic() - started
+
+    # 처음 5는 바로, 나머지 10은 초당 100으로 채워질 때까지 대기
+    assert asyncio.run(run()) >= 0.09
+
+def test_token_bucket_serves_waiters_in_order():
+    async def run():
+        bucket = TokenBucket(capacity=2, refill_per_second=200)
+        order = []
+
+        async def request(name, weight):
+            await bucket.acquire(weight)
+            order.append(name)
+
+        await asyncio.gather(request('a', 2), request('b', 2), request('c', 1), request('d', 1))
+        return order
+
+    assert asyncio.run(run()) == ['a', 'b', 'c', 'd']
@@ -0,0 +1,69 @@
+# tests/test_batch.py
+
+import numpy as np
+import pytest
+
+import technical_indicators.batch as batch
+from benchmarks.synthetic import synthetic_ohlcv
+from heikin_ashi import heikin_ashi_arrays
+from rsi import cal_rsi, stochastic_rsi
+from technical_indicators.ema200 import calculate_ema
+from technical_indicators.macd import calculate_macd
+from technical_indicators.parabolic_sar import parabolic_sar_arrays
+
+N = 500
+PADS = (0, 37, 250, N)  # 마지막 심볼은 데이터가 없음
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return [synthetic_ohlcv(N, seed=i).iloc[pad:] for i, pad in enumerate(PADS)]
+
+def padded(frames, column):
+    values = np.full((len(PADS), N), np.nan)
+    for row, (pad, frame) in enumerate(zip(PADS, frames)):
+        values[row, pad:] = frame[column].to_numpy()
+    return values
+
+def assert_rows_match(result, frames, reference, pad_value=np.nan):
+    for row, (pad, frame) in enumerate(zip(PADS, frames)):
+        if pad == N:
+            continue
+        np.testing.assert_allclose(result[row, pad:], np.asarray(reference(frame), dtype=np.float64),
+                                   rtol=1e-12, atol=1e-9)
+        np.testing.assert_array_equal(result[row, :pad], np.full(pad, pad_value))
+
+
+def test_padded_ewm_indicators_match_trimmed(frames):
+    close = padded(frames, 'Close')
+    assert_rows_match(batch.ema_2d(close, 200), frames, lambda f: calculate_ema(f, 200))
+    for i, line in enumerate(batch.macd_2d(close)):
+        assert_rows_match(line, frames, lambda f, i=i: calculate_macd(f)[i])
+
+def test_padded_rsi_and_stoch_rsi_match_trimmed(frames):
+    rsi = batch.rsi_2d(padded(frames, 'Close'))
+    assert_rows_match(rsi, frames, cal_rsi)
+    k, d = batch.stochastic_rsi_2d(rsi)
+    assert_rows_match(k, frames, lambda f: stochastic_rsi(cal_rsi(f))[0])
+    assert_rows_match(d, frames, lambda f: stochastic_rsi(cal_rsi(f))[1])
+
+@pytest.mark.parametrize('numba', [True, False])
+def test_padded_parabolic_sar_matches_trimmed(frames, monkeypatch, numba):
+    if numba and not batch.NUMBA_AVAILABLE:
+        pytest.skip('numba가 없음')
+    monkeypatch.setattr(batch, 'NUMBA_AVAILABLE', numba)
+    sar, af, ep, trend = batch.parabolic_sar_2d(padded(frames, 'High'), padded(frames, 'Low'))
+
+    def reference(i):
+        return lambda f: parabolic_sar_arrays(f['High'].to_numpy(), f['Low'].to_numpy())[i]
+
+    assert_rows_match(sar, frames, reference(0))
+    assert_rows_match(af, frames, reference(1))
+    assert_rows_match(ep, frames, reference(2))
+    assert_rows_match(trend, frames, reference(3), pad_value=0)
+
+def test_padded_heikin_ashi_matches_trimmed(frames):
+    columns = [padded(frames, c) for c in ('Open', 'High', 'Low', 'Close')]
+    for i, values in enumerate(batch.heikin_ashi_2d(*columns)):
+        assert_rows_match(values, frames, lambda f, i=i: heikin_ashi_arrays(
+            *(f[c].to_numpy() for c in ('Open', 'High', 'Low', 'Close')), tick=None)[i])
@@ -0,0 +1,101 @@
+# tests/test_candle_store.py
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data.candle_store import CANDLE_COLUMNS, CandleStore, to_utc_ns
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'btc_usd_1h.csv')
+START = pd.Timestamp('2024-01-01', tz='UTC')
+
+
+class FixtureDownloader:
+    """
+    네트워크 대신 CSV fixture에서 [start, end) 구간을 잘라 주고, 요청받은 구간을 기록하는 다운로더입니다.
+    """
+
+    def __init__(self, path: str = FIXTURE):
+        self.data = pd.read_csv(path, index_col='Datetime', parse_dates=True)
+        self.calls = []
+
+    def __call__(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp, interval: str) -> pd.DataFrame:
+        self.calls.append((symbol, start, end, interval))
+        return self.data[(self.data.index >= start) & (self.data.index < end)]
+
+
+@pytest.fixture
+def downloader():
+    return FixtureDownloader()
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(str(tmp_path))
+
+
+def test_load_then_read_offline(store, downloader):
+    end = START + pd.Timedelta(days=2)
+    loaded = store.load('BTC-USD', '1h', START, end, downloader)
+    offline = store.load('BTC-USD', '1h', START, end, downloader=None)
+
+    expected = downloader.data[downloader.data.index < end]
+    assert len(loaded) == 48
+    np.testing.assert_array_equal(loaded.index.asi8, expected.index.as_unit('ns').asi8)
+    for name in CANDLE_COLUMNS:
+        np.testing.assert_array_equal(loaded[name].to_numpy(), expected[name].to_numpy())
+    pd.testing.assert_frame_equal(loaded, offline)
+
+def test_sync_fetches_only_missing_ranges(store, downloader):
+    store.load('BTC-USD', '1h', START, START + pd.Timedelta(days=1), downloader)
+    store.load('BTC-USD', '1h', START + pd.Timedelta(hours=12), START + pd.Timedelta(days=3), downloader)
+    store.load('BTC-USD', '1h', START, START + pd.Timedelta(days=3), downloader)
+
+    assert [(call[1], call[2]) for call in downloader.calls] == [
+        (START, START + pd.Timedelta(days=1)),
+        (START + pd.Timedelta(days=1), START + pd.Timedelta(days=3)),
+    ]
+    assert store.coverage('BTC-USD', '1h') == [(START.value, (START + pd.Timedelta(days=3)).value)]
+    assert store.partitions('BTC-USD', '1h') == ['2024-01-01', '2024-01-02', '2024-01-03']
+
+def test_write_replaces_bars_at_same_time(store, downloader):
+    store.write('BTC-USD', '1h', downloader.data.iloc[:10])
+    revised = downloader.data.iloc[5:15].copy()
+    revised['Close'] += 1.
+    store.write('BTC-USD', '1h', revised)
+
+    data = store.read('BTC-USD', '1h', START, START + pd.Timedelta(days=1))
+    assert len(data) == 15
+    assert data.index.is_monotonic_increasing
+    np.testing.assert_array_equal(data['Close'].to_numpy()[:5], downloader.data['Close'].to_numpy()[:5])
+    np.testing.assert_array_equal(data['Close'].to_numpy()[5:], revised['Close'].to_numpy())
+
+def test_read_arrays_inside_partition_is_zero_copy(store, downloader):
+    store.load('BTC-USD', '1h', START, START + pd.Timedelta(days=2), downloader)
+    arrays = store.read_arrays('BTC-USD', '1h', START + pd.Timedelta(hours=3), START + pd.Timedelta(hours=9))
+
+    assert len(arrays['time']) == 6
+    assert isinstance(arrays['Close'], np.memmap)
+    assert not arrays['Close'].flags.writeable
+
+def test_naive_times_are_utc(store, downloader):
+    assert to_utc_ns(datetime(2024, 1, 1)) == to_utc_ns(START) == to_utc_ns('2024-01-01')
+    naive = store.load('BTC-USD', '1h', datetime(2024, 1, 1), datetime(2024, 1, 2), downloader)
+    aware = store.load('BTC-USD', '1h', START, START + pd.Timedelta(days=1), downloader=None)
+    pd.testing.assert_frame_equal(naive, aware)
+    assert len(downloader.calls) == 1
+
+def test_backtest_runs_offline(store, downloader):
+    from backtest.core import backtest_arrays
+    from technical_indicators.pipeline import IndicatorPipeline, epm_indicators
+
+    store.load('BTC-USD', '1h', START, START + pd.Timedelta(days=4), downloader)
+    data = IndicatorPipeline(epm_indicators(), cache=None).run(
+        store.load('BTC-USD', '1h', START, START + pd.Timedelta(days=4), downloader=None))
+    columns = ('Close', 'High', 'Low', 'EMA200', 'MACD', 'Signal', 'ParabolicSAR')
+    events, _, _, _ = backtest_arrays(*(data[c].to_numpy(dtype=np.float64) for c in columns))
+
+    assert len(events) == len(data) == 96
+    assert len(downloader.calls) == 1
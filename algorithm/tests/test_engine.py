@@ -0,0 +1,121 @@
+# tests/test_engine.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.core import (
+    EVENT_LONG_ENTRY, EVENT_LONG_LOSS, EVENT_LONG_PROFIT, EVENT_SHORT_ENTRY, EVENT_SHORT_LOSS, backtest_arrays
+)
+from backtest.engine import (
+    PATH_TP_FIRST, EngineConfig, MarketEvents, build_events, funding_per_bar, run_engine
+)
+from benchmarks.synthetic import synthetic_ohlcv
+from technical_indicators.pipeline import IndicatorPipeline, epm_indicators
+
+FREE = EngineConfig(initial_capital=1000., maker_fee=0., taker_fee=0., slippage=0., path=PATH_TP_FIRST)
+COSTS = EngineConfig(initial_capital=1000., maker_fee=0.001, taker_fee=0.002, slippage=0.01, path=PATH_TP_FIRST)
+
+
+def market(open_, high, low, close, sar, long_entry=(), short_entry=(), funding=None, ticks=None) -> MarketEvents:
+    """
+    손으로 만든 봉으로 이벤트 큐를 만듭니다. ticks는 봉 번호 -> 틱 가격 목록입니다.
+    """
+    n = len(close)
+    long_flags, short_flags = np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    long_flags[list(long_entry)] = True
+    short_flags[list(short_entry)] = True
+    tick_start, tick_end, prices = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64), []
+    for i, bar_ticks in sorted((ticks or {}).items()):
+        tick_start[i] = len(prices)
+        prices.extend(bar_ticks)
+        tick_end[i] = len(prices)
+    return MarketEvents(
+        *(np.asarray(x, dtype=np.float64) for x in (open_, high, low, close, sar)), long_flags, short_flags,
+        np.zeros(n) if funding is None else np.asarray(funding, dtype=np.float64),
+        tick_start, tick_end, np.asarray(prices, dtype=np.float64)
+    )
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_free_tp_first_matches_backtest_arrays(seed):
+    data = IndicatorPipeline(epm_indicators()).run(synthetic_ohlcv(20_000, seed=seed))
+    result = run_engine(build_events(data, '1m'), FREE)
+    columns = [data[c].to_numpy() for c in ('Close', 'High', 'Low', 'EMA200', 'MACD', 'Signal', 'ParabolicSAR')]
+    events, entry_prices, exit_prices, profits = backtest_arrays(*columns)
+
+    assert (events != 0).sum() > 20
+    np.testing.assert_array_equal(result.events, events)
+    np.testing.assert_array_equal(result.entry_prices, entry_prices)
+    np.testing.assert_array_equal(result.exit_prices, exit_prices)
+    np.testing.assert_allclose(result.profits, profits, rtol=1e-9)
+    assert not result.fees.any() and not result.funding.any()
+
+def test_fees_and_slippage_on_entry_and_take_profit():
+    # 1봉 종가 100에 Long (SAR 95 -> 손절 95, 익절 105), 2봉 고가가 익절에 닿음
+    events = market([100, 100, 104], [101, 101, 106], [99, 99, 103], [100, 100, 105], [95, 95, 95], long_entry=[1])
+    result = run_engine(events, COSTS)
+
+    entry_fill = 100 * 1.01
+    quantity = 1000 / entry_fill
+    entry_fee = quantity * entry_fill * 0.002
+    exit_fee = quantity * 105 * 0.001  # 익절은 지정가라 슬리피지 없이 메이커 수수료
+    pnl = quantity * (105 - entry_fill)
+
+    np.testing.assert_array_equal(result.events, [0, EVENT_LONG_ENTRY, EVENT_LONG_PROFIT])
+    assert result.entry_prices[1] == pytest.approx(entry_fill)
+    assert result.exit_prices[2] == 105
+    np.testing.assert_allclose(result.fees, [0, entry_fee, exit_fee])
+    assert result.profits[2] == pytest.approx((pnl - entry_fee - exit_fee) / 1000 * 100)
+    assert result.equity[1] == pytest.approx(1000 - entry_fee + quantity * (100 - entry_fill))
+    assert result.equity[2] == pytest.approx(1000 - entry_fee + pnl - exit_fee)
+
+def test_slippage_on_stop_loss():
+    # 1봉 종가 100에 Short (SAR 104 -> 손절 104, 익절 96), 2봉 고가가 손절에 닿음
+    events = market([100, 100, 101], [101, 101, 105], [99, 99, 100], [100, 100, 104], [104, 104, 104],
+                    short_entry=[1])
+    result = run_engine(events, COSTS)
+
+    entry_fill = 100 * 0.99
+    quantity = 1000 / entry_fill
+    exit_fill = 104 * 1.01
+    np.testing.assert_array_equal(result.events, [0, EVENT_SHORT_ENTRY, EVENT_SHORT_LOSS])
+    assert result.exit_prices[2] == pytest.approx(exit_fill)
+    assert result.fees[2] == pytest.approx(quantity * exit_fill * 0.002)
+    assert result.profits[2] == pytest.approx(
+        (quantity * (entry_fill - exit_fill) - quantity * entry_fill * 0.002 - result.fees[2]) / 1000 * 100
+    )
+
+def test_funding_accrual():
+    index = pd.date_range('2024-01-01 06:00', periods=12, freq='h', tz='UTC')
+    funding = funding_per_bar(index, '1h', 0.0001)
+    # 펀딩 시각 08시(2봉), 16시(10봉)
+    np.testing.assert_array_equal(np.flatnonzero(funding), [2, 10])
+
+    rates = pd.Series([0.0003, -0.0002], index=pd.to_datetime(['2024-01-01 07:30', '2024-01-01 11:00'], utc=True))
+    np.testing.assert_array_equal(funding_per_bar(index, '1h', rates), np.where(np.arange(12) == 1, 0.0003, 0.)
+                                  + np.where(np.arange(12) == 5, -0.0002, 0.))
+
+    # 1봉에 Long으로 진입한 뒤 손절/익절 없이 보유: 펀딩 봉의 시가 기준 명목 금액 x 비율을 지불
+    n = 12
+    close = np.full(n, 100.)
+    events = market(close + 1, close + 1, close - 1, close, np.full(n, 90.), long_entry=[1], funding=funding)
+    result = run_engine(events, FREE)
+    quantity = 1000 / 100
+    np.testing.assert_allclose(result.funding, funding * quantity * 101 * (np.arange(n) > 1))
+    assert result.equity[-1] == pytest.approx(1000 - 2 * quantity * 101 * 0.0001)
+
+def test_tick_exit_path_overrides_bar_order():
+    # 2봉 고가가 익절(105)에 닿지만 틱은 손절(95)을 먼저 지남 -> 손절은 레벨을 넘어선 틱 가격에 체결
+    bars = ([100, 100, 100], [101, 101, 106], [99, 99, 93], [100, 100, 100], [95, 95, 95])
+    without_ticks = run_engine(market(*bars, long_entry=[1]), FREE)
+    assert without_ticks.events[2] == EVENT_LONG_PROFIT
+
+    result = run_engine(market(*bars, long_entry=[1], ticks={2: [100.5, 94., 106.]}), FREE)
+    assert result.events[2] == EVENT_LONG_LOSS
+    assert result.exit_prices[2] == 94.
+    assert result.profits[2] == pytest.approx(-6.)
+
+    # 틱이 어느 레벨에도 닿지 않으면 봉의 고가/저가가 닿아도 보유 유지
+    held = run_engine(market(*bars, long_entry=[1], ticks={2: [100.5, 99.]}), FREE)
+    assert held.events[2] == 0 and np.isnan(held.exit_prices[2])
@@ -0,0 +1,272 @@
+# tests/test_execution.py
+
+import asyncio
+
+import pytest
+
+from fake_exchange import FakeFuturesExchange, RequestTimeout
+from live.execution import (
+    LEG_ENTRY, LEG_STOP_LOSS, LEG_TAKE_PROFIT, STATUS_CANCELED, STATUS_FILLED, STATUS_NEW,
+    OrderExecutor, OrderRejected, OrderRequest, OrderTracker, ProtectionFailed, UserDataStream
+)
+from market_data.metadata import MarketMetadataCache, markets_to_array
+from ws_replay import UserDataFeed, wait_for
+
+SYMBOL = 'BTC/USDT:USDT'
+REQUEST = OrderRequest(SYMBOL, 'buy', 0.01234, 64999.97, 65100.04)
+
+
+@pytest.fixture
+def metadata(tmp_path):
+    market = {'symbol': SYMBOL, 'id': 'BTCUSDT', 'base': 'BTC', 'quote': 'USDT', 'settle': 'USDT',
+              'contract': True, 'linear': True, 'precision': {'price': 0.1, 'amount': 0.001}}
+    return MarketMetadataCache(str(tmp_path)).load(lambda: markets_to_array([market]))
+
+
+def trade(metadata, exchange: FakeFuturesExchange, scenario, fill_timeout: float = 0.2):
+    """
+    로컬 user-data 스트림을 연결한 주문 실행기로 scenario(executor)를 실행합니다.
+    """
+    async def run():
+        async with UserDataFeed(exchange) as feed:
+            tracker = OrderTracker()
+            stream = UserDataStream(exchange, tracker, base_url=feed.url)
+            task = asyncio.ensure_future(stream.run())
+            await asyncio.wait_for(stream.connected.wait(), 5.)
+            executor = OrderExecutor(metadata, exchange, tracker, fill_timeout=fill_timeout)
+            try:
+                await executor.warmup()
+                return await scenario(executor)
+            finally:
+                stream.stop()
+                await asyncio.wait_for(task, 5.)
+                await executor.close()
+
+    return asyncio.run(run())
+
+def calls(exchange: FakeFuturesExchange, name: str):
+    return [call[1:] for call in exchange.calls if call[0] == name]
+
+def statuses(executor: OrderExecutor, client_ids):
+    return [executor.tracker.orders[client_id].status for client_id in client_ids]
+
+
+def test_batch_places_entry_and_protection_in_one_request(metadata):
+    exchange = FakeFuturesExchange(reduce_only_needs_position=False)
+
+    async def scenario(executor):
+        position = await executor.open_position(REQUEST)
+        await executor.tracker.wait(position.entry_id, {STATUS_FILLED}, 5.)
+        await wait_for(lambda: executor.tracker.positions.get('BTCUSDT') == 0.012)
+        return position
+
+    position = trade(metadata, exchange, scenario)
+    assert calls(exchange, 'create_orders') == [(['market', 'STOP_MARKET', 'TAKE_PROFIT_MARKET'],)]
+    assert calls(exchange, 'create_order') == []
+    stop_loss, take_profit = exchange.orders[position.stop_loss_id], exchange.orders[position.take_profit_id]
+    assert exchange.orders[position.entry_id]['amount'] == stop_loss['amount'] == 0.012
+    assert (stop_loss['params']['stopPrice'], take_profit['params']['stopPrice']) == (65000.0, 65100.0)
+    assert stop_loss['params']['reduceOnly'] and stop_loss['side'] == 'sell'
+
+def test_fallback_resends_protection_after_fill_on_stream(metadata):
+    exchange = FakeFuturesExchange(batch=False)
+
+    async def scenario(executor):
+        position = await executor.open_position(REQUEST)
+        return position, statuses(executor, position[1:])
+
+    position, states = trade(metadata, exchange, scenario)
+    # 진입 뒤 보호 주문이 포지션 없이 한 번 거부되고, 체결 이벤트를 받은 뒤 다시 접수됨
+    sent = [(call[1], call[4].get('newClientOrderId')) for call in calls(exchange, 'create_order')]
+    assert sent[0] == ('market', position.entry_id)
+    assert sent[1:3] == sent[3:5]
+    assert sorted(client_id for _, client_id in sent[3:]) == sorted([position.stop_loss_id, position.take_profit_id])
+    assert calls(exchange, 'fetch_order') == []
+    assert states == [STATUS_FILLED, STATUS_NEW, STATUS_NEW]
+
+def test_fill_checked_with_fetch_order_when_stream_is_silent(metadata):
+    exchange = FakeFuturesExchange(silent_fills=True)
+
+    async def scenario(executor):
+        position = await executor.open_position(REQUEST)
+        return position, statuses(executor, position[1:])
+
+    position, states = trade(metadata, exchange, scenario)
+    assert calls(exchange, 'fetch_order') == [(SYMBOL, position.entry_id)]
+    assert states == [STATUS_FILLED, STATUS_NEW, STATUS_NEW]
+    assert exchange.orders[position.stop_loss_id]['status'] == 'NEW'
+
+def test_unfilled_entry_is_cancelled_when_protection_cannot_be_placed(metadata):
+    exchange = FakeFuturesExchange(fill_delay=None)
+
+    async def scenario(executor):
+        with pytest.raises(ProtectionFailed) as error:
+            await executor.open_position(REQUEST)
+        return error.value
+
+    error = trade(metadata, exchange, scenario)
+    entry_id = error.client_ids[LEG_ENTRY]
+    assert (error.filled, error.flattened) == (0., True)
+    assert exchange.orders[entry_id]['status'] == 'CANCELED'
+    assert all(call[3] != 'sell' for call in calls(exchange, 'create_order'))
+    assert exchange.positions == {}
+
+def test_rejected_retry_flattens_position(metadata):
+    exchange = FakeFuturesExchange(reject_protection=3)
+
+    async def scenario(executor):
+        with pytest.raises(ProtectionFailed) as error:
+            await executor.open_position(REQUEST)
+        await wait_for(lambda: executor.tracker.positions.get('BTCUSDT') == 0.)
+        return error.value
+
+    error = trade(metadata, exchange, scenario)
+    # 배치에서 둘 다, 재전송에서 하나가 거부됨 -> 접수된 쪽은 취소하고 체결 수량을 청산
+    accepted = [client_id for client_id in (error.client_ids[LEG_STOP_LOSS], error.client_ids[LEG_TAKE_PROFIT])
+                if client_id in exchange.orders]
+    assert len(accepted) == 1 and exchange.orders[accepted[0]]['status'] == 'CANCELED'
+    assert (error.filled, error.flattened) == (0.012, True)
+    flatten = calls(exchange, 'create_order')[-1]
+    assert flatten == (SYMBOL, 'market', 'sell', 0.012, {'reduceOnly': True})
+    assert exchange.positions == {'BTCUSDT': 0.}
+
+def test_filled_stop_loss_cancels_take_profit(metadata):
+    exchange = FakeFuturesExchange(reduce_only_needs_position=False)
+
+    async def scenario(executor):
+        position = await executor.open_position(REQUEST)
+        await executor.tracker.wait(position.entry_id, {STATUS_FILLED}, 5.)
+        exchange.trigger(position.stop_loss_id, 65000.)
+        await executor.tracker.wait(position.take_profit_id, {STATUS_CANCELED}, 5.)
+        return position
+
+    position = trade(metadata, exchange, scenario)
+    assert calls(exchange, 'cancel_order') == [(SYMBOL, position.take_profit_id)]
+    assert exchange.orders[position.take_profit_id]['status'] == 'CANCELED'
+    assert exchange.positions == {'BTCUSDT': 0.}
+
+def test_rejected_entry_cancels_accepted_protection(metadata):
+    exchange = FakeFuturesExchange(reject_entry=True, reduce_only_needs_position=False)
+
+    async def scenario(executor):
+        with pytest.raises(OrderRejected) as error:
+            await executor.open_position(REQUEST)
+        return error.value, dict(executor._siblings)
+
+    error, siblings = trade(metadata, exchange, scenario)
+    protection = [error.client_ids[LEG_STOP_LOSS], error.client_ids[LEG_TAKE_PROFIT]]
+    assert sorted(call[1] for call in calls(exchange, 'cancel_order')) == sorted(protection)
+    assert [exchange.orders[client_id]['status'] for client_id in protection] == ['CANCELED', 'CANCELED']
+    assert siblings == {}
+
+def test_close_position_cancels_legs_and_flattens(metadata):
+    exchange = FakeFuturesExchange(reduce_only_needs_position=False)
+
+    async def scenario(executor):
+        position = await executor.open_position(REQUEST)
+        await wait_for(lambda: executor.tracker.positions.get('BTCUSDT') == 0.012)
+        await executor.close_position(SYMBOL)
+        return position
+
+    position = trade(metadata, exchange, scenario)
+    assert sorted(call[1] for call in calls(exchange, 'cancel_order')) == sorted(position[2:])
+    assert calls(exchange, 'create_order')[-1] == (SYMBOL, 'market', 'sell', 0.012, {'reduceOnly': True})
+
+def test_entry_timeout_is_looked_up_instead_of_rejected(metadata):
+    exchange = FakeFuturesExchange(batch=False, errors={'create_order': RequestTimeout('timed out')})
+
+    async def scenario(executor):
+        position = await executor.open_position(REQUEST)
+        return position, statuses(executor, position[1:])
+
+    position, states = trade(metadata, exchange, scenario)
+    # 응답을 못 받은 진입은 다시 보내지 않고 조회한 뒤 보호 주문을 걸음
+    assert [call[4]['newClientOrderId'] for call in calls(exchange, 'create_order') if call[1] == 'market'] == \
+        [position.entry_id]
+    assert (SYMBOL, position.entry_id) in calls(exchange, 'fetch_order')
+    assert states == [STATUS_FILLED, STATUS_NEW, STATUS_NEW]
+
+def test_batch_timeout_is_looked_up_instead_of_resent(metadata):
+    exchange = FakeFuturesExchange(errors={'create_orders': RequestTimeout('timed out')})
+
+    async def scenario(executor):
+        position = await executor.open_position(REQUEST)
+        return position, statuses(executor, position[1:])
+
+    position, states = trade(metadata, exchange, scenario)
+    assert sorted(client_id for _, client_id in calls(exchange, 'fetch_order')) == sorted(position[1:])
+    # 같은 client order id로 진입을 다시 보내지 않고, 접수되지 않은 보호 주문만 체결 후 다시 보냄
+    assert sorted(call[1] for call in calls(exchange, 'create_order')) == ['STOP_MARKET', 'TAKE_PROFIT_MARKET']
+    assert states == [STATUS_FILLED, STATUS_NEW, STATUS_NEW]
+
+def test_unconfirmed_fill_is_flattened_from_positions(metadata):
+    exchange = FakeFuturesExchange(silent_fills=True, errors={'fetch_order': RequestTimeout('timed out')})
+
+    async def scenario(executor):
+        with pytest.raises(ProtectionFailed) as error:
+            await executor.open_position(REQUEST)
+        await wait_for(lambda: exchange.positions.get('BTCUSDT') == 0.)
+        return error.value
+
+    error = trade(metadata, exchange, scenario)
+    assert (error.filled, error.flattened) == (0.012, True)
+    assert calls(exchange, 'fetch_positions') == [([SYMBOL],)]
+    assert calls(exchange, 'create_order')[-1] == (SYMBOL, 'market', 'sell', 0.012, {'reduceOnly': True})
+
+def test_unknown_fill_is_not_reported_flattened(metadata):
+    exchange = FakeFuturesExchange(silent_fills=True, errors={'fetch_order': RequestTimeout('timed out'),
+                                                              'fetch_positions': RequestTimeout('timed out')})
+
+    async def scenario(executor):
+        with pytest.raises(ProtectionFailed) as error:
+            await executor.open_position(REQUEST)
+        return error.value
+
+    error = trade(metadata, exchange, scenario)
+    assert (error.filled, error.flattened) == (None, False)
+    assert exchange.positions == {'BTCUSDT': 0.012}
+
+def test_user_data_stream_reconnects_and_resyncs_missed_fill(metadata):
+    exchange = FakeFuturesExchange(reduce_only_needs_position=False)
+
+    async def run():
+        async with UserDataFeed(exchange) as feed:
+            tracker = OrderTracker()
+            stream = UserDataStream(exchange, tracker, base_url=feed.url, initial_backoff=0.01)
+            task = asyncio.ensure_future(stream.run())
+            executor = OrderExecutor(metadata, exchange, tracker, fill_timeout=0.2)
+            try:
+                await asyncio.wait_for(stream.connected.wait(), 5.)
+                position = await executor.open_position(REQUEST)
+                await wait_for(lambda: tracker.positions.get('BTCUSDT') == 0.012)
+
+                # listenKey 발급이 ccxt 오류로 실패하는 동안 손절이 체결됨 (이벤트 유실)
+                exchange.errors['fapiPrivatePostListenKey'] = RequestTimeout('timed out')
+                await feed.disconnect()
+                await wait_for(lambda: not stream.connected.is_set())
+                exchange.trigger(position.stop_loss_id, 65000.)
+                await wait_for(lambda: len(calls(exchange, 'listen_key')) >= 3)
+                del exchange.errors['fapiPrivatePostListenKey']
+
+                await executor.tracker.wait(position.take_profit_id, {STATUS_CANCELED}, 5.)
+                return position, dict(tracker.positions), task.done()
+            finally:
+                stream.stop()
+                await asyncio.wait_for(task, 5.)
+                await executor.close()
+
+    position, positions, stopped = asyncio.run(run())
+    assert not stopped
+    assert calls(exchange, 'fetch_open_orders') == [(SYMBOL,)]
+    assert exchange.orders[position.take_profit_id]['status'] == 'CANCELED'
+    assert positions == {'BTCUSDT': 0.}
+
+def test_failed_cancel_is_logged(metadata, caplog):
+    exchange = FakeFuturesExchange(reduce_only_needs_position=False)
+
+    async def scenario(executor):
+        await executor.cancel('unknown-client-id', SYMBOL)
+
+    with caplog.at_level('WARNING', logger='live.execution'):
+        trade(metadata, exchange, scenario)
+    assert any('cancel unknown-client-id failed' in record.getMessage() for record in caplog.records)
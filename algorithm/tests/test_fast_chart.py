@@ -0,0 +1,59 @@
+# tests/test_fast_chart.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('plotly')
+
+from benchmarks.synthetic import synthetic_ohlcv
+from charting.fast_chart import create_chart, relayout_range, update_visible
+from research_epm_long import add_trade_signals
+from technical_indicators.pipeline import IndicatorPipeline, epm_indicators
+
+
+@pytest.fixture(scope='module')
+def data():
+    return IndicatorPipeline(epm_indicators(), cache=None).run(synthetic_ohlcv(50_000))
+
+def test_relayout_range():
+    assert relayout_range({'xaxis.range[0]': 'a', 'xaxis.range[1]': 'b'}) == (True, ('a', 'b'))
+    assert relayout_range({'xaxis2.range': ['a', 'b']}) == (True, ('a', 'b'))
+    assert relayout_range({'xaxis.autorange': True}) == (True, None)
+    assert relayout_range({'dragmode': 'pan'}) == (False, None)
+
+def test_signal_marker_text(data):
+    signals = add_trade_signals(data.iloc[:20_000])
+    fig = create_chart(signals, 'test', max_points=500)
+    traces = {trace.name: trace for trace in fig.data}
+
+    profits = signals[signals['LongProfitSignal'].to_numpy(dtype=bool)]
+    assert len(profits) > 0
+    row = profits.iloc[0]
+    assert traces['Long Profit'].text[0] == (
+        f"Long 매수: {row['EntryPrice']:.2f}<br>매도: {row['ExitPrice']:.2f}<br>수익률: {row['ProfitPercentage']:.2f}%"
+    )
+    entries = signals[signals['LongSignal'].to_numpy(dtype=bool)]
+    assert traces['Long Signal'].text[0] == f"Long 진입: {entries['EntryPrice'].iloc[0]:.2f}"
+
+def test_zoom_redownsamples_visible_range(data):
+    fig = create_chart(data, 'test', max_points=500)
+    full_step = np.diff(pd.DatetimeIndex(fig.data[0].x)[:2])[0]
+
+    start, end = data.index[10_000], data.index[12_000]
+    _, x_range = relayout_range({'xaxis.range[0]': str(start), 'xaxis.range[1]': str(end)})
+    update_visible(fig, data, x_range, max_points=500)
+
+    candles = pd.DatetimeIndex(fig.data[0].x)
+    assert candles[0] >= start and candles[-1] <= end
+    assert len(candles) <= 500
+    assert np.diff(candles[:2])[0] < full_step
+    for trace in fig.data[1:]:
+        x = pd.DatetimeIndex(trace.x)
+        assert len(x) <= 500 and (len(x) == 0 or (x[0] >= start and x[-1] <= end))
+
+    # 전체 보기로 돌아가면 처음과 같은 트레이스
+    update_visible(fig, data, None, max_points=500)
+    fresh = create_chart(data, 'test', max_points=500)
+    for trace, expected in zip(fig.data, fresh.data):
+        np.testing.assert_array_equal(np.asarray(trace.x), np.asarray(expected.x))
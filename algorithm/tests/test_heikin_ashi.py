@@ -0,0 +1,37 @@
+# tests/test_heikin_ashi.py
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_ohlcv
+from heikin_ashi import _heikin_ashi_kernel, _heikin_ashi_vectorized
+from math_extention.rounding import tick_scale
+
+
+def kernel(open_, high, low, close, tick):
+    n = len(close)
+    ha_open, ha_close = [0.] * n, [0.] * n
+    _heikin_ashi_kernel(open_.tolist(), high.tolist(), low.tolist(), close.tolist(), *tick_scale(tick),
+                        ha_open, ha_close)
+    return np.array(ha_open), np.array(ha_close)
+
+
+@pytest.mark.parametrize('tick', [0.01, 0.05, 0.5, 1., 1e-4])
+@pytest.mark.parametrize('seed', [0, 3])
+def test_vectorized_matches_kernel(tick, seed):
+    frame = synthetic_ohlcv(20_000, seed=seed)
+    columns = [frame[c].to_numpy() for c in ('Open', 'High', 'Low', 'Close')]
+    for actual, expected in zip(_heikin_ashi_vectorized(*columns, *tick_scale(tick)), kernel(*columns, tick)):
+        np.testing.assert_array_equal(actual, expected)
+
+def test_vectorized_matches_kernel_with_negative_prices_and_nan():
+    # 음수 구간은 0에서 먼 쪽 반올림이라 EWM 후보가 자주 어긋남 -> 순차 보정 경로
+    walk = np.random.default_rng(0).normal(0, 1, 2000).cumsum()
+    columns = [walk, walk + 0.5, walk - 0.5, walk + 0.1]
+    for actual, expected in zip(_heikin_ashi_vectorized(*columns, *tick_scale(0.01)), kernel(*columns, 0.01)):
+        np.testing.assert_array_equal(actual, expected)
+
+    prices = np.array([1., 2., np.nan, 3., 4.])
+    columns = [prices, prices + 1, prices - 1, prices]
+    for actual, expected in zip(_heikin_ashi_vectorized(*columns, *tick_scale(0.01)), kernel(*columns, 0.01)):
+        np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,24 @@
+# tests/test_imports.py
+
+import importlib.util
+import os
+
+import pytest
+
+# python -m algorithm의 진입점 (algorithm/은 패키지가 아니므로 파일에서 읽음)
+_spec = importlib.util.spec_from_file_location(
+    'algorithm_cli', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '__main__.py')
+)
+cli = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cli)
+
+# 느린 CI 머신에서는 예산 배율을 키움 (``imports --scale``과 같음)
+SCALE = float(os.environ.get('PYCOIN_IMPORT_BUDGET_SCALE', '1'))
+
+
+@pytest.mark.parametrize('command', list(cli.SUBCOMMAND_MODULES))
+def test_subcommand_import_budget(command):
+    report = cli.measure_imports(command)
+    assert report['ms'] <= report['budget_ms'] * SCALE, report
+    if command in cli.HEADLESS_COMMANDS:
+        assert report['heavy'] == [], f'{command} loads {report["heavy"]}'
@@ -0,0 +1,92 @@
+# tests/test_intrabar.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.core import (
+    EVENT_LONG_ENTRY, EVENT_LONG_LOSS, EVENT_LONG_PROFIT, EVENT_SHORT_ENTRY, EVENT_SHORT_PROFIT
+)
+from backtest.intrabar import IntrabarResolver, frame_source, store_source
+from market_data.candle_store import CandleStore
+
+START = pd.Timestamp('2024-01-01', tz='UTC')
+
+
+@pytest.fixture
+def hourly():
+    """
+    1봉 Long 진입(종가 100, SAR 95 -> 익절 105) -> 2봉 익절/손절 모두 닿음 -> 3봉 Short 진입(종가 100, SAR 104 -> 익절 96)
+    -> 4봉 익절/손절 모두 닿음 -> 5봉 Long 진입 -> 6봉 익절만 닿음
+    """
+    nan = np.nan
+    return {
+        'index': pd.date_range(START, periods=7, freq='h'),
+        'close': np.array([100., 100., 104., 100., 97., 100., 105.]),
+        'high': np.array([101., 101., 106., 101., 105., 101., 106.]),
+        'low': np.array([99., 99., 94., 99., 95., 99., 99.]),
+        'sar': np.array([95., 95., 95., 104., 104., 95., 95.]),
+        'events': np.array([0, EVENT_LONG_ENTRY, EVENT_LONG_PROFIT, EVENT_SHORT_ENTRY, EVENT_SHORT_PROFIT,
+                            EVENT_LONG_ENTRY, EVENT_LONG_PROFIT], dtype=np.int8),
+        'exit_prices': np.array([nan, nan, 105., nan, 96., nan, 105.]),
+        'profits': np.array([nan, nan, 5., nan, 4., nan, 5.]),
+    }
+
+def minutes(hours) -> pd.DataFrame:
+    """
+    시각 -> {분: (고가, 저가)}로 극값을 넣은 1분 봉. 나머지 분은 100 근처에 머묾
+    """
+    frames = []
+    for hour, hits in hours.items():
+        index = pd.date_range(START + pd.Timedelta(hours=hour), periods=60, freq='min')
+        high, low = np.full(60, 100.5), np.full(60, 99.5)
+        for minute, (sub_high, sub_low) in hits.items():
+            high[minute], low[minute] = sub_high, sub_low
+        frames.append(pd.DataFrame({'Open': 100., 'High': high, 'Low': low, 'Close': 100., 'Volume': 1.},
+                                   index=index))
+    return pd.concat(frames)
+
+# 2봉: 10분에 손절(94) 뒤 30분에 익절(106) / 4봉: 5분에 익절(95) 뒤 20분에 손절(105)
+SUB_BARS = {2: {10: (100.5, 94.), 30: (106., 99.5)}, 4: {5: (100.5, 95.), 20: (105., 99.5)}}
+
+def resolve(source, bars):
+    return IntrabarResolver(source, '1h').resolve(
+        bars['index'], bars['close'], bars['high'], bars['low'], bars['sar'],
+        bars['events'], bars['exit_prices'], bars['profits']
+    )
+
+
+def test_stop_first_becomes_loss_and_take_first_stays(hourly):
+    result = resolve(frame_source(minutes(SUB_BARS)), hourly)
+
+    assert (result.ambiguous, result.resolved) == (2, 2)
+    np.testing.assert_array_equal(result.events, [0, EVENT_LONG_ENTRY, EVENT_LONG_LOSS, EVENT_SHORT_ENTRY,
+                                                  EVENT_SHORT_PROFIT, EVENT_LONG_ENTRY, EVENT_LONG_PROFIT])
+    assert result.exit_prices[2] == 95. and result.profits[2] == pytest.approx(-5.)
+    assert result.exit_prices[4] == 96. and result.profits[4] == 4.
+    # 입력은 바꾸지 않음
+    assert hourly['events'][2] == EVENT_LONG_PROFIT
+
+def test_same_sub_bar_counts_as_stop(hourly):
+    result = resolve(frame_source(minutes({2: {10: (106., 94.)}})), hourly)
+    assert result.events[2] == EVENT_LONG_LOSS
+
+def test_missing_sub_bars_keep_take_profit(hourly):
+    # 2봉의 하위 봉이 없으면 익절로 유지하고 resolved에 세지 않음
+    result = resolve(frame_source(minutes({4: SUB_BARS[4]})), hourly)
+    assert (result.ambiguous, result.resolved) == (2, 1)
+    np.testing.assert_array_equal(result.events, hourly['events'])
+    np.testing.assert_array_equal(result.exit_prices, hourly['exit_prices'])
+
+def test_store_source_matches_frame_source(hourly, tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.write('BTC-USD', '1m', minutes(SUB_BARS))
+    from_store = resolve(store_source(store, 'BTC-USD', '1m'), hourly)
+    from_frame = resolve(frame_source(minutes(SUB_BARS)), hourly)
+    for actual, expected in zip(from_store, from_frame):
+        np.testing.assert_array_equal(actual, expected)
+
+    # 저장소에 없는 심볼은 모두 미판정
+    missing = resolve(store_source(store, 'ETH-USD', '1m'), hourly)
+    assert missing.resolved == 0
+    np.testing.assert_array_equal(missing.events, hourly['events'])
@@ -0,0 +1,133 @@
+# tests/test_kline_stream.py
+
+import asyncio
+
+import numpy as np
+
+from fake_exchange import FakeExchange, ohlcv_rows
+from live.signal_pipeline import Bar, SignalPipeline
+from market_data.async_fetcher import AsyncOHLCVFetcher, ohlcv_to_frame
+from market_data.kline_stream import KlineStream, rest_backfill
+from ws_replay import ReplayServer, agg_trade_message, kline_message, wait_for
+
+STEP_MS = 60_000
+
+
+def replay_bars(n: int, seed: int = 0):
+    rows = ohlcv_rows(n, seed=seed)
+    return rows, [Bar('BTCUSDT', row[0], *row[1:]) for row in rows]
+
+async def stream_through(stream: KlineStream, done) -> None:
+    task = asyncio.ensure_future(stream.run())
+    try:
+        await wait_for(done)
+    finally:
+        stream.stop()
+        await asyncio.wait_for(task, 5.)
+
+
+def test_reconnect_fills_gap_from_rest_and_drops_duplicates():
+    rows, bars = replay_bars(60)
+    in_progress = kline_message(bars[20], closed=False)
+    sessions = [
+        [kline_message(bar) for bar in bars[:20]] + [in_progress],
+        # 재연결 후 이미 받은 봉이 다시 오고, 20~34번 봉은 빠진 채 35번부터 이어짐
+        [kline_message(bar) for bar in bars[18:20] + bars[35:]],
+    ]
+    exchange = FakeExchange({'BTC/USDT:USDT': rows})
+    received = []
+
+    async def run():
+        async with ReplayServer(sessions) as server:
+            backfill = rest_backfill(AsyncOHLCVFetcher(exchange), {'BTCUSDT': 'BTC/USDT:USDT'}, '1m')
+            stream = KlineStream(['BTCUSDT'], '1m', received.append, backfill, base_url=server.url,
+                                 initial_backoff=0.01)
+            await stream_through(stream, lambda: len(received) >= len(bars))
+            return server
+
+    server = asyncio.run(run())
+    assert received == bars
+    assert server.connections == 2
+    assert server.queries[0] == 'streams=btcusdt@kline_1m'
+    assert [(call[2], call[3]) for call in exchange.calls] == [(bars[20].open_time, 15)]
+
+def test_failed_backfill_and_handler_do_not_stop_stream():
+    rows, bars = replay_bars(30)
+    sessions = [[kline_message(bar) for bar in bars[:10]], [kline_message(bar) for bar in bars[20:]]]
+    exchange = FakeExchange({'BTC/USDT:USDT': rows})
+    rest = rest_backfill(AsyncOHLCVFetcher(exchange), {'BTCUSDT': 'BTC/USDT:USDT'}, '1m')
+    requests, received = [], []
+
+    async def backfill(symbol, start, end):
+        requests.append((start, end))
+        if len(requests) == 1:
+            raise ConnectionError('REST unavailable')
+        return await rest(symbol, start, end)
+
+    def on_bar(bar):
+        received.append(bar)
+        if bar == bars[5]:
+            raise ValueError('handler failed')
+
+    async def run():
+        async with ReplayServer(sessions) as server:
+            stream = KlineStream(['BTCUSDT'], '1m', on_bar, backfill, base_url=server.url, initial_backoff=0.01)
+            await stream_through(stream, lambda: len(received) >= len(bars))
+            return server
+
+    server = asyncio.run(run())
+    # 첫 backfill이 실패한 20번 봉은 버리고, 다음 봉에서 10~20번 봉을 다시 채움
+    assert received == bars
+    assert requests == [(bars[10].open_time, bars[20].open_time), (bars[10].open_time, bars[21].open_time)]
+    assert server.connections == 2
+
+def test_replayed_stream_matches_batch_signals():
+    from research_epm_long import add_trade_signals
+    from technical_indicators.pipeline import IndicatorPipeline, epm_indicators
+
+    rows, bars = replay_bars(900, seed=3)
+    sessions = [[kline_message(bar) for bar in bars[:500]],
+                [kline_message(bar) for bar in bars[500:600] + bars[640:]]]
+    exchange = FakeExchange({'BTC/USDT:USDT': rows})
+    pipeline = SignalPipeline()
+    updates = []
+
+    async def run():
+        async with ReplayServer(sessions) as server:
+            backfill = rest_backfill(AsyncOHLCVFetcher(exchange), {'BTCUSDT': 'BTC/USDT:USDT'}, '1m')
+            stream = KlineStream(['BTCUSDT'], '1m', lambda bar: updates.append(pipeline.on_bar(bar)), backfill,
+                                 base_url=server.url, initial_backoff=0.01)
+            await stream_through(stream, lambda: len(updates) >= len(bars))
+
+    asyncio.run(run())
+    data = ohlcv_to_frame(rows)
+    reference = add_trade_signals(IndicatorPipeline(epm_indicators(), cache=None).run(data))
+
+    assert [update.bar for update in updates] == bars
+    np.testing.assert_allclose([update.sar for update in updates], reference['ParabolicSAR'].to_numpy())
+    np.testing.assert_array_equal([update.entry_price for update in updates], reference['EntryPrice'].to_numpy())
+    events = np.array([update.event for update in updates])
+    assert (events > 0).any()
+
+def test_agg_trade_bar_closes_on_timer_without_next_trade():
+    open_time = 1_704_067_200_000
+    trades = [(100., 1.), (101.5, 0.5), (99.25, 2.), (100.75, 0.25)]
+    sessions = [[agg_trade_message('BTCUSDT', price, qty, open_time + 1000 * i) for i, (price, qty) in enumerate(trades)]]
+    received = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        # 봉이 끝나기 50ms 전부터 흐르는 시계: 다음 체결 없이 타이머만으로 마감되어야 함
+        def clock():
+            return (open_time + STEP_MS) / 1000 - 0.05 + (loop.time() - started)
+
+        async with ReplayServer(sessions) as server:
+            stream = KlineStream(['BTCUSDT'], '1m', received.append, base_url=server.url, agg_trade=True,
+                                 flush_delay=0.02, clock=clock)
+            await stream_through(stream, lambda: len(received) >= 1)
+            return loop.time() - started
+
+    elapsed = asyncio.run(run())
+    assert received == [Bar('BTCUSDT', open_time, 100., 101.5, 99.25, 100.75, 3.75)]
+    assert elapsed < 1.
@@ -0,0 +1,61 @@
+# tests/test_latch.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from technical_indicators.latch import crossed_above, latch
+
+
+def loop_latch(set_: np.ndarray, reset: np.ndarray) -> np.ndarray:
+    """
+    이전 r2.py의 루프 (extended_k_above_d, buy_signal)를 그대로 옮긴 기준 구현
+    """
+    state = set_.copy()
+    for i in range(1, len(set_)):
+        if state[i - 1]:
+            state[i] = not reset[i]
+        elif set_[i]:
+            state[i] = True
+    return state
+
+def random_conditions(shape, seed: int, density: float = 0.3):
+    rng = np.random.default_rng(seed)
+    set_ = rng.random(shape) < density
+    reset = rng.random(shape) < density
+    # set과 reset이 모두 참인 봉이 연속되는 구간
+    set_[..., 40:50] = reset[..., 40:50] = True
+    return set_, reset
+
+
+@pytest.mark.parametrize('density', [0.05, 0.3, 0.7])
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_r2_loop(seed, density):
+    set_, reset = random_conditions(500, seed, density)
+    assert (set_ & reset).any()
+    np.testing.assert_array_equal(latch(set_, reset), loop_latch(set_, reset))
+
+def test_rows_match_r2_loop():
+    set_, reset = random_conditions((6, 300), 1)
+    expected = np.stack([loop_latch(s, r) for s, r in zip(set_, reset)])
+    np.testing.assert_array_equal(latch(set_, reset), expected)
+
+def test_first_bar_and_initial_state():
+    # 첫 봉은 이전 루프와 같이 set 값 (둘 다 참이면 꺼진 상태에서 반전 -> 켜짐)
+    cases = {(True, True): True, (True, False): True, (False, True): False, (False, False): False}
+    for (s, r), expected in cases.items():
+        assert latch(np.array([s]), np.array([r]))[0] == expected
+
+    # initial=True면 첫 봉 이전이 켜진 상태
+    set_, reset = random_conditions(200, 2)
+    expected = loop_latch(np.concatenate([[True], set_]), np.concatenate([[False], reset]))[1:]
+    np.testing.assert_array_equal(latch(set_, reset, initial=True), expected)
+    assert latch(np.zeros(0, dtype=bool), np.zeros(0, dtype=bool)).shape == (0,)
+
+def test_crossed_above_matches_r2_expression():
+    rng = np.random.default_rng(3)
+    k, d = rng.uniform(0, 100, 300), rng.uniform(0, 100, 300)
+    k[[0, 10, 11]] = np.nan
+    expected = (pd.Series(k).shift(1) < pd.Series(d).shift(1)) & (pd.Series(k) > pd.Series(d))
+    np.testing.assert_array_equal(crossed_above(k, d), expected.to_numpy())
+    np.testing.assert_array_equal(crossed_above(np.stack([k, d]), np.stack([d, k]))[0], expected.to_numpy())
@@ -0,0 +1,25 @@
+# tests/test_latency.py
+
+import numpy as np
+
+from instrumentation.latency import MAX_LATENCY_NS, LatencyHistogram, _bucket_index, _bucket_upper
+
+
+def test_bucket_relative_error_is_below_one_percent():
+    values = np.unique(np.concatenate([
+        np.arange(1, 100_000), np.random.default_rng(0).integers(1, MAX_LATENCY_NS, 100_000)
+    ])).tolist()
+    uppers = np.array([_bucket_upper(_bucket_index(value)) for value in values], dtype=np.float64)
+
+    assert (uppers >= values).all()
+    assert ((uppers - values) / values).max() < 0.01
+
+def test_quantiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value * 1000)
+
+    snapshot = histogram.snapshot((0.5, 0.99))
+    assert snapshot['count'] == 100_000 and snapshot['max_ns'] == 100_000_000
+    assert 50_000_000 <= snapshot['p50_ns'] < 50_000_000 * 1.01
+    assert 99_000_000 <= snapshot['p99_ns'] < 99_000_000 * 1.01
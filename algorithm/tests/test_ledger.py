@@ -0,0 +1,106 @@
+# tests/test_ledger.py
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.core import (
+    EVENT_LONG_ENTRY, EVENT_LONG_TO_SHORT, EVENT_SHORT_ENTRY, EVENT_SHORT_PROFIT, POSITION_LONG, POSITION_SHORT
+)
+from backtest.ledger import (
+    NAT, STATISTICS, TradeLedger, _statistics_arrays, _statistics_kernel, ledger_statistics, trade_statistics
+)
+
+
+@pytest.fixture
+def bars():
+    """
+    Long 진입 -> Long/Short 전환 -> Short 익절 -> 미청산 Short 진입 (8봉)
+    """
+    nan = np.nan
+    return {
+        'events': np.array([0, EVENT_LONG_ENTRY, 0, EVENT_LONG_TO_SHORT, 0, EVENT_SHORT_PROFIT, EVENT_SHORT_ENTRY, 0],
+                           dtype=np.int8),
+        'entry_prices': np.array([nan, 100., nan, 110., nan, nan, 100., nan]),
+        'exit_prices': np.array([nan, nan, nan, 110., nan, 99., nan, nan]),
+        'profits': np.array([nan, nan, nan, 10., nan, 10., nan, nan]),
+        'high': np.array([101., 102., 105., 112., 115., 104., 101., 103.]),
+        'low': np.array([99., 98., 95., 108., 100., 98., 99., 97.]),
+        'times': pd.date_range('2024-01-01', periods=8, freq='h', tz='UTC'),
+    }
+
+def test_from_events_matches_hand_computed_ledger(bars):
+    ledger = TradeLedger.from_events(bars['events'], bars['entry_prices'], bars['exit_prices'], bars['profits'],
+                                     bars['high'], bars['low'], bars['times'], fee_rate=0.001)
+
+    assert len(ledger) == 3
+    np.testing.assert_array_equal(ledger.entry_index, [1, 3, 6])
+    # 전환 봉(3)은 첫 거래의 청산이자 두 번째 거래의 진입, 마지막 거래는 미청산
+    np.testing.assert_array_equal(ledger.exit_index, [3, 5, -1])
+    np.testing.assert_array_equal(ledger.side, [POSITION_LONG, POSITION_SHORT, POSITION_SHORT])
+    np.testing.assert_array_equal(ledger.entry_price, [100., 110., 100.])
+    np.testing.assert_array_equal(ledger.exit_price, [110., 99., np.nan])
+    np.testing.assert_array_equal(ledger.profit, [10., 10., np.nan])
+    np.testing.assert_allclose(ledger.fees, [0.1 * (1 + 1.1), 0.1 * (1 + 99 / 110), 0.1])
+
+    times = bars['times'].as_unit('ns').asi8
+    np.testing.assert_array_equal(ledger.entry_time, times[[1, 3, 6]])
+    np.testing.assert_array_equal(ledger.exit_time, [times[3], times[5], NAT])
+
+    # MAE/MFE: 진입 다음 봉부터 청산 봉까지 (미청산은 마지막 봉까지), 유리한 방향이 +
+    np.testing.assert_allclose(ledger.mae, [-5., (110 - 115) / 110 * 100, -3.])
+    np.testing.assert_allclose(ledger.mfe, [12., (110 - 98) / 110 * 100, 3.])
+    np.testing.assert_array_equal(ledger.holding_bars(8), [2, 2, 2])
+
+def test_from_events_without_prices_or_times(bars):
+    ledger = TradeLedger.from_events(bars['events'][:4], bars['entry_prices'][:4], bars['exit_prices'][:4],
+                                     bars['profits'][:4])
+    np.testing.assert_array_equal(ledger.exit_index, [3, -1])
+    assert np.isnan(ledger.mae).all() and np.isnan(ledger.mfe).all()
+    assert (ledger.entry_time == NAT).all()
+    np.testing.assert_array_equal(ledger.fees, [0., 0.])
+
+def test_trade_statistics_hand_computed():
+    returns = np.array([10., -5., np.nan])
+    held = np.array([2, 3, 4])
+    stats = trade_statistics(returns, held, 10)
+
+    std = math.sqrt(7.5 ** 2 * 2)
+    assert stats['trades'] == 2
+    assert stats['win_rate'] == 0.5
+    assert stats['total_return'] == pytest.approx((1.1 * 0.95 - 1) * 100)
+    assert stats['mean_return'] == pytest.approx(2.5)
+    assert stats['max_drawdown'] == pytest.approx((1 - 0.95) * 100)
+    assert stats['sharpe'] == pytest.approx(2.5 / std)
+    assert stats['sortino'] == pytest.approx(2.5 / math.sqrt(25 / 2))
+    assert stats['profit_factor'] == pytest.approx(2.)
+    assert stats['exposure'] == pytest.approx(0.9)
+
+    # 1년 10봉 x 2거래 -> 연 20거래로 연율화
+    annual = trade_statistics(returns, held, 10, bars_per_year=100)
+    assert annual['sharpe'] == pytest.approx(2.5 / std * math.sqrt(20))
+
+def test_no_closed_trades():
+    stats = trade_statistics(np.array([np.nan]), np.array([5]), 10)
+    assert (stats['trades'], stats['total_return'], stats['max_drawdown'], stats['exposure']) == (0, 0., 0., 0.5)
+    assert np.isnan(stats['win_rate']) and np.isnan(stats['sharpe'])
+
+def test_array_statistics_match_kernel():
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0.1, 2., 5000)
+    returns[rng.random(5000) < 0.01] = np.nan
+    held = rng.integers(1, 50, 5000)
+    for periods in (0., 250.):
+        expected = _statistics_kernel(returns, held, 300_000, periods)
+        np.testing.assert_allclose(_statistics_arrays(returns, held, 300_000, periods), expected, rtol=1e-9)
+
+def test_ledger_statistics_uses_net_returns(bars):
+    ledger = TradeLedger.from_events(bars['events'], bars['entry_prices'], bars['exit_prices'], bars['profits'],
+                                     fee_rate=0.001)
+    net = ledger_statistics(ledger, 8)
+    gross = ledger_statistics(ledger, 8, net=False)
+    assert set(net) == set(STATISTICS)
+    assert gross['total_return'] == pytest.approx(21.)
+    assert net['total_return'] == pytest.approx(((1 + (10 - 0.21) / 100) * (1 + (10 - 0.1 * (1 + 99 / 110)) / 100) - 1) * 100)
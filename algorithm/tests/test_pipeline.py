@@ -0,0 +1,33 @@
+# tests/test_pipeline.py
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_ohlcv
+from technical_indicators.pipeline import IndicatorCache, IndicatorPipeline, epm_indicators
+
+
+def test_cache_is_bounded_by_bytes():
+    cache = IndicatorCache(maxsize=100, max_bytes=3 * 8000)
+    for key in range(5):
+        cache.put(key, np.zeros(1000))
+    assert len(cache) == 3 and cache.nbytes == 24000
+    assert cache.get(0) is None and cache.get(4) is not None
+
+    # max_bytes보다 큰 결과는 캐시하지 않고, 튜플 결과는 모든 배열을 셈
+    cache.put('big', np.zeros(4000))
+    assert cache.get('big') is None and cache.nbytes == 24000
+    cache.put(4, (np.zeros(500), np.zeros(1000)))
+    assert cache.nbytes == 8000 + 12000 and cache.get(2) is None
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+def test_cached_run_matches_uncached():
+    data = synthetic_ohlcv(5000)
+    cache = IndicatorCache(max_bytes=2**20)
+    pipeline = IndicatorPipeline(epm_indicators(), cache=cache)
+    first, second = pipeline.run(data), pipeline.run(data)
+
+    assert cache.hits > 0 and cache.nbytes <= cache.max_bytes
+    uncached = IndicatorPipeline(epm_indicators(), cache=None).run(data)
+    for frame in (first, second):
+        np.testing.assert_array_equal(frame.to_numpy(), uncached.to_numpy())
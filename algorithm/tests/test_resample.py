@@ -0,0 +1,89 @@
+# tests/test_resample.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_ohlcv
+from live.signal_pipeline import Bar
+from market_data.candle_store import CANDLE_COLUMNS, TIME_COLUMN
+from market_data.resample import IncrementalResampler, resample, resample_arrays
+
+# pandas resample 규칙 (분은 'min')
+PANDAS_RULES = {'5m': '5min', '15m': '15min', '1h': '1h', '4h': '4h'}
+AGGREGATIONS = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+@pytest.fixture(scope='module')
+def minutes():
+    """
+    1분 봉 이틀치에서 하위 봉 일부(한 구간 전체 포함)를 뺀 데이터. 마지막 4h 구간은 끝나지 않음
+    """
+    data = synthetic_ohlcv(2 * 1440 - 7, seed=5)
+    missing = np.zeros(len(data), dtype=bool)
+    missing[[3, 4, 61, 500]] = True
+    missing[600:630] = True
+    return data[~missing]
+
+def bars(data: pd.DataFrame, symbol: str = 'BTCUSDT'):
+    times = data.index.as_unit('ns').asi8 // 10**6
+    for time, row in zip(times, data[list(CANDLE_COLUMNS)].itertuples(index=False)):
+        yield Bar(symbol, int(time), *row)
+
+
+@pytest.mark.parametrize('interval', list(PANDAS_RULES))
+def test_batch_matches_pandas_resample(minutes, interval):
+    expected = minutes.resample(PANDAS_RULES[interval]).agg(AGGREGATIONS).dropna(subset=['Open'])
+    actual = resample(minutes, interval)
+
+    np.testing.assert_array_equal(actual.index.as_unit('ns').asi8, expected.index.as_unit('ns').asi8)
+    for name in ('Open', 'High', 'Low', 'Close'):
+        np.testing.assert_array_equal(actual[name].to_numpy(), expected[name].to_numpy())
+    np.testing.assert_allclose(actual['Volume'].to_numpy(), expected['Volume'].to_numpy(), rtol=1e-12)
+
+    arrays = {TIME_COLUMN: minutes.index.as_unit('ns').asi8, **{c: minutes[c].to_numpy() for c in CANDLE_COLUMNS}}
+    from_arrays = resample_arrays(arrays, interval)
+    np.testing.assert_array_equal(from_arrays[TIME_COLUMN], expected.index.as_unit('ns').asi8)
+    for name in CANDLE_COLUMNS:
+        np.testing.assert_array_equal(from_arrays[name], actual[name].to_numpy())
+
+def test_complete_only_drops_unfinished_bucket(minutes):
+    everything = resample(minutes, '4h')
+    complete = resample(minutes, '4h', base_interval='1m', complete_only=True)
+    pd.testing.assert_frame_equal(complete, everything.iloc[:-1])
+    with pytest.raises(ValueError):
+        resample(minutes, '4h', complete_only=True)
+
+def test_incremental_matches_batch(minutes):
+    resampler = IncrementalResampler()
+    closed = [item for bar in bars(minutes) for item in resampler.update(bar)]
+
+    for interval in PANDAS_RULES:
+        expected = resample(minutes, interval, base_interval='1m', complete_only=True)
+        got = [higher for name, higher in closed if name == interval]
+        assert [b.open_time for b in got] == list(expected.index.as_unit('ns').asi8 // 10**6)
+        frame = pd.DataFrame([b[2:] for b in got], columns=list(CANDLE_COLUMNS))
+        for name in ('Open', 'High', 'Low', 'Close'):
+            np.testing.assert_array_equal(frame[name].to_numpy(), expected[name].to_numpy())
+        np.testing.assert_allclose(frame['Volume'].to_numpy(), expected['Volume'].to_numpy(), rtol=1e-12)
+
+    # 끝나지 않은 4h 봉은 진행 중으로 남음
+    partial = resampler.partial('BTCUSDT', '4h')
+    assert partial is not None and partial.close == minutes['Close'].iloc[-1]
+
+def test_incremental_ignores_duplicate_and_out_of_order_bars(minutes):
+    data = minutes.iloc[:60]
+    stream = list(bars(data))
+    replayed = stream[:20] + stream[15:20] + [stream[3]] + stream[20:]
+
+    clean, noisy = IncrementalResampler(['5m', '15m']), IncrementalResampler(['5m', '15m'])
+    expected = [item for bar in stream for item in clean.update(bar)]
+    actual = [item for bar in replayed for item in noisy.update(bar)]
+    assert actual == expected
+    assert noisy.update(stream[-1]) == []
+
+    # 심볼마다 따로 추적
+    other = Bar('ETHUSDT', *stream[0][1:])
+    assert noisy.partial('ETHUSDT', '5m') is None
+    noisy.update(other)
+    assert noisy.partial('ETHUSDT', '5m') == Bar('ETHUSDT', *stream[0][1:])
@@ -0,0 +1,47 @@
+# tests/test_research_epm_long.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.core import SIGNAL_COLUMNS, expand_events
+from benchmarks.synthetic import synthetic_ohlcv
+from research_epm_long import add_trade_signals, compact_epm_frame
+from technical_indicators.pipeline import IndicatorPipeline, epm_indicators
+
+PRICE_COLUMNS = ('EntryPrice', 'ExitPrice', 'ProfitPercentage')
+
+
+@pytest.fixture(scope='module')
+def data():
+    return synthetic_ohlcv(30_000, seed=2)
+
+@pytest.fixture(scope='module')
+def dense(data):
+    return add_trade_signals(IndicatorPipeline(epm_indicators(), cache=None).run(data))
+
+
+@pytest.mark.parametrize('dtype', [np.float32, None])
+def test_compact_events_match_add_trade_signals(data, dense, dtype):
+    compact, ledger = compact_epm_frame(data, dtype=dtype)
+
+    for name in epm_indicators():
+        expected = dense[name].to_numpy()
+        assert compact[name].dtype == (expected.dtype if dtype is None else dtype)
+        np.testing.assert_array_equal(compact[name].to_numpy(), expected.astype(dtype or expected.dtype))
+    for name in ('Open', 'High', 'Low', 'Close', 'Volume'):
+        np.testing.assert_array_equal(compact[name].to_numpy(), data[name].to_numpy())
+
+    signals = expand_events(compact['Event'].to_numpy())
+    assert signals['LongSignal'].sum() > 10
+    for name in SIGNAL_COLUMNS:
+        np.testing.assert_array_equal(signals[name], dense[name].to_numpy())
+
+def test_signal_rows_match_dense_markers(data, dense):
+    compact, ledger = compact_epm_frame(data)
+    rows = ledger.signal_rows(compact)
+
+    expected = dense[dense[list(SIGNAL_COLUMNS)].any(axis=1)]
+    pd.testing.assert_index_equal(rows.index, expected.index)
+    for name in ('High', 'Low') + SIGNAL_COLUMNS + PRICE_COLUMNS:
+        np.testing.assert_array_equal(rows[name].to_numpy(), expected[name].to_numpy())
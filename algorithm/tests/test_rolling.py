@@ -0,0 +1,63 @@
+# tests/test_rolling.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from technical_indicators.rolling import rolling_max, rolling_mean, rolling_min, stochastic_rsi_arrays
+from technical_indicators.streaming import RollingMeanState, RollingMinMaxState
+
+WINDOWS = (1, 3, 14, 50)
+
+
+def series(seed: int = 0, n: int = 1000) -> np.ndarray:
+    """
+    NaN 구간, 같은 값 반복, 음수/양수가 섞인 값
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0, 1, n).cumsum() * 10. ** rng.integers(-3, 4)
+    values[[5, 17, 18, 19, 300]] = np.nan
+    values[400:420] = np.nan
+    values[500:540] = values[499]
+    values[600:610] = -values[600:610]
+    values[700:760] = 0.
+    return values
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_matches_pandas_bit_for_bit(window, seed):
+    values = series(seed)
+    rolling = pd.Series(values).rolling(window)
+    np.testing.assert_array_equal(rolling_min(values, window), rolling.min().to_numpy())
+    np.testing.assert_array_equal(rolling_max(values, window), rolling.max().to_numpy())
+    np.testing.assert_array_equal(rolling_mean(values, window), rolling.mean().to_numpy())
+
+def test_short_input_and_rows():
+    values = series()
+    # 구간보다 짧은 입력은 모두 NaN
+    assert np.isnan(rolling_mean(values[:10], 14)).all() and np.isnan(rolling_min(values[:10], 14)).all()
+
+    rows = np.stack([values, series(1), np.full(len(values), np.nan)])
+    for function in (rolling_min, rolling_max, rolling_mean):
+        np.testing.assert_array_equal(function(rows, 14), np.stack([function(row, 14) for row in rows]))
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_streaming_states_match_batch(window):
+    values = series()
+    states = (RollingMinMaxState(window), RollingMinMaxState(window, is_max=True), RollingMeanState(window))
+    streamed = np.array([[state.update(value) for state in states] for value in values])
+    np.testing.assert_array_equal(streamed[:, 0], rolling_min(values, window))
+    np.testing.assert_array_equal(streamed[:, 1], rolling_max(values, window))
+    np.testing.assert_array_equal(streamed[:, 2], rolling_mean(values, window))
+
+def test_stochastic_rsi_matches_pandas():
+    rsi = pd.Series(np.clip(series(3) % 100, 0, 100))
+    min_val = rsi.rolling(14).min()
+    max_val = rsi.rolling(14).max()
+    k = (((rsi - min_val) / (max_val - min_val)) * 100).rolling(3).mean()
+    d = k.rolling(3).mean()
+
+    actual_k, actual_d = stochastic_rsi_arrays(rsi.to_numpy())
+    np.testing.assert_array_equal(actual_k, k.to_numpy())
+    np.testing.assert_array_equal(actual_d, d.to_numpy())
@@ -0,0 +1,65 @@
+# tests/test_rounding.py
+
+import decimal
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from math_extention.rounding import (
+    ROUND_DOWN, ROUND_HALF_UP, ROUND_UP, PrecisionTable, ceil_to_step, floor_to_step, quantize, round_to_tick
+)
+
+DECIMAL_MODES = {ROUND_HALF_UP: decimal.ROUND_HALF_UP, ROUND_DOWN: decimal.ROUND_DOWN, ROUND_UP: decimal.ROUND_UP}
+TICKS = (0.01, 0.001, 0.05, 0.5, 10., 1e-8)
+
+
+def values() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    random = rng.uniform(1, 10, 200) * 10. ** rng.integers(-12, 12, 200)
+    boundary = [1.005, 2.675, 0.3 / 0.1, 0.1 + 0.2, 1.115, 64999.97, 0.0125, 1234.5, 0.000150]
+    extreme = [1e-20, 1e-30, 3.3e-17, 1e15 + 0.5, 1e17, 1e20, 1.5e20, 1e300]
+    magnitudes = np.concatenate([random, boundary, extreme])
+    return np.concatenate([magnitudes, -magnitudes, [0., np.nan]])
+
+def decimal_reference(value: float, tick: float, mode: int) -> float:
+    """
+    값을 유효 숫자 15자리 십진수로 나타내 Decimal로 맞춘 결과
+    """
+    if value != value or value == 0:
+        return value
+    with decimal.localcontext() as context:
+        context.prec = 400
+        tick_decimal = Decimal(repr(tick))
+        count = (Decimal(f'{value:.15g}') / tick_decimal).to_integral_value(rounding=DECIMAL_MODES[mode])
+        return float(count * tick_decimal)
+
+
+@pytest.mark.parametrize('mode', [ROUND_HALF_UP, ROUND_DOWN, ROUND_UP])
+@pytest.mark.parametrize('tick', TICKS)
+def test_scalar_array_and_decimal_agree(tick, mode):
+    data = values()
+    array = quantize(data, tick, mode)
+    scalar = np.array([quantize(value, tick, mode) for value in data])
+    expected = np.array([decimal_reference(value, tick, mode) for value in data])
+
+    np.testing.assert_array_equal(array, scalar)
+    np.testing.assert_allclose(array, expected, rtol=1e-14, atol=0)
+    # 2차원 입력도 원소별로 같은 결과
+    np.testing.assert_array_equal(quantize(data[:-2].reshape(2, -1), tick, mode), array[:-2].reshape(2, -1))
+
+def test_tiny_and_huge_values_do_not_overflow():
+    np.testing.assert_array_equal(ceil_to_step(np.array([1e-20, -1e-20]), 0.001), [0.001, -0.001])
+    assert ceil_to_step(1e-20, 0.001) == 0.001
+    np.testing.assert_array_equal(round_to_tick(np.array([1e-30, 6e-9]), 1e-8), [0., 1e-8])
+    assert round_to_tick(1e-30, 1e-8) == 0.
+    np.testing.assert_array_equal(floor_to_step(np.array([1e20 + 0.7]), 0.001), [1e20])
+
+def test_precision_table_matches_quantize():
+    table = PrecisionTable(['A', 'B'], [0.01, 0.05], [0.001, 1.])
+    data = values()[:50]
+    np.testing.assert_array_equal(table.price('B', data), round_to_tick(data, 0.05))
+    assert table.amount('A', 1e-20, ROUND_UP) == 0.001
+    symbols = ['A', 'B'] * 25
+    expected = [floor_to_step(value, 0.001 if symbol == 'A' else 1.) for symbol, value in zip(symbols, data)]
+    np.testing.assert_array_equal(table.amounts(symbols, data), expected)
@@ -0,0 +1,88 @@
+# tests/test_streaming.py
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_ohlcv
+from heikin_ashi import heikin_ashi
+from rsi import cal_rsi, stochastic_rsi
+from technical_indicators.ema200 import calculate_ema
+from technical_indicators.macd import calculate_macd
+from technical_indicators.parabolic_sar import parabolic_sar_arrays
+from technical_indicators.streaming import (
+    EMAState, EWMState, HeikinAshiState, MACDState, ParabolicSARState, RSIState, StochRSIState, load_state
+)
+
+N = 600
+
+
+@pytest.fixture(scope='module')
+def data():
+    frame = synthetic_ohlcv(N, seed=7)
+    # 같은 종가가 이어지는 구간 (RSI 손실 0, EWM 동일 값 분기)
+    frame.iloc[100:110, frame.columns.get_loc('Close')] = frame['Close'].iloc[100]
+    return frame
+
+def stream(state, columns, resume_at=None):
+    """
+    봉을 하나씩 넣은 결과를 모읍니다. resume_at이 있으면 그 봉 앞에서 JSON으로 저장/복원한 상태로 이어 갑니다.
+    """
+    rows = []
+    for i, values in enumerate(zip(*columns)):
+        if i == resume_at:
+            state = load_state(json.loads(json.dumps(state.to_dict())))
+        rows.append(state.update(*values))
+    return np.array(rows, dtype=float)
+
+RESUME = (None, 1, 13, N // 2)
+
+
+@pytest.mark.parametrize('resume_at', RESUME)
+def test_ewm_matches_pandas(data, resume_at):
+    close = data['Close'].to_numpy().copy()
+    close[[5, 40, 41]] = np.nan
+    for alpha, adjust, min_periods in ((0.1, False, 0), (1 / 14, True, 14), (0.5, False, 3)):
+        expected = pd.Series(close).ewm(alpha=alpha, adjust=adjust, min_periods=min_periods).mean().to_numpy()
+        actual = stream(EWMState(alpha, adjust, min_periods), [close], resume_at)
+        np.testing.assert_array_equal(actual, expected)
+
+@pytest.mark.parametrize('resume_at', RESUME)
+def test_ema_and_macd_match_batch(data, resume_at):
+    close = data['Close'].to_numpy()
+    np.testing.assert_array_equal(stream(EMAState(200), [close], resume_at), calculate_ema(data, 200).to_numpy())
+
+    expected = np.column_stack([s.to_numpy() for s in calculate_macd(data)])
+    np.testing.assert_array_equal(stream(MACDState(), [close], resume_at), expected)
+
+@pytest.mark.parametrize('resume_at', RESUME)
+def test_parabolic_sar_matches_batch(data, resume_at):
+    high, low = data['High'].to_numpy(), data['Low'].to_numpy()
+    actual = stream(ParabolicSARState(), [high, low], resume_at)
+    np.testing.assert_array_equal(actual, parabolic_sar_arrays(high, low)[0])
+
+@pytest.mark.parametrize('resume_at', RESUME)
+def test_rsi_and_stoch_rsi_match_batch(data, resume_at):
+    rsi = cal_rsi(data)
+    np.testing.assert_array_equal(stream(RSIState(), [data['Close'].to_numpy()], resume_at), rsi.to_numpy())
+
+    k, d = stochastic_rsi(rsi)
+    actual = stream(StochRSIState(), [rsi.to_numpy()], resume_at)
+    np.testing.assert_array_equal(actual, np.column_stack([k.to_numpy(), d.to_numpy()]))
+
+@pytest.mark.parametrize('tick', [0.01, 0.5, None])
+@pytest.mark.parametrize('resume_at', RESUME)
+def test_heikin_ashi_matches_batch(data, tick, resume_at):
+    columns = [data[c].to_numpy() for c in ('Open', 'High', 'Low', 'Close')]
+    actual = stream(HeikinAshiState(tick), columns, resume_at)
+    np.testing.assert_array_equal(actual, heikin_ashi(data, tick).to_numpy())
+
+def test_nested_state_round_trip_is_json():
+    state = StochRSIState()
+    for value in np.linspace(10, 90, 20):
+        state.update(value)
+    saved = json.loads(json.dumps(state.to_dict()))
+    restored = load_state(saved)
+    assert type(restored) is StochRSIState and restored.to_dict() == saved
@@ -0,0 +1,40 @@
+# tests/test_sweep.py
+
+import pandas as pd
+import pytest
+
+from backtest.sweep import SweepParams, grid_search_space, random_search_space, run_sweep
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+@pytest.fixture(scope='module')
+def data():
+    return synthetic_ohlcv(5000, seed=4)
+
+@pytest.fixture(scope='module')
+def params():
+    return grid_search_space(ema_periods=(50, 200), fast_periods=(8, 12), slow_periods=(21, 26), steps=(0.02, 0.03))
+
+
+@pytest.mark.parametrize('statistics', [False, True])
+def test_serial_matches_parallel(data, params, statistics):
+    # chunk_size를 작게 해 여러 청크가 여러 워커에 나뉘도록 함
+    options = {'chunk_size': 3, 'statistics': statistics, 'fee_rate': 0.0005 if statistics else 0.}
+    serial = run_sweep(data, params, max_workers=1, **options)
+    parallel = run_sweep(data, params, max_workers=2, **options)
+    assert len(serial) == len(params)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+def test_random_search_space_samples_from_grid():
+    space = {'ema_period': (50, 100, 200), 'fast_period': (8, 12, 30), 'slow_period': (26,)}
+    samples = random_search_space(space, 5, seed=1)
+    assert len(samples) == len(set(samples)) == 5
+    assert set(samples) <= set(grid_search_space((50, 100, 200), (8, 12, 30), (26,)))
+    assert samples == random_search_space(space, 5, seed=1)
+    # 조합보다 많이 뽑으면 전체 (fast >= slow인 30은 제외)
+    assert len(random_search_space(space, 100)) == 6
+    assert all(p.step == SweepParams().step for p in samples)
+
+def test_random_search_space_rejects_unknown_names():
+    with pytest.raises(ValueError, match='ema_periods'):
+        random_search_space({'ema_periods': (50, 100)}, 2)
@@ -0,0 +1,67 @@
+# tests/test_walk_forward.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.sweep import OHLC_COLUMNS, _attach_local, _evaluate, grid_search_space
+from backtest.walk_forward import METRICS, Window, rolling_windows, run_walk_forward
+from benchmarks.synthetic import synthetic_ohlcv
+
+TRAIN, TEST, WARMUP = 1500, 500, 200
+
+
+@pytest.fixture(scope='module')
+def data():
+    return synthetic_ohlcv(4200, seed=3)
+
+@pytest.fixture(scope='module')
+def params():
+    return grid_search_space(ema_periods=(50, 100), fast_periods=(8, 12), steps=(0.02, 0.04))
+
+
+def test_rolling_windows_boundaries():
+    assert rolling_windows(100, 30, 10, warmup=5) == [
+        Window(start, start + 30, start + 30, start + 40) for start in range(5, 56, 10)
+    ]
+    anchored = rolling_windows(100, 30, 10, warmup=5, anchored=True)
+    assert [w.train_start for w in anchored] == [5] * 6
+    assert [w.train_end for w in anchored] == list(range(35, 86, 10))
+    # 검증 구간이 test_bars보다 짧게 남으면 제외, 학습+검증이 데이터보다 길면 빈 목록
+    assert rolling_windows(94, 30, 10, warmup=5)[-1] == Window(45, 75, 75, 85)
+    assert rolling_windows(39, 30, 10) == []
+    assert rolling_windows(40, 30, 10) == [Window(0, 30, 30, 40)]
+
+def test_test_windows_use_in_sample_choice(data, params):
+    results = run_walk_forward(data, params, TRAIN, TEST, warmup=WARMUP, max_workers=1)
+    assert len(results) == 5 and results['ema_period'].notna().all()
+
+    _attach_local(np.ascontiguousarray(data[list(OHLC_COLUMNS)].to_numpy(dtype=np.float64).T))
+    for _, row in results.iterrows():
+        # 학습 구간 성과로만 고른 조합 (동점이면 결과와 같은 조합이 포함되는지 확인)
+        train = [_evaluate(p, int(row['train_start']), int(row['train_end'])) for p in params]
+        eligible = [t for t in train if t['trades'] >= 1]
+        best = max(t['total_return'] for t in eligible)
+        chosen = next(p for p in params if all(row[name] == value for name, value in p._asdict().items()))
+        assert row['train_total_return'] == best
+        assert _evaluate(chosen, int(row['train_start']), int(row['train_end']))['total_return'] == best
+
+        test = _evaluate(chosen, int(row['test_start']), int(row['test_end']))
+        for name in METRICS:
+            np.testing.assert_equal(row[f'test_{name}'], test[name])
+
+def test_choice_ignores_data_after_train_end(data, params):
+    # 첫 구간의 학습 끝 이후 봉을 바꿔도 첫 구간의 선택과 학습 성과는 그대로
+    original = run_walk_forward(data, params, TRAIN, TEST, warmup=WARMUP, max_workers=1)
+    changed = data.copy()
+    end = WARMUP + TRAIN
+    changed.iloc[end:] = synthetic_ohlcv(len(data) - end, seed=99).to_numpy()
+    perturbed = run_walk_forward(changed, params, TRAIN, TEST, warmup=WARMUP, max_workers=1)
+
+    columns = ['ema_period', 'fast_period', 'step'] + [f'train_{name}' for name in METRICS]
+    pd.testing.assert_series_equal(perturbed.loc[0, columns], original.loc[0, columns])
+
+def test_serial_matches_parallel(data, params):
+    serial = run_walk_forward(data, params, TRAIN, TEST, warmup=WARMUP, max_workers=1)
+    parallel = run_walk_forward(data, params, TRAIN, TEST, warmup=WARMUP, max_workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
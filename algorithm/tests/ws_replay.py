@@ -0,0 +1,138 @@
+# tests/ws_replay.py
+
+"""
+Binance combined stream을 흉내 내는 로컬 WebSocket 리플레이 서버입니다.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from live.signal_pipeline import Bar
+
+
+def kline_message(bar: Bar, interval: str = '1m', closed: bool = True) -> Dict[str, Any]:
+    """
+    봉을 combined stream kline 메시지로 만듭니다.
+    """
+    k = {'t': bar.open_time, 'i': interval, 'o': str(bar.open), 'h': str(bar.high), 'l': str(bar.low),
+         'c': str(bar.close), 'v': str(bar.volume), 'x': closed}
+    return {'stream': f'{bar.symbol.lower()}@kline_{interval}', 'data': {'e': 'kline', 's': bar.symbol, 'k': k}}
+
+def agg_trade_message(symbol: str, price: float, quantity: float, trade_time: int) -> Dict[str, Any]:
+    return {'stream': f'{symbol.lower()}@aggTrade',
+            'data': {'e': 'aggTrade', 's': symbol, 'p': str(price), 'q': str(quantity), 'T': trade_time}}
+
+
+class ReplayServer:
+    """
+    연결마다 준비된 메시지 묶음 하나를 보냅니다. 묶음을 다 보낸 뒤 hold가 False면 연결을 끊어
+    재연결을 유도하고, True면 클라이언트가 닫을 때까지 연결을 유지합니다.
+    """
+
+    def __init__(self, sessions: List[List[Dict[str, Any]]], hold_last: bool = True):
+        """
+        :param sessions: 연결 순서별 보낼 메시지 목록
+        :param hold_last: 마지막 묶음을 보낸 뒤 연결을 유지할지 여부
+        """
+        self.sessions = list(sessions)
+        self.hold_last = hold_last
+        self.connections = 0
+        self.queries: List[str] = []
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ''
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.queries.append(request.query_string)
+        index = self.connections
+        self.connections += 1
+        messages = self.sessions[index] if index < len(self.sessions) else []
+        for message in messages:
+            await ws.send_str(json.dumps(message))
+        if index >= len(self.sessions) - 1 and self.hold_last:
+            async for _ in ws:
+                pass
+        await ws.close()
+        return ws
+
+    async def __aenter__(self) -> 'ReplayServer':
+        app = web.Application()
+        app.router.add_get('/stream', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f'http://127.0.0.1:{port}'
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._runner.cleanup()
+
+
+async def wait_for(condition, timeout: float = 5.) -> None:
+    """
+    condition()이 참이 될 때까지 기다립니다.
+    """
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+class UserDataFeed:
+    """
+    ``FakeFuturesExchange``의 이벤트를 ``/ws/{listenKey}``로 연결한 클라이언트에 보내는 user-data 스트림 서버입니다.
+    """
+
+    def __init__(self, exchange: Any):
+        """
+        :param exchange: 이벤트를 보낼 모의 거래소
+        """
+        self.url = ''
+        self.listen_keys: List[str] = []
+        self._clients: List[web.WebSocketResponse] = []
+        self._runner: Optional[web.AppRunner] = None
+        exchange.listeners.append(self.publish)
+
+    def publish(self, payload: Dict[str, Any]) -> None:
+        message = json.dumps(payload)
+        for ws in list(self._clients):
+            asyncio.ensure_future(ws.send_str(message))
+
+    async def disconnect(self) -> None:
+        """
+        연결된 클라이언트를 모두 끊습니다 (끊긴 동안의 이벤트는 전달되지 않음).
+        """
+        await asyncio.gather(*(ws.close() for ws in list(self._clients)))
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.listen_keys.append(request.match_info['listen_key'])
+        self._clients.append(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self._clients.remove(ws)
+        return ws
+
+    async def __aenter__(self) -> 'UserDataFeed':
+        app = web.Application()
+        app.router.add_get('/ws/{listen_key}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f'http://127.0.0.1:{port}'
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._runner.cleanup()
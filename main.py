@@ -1,23 +1,39 @@
-import pprint
+import os
+import sys
 
-import ccxt
+ALGORITHM = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algorithm')
+if ALGORITHM not in sys.path:
+    # algorithm/의 모듈들은 그 디렉터리 기준 절대 경로로 서로를 import (algorithm/__main__.py와 같음)
+    sys.path.insert(0, ALGORITHM)
 
-from securite.decrypter import decrypter_les_donnees
 
-data = decrypter_les_donnees()
-cle_API = data["api_key"]
-clef_screte = data["secret_key"]
+def create_exchange():
+    # ccxt는 import가 무거워서 실제로 거래소에 요청할 때만 불러온다
+    import ccxt
+    from securite.decrypter import decrypter_les_donnees
 
-# Login
-exchange = ccxt.binance(config={
-    'apiKey':cle_API,
-    'secret':clef_screte,
-    'enableRateLimit':True,
-    'options':{
-        'defaultType':'future'
-    }
-})
+    data = decrypter_les_donnees()
+    cle_API = data["api_key"]
+    clef_screte = data["secret_key"]
 
-markets = exchange.load_markets()
-pprint.pprint(markets)
-print(len(markets.keys()))
\ No newline at end of file
+    # Login
+    return ccxt.binance(config={
+        'apiKey':cle_API,
+        'secret':clef_screte,
+        'enableRateLimit':True,
+        'options':{
+            'defaultType':'future'
+        }
+    })
+
+
+def main():
+    from market_data.metadata import MarketMetadataCache, fetch_ccxt_markets
+
+    # 마켓 메타데이터는 디스크 캐시에서 읽고, TTL이 지났을 때만 거래소 객체를 만들어 다시 받는다
+    markets = MarketMetadataCache('market_cache').load(lambda: fetch_ccxt_markets(create_exchange()))
+    print(len(markets))
+
+
+if __name__ == '__main__':
+    main()